@@ -0,0 +1,84 @@
+"""ASGI middleware: admission control (load shedding) for chat routes, request body size limit."""
+
+from fastapi import HTTPException
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import get_admission_retry_after_seconds, get_max_request_body_bytes
+from app.core.telemetry import record_admission_shed, record_oversize
+from app.core.tenancy import resolve_tenant
+from app.services.admission import current_signals, should_shed
+from app.services.scheduler import PRIORITY_BATCH, PRIORITY_INTERACTIVE, resolve_priority
+
+# Shed paths and the priority class they default to (same defaults as the scheduler).
+_SHED_PATHS = {
+    "/v1/chat": PRIORITY_INTERACTIVE,
+    "/v1/chat/completions": PRIORITY_INTERACTIVE,
+    "/v1/chat/batch": PRIORITY_BATCH,
+}
+
+
+class AdmissionMiddleware:
+    """
+    Rejects new chat requests with 503 + Retry-After while the admission controller reports
+    overload. Runs before the body is read; every other route passes straight through.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["method"] == "POST":
+            default = _SHED_PATHS.get(scope["path"])
+            if default is not None:
+                headers = Headers(scope=scope)
+                priority = resolve_priority(headers, resolve_tenant(headers), default)
+                if should_shed(current_signals(), priority):
+                    record_admission_shed(priority)
+                    response = JSONResponse(
+                        {"detail": "Server is overloaded; retry later"},
+                        status_code=503,
+                        headers={"Retry-After": str(get_admission_retry_after_seconds())},
+                    )
+                    await response(scope, receive, send)
+                    return
+        await self.app(scope, receive, send)
+
+
+class BodyLimitMiddleware:
+    """
+    Rejects request bodies over MAX_REQUEST_BODY_BYTES with 413 before they are parsed: at once
+    when Content-Length is over the limit, otherwise as soon as the streamed body passes it
+    (nothing past the limit is buffered).
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        limit = get_max_request_body_bytes()
+        if scope["type"] != "http" or not limit:
+            await self.app(scope, receive, send)
+            return
+        detail = f"Request body exceeds MAX_REQUEST_BODY_BYTES ({limit})"
+        length = Headers(scope=scope).get("content-length", "")
+        if length.isdigit() and int(length) > limit:
+            record_oversize("request_body")
+            response = JSONResponse({"detail": detail}, status_code=413, headers={"Connection": "close"})
+            await response(scope, receive, send)
+            return
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    record_oversize("request_body")
+                    # Re-raised by FastAPI's body parsing and rendered by its exception handler.
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
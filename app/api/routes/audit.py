@@ -31,5 +31,18 @@ def get_audit_event(request_id: str) -> AuditEventView:
         failure_category=event.failure_category,
         prompt_hash=event.prompt_hash,
         prompt_length=event.prompt_length,
+        prompt_flags=event.prompt_flags,
+        tenant=event.tenant,
+        cost_usd=event.cost_usd,
+        model=event.model,
+        input_tokens=event.input_tokens,
+        output_tokens=event.output_tokens,
+        tokens_per_second=event.tokens_per_second,
+        policy_variant=event.policy_variant,
+        shadow_decision=event.shadow_decision,
+        decision_trace=event.decision_trace,
+        priority=event.priority,
+        queue_wait_ms=event.queue_wait_ms,
+        transport_timing=event.transport_timing,
         created_at=event.created_at,
     )
@@ -0,0 +1,25 @@
+"""POST /v1/chat/batch: many chats in one request, streamed back as NDJSON."""
+
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Request
+from fastapi.responses import StreamingResponse
+
+from app.api.schemas.batch import ChatBatchRequest
+from app.core.config import get_batch_max_items
+from app.services.batch import run_batch
+
+router = APIRouter()
+
+
+@router.post("/v1/chat/batch")
+def post_chat_batch(body: ChatBatchRequest, request: Request, background: BackgroundTasks) -> StreamingResponse:
+    """
+    Route and run every request; one ChatBatchItem JSON line per request, in completion order.
+    422 when the batch exceeds BATCH_MAX_ITEMS or a request uses a session.
+    """
+    limit = get_batch_max_items()
+    if len(body.requests) > limit:
+        raise HTTPException(status_code=422, detail=f"Batch exceeds BATCH_MAX_ITEMS ({limit})")
+    if any(r.start_session or r.session_id is not None for r in body.requests):
+        raise HTTPException(status_code=422, detail="Sessions are not supported in batch requests")
+    lines = run_batch(body.requests, headers=dict(request.headers), background=background)
+    return StreamingResponse(lines, media_type="application/x-ndjson", background=background)
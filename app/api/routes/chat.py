@@ -1,16 +1,57 @@
 """POST /v1/chat: validate body, call orchestrator, return response."""
 
-from fastapi import APIRouter, Response
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Request, Response
 
 from app.api.schemas.chat import ChatRequest, ChatResponse
+from app.core.tenancy import resolve_tenant
 from app.services.chat_orchestrator import handle_chat_request
+from app.services.idempotency import (
+    IDEMPOTENCY_HEADER,
+    MAX_KEY_LENGTH,
+    IdempotencyError,
+    request_fingerprint,
+    run_idempotent,
+)
+from app.services.sessions import SessionError
 
 router = APIRouter()
 
 
 @router.post("/v1/chat", response_model=ChatResponse)
-def post_chat(body: ChatRequest, response: Response) -> ChatResponse:
-    """Chat endpoint: decision → provider → audit → response."""
-    result = handle_chat_request(body)
+def post_chat(
+    body: ChatRequest, request: Request, response: Response, background: BackgroundTasks
+) -> ChatResponse:
+    """
+    Chat endpoint: decision → provider → audit → response (shadow evaluation runs after).
+    With an Idempotency-Key header, a repeated request returns the stored response.
+    Session errors: 404 unknown/expired session_id, 409 turn in progress, 413 history too long,
+    503 every held session busy.
+    """
+    try:
+        result = _post_chat(body, request, response, background)
+    except SessionError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.detail) from None
     response.headers["X-Request-Id"] = result.request_id
     return result
+
+
+def _post_chat(body: ChatRequest, request: Request, response: Response, background: BackgroundTasks) -> ChatResponse:
+    key = request.headers.get(IDEMPOTENCY_HEADER)
+    if key is None:
+        result = handle_chat_request(body, headers=request.headers, background=background)
+    else:
+        key = key.strip()
+        if not key or len(key) > MAX_KEY_LENGTH:
+            raise HTTPException(status_code=422, detail="Invalid Idempotency-Key")
+        try:
+            result, replayed = run_idempotent(
+                key,
+                resolve_tenant(request.headers),
+                request_fingerprint(body),
+                lambda: handle_chat_request(body, headers=request.headers, background=background),
+            )
+        except IdempotencyError as exc:
+            raise HTTPException(status_code=exc.status_code, detail=exc.detail) from None
+        if replayed:
+            response.headers["Idempotent-Replayed"] = "true"
+    return result
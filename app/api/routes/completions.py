@@ -0,0 +1,31 @@
+"""POST /v1/chat/completions: OpenAI-compatible endpoint, relayed to the routed provider."""
+
+from fastapi import APIRouter, BackgroundTasks, Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+from app.services.completions import CompletionError, error_body, run_completion
+
+router = APIRouter()
+
+
+@router.post("/v1/chat/completions")
+async def post_chat_completions(request: Request, background: BackgroundTasks) -> Response:
+    """
+    OpenAI chat completions request, routed like /v1/chat. The body is read raw (not validated
+    by a model) so it can be forwarded unchanged; the upstream status, content type and body
+    bytes are returned as they arrive. 400 for a body without messages; 502/504 when the
+    provider cannot be reached.
+    """
+    raw = await request.body()
+    try:
+        start, chunks = await run_in_threadpool(run_completion, raw, dict(request.headers), background)
+    except CompletionError as exc:
+        return Response(error_body(exc.message), status_code=exc.status_code, media_type="application/json")
+    return StreamingResponse(
+        chunks,
+        status_code=start.status_code,
+        media_type=start.media_type,
+        headers=start.headers,
+        background=background,
+    )
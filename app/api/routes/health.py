@@ -3,6 +3,7 @@ from fastapi import APIRouter
 router = APIRouter()
 
 
+# async so it answers on the event loop even while the sync-endpoint threadpool is saturated.
 @router.get("/v1/health")
-def get_health() -> dict[str, str]:
+async def get_health() -> dict[str, str]:
     return {"status": "ok"}
@@ -0,0 +1,36 @@
+"""POST /v1/chat/jobs and GET /v1/chat/jobs/{job_id}: asynchronous chat."""
+
+from fastapi import APIRouter, HTTPException, Request
+
+from app.api.schemas.jobs import ChatJobRequest, ChatJobView
+from app.core.tenancy import resolve_tenant
+from app.services.jobs import JobCallbackError, JobQueueFull, JobWorkersUnavailable, get_job_view, submit_job
+
+router = APIRouter()
+
+
+@router.post("/v1/chat/jobs", response_model=ChatJobView, status_code=202)
+def post_chat_job(body: ChatJobRequest, request: Request) -> ChatJobView:
+    """Enqueue a chat; returns the queued job immediately (503 when the backlog is full or JOB_WORKERS=0)."""
+    try:
+        job = submit_job(body, headers=request.headers)
+    except JobCallbackError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from None
+    except JobWorkersUnavailable:
+        raise HTTPException(status_code=503, detail="Chat jobs are disabled on this server") from None
+    except JobQueueFull:
+        raise HTTPException(status_code=503, detail="Job queue is full", headers={"Retry-After": "5"}) from None
+    return job.view()
+
+
+@router.get("/v1/chat/jobs/{job_id}", response_model=ChatJobView)
+def get_chat_job(job_id: str, request: Request) -> ChatJobView:
+    """Job status and, once completed, the chat response. 404 when unknown, expired, or another tenant's."""
+    try:
+        view = get_job_view(job_id, resolve_tenant(request.headers))
+    except Exception:
+        # Treat database errors as unavailable, like GET /v1/audit.
+        raise HTTPException(status_code=404, detail="Job not found") from None
+    if view is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return view
@@ -13,7 +13,7 @@ router = APIRouter()
 
 
 @router.get("/v1/metrics")
-def get_metrics() -> Response:
-    """Return metrics in Prometheus exposition format."""
+async def get_metrics() -> Response:
+    """Return metrics in Prometheus exposition format (async: no threadpool slot needed under load)."""
     body = generate_latest(REGISTRY)
     return Response(content=body, media_type=CONTENT_TYPE)
@@ -1,32 +1,106 @@
 """GET /v1/routes: effective policy view (rule order and thresholds; no secrets)."""
 
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Query
 
-from app.api.schemas.routes import ROUTE_RULE_ORDER, RoutesResponse
-from app.core.config import get_policy_config, get_public_provider_from_url
+from app.api.schemas.routes import BudgetView, RolloutView, RoutesResponse, RuleView
+from app.core.config import PolicyConfig, get_policy_config, get_public_provider
+from app.core.policy_store import get_policy_dir, get_policy_store
+from app.core.tenancy import is_valid_tenant
+from app.core.telemetry import record_budget_remaining
+from app.decision.rules import BudgetRule, Rule, get_pipeline
 
 router = APIRouter()
 
 
+def _rollout_view(config: PolicyConfig) -> RolloutView | None:
+    rollout = config.rollout
+    if rollout is None:
+        return None
+    return RolloutView(
+        mode=rollout.mode,
+        canary_percent=rollout.canary_percent,
+        canary_key=rollout.canary_key,
+        shadow_sample_rate=rollout.shadow_sample_rate,
+        candidate_rule_order=[rule.name for rule in get_pipeline(rollout.candidate)] + ["default"],
+    )
+
+
+def _budget_views(pipeline: tuple[Rule, ...]) -> list[BudgetView]:
+    """Budget state for every budget rule (also refreshes the remaining-budget gauge)."""
+    views = []
+    for rule in pipeline:
+        if not isinstance(rule, BudgetRule):
+            continue
+        for key, limit in rule.budget_keys():
+            spent = rule.spent_usd(key)
+            remaining = max(0.0, limit - spent)
+            record_budget_remaining(rule.name, key, remaining)
+            views.append(
+                BudgetView(
+                    rule=rule.name,
+                    scope=rule.scope,
+                    key=key,
+                    limit_usd=limit,
+                    spent_usd=spent,
+                    remaining_usd=remaining,
+                    window_hours=rule.window_hours,
+                )
+            )
+    return views
+
+
 @router.get("/v1/routes", response_model=RoutesResponse)
-def get_routes() -> RoutesResponse:
+def get_routes(
+    tenant: str | None = Query(
+        None, description="Tenant id (X-Tenant value or key-<hash>); POLICY_DIR mode shows its policy."
+    ),
+) -> RoutesResponse:
     """
     Return the current effective routing policy (read-only).
     Uses get_policy_config() as single source of truth. No API keys or secrets.
     """
-    config = get_policy_config()
-    usd_cost_mode_active = (
-        config.cost_max_usd_for_local is not None
-        and config.llm_input_usd_per_1m_tokens is not None
+    if tenant is not None:
+        tenant = tenant.strip().lower()
+        if not is_valid_tenant(tenant):
+            raise HTTPException(status_code=422, detail="Invalid tenant id")
+    config = get_policy_config(tenant)
+    policy_dir = get_policy_dir()
+    if policy_dir is None:
+        policy_source = "policy_file"
+    elif get_policy_store(policy_dir).index.has_tenant(tenant):
+        policy_source = "tenant"
+    else:
+        policy_source = "default"
+    usd_cost_mode_active = config.cost_max_usd_for_local is not None and (
+        config.llm_input_usd_per_1m_tokens is not None or config.pricing is not None
     )
+    pipeline = get_pipeline(config)
+    index = config.sensitivity_keyword_index
     return RoutesResponse(
-        rule_order=list(ROUTE_RULE_ORDER),
+        tenant=tenant,
+        policy_source=policy_source,
+        rule_order=[rule.name for rule in pipeline] + ["default"],
+        pipeline=[
+            RuleView(name=rule.name, type=rule.type_name, params=rule.describe())
+            for rule in pipeline
+        ],
         sensitivity_keyword_count=len(config.sensitivity_keywords),
+        sensitivity_keyword_index_terms=index.term_count if index else None,
+        sensitivity_keyword_index_bytes=index.size_bytes if index else None,
+        sensitivity_detectors=(
+            list(config.sensitivity_detectors.detectors) if config.sensitivity_detectors else []
+        ),
+        decision_scope=config.decision_scope,
         cost_max_prompt_length_for_local=config.cost_max_prompt_length_for_local,
         default_provider=config.default_provider,
         usd_cost_mode_active=usd_cost_mode_active,
         cost_max_usd_for_local=config.cost_max_usd_for_local,
         llm_input_usd_per_1m_tokens=config.llm_input_usd_per_1m_tokens,
+        cost_tokenizer=config.cost_tokenizer,
+        cost_expected_output_tokens=config.cost_expected_output_tokens,
+        pricing_models=config.pricing.model_keys() if config.pricing else [],
         cost_chars_per_token=config.cost_chars_per_token,
-        available_public_provider=get_public_provider_from_url(),
+        available_public_provider=get_public_provider(),
+        rollout=_rollout_view(config),
+        budgets=_budget_views(pipeline),
     )
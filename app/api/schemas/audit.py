@@ -13,4 +13,29 @@ class AuditEventView(BaseModel):
     failure_category: str | None = Field(None, description="normalized failure category")
     prompt_hash: str | None = Field(None, description="hash of prompt text (no raw prompt)")
     prompt_length: int | None = Field(None, description="prompt text length (no raw prompt)")
+    prompt_flags: str | None = Field(
+        None, description="safe decision flags, e.g. detectors=email,iban (no matched text)"
+    )
+    tenant: str | None = Field(None, description="tenant id (X-Tenant or hashed API key)")
+    cost_usd: float | None = Field(
+        None, description="public LLM cost in USD (reported usage when available, else estimate)"
+    )
+    model: str | None = Field(None, description="model that served the request")
+    input_tokens: int | None = Field(None, description="provider-reported input tokens")
+    output_tokens: int | None = Field(None, description="provider-reported output tokens")
+    tokens_per_second: float | None = Field(None, description="output tokens per second (Ollama timings)")
+    policy_variant: str | None = Field(
+        None, description="'candidate' when a canary rollout decided this request with the candidate policy"
+    )
+    shadow_decision: str | None = Field(
+        None, description="shadow candidate's decision when it diverged from the active one (sampled)"
+    )
+    decision_trace: str | None = Field(
+        None, description="compact JSON decision trace when tracing was enabled (metadata only)"
+    )
+    priority: str | None = Field(None, description="scheduler priority class: interactive or batch")
+    queue_wait_ms: float | None = Field(None, description="time spent waiting for a provider slot in milliseconds")
+    transport_timing: str | None = Field(
+        None, description="compact JSON transport phases (ms) and body bytes of the provider call"
+    )
     created_at: datetime = Field(..., description="timestamp when audit event was created")
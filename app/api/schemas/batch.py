@@ -0,0 +1,17 @@
+"""Pydantic models for POST /v1/chat/batch (request) and its NDJSON result lines."""
+
+from pydantic import BaseModel, Field
+
+from app.api.schemas.chat import ChatRequest, ChatResponse
+
+
+class ChatBatchRequest(BaseModel):
+    requests: list[ChatRequest] = Field(
+        ..., min_length=1, description="independent chat requests (at most BATCH_MAX_ITEMS)"
+    )
+
+
+class ChatBatchItem(ChatResponse):
+    """One NDJSON line: the ChatResponse for requests[index]."""
+
+    index: int = Field(..., description="position of the request in `requests`")
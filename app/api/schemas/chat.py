@@ -1,5 +1,7 @@
 """Pydantic models for /v1/chat request and response. Aligned with providers.ChatResult and audit."""
 
+from typing import Any
+
 from pydantic import BaseModel, Field
 
 
@@ -11,6 +13,47 @@ class ChatMessage(BaseModel):
 class ChatRequest(BaseModel):
     messages: list[ChatMessage] = Field(..., min_length=1, description="chat messages")
     model: str | None = Field(None, description="optional model name (provider-specific default if omitted)")
+    start_session: bool = Field(
+        False, description="keep this conversation on the gateway; the response returns its session_id"
+    )
+    session_id: str | None = Field(
+        None, max_length=64, description="continue a session: `messages` holds only the new messages"
+    )
+
+
+class ChatUsageView(BaseModel):
+    """Token usage reported by the provider (null when not reported) and the call's cost."""
+
+    input_tokens: int | None = Field(None, description="input (prompt) tokens reported by the provider")
+    output_tokens: int | None = Field(None, description="output (completion) tokens reported by the provider")
+    tokens_per_second: float | None = Field(
+        None, description="output tokens per second from provider timings (Ollama only)"
+    )
+    cost_usd: float = Field(
+        0.0, description="USD from reported tokens and policy pricing, else the decision-time estimate; 0 for local"
+    )
+
+
+class RuleTraceView(BaseModel):
+    """One rule of the decision pipeline: outcome, safe inputs, and elapsed time."""
+
+    name: str = Field(..., description="rule name from the policy")
+    type: str = Field(..., description="rule type")
+    ran: bool = Field(..., description="false when an earlier rule matched first")
+    outcome: str = Field(..., description="match, pass, or skipped")
+    elapsed_ns: int = Field(..., description="evaluation time in nanoseconds (0 when skipped)")
+    reason_codes: list[str] = Field(default_factory=list, description="reason codes when matched")
+    inputs: dict[str, Any] = Field(
+        default_factory=dict, description="metadata the rule used (lengths, estimates, detector classes)"
+    )
+
+
+class DecisionTraceView(BaseModel):
+    """Per-rule decision trace (X-Decision-Trace or sampling). Never contains prompt text."""
+
+    cache: str = Field(..., description="decision cache: bypass while tracing")
+    total_ns: int = Field(..., description="pipeline evaluation time in nanoseconds")
+    rules: list[RuleTraceView] = Field(..., description="pipeline rules in evaluation order")
 
 
 class ChatResponse(BaseModel):
@@ -21,3 +64,7 @@ class ChatResponse(BaseModel):
     reason_codes: list[str] = Field(..., description="decision reason codes")
     content: str | None = Field(None, description="assistant reply (success)")
     error: str | None = Field(None, description="error message or failure category (failure)")
+    model: str | None = Field(None, description="model that served the request, as reported by the provider (success)")
+    usage: ChatUsageView | None = Field(None, description="token usage and cost (success)")
+    trace: DecisionTraceView | None = Field(None, description="decision trace (when tracing was enabled)")
+    session_id: str | None = Field(None, description="session to continue with the next turn (session requests)")
@@ -0,0 +1,33 @@
+"""Pydantic models for /v1/chat/jobs: asynchronous chat submission and job status."""
+
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+from app.api.schemas.chat import ChatRequest, ChatResponse
+
+JobPriority = Literal["high", "normal", "low"]
+JobStatus = Literal["queued", "running", "completed", "failed"]
+
+
+class ChatJobRequest(ChatRequest):
+    """A chat request plus queueing options."""
+
+    priority: JobPriority = Field("normal", description="queue priority: high, normal, or low")
+    callback_url: str | None = Field(
+        None, description="URL that receives the job view (POST) when the job finishes; host must be allowlisted"
+    )
+
+
+class ChatJobView(BaseModel):
+    """Job status; `result` is the ChatResponse once completed (it may itself carry a provider error)."""
+
+    job_id: str = Field(..., description="job id for GET /v1/chat/jobs/{job_id}")
+    status: JobStatus = Field(..., description="queued, running, completed, or failed")
+    priority: JobPriority = Field(..., description="queue priority")
+    created_at: datetime = Field(..., description="when the job was accepted")
+    started_at: datetime | None = Field(None, description="when a worker picked the job up")
+    finished_at: datetime | None = Field(None, description="when the job completed or failed")
+    result: ChatResponse | None = Field(None, description="chat response (completed)")
+    error: str | None = Field(None, description="why the job failed (failed; not a provider error)")
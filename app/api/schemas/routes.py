@@ -1,23 +1,83 @@
 """Pydantic model for GET /v1/routes: safe effective-policy view (no secrets)."""
 
+from typing import Any
+
 from pydantic import BaseModel, Field
 
-# Rule order matches app/decision/engine.py: sensitivity → cost → default.
-ROUTE_RULE_ORDER = ("sensitivity", "cost", "default")
+
+class RuleView(BaseModel):
+    """One compiled rule in the routing pipeline (safe params only)."""
+
+    name: str = Field(..., description="Rule name (defaults to its type).")
+    type: str = Field(..., description="Registered rule type, e.g. sensitivity, cost, header_match.")
+    params: dict[str, Any] = Field(
+        default_factory=dict,
+        description="Rule parameters as compiled (keywords and header values are not exposed).",
+    )
+
+
+class BudgetView(BaseModel):
+    """Current state of one budget rule for one scope key (global or a tenant)."""
+
+    rule: str = Field(..., description="Budget rule name.")
+    scope: str = Field(..., description="'tenant' or 'global'.")
+    key: str = Field(..., description="Ledger key: 'global' or 'tenant:<id>'.")
+    limit_usd: float = Field(..., description="Spend limit for the window in USD.", ge=0)
+    spent_usd: float = Field(..., description="Estimated public spend in the window in USD.", ge=0)
+    remaining_usd: float = Field(..., description="limit_usd - spent_usd, floored at 0.", ge=0)
+    window_hours: int = Field(..., description="Sliding window length in hours.", ge=1)
+
+
+class RolloutView(BaseModel):
+    """Candidate policy rollout settings (policy `rollout`)."""
+
+    mode: str = Field(..., description="'shadow' (decide alongside, no effect) or 'canary' (routes a share of traffic).")
+    canary_percent: float = Field(..., description="Percent of traffic decided by the candidate (canary mode).", ge=0, le=100)
+    canary_key: str = Field(..., description="What selects canary traffic: 'request_id' or 'tenant'.")
+    shadow_sample_rate: float = Field(..., description="Share of shadow divergences recorded in audit.", ge=0, le=1)
+    candidate_rule_order: list[str] = Field(..., description="Candidate policy's rule order (then default).")
 
 
 class RoutesResponse(BaseModel):
     """Effective routing policy (read-only). No API keys, env URLs, or secrets."""
 
+    tenant: str | None = Field(None, description="Tenant requested via ?tenant= (normalized), or null.")
+    policy_source: str = Field(
+        "policy_file",
+        description="'policy_file' (POLICY_FILE), 'tenant' (POLICY_DIR/<tenant>.json), or 'default' (POLICY_DIR/default.json).",
+    )
+
     rule_order: list[str] = Field(
         ...,
-        description="Order in which rules are evaluated: sensitivity, then cost, then default.",
+        description="Order in which rules are evaluated (compiled pipeline names, then default).",
+    )
+    pipeline: list[RuleView] = Field(
+        ...,
+        description="Compiled rule pipeline in evaluation order; the first matching rule wins.",
     )
     sensitivity_keyword_count: int = Field(
         ...,
         description="Number of configured sensitivity keywords (keywords not exposed for privacy).",
         ge=0,
     )
+    sensitivity_keyword_index_terms: int | None = Field(
+        None,
+        description="Term count of the external keyword index (sensitivity.keyword_index); null when not configured.",
+        ge=0,
+    )
+    sensitivity_keyword_index_bytes: int | None = Field(
+        None,
+        description="Size in bytes of the memory-mapped keyword index file; null when not configured.",
+        ge=0,
+    )
+    sensitivity_detectors: list[str] = Field(
+        default_factory=list,
+        description="Enabled PII/secret detector classes for the sensitivity rule (e.g. api_key, email).",
+    )
+    decision_scope: str = Field(
+        "last_user",
+        description="'last_user' (rules see the last user message) or 'conversation' (all messages; cost uses total input).",
+    )
     cost_max_prompt_length_for_local: int = Field(
         ...,
         description="Max prompt length (chars) below which cost rule prefers local.",
@@ -27,7 +87,7 @@ class RoutesResponse(BaseModel):
         ...,
         description=(
             "Whether USD-based cost gate is active "
-            "(True when both cost_max_usd_for_local and llm_input_usd_per_1m_tokens are configured)."
+            "(True when cost_max_usd_for_local and a price — llm_input_usd_per_1m_tokens or cost.pricing — are configured)."
         ),
     )
     cost_max_usd_for_local: float | None = Field(
@@ -40,6 +100,19 @@ class RoutesResponse(BaseModel):
         description="Configured LLM input price in USD per 1M input tokens (policy cost.input_usd_per_1m_tokens; approximate).",
         ge=0,
     )
+    cost_tokenizer: str = Field(
+        "heuristic",
+        description="Token estimator for USD mode: 'heuristic' (chars / cost_chars_per_token) or 'bpe_estimate'.",
+    )
+    cost_expected_output_tokens: int = Field(
+        0,
+        description="Output tokens assumed per request when a pricing entry has an output rate.",
+        ge=0,
+    )
+    pricing_models: list[str] = Field(
+        default_factory=list,
+        description="Priced provider/model keys from cost.pricing (e.g. openai/gpt-4o-mini).",
+    )
     cost_chars_per_token: int = Field(
         ...,
         description="Heuristic chars-per-token used for the USD estimate (tokens ≈ chars / cost_chars_per_token).",
@@ -47,9 +120,14 @@ class RoutesResponse(BaseModel):
     )
     default_provider: str = Field(
         ...,
-        description="Policy default: 'local' or 'public'. When 'public', the resolved provider (openai or anthropic) is derived from PUBLIC_LLM_URL at decision time.",
+        description="Policy default: 'local' or 'public'. When 'public', the provider is PUBLIC_PROVIDER, else inferred from PUBLIC_LLM_URL (openai or anthropic), at decision time.",
     )
     available_public_provider: str = Field(
         ...,
-        description="Public provider inferred from PUBLIC_LLM_URL (e.g. openai or anthropic when host contains that name).",
+        description="Provider backend that 'public' routes resolve to: PUBLIC_PROVIDER, else inferred from PUBLIC_LLM_URL (openai or anthropic).",
+    )
+    rollout: RolloutView | None = Field(None, description="Candidate policy rollout, or null when none is configured.")
+    budgets: list[BudgetView] = Field(
+        default_factory=list,
+        description="Budget rule state per scope key (tenants with spend or a configured limit).",
     )
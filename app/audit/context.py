@@ -19,6 +19,17 @@ class AuditRequestContext:
         "prompt_hash",
         "prompt_length",
         "prompt_flags",
+        "tenant",
+        "cost_usd",
+        "model",
+        "input_tokens",
+        "output_tokens",
+        "tokens_per_second",
+        "policy_variant",
+        "decision_trace",
+        "priority",
+        "queue_wait_ms",
+        "transport_timing",
     )
 
     def __init__(
@@ -32,6 +43,17 @@ class AuditRequestContext:
         prompt_hash: str | None = None,
         prompt_length: int | None = None,
         prompt_flags: str | None = None,
+        tenant: str | None = None,
+        cost_usd: float | None = None,
+        model: str | None = None,
+        input_tokens: int | None = None,
+        output_tokens: int | None = None,
+        tokens_per_second: float | None = None,
+        policy_variant: str | None = None,
+        decision_trace: str | None = None,
+        priority: str | None = None,
+        queue_wait_ms: float | None = None,
+        transport_timing: str | None = None,
     ) -> None:
         self.request_id = request_id
         self.decision = decision
@@ -41,6 +63,17 @@ class AuditRequestContext:
         self.prompt_hash = prompt_hash
         self.prompt_length = prompt_length
         self.prompt_flags = prompt_flags
+        self.tenant = tenant
+        self.cost_usd = cost_usd
+        self.model = model
+        self.input_tokens = input_tokens
+        self.output_tokens = output_tokens
+        self.tokens_per_second = tokens_per_second
+        self.policy_variant = policy_variant
+        self.decision_trace = decision_trace
+        self.priority = priority
+        self.queue_wait_ms = queue_wait_ms
+        self.transport_timing = transport_timing
 
     def to_dict(self) -> dict[str, Any]:
         """For tests: dict representation (no raw prompt)."""
@@ -53,4 +86,15 @@ class AuditRequestContext:
             "prompt_hash": self.prompt_hash,
             "prompt_length": self.prompt_length,
             "prompt_flags": self.prompt_flags,
+            "tenant": self.tenant,
+            "cost_usd": self.cost_usd,
+            "model": self.model,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "tokens_per_second": self.tokens_per_second,
+            "policy_variant": self.policy_variant,
+            "decision_trace": self.decision_trace,
+            "priority": self.priority,
+            "queue_wait_ms": self.queue_wait_ms,
+            "transport_timing": self.transport_timing,
         }
@@ -30,8 +30,28 @@ class AuditEvent(Base):
     prompt_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
     prompt_length: Mapped[int | None] = mapped_column(Integer, nullable=True)
     prompt_flags: Mapped[str | None] = mapped_column(Text, nullable=True)
+    tenant: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    cost_usd: Mapped[float | None] = mapped_column(Float, nullable=True)
+    model: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    input_tokens: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    output_tokens: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    tokens_per_second: Mapped[float | None] = mapped_column(Float, nullable=True)
+    # Rollout: "candidate" when a canary request was decided by the candidate policy;
+    # shadow_decision holds the shadow candidate's decision when it diverged (sampled).
+    policy_variant: Mapped[str | None] = mapped_column(String(16), nullable=True)
+    shadow_decision: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Compact JSON decision trace (per-rule outcome, inputs, ns) when tracing was enabled.
+    decision_trace: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Scheduler class (interactive | batch) and time spent waiting for a provider slot.
+    priority: Mapped[str | None] = mapped_column(String(16), nullable=True)
+    queue_wait_ms: Mapped[float | None] = mapped_column(Float, nullable=True)
+    # Compact JSON transport phases (connect, tls, write, ttfb, read ms) and body bytes of the provider call.
+    transport_timing: Mapped[str | None] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc)
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+        index=True,
     )
 
     def __repr__(self) -> str:
@@ -49,5 +69,53 @@ class AuditEvent(Base):
             "prompt_hash": self.prompt_hash,
             "prompt_length": self.prompt_length,
             "prompt_flags": self.prompt_flags,
+            "tenant": self.tenant,
+            "cost_usd": self.cost_usd,
+            "model": self.model,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "tokens_per_second": self.tokens_per_second,
+            "policy_variant": self.policy_variant,
+            "shadow_decision": self.shadow_decision,
+            "decision_trace": self.decision_trace,
+            "priority": self.priority,
+            "queue_wait_ms": self.queue_wait_ms,
+            "transport_timing": self.transport_timing,
             "created_at": self.created_at.isoformat() if self.created_at else None,
         }
+
+
+class IdempotencyRecord(Base):
+    """
+    Idempotency-Key claim shared by all workers. `response` is NULL while the first request
+    is in flight, then the serialized ChatResponse until `expires_at`. An in-flight claim past
+    `claimed_until` belongs to a worker that died mid-request; the next retry takes it over.
+    """
+
+    __tablename__ = "idempotency_records"
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)  # SHA-256 of tenant + key
+    fingerprint: Mapped[str] = mapped_column(String(64), nullable=False)  # SHA-256 of the body
+    response: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+    claimed_until: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+
+class ChatJob(Base):
+    """
+    State of one asynchronous chat job (POST /v1/chat/jobs). The request body is never stored:
+    only status, routing metadata and, once completed, the serialized ChatResponse.
+    """
+
+    __tablename__ = "chat_jobs"
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    status: Mapped[str] = mapped_column(String(16), nullable=False)
+    priority: Mapped[str] = mapped_column(String(8), nullable=False)
+    tenant: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    result: Mapped[str | None] = mapped_column(Text, nullable=True)
+    error: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -1,9 +1,12 @@
 """Persistence adapter for audit events (Postgres backend, config-driven)."""
 
-from sqlalchemy import create_engine, select
+from datetime import datetime, timezone
+
+from sqlalchemy import create_engine, delete, func, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, sessionmaker
 
-from app.audit.models import AuditEvent
+from app.audit.models import AuditEvent, ChatJob, IdempotencyRecord
 from app.core.config import get_database_url
 
 
@@ -47,6 +50,16 @@ def save_audit_event(event: AuditEvent, session: Session | None = None) -> None:
         s.commit()
 
 
+def save_audit_events(events: list[AuditEvent], session: Session | None = None) -> None:
+    """Persist many audit events in one transaction (batch requests)."""
+
+    def _write(s: Session) -> None:
+        s.add_all(events)
+        s.commit()
+
+    _with_session(session, _write)
+
+
 def get_audit_event_by_request_id(
     request_id: str, session: Session | None = None
 ) -> AuditEvent | None:
@@ -57,3 +70,178 @@ def get_audit_event_by_request_id(
     factory = get_audit_session_factory()
     with factory() as s:
         return s.execute(stmt).scalar_one_or_none()
+
+
+def set_shadow_decision(request_id: str, shadow_decision: str, session: Session | None = None) -> None:
+    """Record the shadow candidate's (divergent) decision on an existing audit event."""
+
+    def _write(s: Session) -> None:
+        s.execute(
+            update(AuditEvent)
+            .where(AuditEvent.request_id == request_id)
+            .values(shadow_decision=shadow_decision)
+        )
+        s.commit()
+
+    _with_session(session, _write)
+
+
+def _with_session(session: Session | None, fn):
+    if session is not None:
+        return fn(session)
+    factory = get_audit_session_factory()
+    with factory() as s:
+        return fn(s)
+
+
+def sum_spend_by_hour(
+    since: datetime, session: Session | None = None
+) -> list[tuple[str | None, datetime, float]]:
+    """(tenant, hour start, total cost_usd) of audit events after `since` with recorded spend, all workers."""
+    hour = func.date_trunc("hour", AuditEvent.created_at).label("hour")
+    stmt = (
+        select(AuditEvent.tenant, hour, func.sum(AuditEvent.cost_usd))
+        .where(AuditEvent.created_at > since, AuditEvent.cost_usd > 0)
+        .group_by(AuditEvent.tenant, hour)
+    )
+    return _with_session(session, lambda s: [tuple(r) for r in s.execute(stmt).all()])
+
+
+def _idempotency_lapsed(now: datetime):
+    """Records a claim may replace: expired, or in flight past their lease (the worker died)."""
+    return (IdempotencyRecord.expires_at <= now) | (
+        IdempotencyRecord.response.is_(None) & (IdempotencyRecord.claimed_until <= now)
+    )
+
+
+def _live_idempotency_record(s: Session, key: str, now: datetime) -> tuple[str, str | None] | None:
+    row = s.execute(
+        select(IdempotencyRecord.fingerprint, IdempotencyRecord.response).where(
+            IdempotencyRecord.key == key, ~_idempotency_lapsed(now)
+        )
+    ).first()
+    return (row[0], row[1]) if row is not None else None
+
+
+def claim_idempotency_key(
+    key: str,
+    fingerprint: str,
+    expires_at: datetime,
+    claimed_until: datetime,
+    session: Session | None = None,
+) -> tuple[str, str | None] | None:
+    """
+    Insert a pending record for `key` leased until `claimed_until` (replacing an expired record
+    or a lapsed claim). Returns None when this call claimed the key, else (fingerprint,
+    response) of the live record (response None = in flight).
+    """
+
+    def _claim(s: Session) -> tuple[str, str | None] | None:
+        now = datetime.now(timezone.utc)
+        for _ in range(3):
+            s.execute(delete(IdempotencyRecord).where(IdempotencyRecord.key == key, _idempotency_lapsed(now)))
+            s.add(
+                IdempotencyRecord(
+                    key=key,
+                    fingerprint=fingerprint,
+                    created_at=now,
+                    expires_at=expires_at,
+                    claimed_until=claimed_until,
+                )
+            )
+            try:
+                s.commit()
+                return None
+            except IntegrityError:
+                s.rollback()
+            row = _live_idempotency_record(s, key, now)
+            if row is not None:
+                return row
+            # Released (or lapsed) between our insert and select: try to claim again.
+        raise RuntimeError("idempotency key claim did not settle")
+
+    return _with_session(session, _claim)
+
+
+def get_idempotency_record(key: str, session: Session | None = None) -> tuple[str, str | None] | None:
+    """(fingerprint, response) of the record for `key`, or None when there is none or its claim lapsed."""
+    return _with_session(session, lambda s: _live_idempotency_record(s, key, datetime.now(timezone.utc)))
+
+
+def complete_idempotency_key(key: str, response: str, session: Session | None = None) -> None:
+    """Store the serialized response on a claimed record."""
+
+    def _write(s: Session) -> None:
+        s.execute(update(IdempotencyRecord).where(IdempotencyRecord.key == key).values(response=response))
+        s.commit()
+
+    _with_session(session, _write)
+
+
+def release_idempotency_key(key: str, session: Session | None = None) -> None:
+    """Drop an in-flight claim (the request failed) so a retry runs again."""
+
+    def _write(s: Session) -> None:
+        s.execute(
+            delete(IdempotencyRecord).where(
+                IdempotencyRecord.key == key, IdempotencyRecord.response.is_(None)
+            )
+        )
+        s.commit()
+
+    _with_session(session, _write)
+
+
+def delete_expired_idempotency_keys(now: datetime, session: Session | None = None) -> int:
+    """Delete records whose TTL has passed. Returns the number of rows removed."""
+
+    def _write(s: Session) -> int:
+        result = s.execute(delete(IdempotencyRecord).where(IdempotencyRecord.expires_at <= now))
+        s.commit()
+        return result.rowcount or 0
+
+    return _with_session(session, _write)
+
+
+def save_chat_job(job: ChatJob, session: Session | None = None) -> None:
+    """Insert or update one chat job row."""
+
+    def _write(s: Session) -> None:
+        s.merge(job)
+        s.commit()
+
+    _with_session(session, _write)
+
+
+def get_chat_job(job_id: str, session: Session | None = None) -> ChatJob | None:
+    """Fetch one chat job by id, or None when not found."""
+    stmt = select(ChatJob).where(ChatJob.id == job_id)
+
+    def _read(s: Session) -> ChatJob | None:
+        job = s.execute(stmt).scalar_one_or_none()
+        if job is not None:
+            s.expunge(job)
+        return job
+
+    return _with_session(session, _read)
+
+
+def delete_chat_job(job_id: str, session: Session | None = None) -> None:
+    """Delete one chat job row (a submission that was rejected after being recorded)."""
+
+    def _write(s: Session) -> None:
+        s.execute(delete(ChatJob).where(ChatJob.id == job_id))
+        s.commit()
+
+    _with_session(session, _write)
+
+
+def delete_expired_chat_jobs(before: datetime, session: Session | None = None) -> int:
+    """Delete jobs submitted before `before`, finished or not. Returns the number of rows removed."""
+
+    def _write(s: Session) -> int:
+        result = s.execute(delete(ChatJob).where(ChatJob.created_at < before))
+        s.commit()
+        return result.rowcount or 0
+
+    return _with_session(session, _write)
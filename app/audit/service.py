@@ -5,7 +5,7 @@ from typing import TYPE_CHECKING
 
 from app.audit.context import AuditRequestContext
 from app.audit.models import AuditEvent
-from app.audit.repository import save_audit_event
+from app.audit.repository import save_audit_event, save_audit_events
 from app.core.config import get_audit_enabled, get_database_url
 
 if TYPE_CHECKING:
@@ -23,6 +23,17 @@ def build_audit_event(ctx: AuditRequestContext) -> AuditEvent:
         prompt_hash=ctx.prompt_hash,
         prompt_length=ctx.prompt_length,
         prompt_flags=ctx.prompt_flags,
+        tenant=ctx.tenant,
+        cost_usd=ctx.cost_usd,
+        model=ctx.model,
+        input_tokens=ctx.input_tokens,
+        output_tokens=ctx.output_tokens,
+        tokens_per_second=ctx.tokens_per_second,
+        policy_variant=ctx.policy_variant,
+        decision_trace=ctx.decision_trace,
+        priority=ctx.priority,
+        queue_wait_ms=ctx.queue_wait_ms,
+        transport_timing=ctx.transport_timing,
         created_at=datetime.now(timezone.utc),
     )
 
@@ -36,3 +47,10 @@ def persist_audit_event(ctx: AuditRequestContext, session: "Session | None" = No
         return
     event = build_audit_event(ctx)
     save_audit_event(event, session=session)
+
+
+def persist_audit_events(contexts: list[AuditRequestContext], session: "Session | None" = None) -> None:
+    """Persist many audit events in one bulk insert (no-op when audit is disabled or nothing to write)."""
+    if not contexts or not get_audit_enabled() or not get_database_url():
+        return
+    save_audit_events([build_audit_event(ctx) for ctx in contexts], session=session)
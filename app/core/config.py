@@ -2,6 +2,15 @@
 
 import os
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from app.decision.detectors import DetectorScanner
+    from app.decision.fallbacks import LocalFallbacks
+    from app.decision.keyword_index import KeywordIndex
+    from app.decision.pricing import PricingTable
+    from app.decision.rollout import Rollout
+    from app.decision.rules import Rule
 
 
 def get_database_url() -> str | None:
@@ -19,27 +28,346 @@ def get_audit_enabled() -> bool:
     return get_database_url() is not None
 
 
+# What the decision engine looks at: the last user message, or every message in the request.
+DECISION_SCOPE_LAST_USER = "last_user"
+DECISION_SCOPE_CONVERSATION = "conversation"
+DECISION_SCOPES = (DECISION_SCOPE_LAST_USER, DECISION_SCOPE_CONVERSATION)
+
+
 @dataclass(frozen=True)
 class PolicyConfig:
     """Policy thresholds and keywords for decision engine (from POLICY_FILE only)."""
 
     sensitivity_keywords: tuple[str, ...]
     cost_max_prompt_length_for_local: int
-    default_provider: str  # "local" | "public" (resolved to openai|anthropic in decision engine)
+    default_provider: str  # "local" | "public" (resolved to the public provider in decision engine)
     cost_max_usd_for_local: float | None
     llm_input_usd_per_1m_tokens: float | None
     cost_chars_per_token: int
+    # Compiled rule pipeline from the policy `rules` array; None = default (sensitivity → cost).
+    rules: "tuple[Rule, ...] | None" = None
+    # Compiled PII/secret detectors for the sensitivity rule; None = keywords only.
+    sensitivity_detectors: "DetectorScanner | None" = None
+    # Memory-mapped external keyword dictionary (sensitivity.keyword_index); None = not configured.
+    sensitivity_keyword_index: "KeywordIndex | None" = None
+    # last_user: rules see the last user message. conversation: sensitivity scans every message
+    # and the cost rule uses the total input length the provider bills for.
+    decision_scope: str = DECISION_SCOPE_LAST_USER
+    # Per-provider/model prices (cost.pricing); None = global input_usd_per_1m_tokens only.
+    pricing: "PricingTable | None" = None
+    # Token estimator for USD mode: "heuristic" (chars / chars_per_token) or "bpe_estimate".
+    cost_tokenizer: str = "heuristic"
+    # Output tokens assumed per request when pricing output (cost.expected_output_tokens).
+    cost_expected_output_tokens: int = 0
+    # Fingerprint of the loaded policy content (decision cache generation); None = built in code.
+    generation: str | None = None
+    # Candidate policy in shadow or canary rollout (policy `rollout`); None = no candidate.
+    rollout: "Rollout | None" = None
+    # Smaller local models to use while the local provider is saturated (policy local_fallbacks).
+    local_fallbacks: "LocalFallbacks | None" = None
 
 
-def get_policy_config() -> PolicyConfig:
+def get_policy_config(tenant: str | None = None) -> PolicyConfig:
     """
-    Load policy config from the file specified by POLICY_FILE.
+    Load policy config from the file specified by POLICY_FILE (compiled once, reloaded when it changes).
     POLICY_FILE must be set and the file must exist and be valid JSON; otherwise raises PolicyFileError.
-    Env is not a policy source.
+    When POLICY_DIR is set, returns `tenant`'s policy from the compiled per-tenant index instead
+    (default.json when the tenant has no file). Env is not a policy source.
+    """
+    from app.core.policy_store import get_policy_dir, get_policy_store
+
+    policy_dir = get_policy_dir()
+    if policy_dir:
+        return get_policy_store(policy_dir).get(tenant)
+
+    from app.core.policy_file import get_cached_policy_config
+
+    return get_cached_policy_config()
+
+
+def get_policy_reload_seconds() -> float:
+    """Min seconds between POLICY_DIR rescans for changed files (default 2). From env POLICY_RELOAD_SECONDS."""
+    raw = os.getenv("POLICY_RELOAD_SECONDS", "2").strip()
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        return 2.0
+
+
+def get_decision_cache_size() -> int:
+    """Max entries in the in-process decision cache (default 1024; 0 disables). From env DECISION_CACHE_SIZE."""
+    raw = os.getenv("DECISION_CACHE_SIZE", "1024").strip()
+    try:
+        return max(0, int(raw))
+    except ValueError:
+        return 1024
+
+
+def get_budget_sync_seconds() -> float:
+    """
+    Seconds between spend ledger re-syncs from the audit log (default 30; 0 = only at startup).
+    From env BUDGET_SYNC_SECONDS.
+    """
+    raw = os.getenv("BUDGET_SYNC_SECONDS", "30").strip()
+    try:
+        value = float(raw)
+    except ValueError:
+        return 30.0
+    return 0.0 if value <= 0 else max(1.0, value)
+
+
+def get_decision_trace_sample_rate() -> float:
+    """Share of requests traced without X-Decision-Trace, 0..1 (default 0). From env DECISION_TRACE_SAMPLE_RATE."""
+    raw = os.getenv("DECISION_TRACE_SAMPLE_RATE", "0").strip()
+    try:
+        return min(1.0, max(0.0, float(raw)))
+    except ValueError:
+        return 0.0
+
+
+def get_idempotency_ttl_seconds() -> float:
+    """Seconds a stored Idempotency-Key result is replayed (default 86400, min 60). From env IDEMPOTENCY_TTL_SECONDS."""
+    raw = os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400").strip()
+    try:
+        return max(60.0, float(raw))
+    except ValueError:
+        return 86400.0
+
+
+def get_idempotency_cache_size() -> int:
+    """Max Idempotency-Key entries kept in memory per worker (default 10000). From env IDEMPOTENCY_CACHE_SIZE."""
+    raw = os.getenv("IDEMPOTENCY_CACHE_SIZE", "10000").strip()
+    try:
+        return max(1, int(raw))
+    except ValueError:
+        return 10000
+
+
+def get_idempotency_lease_seconds() -> float:
+    """
+    Seconds an in-flight Idempotency-Key claim is held in Postgres before a retry may take it
+    over (the claiming worker is presumed dead). Default twice PROVIDER_TIMEOUT_SECONDS, min 1.
+    From env IDEMPOTENCY_LEASE_SECONDS.
+    """
+    default = 2 * get_provider_timeout_seconds()
+    raw = (os.getenv("IDEMPOTENCY_LEASE_SECONDS") or "").strip()
+    if not raw:
+        return default
+    try:
+        return max(1.0, float(raw))
+    except ValueError:
+        return default
+
+
+def get_idempotency_wait_seconds() -> float:
+    """Max seconds a duplicate waits for the in-flight request (default 120). From env IDEMPOTENCY_WAIT_SECONDS."""
+    raw = os.getenv("IDEMPOTENCY_WAIT_SECONDS", "120").strip()
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        return 120.0
+
+
+def get_session_ttl_seconds() -> float:
+    """Seconds an idle chat session is kept (default 1800, min 60). From env SESSION_TTL_SECONDS."""
+    raw = os.getenv("SESSION_TTL_SECONDS", "1800").strip()
+    try:
+        return max(60.0, float(raw))
+    except ValueError:
+        return 1800.0
+
+
+def get_session_max() -> int:
+    """Max chat sessions kept in memory per worker (default 10000). From env SESSION_MAX."""
+    raw = os.getenv("SESSION_MAX", "10000").strip()
+    try:
+        return max(1, int(raw))
+    except ValueError:
+        return 10000
+
+
+def get_session_max_chars() -> int:
+    """Max characters of history per chat session (default 400000). From env SESSION_MAX_CHARS."""
+    raw = os.getenv("SESSION_MAX_CHARS", "400000").strip()
+    try:
+        return max(1, int(raw))
+    except ValueError:
+        return 400000
+
+
+def get_job_workers() -> int:
+    """Worker threads executing /v1/chat/jobs per process (default 2; 0 disables jobs, 503). From env JOB_WORKERS."""
+    raw = os.getenv("JOB_WORKERS", "2").strip()
+    try:
+        return max(0, int(raw))
+    except ValueError:
+        return 2
+
+
+def get_job_queue_max() -> int:
+    """Max queued jobs per process before submissions get 503 (default 1000). From env JOB_QUEUE_MAX."""
+    raw = os.getenv("JOB_QUEUE_MAX", "1000").strip()
+    try:
+        return max(1, int(raw))
+    except ValueError:
+        return 1000
+
+
+def get_job_result_ttl_seconds() -> float:
+    """Seconds a finished job stays retrievable (default 86400, min 60). From env JOB_RESULT_TTL_SECONDS."""
+    raw = os.getenv("JOB_RESULT_TTL_SECONDS", "86400").strip()
+    try:
+        return max(60.0, float(raw))
+    except ValueError:
+        return 86400.0
+
+
+def get_job_callback_allowed_hosts() -> frozenset[str]:
+    """Hosts job callback_url may point to (default none: callbacks disabled). From env JOB_CALLBACK_ALLOWED_HOSTS (comma-separated)."""
+    raw = os.getenv("JOB_CALLBACK_ALLOWED_HOSTS") or ""
+    return frozenset(h.strip().lower() for h in raw.split(",") if h.strip())
+
+
+def get_batch_max_items() -> int:
+    """Max requests in one POST /v1/chat/batch (default 1000). From env BATCH_MAX_ITEMS."""
+    raw = os.getenv("BATCH_MAX_ITEMS", "1000").strip()
+    try:
+        return max(1, int(raw))
+    except ValueError:
+        return 1000
+
+
+def get_batch_concurrency(provider: str) -> int:
+    """
+    Concurrent provider calls per batch for `provider`: BATCH_LOCAL_CONCURRENCY for local
+    (default 4), BATCH_PUBLIC_CONCURRENCY for openai/anthropic (default 16).
+    """
+    name, default = ("BATCH_LOCAL_CONCURRENCY", 4) if provider == "local" else ("BATCH_PUBLIC_CONCURRENCY", 16)
+    raw = os.getenv(name, str(default)).strip()
+    try:
+        return max(1, int(raw))
+    except ValueError:
+        return default
+
+
+def get_scheduler_slots(provider: str) -> int:
+    """
+    Concurrent calls the scheduler admits per provider and process: SCHEDULER_LOCAL_SLOTS for
+    local (default 4), SCHEDULER_PUBLIC_SLOTS for each public provider (default 32).
+    """
+    name, default = ("SCHEDULER_LOCAL_SLOTS", 4) if provider == "local" else ("SCHEDULER_PUBLIC_SLOTS", 32)
+    raw = os.getenv(name, str(default)).strip()
+    try:
+        return max(1, int(raw))
+    except ValueError:
+        return default
+
+
+def get_admission_loop_lag_ms() -> float:
+    """Event-loop lag (ms) above which batch /v1/chat traffic is shed (default 250; 0 disables). From env ADMISSION_LOOP_LAG_MS."""
+    raw = os.getenv("ADMISSION_LOOP_LAG_MS", "250").strip()
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        return 250.0
+
+
+def get_admission_threadpool_utilization() -> float:
+    """
+    Threadpool demand ((busy + waiting) / threads) above which batch traffic is shed
+    (default 0.9; 0 disables). From env ADMISSION_THREADPOOL_UTILIZATION.
+    """
+    raw = os.getenv("ADMISSION_THREADPOOL_UTILIZATION", "0.9").strip()
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        return 0.9
+
+
+def get_admission_queue_depth() -> int:
+    """Requests waiting for provider slots above which batch traffic is shed (default 64; 0 disables). From env ADMISSION_QUEUE_DEPTH."""
+    raw = os.getenv("ADMISSION_QUEUE_DEPTH", "64").strip()
+    try:
+        return max(0, int(raw))
+    except ValueError:
+        return 64
+
+
+def get_admission_interactive_factor() -> float:
+    """
+    Multiple of a threshold at which interactive traffic is shed too (default 2, min 1).
+    From env ADMISSION_INTERACTIVE_FACTOR.
     """
-    from app.core.policy_file import load_policy_config
+    raw = os.getenv("ADMISSION_INTERACTIVE_FACTOR", "2").strip()
+    try:
+        return max(1.0, float(raw))
+    except ValueError:
+        return 2.0
+
+
+def get_admission_retry_after_seconds() -> int:
+    """Retry-After on shed (503) responses (default 2, min 1). From env ADMISSION_RETRY_AFTER_SECONDS."""
+    raw = os.getenv("ADMISSION_RETRY_AFTER_SECONDS", "2").strip()
+    try:
+        return max(1, int(raw))
+    except ValueError:
+        return 2
+
+
+def get_max_request_body_bytes() -> int:
+    """
+    Max request body size in bytes; larger bodies get 413 before they are parsed
+    (default 8388608 = 8 MiB; 0 disables). From env MAX_REQUEST_BODY_BYTES.
+    """
+    raw = os.getenv("MAX_REQUEST_BODY_BYTES", "8388608").strip()
+    try:
+        return max(0, int(raw))
+    except ValueError:
+        return 8388608
+
+
+def get_max_provider_response_bytes() -> int:
+    """
+    Max provider response body size in bytes; the read stops there and the call fails
+    (default 16777216 = 16 MiB; 0 disables). From env MAX_PROVIDER_RESPONSE_BYTES.
+    """
+    raw = os.getenv("MAX_PROVIDER_RESPONSE_BYTES", "16777216").strip()
+    try:
+        return max(0, int(raw))
+    except ValueError:
+        return 16777216
+
+
+def _env_map(name: str) -> dict[str, str]:
+    """Parse "key=value,key=value" from env `name` (keys lower-cased)."""
+    pairs = (item.split("=", 1) for item in (os.getenv(name) or "").split(",") if "=" in item)
+    return {t.strip().lower(): v.strip() for t, v in pairs if t.strip() and v.strip()}
 
-    return load_policy_config()
+
+def get_tenant_weights() -> dict[str, float]:
+    """Fair-share weight per tenant (default 1). From env SCHEDULER_TENANT_WEIGHTS ("acme=4,globex=0.5")."""
+    weights: dict[str, float] = {}
+    for tenant, raw in _env_map("SCHEDULER_TENANT_WEIGHTS").items():
+        try:
+            value = float(raw)
+        except ValueError:
+            continue
+        if value > 0:
+            weights[tenant] = value
+    return weights
+
+
+def get_tenant_priorities() -> dict[str, str]:
+    """Default priority class per tenant or API key tenant id. From env SCHEDULER_TENANT_PRIORITIES ("key-1a2b3c4d5e6f=batch")."""
+    return {t: v.lower() for t, v in _env_map("SCHEDULER_TENANT_PRIORITIES").items()}
+
+
+def get_api_key_tenants() -> dict[str, str]:
+    """
+    Tenant for an API key id ("key-" + hash prefix, see tenancy.resolve_tenant). From env
+    API_KEY_TENANTS ("key-1a2b3c4d5e6f=acme,key-0f9e8d7c6b5a=acme"); values lower-cased.
+    """
+    return {k: v.lower() for k, v in _env_map("API_KEY_TENANTS").items()}
 
 
 def get_local_llm_url() -> str:
@@ -64,6 +392,20 @@ def get_public_llm_api_key() -> str | None:
     return os.getenv("PUBLIC_LLM_API_KEY") or None
 
 
+def get_anthropic_prompt_cache_enabled() -> bool:
+    """Whether Anthropic requests get automatic cache_control breakpoints (default True). From env ANTHROPIC_PROMPT_CACHE."""
+    return os.getenv("ANTHROPIC_PROMPT_CACHE", "").strip().lower() not in ("0", "false", "no")
+
+
+def get_anthropic_prompt_cache_min_chars() -> int:
+    """Min prefix length in chars worth a cache breakpoint (default 4096, ~1024 tokens). From env ANTHROPIC_PROMPT_CACHE_MIN_CHARS."""
+    raw = os.getenv("ANTHROPIC_PROMPT_CACHE_MIN_CHARS", "4096").strip()
+    try:
+        return max(0, int(raw))
+    except ValueError:
+        return 4096
+
+
 def get_public_provider_from_url() -> str:
     """
     Infer public provider from PUBLIC_LLM_URL (e.g. host contains anthropic → anthropic).
@@ -75,6 +417,91 @@ def get_public_provider_from_url() -> str:
     return "openai"
 
 
+# Adapter kinds (API dialects) a provider backend can use.
+PROVIDER_KINDS = ("ollama", "openai", "anthropic")
+BUILTIN_PROVIDER_BACKENDS = {"local": "ollama", "openai": "openai", "anthropic": "anthropic"}
+
+
+def get_provider_backends() -> dict[str, str]:
+    """
+    Provider backend name → adapter kind: the built-in local, openai and anthropic, plus or
+    overridden by env PROVIDER_BACKENDS ("vllm=openai,llamacpp=openai,local=openai"). Entries with
+    an unknown kind or a name other than [a-z0-9_] are ignored.
+    """
+    backends = dict(BUILTIN_PROVIDER_BACKENDS)
+    for name, kind in _env_map("PROVIDER_BACKENDS").items():
+        kind = kind.lower()
+        if kind in PROVIDER_KINDS and name.replace("_", "").isalnum() and name.isascii():
+            backends[name] = kind
+    return backends
+
+
+def get_public_provider() -> str:
+    """
+    Backend that routes to "public" resolve to: env PUBLIC_PROVIDER when it names a configured
+    backend other than local, else inferred from PUBLIC_LLM_URL (get_public_provider_from_url).
+    """
+    name = (os.getenv("PUBLIC_PROVIDER") or "").strip().lower()
+    if name and name != "local" and name in get_provider_backends():
+        return name
+    return get_public_provider_from_url()
+
+
+def get_provider_url(provider: str) -> str | None:
+    """Base URL for backend `provider` from env PROVIDER_URL_<PROVIDER>; None = the built-in default."""
+    url = (os.getenv(f"PROVIDER_URL_{provider.upper()}") or "").strip()
+    return url.rstrip("/") or None
+
+
+def get_provider_api_key(provider: str) -> str | None:
+    """API key for backend `provider` from env PROVIDER_API_KEY_<PROVIDER>. No default; no secrets in code."""
+    return os.getenv(f"PROVIDER_API_KEY_{provider.upper()}") or None
+
+
+@dataclass(frozen=True)
+class PoolSettings:
+    """Connection pool limits of one provider backend (httpx.Limits)."""
+
+    max_connections: int
+    max_keepalive: int
+    keepalive_expiry: float
+
+
+def get_provider_pool(provider: str) -> PoolSettings:
+    """
+    Connection pool for backend `provider`. Defaults: max_connections 100, max_keepalive 20,
+    keepalive_expiry 5 s. Overridden by env PROVIDER_POOL_<PROVIDER>
+    ("max_connections=16,max_keepalive=16,keepalive_expiry=30"); invalid values are ignored.
+    """
+    values = {"max_connections": 100.0, "max_keepalive": 20.0, "keepalive_expiry": 5.0}
+    for key, raw in _env_map(f"PROVIDER_POOL_{provider.upper()}").items():
+        if key not in values:
+            continue
+        try:
+            value = float(raw)
+        except ValueError:
+            continue
+        if value >= (0.0 if key == "keepalive_expiry" else 1.0):
+            values[key] = value
+    return PoolSettings(
+        max_connections=int(values["max_connections"]),
+        max_keepalive=int(values["max_keepalive"]),
+        keepalive_expiry=values["keepalive_expiry"],
+    )
+
+
+def get_provider_retries(provider: str) -> int:
+    """
+    Extra attempts for backend `provider` when the connection could not be opened (the request
+    was not sent), default 0, max 3. From env PROVIDER_RETRIES_<PROVIDER>.
+    """
+    raw = os.getenv(f"PROVIDER_RETRIES_{provider.upper()}", "0").strip()
+    try:
+        return min(3, max(0, int(raw)))
+    except ValueError:
+        return 0
+
+
 def get_provider_timeout_seconds() -> float:
     """Provider HTTP timeout in seconds (default 60.0). From env PROVIDER_TIMEOUT_SECONDS."""
     raw = os.getenv("PROVIDER_TIMEOUT_SECONDS", "60").strip()
@@ -82,3 +509,86 @@ def get_provider_timeout_seconds() -> float:
         return max(1.0, float(raw))
     except ValueError:
         return 60.0
+
+
+@dataclass(frozen=True)
+class ProviderTimeouts:
+    """Per-phase HTTP timeouts in seconds for one provider."""
+
+    connect: float
+    read: float
+    write: float
+    pool: float
+
+
+_TIMEOUT_PHASES = ("connect", "read", "write", "pool")
+
+
+def get_provider_timeouts(provider: str) -> ProviderTimeouts:
+    """
+    Split timeouts for `provider` (local, openai, anthropic). Defaults: connect 5, read
+    PROVIDER_TIMEOUT_SECONDS, write 10, pool 5. Overridden per provider by env
+    PROVIDER_TIMEOUTS_<PROVIDER> ("connect=2,read=120"); invalid or non-positive values are ignored.
+    """
+    values = {"connect": 5.0, "read": get_provider_timeout_seconds(), "write": 10.0, "pool": 5.0}
+    for phase, raw in _env_map(f"PROVIDER_TIMEOUTS_{provider.upper()}").items():
+        if phase not in _TIMEOUT_PHASES:
+            continue
+        try:
+            value = float(raw)
+        except ValueError:
+            continue
+        if value > 0:
+            values[phase] = value
+    return ProviderTimeouts(**values)
+
+
+PROVIDER_TIMEOUT_MODES = ("static", "adaptive")
+
+
+def get_provider_timeout_mode() -> str:
+    """static (configured read timeout) or adaptive (from observed latency). From env PROVIDER_TIMEOUT_MODE."""
+    raw = (os.getenv("PROVIDER_TIMEOUT_MODE") or "static").strip().lower()
+    return raw if raw in PROVIDER_TIMEOUT_MODES else "static"
+
+
+def get_adaptive_timeout_percentile() -> float:
+    """Latency percentile the adaptive read timeout is based on (default 99, 50–100). From env ADAPTIVE_TIMEOUT_PERCENTILE."""
+    raw = os.getenv("ADAPTIVE_TIMEOUT_PERCENTILE", "99").strip()
+    try:
+        return min(100.0, max(50.0, float(raw)))
+    except ValueError:
+        return 99.0
+
+
+def get_adaptive_timeout_multiplier() -> float:
+    """Headroom applied to the percentile (default 2, min 1). From env ADAPTIVE_TIMEOUT_MULTIPLIER."""
+    raw = os.getenv("ADAPTIVE_TIMEOUT_MULTIPLIER", "2").strip()
+    try:
+        return max(1.0, float(raw))
+    except ValueError:
+        return 2.0
+
+
+def get_adaptive_timeout_floor_seconds() -> float:
+    """Lowest adaptive read timeout (default 5). From env ADAPTIVE_TIMEOUT_FLOOR_SECONDS."""
+    raw = os.getenv("ADAPTIVE_TIMEOUT_FLOOR_SECONDS", "5").strip()
+    try:
+        return max(0.1, float(raw))
+    except ValueError:
+        return 5.0
+
+
+def get_adaptive_timeout_ceiling_seconds(provider: str) -> float:
+    """
+    Highest adaptive read timeout. From env ADAPTIVE_TIMEOUT_CEILING_SECONDS; defaults to the
+    provider's configured read timeout.
+    """
+    default = get_provider_timeouts(provider).read
+    raw = (os.getenv("ADAPTIVE_TIMEOUT_CEILING_SECONDS") or "").strip()
+    if not raw:
+        return default
+    try:
+        return max(0.1, float(raw))
+    except ValueError:
+        return default
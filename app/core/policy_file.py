@@ -3,10 +3,19 @@ Load policy from JSON file. POLICY_FILE must be set; file must exist and be vali
 Unknown top-level keys are ignored (extensibility). Uses stdlib json only.
 """
 
+import hashlib
 import json
 import os
+from typing import Callable, Iterable
 
-from app.core.config import PolicyConfig
+from app.core.config import DECISION_SCOPE_LAST_USER, DECISION_SCOPES, PolicyConfig
+from app.decision.detectors import DetectorConfigError, compile_detectors
+from app.decision.fallbacks import FallbackConfigError, compile_local_fallbacks
+from app.decision.keyword_index import KeywordIndex, KeywordIndexError, load_keyword_index
+from app.decision.pricing import PricingConfigError, compile_pricing
+from app.decision.rollout import Rollout, RolloutConfigError, parse_rollout
+from app.decision.rules import RuleConfigError, compile_rules
+from app.decision.tokens import TOKENIZER_HEURISTIC, TOKENIZERS
 
 POLICY_FILE_ENV = "POLICY_FILE"
 
@@ -15,6 +24,46 @@ class PolicyFileError(Exception):
     """Raised when POLICY_FILE is unset, file is missing, or JSON is invalid."""
 
 
+class SharedPolicyParts:
+    """
+    Dedupes compiled policy parts across the policies of one PolicyStore: identical keyword
+    sets, the same keyword index file, and identical detector specs are held once in memory.
+    """
+
+    def __init__(self) -> None:
+        self._keywords: dict[tuple[str, ...], tuple[str, ...]] = {}
+        self._indexes: dict[tuple[str, int, int], KeywordIndex] = {}
+        self._detectors: dict[str, object] = {}
+
+    def keywords(self, keywords: tuple[str, ...]) -> tuple[str, ...]:
+        return self._keywords.setdefault(keywords, keywords)
+
+    def keyword_index(self, path: str, load: Callable[[str], KeywordIndex]) -> KeywordIndex:
+        st = os.stat(path)
+        key = (path, st.st_size, st.st_mtime_ns)
+        index = self._indexes.get(key)
+        if index is None:
+            index = self._indexes[key] = load(path)
+        return index
+
+    def detectors(self, spec: object, compile_: Callable[[], object]):
+        key = json.dumps(spec, sort_keys=True, default=str)
+        scanner = self._detectors.get(key)
+        if scanner is None:
+            scanner = self._detectors[key] = compile_()
+        return scanner
+
+    def retain(self, configs: Iterable[PolicyConfig]) -> None:
+        """Drop parts no longer used by any of `configs` (after a reload replaced a policy)."""
+        configs = list(configs)
+        live = {id(part) for c in configs for part in (
+            c.sensitivity_keywords, c.sensitivity_keyword_index, c.sensitivity_detectors
+        )}
+        self._keywords = {k: v for k, v in self._keywords.items() if id(v) in live}
+        self._indexes = {k: v for k, v in self._indexes.items() if id(v) in live}
+        self._detectors = {k: v for k, v in self._detectors.items() if id(v) in live}
+
+
 def _get_policy_path() -> str:
     """Return POLICY_FILE path; raise PolicyFileError if unset or empty."""
     path = (os.getenv(POLICY_FILE_ENV) or "").strip()
@@ -25,11 +74,63 @@ def _get_policy_path() -> str:
     return path
 
 
-def load_policy_config(path: str | None = None) -> PolicyConfig:
+# (path from env, stamps of every file it was built from, config) of the last POLICY_FILE load.
+_cached: tuple[str, tuple, PolicyConfig] | None = None
+
+
+def _source_paths(file_path: str, config: PolicyConfig) -> list[str]:
+    """The policy file plus every file it pulled in (keyword indexes, rollout candidate)."""
+    paths = [file_path]
+    if config.sensitivity_keyword_index is not None:
+        paths.append(config.sensitivity_keyword_index.path)
+    if config.rollout is not None:
+        paths.extend(_source_paths(config.rollout.candidate_path, config.rollout.candidate))
+    return paths
+
+
+def _stamps(paths: list[str]) -> tuple | None:
+    """(path, size, mtime_ns) per file; None when one of them cannot be stat'ed."""
+    stamps = []
+    for p in paths:
+        try:
+            st = os.stat(p)
+        except OSError:
+            return None
+        stamps.append((p, st.st_size, st.st_mtime_ns))
+    return tuple(stamps)
+
+
+def get_cached_policy_config() -> PolicyConfig:
+    """
+    The POLICY_FILE policy, compiled once and reused until the file (or a file it references)
+    changes size or mtime. A request then costs a few stat calls instead of a full recompile.
+    """
+    global _cached
+    path = _get_policy_path()
+    cached = _cached
+    if cached is not None and cached[0] == path:
+        stamps = _stamps([s[0] for s in cached[1]])
+        if stamps is not None and stamps == cached[1]:
+            return cached[2]
+    file_path = os.path.expanduser(path)
+    # Stamp before loading: a write during the load leaves a stale stamp and forces a reload.
+    before = _stamps([file_path])
+    config = load_policy_config(path)
+    stamps = _stamps(_source_paths(file_path, config))
+    if before is not None and stamps is not None and stamps[0] == before[0]:
+        _cached = (path, stamps, config)
+    return config
+
+
+def load_policy_config(
+    path: str | None = None, *, shared: SharedPolicyParts | None = None, candidate: bool = False
+) -> PolicyConfig:
     """
     Load policy from JSON file. If path is None, use POLICY_FILE from env.
     Raises PolicyFileError if POLICY_FILE unset, file missing, or JSON invalid.
     Unknown top-level keys (e.g. capability) are ignored.
+    shared: reuse identical compiled parts across policies (policy directory mode).
+    candidate: loading a rollout candidate (which may not declare its own rollout).
     """
     file_path = path if path is not None else _get_policy_path()
     file_path = os.path.expanduser(file_path)
@@ -39,12 +140,14 @@ def load_policy_config(path: str | None = None) -> PolicyConfig:
         )
 
     try:
-        with open(file_path, encoding="utf-8") as f:
-            data = json.load(f)
-    except json.JSONDecodeError as e:
+        with open(file_path, "rb") as f:
+            raw = f.read()
+        data = json.loads(raw.decode("utf-8"))
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
         raise PolicyFileError(f"Policy file is not valid JSON: {file_path}. {e!s}") from e
     except OSError as e:
         raise PolicyFileError(f"Cannot read policy file: {file_path}. {e!s}") from e
+    generation = hashlib.sha256(raw)
 
     if not isinstance(data, dict):
         raise PolicyFileError(
@@ -69,6 +172,14 @@ def load_policy_config(path: str | None = None) -> PolicyConfig:
     sensitivity_keywords = tuple(
         str(k).strip().lower() for k in keywords_raw if str(k).strip()
     )
+    if shared is not None:
+        sensitivity_keywords = shared.keywords(sensitivity_keywords)
+    sensitivity_detectors = _load_detectors(sensitivity, shared)
+    sensitivity_keyword_index = _load_keyword_index(sensitivity, file_path, shared)
+    if sensitivity_keyword_index is not None:
+        # The index is a separate file; a rebuild must also change the generation.
+        st = os.stat(sensitivity_keyword_index.path)
+        generation.update(f"|{sensitivity_keyword_index.path}|{st.st_size}|{st.st_mtime_ns}".encode())
 
     # Required: cost object; fields have defaults
     cost = data.get("cost")
@@ -110,11 +221,58 @@ def load_policy_config(path: str | None = None) -> PolicyConfig:
     if cost_chars_per_token <= 0:
         cost_chars_per_token = 4
 
+    cost_expected_output_tokens = _int("expected_output_tokens", 0)
+    cost_tokenizer = str(cost.get("tokenizer") or TOKENIZER_HEURISTIC).strip().lower()
+    if cost_tokenizer not in TOKENIZERS:
+        raise PolicyFileError(
+            f"Policy 'cost.tokenizer' must be one of: {', '.join(TOKENIZERS)}; got {cost_tokenizer!r}."
+        )
+    pricing = None
+    if cost.get("pricing") is not None:
+        try:
+            pricing = compile_pricing(cost["pricing"])
+        except PricingConfigError as e:
+            raise PolicyFileError(f"Policy 'cost.pricing' is invalid: {e!s}") from e
+
     default_provider_raw = (cost.get("default_provider") or "local")
     default_provider = str(default_provider_raw).strip().lower()
     if default_provider not in ("local", "public"):
         default_provider = "local"
 
+    # Optional: ordered rule pipeline, compiled once here (unknown rule types are errors).
+    rules_raw = data.get("rules")
+    rules = None
+    if rules_raw is not None:
+        if not isinstance(rules_raw, list):
+            raise PolicyFileError(
+                f"Policy 'rules' must be an array; got {type(rules_raw).__name__}."
+            )
+        try:
+            rules = compile_rules(rules_raw)
+        except RuleConfigError as e:
+            raise PolicyFileError(f"Policy 'rules' is invalid: {e!s}") from e
+
+    # Optional: decision scope (last user message vs whole conversation).
+    scope_raw = data.get("decision_scope", DECISION_SCOPE_LAST_USER)
+    decision_scope = str(scope_raw).strip().lower()
+    if decision_scope not in DECISION_SCOPES:
+        raise PolicyFileError(
+            f"Policy 'decision_scope' must be one of: {', '.join(DECISION_SCOPES)}; got {scope_raw!r}."
+        )
+
+    local_fallbacks = None
+    if data.get("local_fallbacks") is not None:
+        try:
+            local_fallbacks = compile_local_fallbacks(data["local_fallbacks"])
+        except FallbackConfigError as e:
+            raise PolicyFileError(f"Policy 'local_fallbacks' is invalid: {e!s}") from e
+
+    rollout = None
+    if data.get("rollout") is not None:
+        if candidate:
+            raise PolicyFileError("Policy 'rollout' is not allowed in a rollout candidate policy.")
+        rollout = _load_rollout(data["rollout"], file_path, shared)
+
     return PolicyConfig(
         sensitivity_keywords=sensitivity_keywords,
         cost_max_prompt_length_for_local=cost_max_prompt_length_for_local,
@@ -122,4 +280,83 @@ def load_policy_config(path: str | None = None) -> PolicyConfig:
         cost_max_usd_for_local=cost_max_usd_for_local,
         llm_input_usd_per_1m_tokens=llm_input_usd_per_1m_tokens,
         cost_chars_per_token=cost_chars_per_token,
+        rules=rules,
+        sensitivity_detectors=sensitivity_detectors,
+        sensitivity_keyword_index=sensitivity_keyword_index,
+        pricing=pricing,
+        cost_tokenizer=cost_tokenizer,
+        cost_expected_output_tokens=cost_expected_output_tokens,
+        decision_scope=decision_scope,
+        generation=generation.hexdigest(),
+        rollout=rollout,
+        local_fallbacks=local_fallbacks,
     )
+
+
+def _load_rollout(raw: object, policy_path: str, shared: SharedPolicyParts | None) -> Rollout:
+    """Validate `rollout` and compile its candidate (path relative to the policy file's directory)."""
+    try:
+        spec = parse_rollout(raw)
+    except RolloutConfigError as e:
+        raise PolicyFileError(f"Policy 'rollout' is invalid: {e!s}") from e
+    candidate_path = os.path.expanduser(spec.pop("candidate"))
+    if not os.path.isabs(candidate_path):
+        candidate_path = os.path.join(os.path.dirname(os.path.abspath(policy_path)), candidate_path)
+    try:
+        candidate = load_policy_config(candidate_path, shared=shared, candidate=True)
+    except PolicyFileError as e:
+        raise PolicyFileError(f"Policy 'rollout.candidate' is invalid: {e!s}") from e
+    return Rollout(candidate=candidate, candidate_path=candidate_path, **spec)
+
+
+def _load_detectors(sensitivity: dict, shared: SharedPolicyParts | None = None):
+    """Compile optional sensitivity.detectors (+ internal_host_suffixes, detector_cpu_budget_ms)."""
+    detectors_raw = sensitivity.get("detectors")
+    if detectors_raw is None:
+        return None
+    if not isinstance(detectors_raw, list):
+        raise PolicyFileError(
+            f"Policy 'sensitivity.detectors' must be an array; got {type(detectors_raw).__name__}."
+        )
+    suffixes_raw = sensitivity.get("internal_host_suffixes")
+    if suffixes_raw is not None and not isinstance(suffixes_raw, list):
+        raise PolicyFileError(
+            "Policy 'sensitivity.internal_host_suffixes' must be an array; "
+            f"got {type(suffixes_raw).__name__}."
+        )
+    budget_raw = sensitivity.get("detector_cpu_budget_ms")
+    try:
+        budget = float(budget_raw) if budget_raw is not None else None
+    except (TypeError, ValueError):
+        raise PolicyFileError("Policy 'sensitivity.detector_cpu_budget_ms' must be a number.") from None
+    try:
+        if shared is not None:
+            return shared.detectors(
+                [detectors_raw, suffixes_raw, budget],
+                lambda: compile_detectors(detectors_raw, suffixes_raw, budget),
+            )
+        return compile_detectors(detectors_raw, suffixes_raw, budget)
+    except DetectorConfigError as e:
+        raise PolicyFileError(f"Policy 'sensitivity.detectors' is invalid: {e!s}") from e
+
+
+def _load_keyword_index(
+    sensitivity: dict, policy_path: str, shared: SharedPolicyParts | None = None
+) -> KeywordIndex | None:
+    """Open optional sensitivity.keyword_index (path relative to the policy file's directory)."""
+    ref = sensitivity.get("keyword_index")
+    if ref is None:
+        return None
+    if not isinstance(ref, str) or not ref.strip():
+        raise PolicyFileError("Policy 'sensitivity.keyword_index' must be a non-empty path string.")
+    index_path = os.path.expanduser(ref.strip())
+    if not os.path.isabs(index_path):
+        index_path = os.path.join(os.path.dirname(os.path.abspath(policy_path)), index_path)
+    try:
+        if shared is not None:
+            return shared.keyword_index(index_path, load_keyword_index)
+        return load_keyword_index(index_path)
+    except OSError as e:
+        raise PolicyFileError(f"Policy 'sensitivity.keyword_index' is invalid: cannot open {index_path}. {e!s}") from e
+    except KeywordIndexError as e:
+        raise PolicyFileError(f"Policy 'sensitivity.keyword_index' is invalid: {e!s}") from e
@@ -0,0 +1,148 @@
+"""
+Per-tenant policies from POLICY_DIR, compiled once into an in-memory index.
+
+Layout: <POLICY_DIR>/default.json (fallback for every tenant without its own file) and
+<POLICY_DIR>/<tenant>.json per tenant, where <tenant> is the id from app.core.tenancy
+(X-Tenant value, or "key-" + API key hash). Lookup is one dict read. The directory is
+re-scanned at most every POLICY_RELOAD_SECONDS; only files whose size or mtime changed are
+recompiled, and a new index replaces the old one in a single reference swap (readers never
+see a half-built index). A tenant file that fails to compile on reload keeps its previous
+version; one that never compiled raises PolicyFileError for that tenant only.
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+
+from app.core.config import PolicyConfig, get_policy_reload_seconds
+from app.core.policy_file import PolicyFileError, SharedPolicyParts, load_policy_config
+from app.core.tenancy import is_valid_tenant
+
+POLICY_DIR_ENV = "POLICY_DIR"
+DEFAULT_POLICY_NAME = "default"
+
+
+@dataclass(frozen=True)
+class _Entry:
+    """One compiled policy file (or the compile error it produced)."""
+
+    stamp: tuple[int, int]  # (size, mtime_ns) of the file when compiled
+    config: PolicyConfig | None
+    error: str | None = None
+
+
+@dataclass(frozen=True)
+class PolicyIndex:
+    """Immutable snapshot: tenant → compiled policy, plus the default."""
+
+    entries: dict[str, _Entry]
+
+    def get(self, tenant: str | None) -> PolicyConfig:
+        entry = self.entries.get(tenant) if tenant else None
+        if entry is None:
+            entry = self.entries.get(DEFAULT_POLICY_NAME)
+            if entry is None:
+                raise PolicyFileError(
+                    f"POLICY_DIR has no {DEFAULT_POLICY_NAME}.json and no policy for this tenant."
+                )
+        if entry.config is None:
+            raise PolicyFileError(entry.error or "Policy is invalid.")
+        return entry.config
+
+    def has_tenant(self, tenant: str | None) -> bool:
+        return bool(tenant) and tenant != DEFAULT_POLICY_NAME and tenant in self.entries
+
+    def tenants(self) -> list[str]:
+        return sorted(t for t in self.entries if t != DEFAULT_POLICY_NAME)
+
+
+class PolicyStore:
+    """Owns the current PolicyIndex for one directory and refreshes it copy-on-write."""
+
+    def __init__(self, directory: str, reload_seconds: float | None = None) -> None:
+        self.directory = os.path.abspath(os.path.expanduser(directory))
+        self.reload_seconds = get_policy_reload_seconds() if reload_seconds is None else reload_seconds
+        self.shared = SharedPolicyParts()
+        self._index = PolicyIndex({})
+        self._checked_at = float("-inf")
+        self._refresh_lock = threading.Lock()
+        self.refresh()
+
+    def get(self, tenant: str | None = None) -> PolicyConfig:
+        """Policy for `tenant` (None or unknown tenant → default). O(1) besides periodic rescans."""
+        if time.monotonic() - self._checked_at >= self.reload_seconds:
+            # Only one request rescans; the others keep using the current index.
+            if self._refresh_lock.acquire(blocking=False):
+                try:
+                    self._refresh_locked()
+                finally:
+                    self._refresh_lock.release()
+        return self._index.get(tenant)
+
+    @property
+    def index(self) -> PolicyIndex:
+        return self._index
+
+    def refresh(self) -> None:
+        """Rescan the directory now and swap in the new index."""
+        with self._refresh_lock:
+            self._refresh_locked()
+
+    def _refresh_locked(self) -> None:
+        self._checked_at = time.monotonic()
+        old = self._index.entries
+        try:
+            names = os.listdir(self.directory)
+        except OSError as e:
+            raise PolicyFileError(f"Cannot read POLICY_DIR: {self.directory}. {e!s}") from e
+        entries: dict[str, _Entry] = {}
+        changed = False
+        for filename in names:
+            stem, ext = os.path.splitext(filename)
+            if ext != ".json" or not (stem == DEFAULT_POLICY_NAME or is_valid_tenant(stem)):
+                continue
+            path = os.path.join(self.directory, filename)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue  # removed between listdir and stat
+            stamp = (st.st_size, st.st_mtime_ns)
+            previous = old.get(stem)
+            if previous is not None and previous.stamp == stamp:
+                entries[stem] = previous
+                continue
+            changed = True
+            entries[stem] = self._compile(path, stamp, previous)
+        if changed or entries.keys() != old.keys():
+            self._index = PolicyIndex(entries)
+            self.shared.retain(e.config for e in entries.values() if e.config is not None)
+
+    def _compile(self, path: str, stamp: tuple[int, int], previous: _Entry | None) -> _Entry:
+        try:
+            return _Entry(stamp, load_policy_config(path, shared=self.shared))
+        except PolicyFileError as e:
+            if previous is not None and previous.config is not None:
+                # Keep serving the last good version until the file changes again.
+                return _Entry(stamp, previous.config, str(e))
+            return _Entry(stamp, None, str(e))
+
+
+_stores: dict[str, PolicyStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_policy_dir() -> str | None:
+    """POLICY_DIR from env, or None (single POLICY_FILE mode)."""
+    return (os.getenv(POLICY_DIR_ENV) or "").strip() or None
+
+
+def get_policy_store(directory: str) -> PolicyStore:
+    """Process-wide store for `directory` (created and compiled on first use)."""
+    store = _stores.get(directory)
+    if store is None:
+        with _stores_lock:
+            store = _stores.get(directory)
+            if store is None:
+                store = _stores[directory] = PolicyStore(directory)
+    return store
@@ -1,6 +1,10 @@
 """Prometheus metrics for chat requests: counters and latency histograms (low-cardinality labels)."""
 
-from prometheus_client import Counter, Histogram, REGISTRY
+from typing import Mapping
+
+from prometheus_client import Counter, Gauge, Histogram, REGISTRY
+
+from app.providers.tracing import PHASES as TRANSPORT_PHASES
 
 CHAT_REQUESTS_TOTAL = Counter(
     "chat_requests_total",
@@ -15,6 +19,194 @@ CHAT_REQUEST_LATENCY_SECONDS = Histogram(
     buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0),
     registry=REGISTRY,
 )
+DECISION_RULE_LATENCY_SECONDS = Histogram(
+    "decision_rule_latency_seconds",
+    "Time spent evaluating one routing rule in seconds",
+    ["rule", "outcome"],
+    buckets=(0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05),
+    registry=REGISTRY,
+)
+
+DECISION_CACHE_REQUESTS_TOTAL = Counter(
+    "decision_cache_requests_total",
+    "Decision cache lookups by result (hit, miss, bypass)",
+    ["result"],
+    registry=REGISTRY,
+)
+DECISION_CACHE_SAVED_SECONDS_TOTAL = Counter(
+    "decision_cache_saved_seconds_total",
+    "Rule evaluation time avoided by decision cache hits, in seconds",
+    registry=REGISTRY,
+)
+
+SHADOW_DECISIONS_TOTAL = Counter(
+    "shadow_decisions_total",
+    "Candidate policy decisions evaluated in shadow mode, by result (match, diverge, error)",
+    ["result"],
+    registry=REGISTRY,
+)
+SHADOW_EVALUATION_SECONDS = Histogram(
+    "shadow_evaluation_seconds",
+    "Time spent deciding with the shadow candidate policy (after the response is sent)",
+    buckets=(0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05),
+    registry=REGISTRY,
+)
+CANARY_REQUESTS_TOTAL = Counter(
+    "canary_requests_total",
+    "Requests in canary rollout by the policy that decided them (active, candidate)",
+    ["variant"],
+    registry=REGISTRY,
+)
+IDEMPOTENCY_REQUESTS_TOTAL = Counter(
+    "idempotency_requests_total",
+    "Chat requests with an Idempotency-Key by result (new, replay, wait, conflict, timeout)",
+    ["result"],
+    registry=REGISTRY,
+)
+CHAT_JOBS_TOTAL = Counter(
+    "chat_jobs_total",
+    "Asynchronous chat jobs by outcome (completed, failed, rejected)",
+    ["result"],
+    registry=REGISTRY,
+)
+CHAT_JOBS_QUEUED = Gauge(
+    "chat_jobs_queued",
+    "Chat jobs waiting for a worker in this process",
+    registry=REGISTRY,
+)
+SCHEDULER_QUEUE_WAIT_SECONDS = Histogram(
+    "scheduler_queue_wait_seconds",
+    "Time a request waited for a provider slot, by provider and priority class",
+    ["provider", "priority"],
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+    registry=REGISTRY,
+)
+
+ADMISSION_SHED_TOTAL = Counter(
+    "admission_shed_total",
+    "Chat requests rejected with 503 by the admission controller, by priority class",
+    ["priority"],
+    registry=REGISTRY,
+)
+ADMISSION_EVENT_LOOP_LAG_SECONDS = Gauge(
+    "admission_event_loop_lag_seconds",
+    "Latest measured event-loop lag",
+    registry=REGISTRY,
+)
+ADMISSION_THREADPOOL_UTILIZATION = Gauge(
+    "admission_threadpool_utilization",
+    "Threadpool demand: (busy + waiting) / threads; above 1 means requests wait for a thread",
+    registry=REGISTRY,
+)
+ADMISSION_PROVIDER_QUEUE_DEPTH = Gauge(
+    "admission_provider_queue_depth",
+    "Requests waiting for a provider slot, all providers",
+    registry=REGISTRY,
+)
+PROVIDER_READ_TIMEOUT_SECONDS = Histogram(
+    "provider_read_timeout_seconds",
+    "Read timeout chosen for a provider call, by provider and source (static, adaptive, deadline)",
+    ["provider", "source"],
+    buckets=(0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0),
+    registry=REGISTRY,
+)
+PROVIDER_TIMEOUTS_TOTAL = Counter(
+    "provider_timeouts_total",
+    "Provider calls that timed out, by provider and phase (connect, read, write, pool)",
+    ["provider", "phase"],
+    registry=REGISTRY,
+)
+PROVIDER_TRANSPORT_PHASE_SECONDS = Histogram(
+    "provider_transport_phase_seconds",
+    "Provider call transport phases, by provider and phase (connect incl. DNS, tls, write, ttfb, read)",
+    ["provider", "phase"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+    registry=REGISTRY,
+)
+PROVIDER_TRANSPORT_BYTES = Histogram(
+    "provider_transport_bytes",
+    "Provider call body sizes in bytes, by provider and direction (sent, received)",
+    ["provider", "direction"],
+    buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216),
+    registry=REGISTRY,
+)
+PROVIDER_DEADLINE_SKIPS_TOTAL = Counter(
+    "provider_deadline_skips_total",
+    "Provider calls skipped because the client deadline could not be met",
+    ["provider"],
+    registry=REGISTRY,
+)
+LOCAL_SATURATED = Gauge(
+    "local_saturated",
+    "1 while the local provider is saturated and mapped models are served by their fallbacks",
+    registry=REGISTRY,
+)
+LOCAL_SATURATION_EPISODES_TOTAL = Counter(
+    "local_saturation_episodes_total",
+    "Times the local provider entered the saturated state",
+    registry=REGISTRY,
+)
+LOCAL_MODEL_DOWNGRADES_TOTAL = Counter(
+    "local_model_downgrades_total",
+    "Local requests served by a smaller fallback model, by requested and fallback model",
+    ["model", "fallback"],
+    registry=REGISTRY,
+)
+CHAT_SESSION_REQUESTS_TOTAL = Counter(
+    "chat_session_requests_total",
+    "Session chat requests by result (started, continued, not_found, conflict)",
+    ["result"],
+    registry=REGISTRY,
+)
+CHAT_SESSIONS_ACTIVE = Gauge(
+    "chat_sessions_active",
+    "Chat sessions held in memory by this worker",
+    registry=REGISTRY,
+)
+OVERSIZE_REJECTIONS_TOTAL = Counter(
+    "oversize_rejections_total",
+    "Requests rejected (413) or provider calls failed for size, by kind (request_body, provider_response)",
+    ["kind"],
+    registry=REGISTRY,
+)
+CHAT_COMPLETIONS_TOTAL = Counter(
+    "chat_completions_total",
+    "/v1/chat/completions requests by mode (relay: bytes passed through, transcode: via the adapter)",
+    ["mode"],
+    registry=REGISTRY,
+)
+PUBLIC_SPEND_USD_TOTAL = Counter(
+    "public_spend_usd_total",
+    "Public LLM spend in USD (successful public calls; provider usage when reported, else estimate)",
+    ["provider", "model"],
+    registry=REGISTRY,
+)
+LLM_TOKENS_TOTAL = Counter(
+    "llm_tokens_total",
+    "Provider-reported tokens by provider, model and direction (input, output, cache_read, cache_creation)",
+    ["provider", "model", "direction"],
+    registry=REGISTRY,
+)
+LLM_OUTPUT_TOKENS_PER_SECOND = Histogram(
+    "llm_output_tokens_per_second",
+    "Generation throughput from provider timings (Ollama eval_count / eval_duration)",
+    ["provider", "model"],
+    buckets=(1, 5, 10, 20, 40, 80, 160, 320),
+    registry=REGISTRY,
+)
+LLM_INPUT_CHARS_PER_TOKEN = Histogram(
+    "llm_input_chars_per_token",
+    "Request message characters per reported input token (checks cost.chars_per_token)",
+    ["provider"],
+    buckets=(1, 1.5, 2, 2.5, 3, 3.5, 4, 5, 6, 8),
+    registry=REGISTRY,
+)
+BUDGET_REMAINING_USD = Gauge(
+    "budget_remaining_usd",
+    "Remaining budget in USD per budget rule and scope key (global or tenant:<id>)",
+    ["rule", "key"],
+    registry=REGISTRY,
+)
 
 
 def record_chat_request(
@@ -27,3 +219,176 @@ def record_chat_request(
     """Increment chat_requests_total and observe latency for Prometheus."""
     CHAT_REQUESTS_TOTAL.labels(provider=provider, status=status).inc()
     CHAT_REQUEST_LATENCY_SECONDS.labels(provider=provider).observe(latency_ms / 1000.0)
+
+
+def record_rule_evaluation(rule: str, seconds: float, matched: bool) -> None:
+    """Observe one rule evaluation (outcome=match when the rule decided the route)."""
+    DECISION_RULE_LATENCY_SECONDS.labels(
+        rule=rule, outcome="match" if matched else "pass"
+    ).observe(seconds)
+
+
+def record_decision_cache(result: str, saved_seconds: float = 0.0) -> None:
+    """Count one decision cache lookup; on a hit, add the evaluation time it saved."""
+    DECISION_CACHE_REQUESTS_TOTAL.labels(result=result).inc()
+    if saved_seconds > 0:
+        DECISION_CACHE_SAVED_SECONDS_TOTAL.inc(saved_seconds)
+
+
+def record_shadow_decision(result: str, seconds: float) -> None:
+    """Count one shadow evaluation and observe its duration."""
+    SHADOW_DECISIONS_TOTAL.labels(result=result).inc()
+    SHADOW_EVALUATION_SECONDS.observe(seconds)
+
+
+def record_canary_request(variant: str) -> None:
+    """Count one request decided during a canary rollout (variant: active or candidate)."""
+    CANARY_REQUESTS_TOTAL.labels(variant=variant).inc()
+
+
+def record_idempotency(result: str) -> None:
+    """Count one Idempotency-Key request (new, replay, wait, conflict, timeout, or full)."""
+    IDEMPOTENCY_REQUESTS_TOTAL.labels(result=result).inc()
+
+
+def record_chat_job(result: str) -> None:
+    """Count one chat job outcome (completed, failed, or rejected when the queue is full)."""
+    CHAT_JOBS_TOTAL.labels(result=result).inc()
+
+
+def set_chat_jobs_queued(depth: int) -> None:
+    """Set the current number of queued chat jobs."""
+    CHAT_JOBS_QUEUED.set(depth)
+
+
+def record_queue_wait(provider: str, priority: str, seconds: float) -> None:
+    """Observe how long one request waited for a provider slot."""
+    SCHEDULER_QUEUE_WAIT_SECONDS.labels(provider=provider, priority=priority).observe(seconds)
+
+
+# Model names come from requests and provider responses; cap distinct label values.
+MAX_MODEL_LABELS = 32
+_model_labels: set[str] = set()
+
+
+def record_admission_shed(priority: str) -> None:
+    """Increment admission_shed_total for a rejected request."""
+    ADMISSION_SHED_TOTAL.labels(priority=priority).inc()
+
+
+def set_admission_signals(loop_lag_seconds: float, threadpool_utilization: float, queue_depth: int) -> None:
+    """Publish the admission controller's latest inputs."""
+    ADMISSION_EVENT_LOOP_LAG_SECONDS.set(loop_lag_seconds)
+    ADMISSION_THREADPOOL_UTILIZATION.set(threadpool_utilization)
+    ADMISSION_PROVIDER_QUEUE_DEPTH.set(queue_depth)
+
+
+def record_timeout_plan(provider: str, source: str, read_seconds: float) -> None:
+    """Observe the read timeout chosen for one provider call."""
+    PROVIDER_READ_TIMEOUT_SECONDS.labels(provider=provider, source=source).observe(read_seconds)
+
+
+def record_provider_timeout(provider: str, phase: str) -> None:
+    """Count one provider call that timed out in `phase`."""
+    PROVIDER_TIMEOUTS_TOTAL.labels(provider=provider, phase=phase).inc()
+
+
+def record_transport_timing(provider: str, timing: Mapping[str, float]) -> None:
+    """Observe the transport phases and body sizes of one traced provider call."""
+    for phase in TRANSPORT_PHASES:
+        ms = timing.get(f"{phase}_ms")
+        if ms is not None:
+            PROVIDER_TRANSPORT_PHASE_SECONDS.labels(provider=provider, phase=phase).observe(ms / 1000.0)
+    for direction in ("sent", "received"):
+        size = timing.get(f"bytes_{direction}")
+        if size is not None:
+            PROVIDER_TRANSPORT_BYTES.labels(provider=provider, direction=direction).observe(size)
+
+
+def record_deadline_skip(provider: str) -> None:
+    """Count one provider call skipped for the client deadline."""
+    PROVIDER_DEADLINE_SKIPS_TOTAL.labels(provider=provider).inc()
+
+
+def record_session_request(result: str) -> None:
+    """Count one session request: started, continued, not_found, conflict, or full."""
+    CHAT_SESSION_REQUESTS_TOTAL.labels(result=result).inc()
+
+
+def set_chat_sessions_active(count: int) -> None:
+    CHAT_SESSIONS_ACTIVE.set(count)
+
+
+def record_oversize(kind: str) -> None:
+    """Count one body over its size limit (request_body: 413; provider_response: failed call)."""
+    OVERSIZE_REJECTIONS_TOTAL.labels(kind=kind).inc()
+
+
+def record_chat_completion(mode: str) -> None:
+    """Count one /v1/chat/completions request by mode (relay or transcode)."""
+    CHAT_COMPLETIONS_TOTAL.labels(mode=mode).inc()
+
+
+def record_local_saturation(saturated: bool, entered: bool = False) -> None:
+    """Set the local_saturated gauge; count an episode when the state was just entered."""
+    LOCAL_SATURATED.set(1 if saturated else 0)
+    if entered:
+        LOCAL_SATURATION_EPISODES_TOTAL.inc()
+
+
+def record_model_downgrade(model: str | None, fallback: str) -> None:
+    """Count one request served by `fallback` instead of `model`."""
+    LOCAL_MODEL_DOWNGRADES_TOTAL.labels(model=model_label(model), fallback=model_label(fallback)).inc()
+
+
+def model_label(model: str | None) -> str:
+    """Metric label for a model: "default" when unset, "other" past MAX_MODEL_LABELS distinct names."""
+    if not model:
+        return "default"
+    if model in _model_labels:
+        return model
+    if len(_model_labels) >= MAX_MODEL_LABELS:
+        return "other"
+    _model_labels.add(model)
+    return model
+
+
+def record_public_spend(provider: str, model: str | None, usd: float) -> None:
+    """Add spend for one successful public call."""
+    if usd > 0:
+        PUBLIC_SPEND_USD_TOTAL.labels(provider=provider, model=model_label(model)).inc(usd)
+
+
+def record_usage(
+    provider: str,
+    model: str | None,
+    input_tokens: int | None,
+    output_tokens: int | None,
+    tokens_per_second: float | None,
+    input_chars: int,
+    cache_read_tokens: int | None = None,
+    cache_creation_tokens: int | None = None,
+) -> None:
+    """Record provider-reported token counts, throughput and observed chars per input token."""
+    label = model_label(model)
+    if input_tokens is not None:
+        LLM_TOKENS_TOTAL.labels(provider=provider, model=label, direction="input").inc(input_tokens)
+        # Anthropic reports cached input separately; the prompt's chars cover all of it.
+        prompt_tokens = input_tokens + (cache_read_tokens or 0) + (cache_creation_tokens or 0)
+        if prompt_tokens > 0 and input_chars > 0:
+            LLM_INPUT_CHARS_PER_TOKEN.labels(provider=provider).observe(input_chars / prompt_tokens)
+    if output_tokens is not None:
+        LLM_TOKENS_TOTAL.labels(provider=provider, model=label, direction="output").inc(output_tokens)
+    if cache_read_tokens:
+        LLM_TOKENS_TOTAL.labels(provider=provider, model=label, direction="cache_read").inc(cache_read_tokens)
+    if cache_creation_tokens:
+        LLM_TOKENS_TOTAL.labels(provider=provider, model=label, direction="cache_creation").inc(
+            cache_creation_tokens
+        )
+    if tokens_per_second is not None:
+        LLM_OUTPUT_TOKENS_PER_SECOND.labels(provider=provider, model=label).observe(tokens_per_second)
+
+
+def record_budget_remaining(rule: str, key: str, remaining_usd: float) -> None:
+    """Set the remaining budget gauge for one budget rule and scope key."""
+    BUDGET_REMAINING_USD.labels(rule=rule, key=key).set(remaining_usd)
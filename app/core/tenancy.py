@@ -0,0 +1,46 @@
+"""
+Tenant attribution for budgets and audit (no secrets: API keys are reduced to a short hash).
+
+Resolution: with a bearer token / X-API-Key, the tenant comes from the key: its mapping in
+API_KEY_TENANTS, else "key-" + first 12 hex chars of its SHA-256. X-Tenant is not authenticated,
+so it is ignored when a key is sent and only names the tenant of keyless requests (validated
+slug). Otherwise None (unattributed).
+"""
+
+import hashlib
+import re
+from typing import Mapping
+
+from app.core.config import get_api_key_tenants
+
+TENANT_HEADER = "x-tenant"
+_TENANT_SLUG = re.compile(r"[A-Za-z0-9][A-Za-z0-9_.\-]{0,63}")
+
+
+def is_valid_tenant(tenant: str) -> bool:
+    """True for a lowercase tenant id as produced by resolve_tenant (also safe as a file name)."""
+    return bool(_TENANT_SLUG.fullmatch(tenant)) and tenant == tenant.lower()
+
+
+def _api_key(headers: Mapping[str, str]) -> str | None:
+    auth = (headers.get("authorization") or "").strip()
+    if auth[:7].lower() == "bearer " and auth[7:].strip():
+        return auth[7:].strip()
+    key = (headers.get("x-api-key") or "").strip()
+    return key or None
+
+
+def resolve_tenant(headers: Mapping[str, str] | None) -> str | None:
+    """Tenant id for this request, or None. `headers` keys may be any case."""
+    if not headers:
+        return None
+    lowered = {k.lower(): v for k, v in headers.items()}
+    key = _api_key(lowered)
+    if key:
+        key_id = "key-" + hashlib.sha256(key.encode()).hexdigest()[:12]
+        mapped = get_api_key_tenants().get(key_id)
+        return mapped if mapped and is_valid_tenant(mapped) else key_id
+    explicit = (lowered.get(TENANT_HEADER) or "").strip()
+    if explicit and _TENANT_SLUG.fullmatch(explicit):
+        return explicit.lower()
+    return None
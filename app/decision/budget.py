@@ -0,0 +1,135 @@
+"""
+In-memory sliding-window spend ledger for budget rules (global and per tenant).
+
+Spend is bucketed by hour. Writers on the chat path only append to a deque (atomic, no lock);
+readers fold pending records into the buckets under a lock that writers never take, so
+recording spend never serializes requests. Windows are approximate to one bucket.
+Buckets older than the retention window are dropped when a new hour starts. The ledger is
+rebuilt from the audit log on startup and then every BUDGET_SYNC_SECONDS by
+app.services.budget_sync, so every worker also counts the spend of the others.
+"""
+
+import itertools
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Iterable
+
+BUCKET_SECONDS = 3600
+RETENTION_SECONDS = 31 * 24 * 3600
+GLOBAL_KEY = "global"
+
+
+def tenant_key(tenant: str) -> str:
+    return f"tenant:{tenant}"
+
+
+class SpendLedger:
+    """Spend per scope key ("global", "tenant:<id>") in hourly buckets."""
+
+    def __init__(self, bucket_seconds: int = BUCKET_SECONDS, retention_seconds: int = RETENTION_SECONDS) -> None:
+        self.bucket_seconds = bucket_seconds
+        self.retention_seconds = retention_seconds
+        self._pending: deque[tuple[int, str | None, float, float]] = deque()
+        self._buckets: dict[str, dict[int, float]] = {}
+        self._latest_bucket = 0
+        self._fold_lock = threading.Lock()
+        # Sequence numbers order records against sync markers (next() on a count is atomic).
+        self._seq = itertools.count()
+        # Records folded since the last sync marker; kept only once syncing has started.
+        self._tail: list[tuple[int, str | None, float, float]] | None = None
+
+    def add(self, tenant: str | None, usd: float, at: float | None = None) -> None:
+        """Record spend (counts toward global and the tenant). Lock-free append."""
+        if usd > 0:
+            self._pending.append((next(self._seq), tenant, usd, time.time() if at is None else at))
+
+    def sync_marker(self) -> int:
+        """
+        Take before reading the audit log for replace(). Spend is added only after its audit
+        event is written, so records added before the marker are in what the read returns.
+        """
+        with self._fold_lock:
+            if self._tail is None:
+                self._tail = []
+        return next(self._seq)
+
+    def replace(self, rows: Iterable[tuple[str | None, datetime, float]], marker: int) -> None:
+        """
+        Rebuild the buckets from audit spend rows (tenant, hour, usd), then re-apply this
+        worker's records added after `marker`, which the read may not have seen. A record
+        committed in between counts twice until the next sync: budgets err on the safe side.
+        """
+        with self._fold_lock:
+            self._fold_pending()
+            tail = [record for record in self._tail or () if record[0] > marker]
+            self._buckets = {}
+            self._latest_bucket = 0
+            for tenant, hour, usd in rows:
+                self._apply(tenant, usd, hour.timestamp())
+            for _, tenant, usd, at in tail:
+                self._apply(tenant, usd, at)
+            self._tail = tail
+            self._prune(self._latest_bucket - self.retention_seconds // self.bucket_seconds)
+
+    def _fold(self) -> None:
+        with self._fold_lock:
+            latest = self._latest_bucket
+            self._fold_pending()
+            if self._latest_bucket > latest:
+                self._prune(self._latest_bucket - self.retention_seconds // self.bucket_seconds)
+
+    def _fold_pending(self) -> None:
+        """Move pending records into the buckets (caller holds the fold lock)."""
+        pending = self._pending
+        tail = self._tail
+        while pending:
+            try:
+                record = pending.popleft()
+            except IndexError:
+                break
+            _, tenant, usd, at = record
+            self._apply(tenant, usd, at)
+            if tail is not None:
+                tail.append(record)
+
+    def _apply(self, tenant: str | None, usd: float, at: float) -> None:
+        bucket = int(at // self.bucket_seconds)
+        self._latest_bucket = max(self._latest_bucket, bucket)
+        for key in (GLOBAL_KEY, tenant_key(tenant)) if tenant else (GLOBAL_KEY,):
+            per_key = self._buckets.setdefault(key, {})
+            per_key[bucket] = per_key.get(bucket, 0.0) + usd
+
+    def _prune(self, oldest: int) -> None:
+        """Drop buckets before `oldest` (caller holds the fold lock)."""
+        for key, per_key in list(self._buckets.items()):
+            for bucket in [b for b in per_key if b < oldest]:
+                del per_key[bucket]
+            if not per_key:
+                del self._buckets[key]
+
+    def spent(self, key: str, window_seconds: int, now: float | None = None) -> float:
+        """Spend for `key` in the last `window_seconds` (bucket granularity)."""
+        self._fold()
+        now = time.time() if now is None else now
+        first = int((now - window_seconds) // self.bucket_seconds) + 1
+        per_key = self._buckets.get(key)
+        if not per_key:
+            return 0.0
+        return sum(usd for bucket, usd in list(per_key.items()) if bucket >= first)
+
+    def keys(self, prefix: str = "") -> list[str]:
+        """Scope keys with recorded spend (optionally filtered by prefix)."""
+        self._fold()
+        return sorted(k for k in list(self._buckets) if k.startswith(prefix))
+
+    def clear(self) -> None:
+        with self._fold_lock:
+            self._pending.clear()
+            self._buckets = {}
+            self._latest_bucket = 0
+            self._tail = None
+
+
+spend_ledger = SpendLedger()
@@ -0,0 +1,62 @@
+"""
+Bounded LRU cache of routing decisions (decide() is deterministic per prompt and policy).
+
+Keys are (policy generation, prompt SHA-256, prompt length, model, public provider). The
+policy generation is a fingerprint of the loaded policy content, so editing the policy file
+changes every key and stale entries simply age out. Entries store the unresolved route target ("local" | "public"),
+so PUBLIC_PROVIDER / PUBLIC_LLM_URL is still applied per request.
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from app.core.config import get_decision_cache_size
+
+CacheKey = tuple[str, str, int, str | None, str]
+
+
+@dataclass(frozen=True)
+class CachedDecision:
+    """Cached pipeline outcome plus the evaluation time a hit saves."""
+
+    target: str
+    reason_codes: tuple[str, ...]
+    flags: tuple[str, ...]
+    cost_usd: float
+    eval_seconds: float
+
+
+class DecisionCache:
+    """Thread-safe LRU map of CacheKey → CachedDecision. maxsize 0 disables caching."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._entries: OrderedDict[CacheKey, CachedDecision] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: CacheKey) -> CachedDecision | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: CacheKey, entry: CachedDecision) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+decision_cache = DecisionCache(get_decision_cache_size())
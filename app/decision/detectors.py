@@ -0,0 +1,293 @@
+"""
+PII/secret detectors for the sensitivity rule (config-driven; compiled once per policy).
+
+One DetectorScanner per policy holds a compiled pattern per detector class. Cheap substring
+prefilters drop classes that cannot match, and the prompt is visited once, window by window:
+every active class runs over a window while it is cache-hot, and validators (Luhn, IBAN
+mod-97, context checks) reject look-alikes. The per-request CPU time budget is checked
+between windows. Each pattern starts with a literal or a narrow character class so the regex
+engine can skip ahead quickly; a single alternation of all classes defeats that and is
+several times slower in CPython's `re`.
+"""
+
+import re
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterable
+
+DETECTOR_API_KEY = "api_key"
+DETECTOR_EMAIL = "email"
+DETECTOR_CREDIT_CARD = "credit_card"
+DETECTOR_IBAN = "iban"
+DETECTOR_INTERNAL_HOSTNAME = "internal_hostname"
+
+ALL_DETECTORS = (
+    DETECTOR_API_KEY,
+    DETECTOR_EMAIL,
+    DETECTOR_CREDIT_CARD,
+    DETECTOR_IBAN,
+    DETECTOR_INTERNAL_HOSTNAME,
+)
+
+DEFAULT_CPU_BUDGET_MS = 50.0
+
+# Every pattern is length-bounded so windows only need to overlap by MAX_MATCH_CHARS.
+MAX_MATCH_CHARS = 320
+WINDOW_CHARS = 64 * 1024
+
+_PATTERNS = {
+    DETECTOR_API_KEY: re.compile(
+        r"sk-[A-Za-z0-9_\-]{20,200}"
+        r"|AKIA[0-9A-Z]{16}"
+        r"|gh[pousr]_[A-Za-z0-9]{36,80}"
+        r"|xox[abprs]-[A-Za-z0-9\-]{10,200}"
+        r"|AIza[0-9A-Za-z_\-]{35}"
+        r"|-----BEGIN [A-Z ]{0,20}PRIVATE KEY-----"
+    ),
+    # Anchored on "@"; the local part is checked by _email_valid (one char of context).
+    DETECTOR_EMAIL: re.compile(r"@[A-Za-z0-9\-]{1,63}(?:\.[A-Za-z0-9\-]{1,63}){0,6}\.[A-Za-z]{2,24}"),
+    # Runs of digits, spaces and dashes; _card_valid looks for a card inside the run.
+    DETECTOR_CREDIT_CARD: re.compile(r"[0-9][0-9 \-]{11,78}[0-9]"),
+    DETECTOR_IBAN: re.compile(r"[A-Z][A-Z][0-9][0-9](?: ?[A-Z0-9]{4}){2,7}(?: ?[A-Z0-9]{1,3})?"),
+}
+
+_API_KEY_PREFIXES = ("sk-", "AKIA", "ghp_", "gho_", "ghu_", "ghs_", "ghr_", "xox", "AIza", "PRIVATE KEY")
+_DIGIT_RUN = re.compile(r"[0-9]{4}")
+_CARD_SEPARATOR = re.compile(r"([ \-]+)")
+_IBAN_HEAD = re.compile(r"[A-Z][A-Z][0-9][0-9]")
+_LOCAL_PART_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789._%+-")
+_LABEL_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-")
+
+
+class DetectorConfigError(ValueError):
+    """Raised when detector configuration in the policy is invalid."""
+
+
+def luhn_valid(digits: str) -> bool:
+    """Luhn checksum for card numbers (digits only)."""
+    total = 0
+    parity = len(digits) % 2
+    for i, ch in enumerate(digits):
+        d = ord(ch) - 48
+        if i % 2 == parity:
+            d *= 2
+            if d > 9:
+                d -= 9
+        total += d
+    return total % 10 == 0
+
+
+def iban_valid(candidate: str) -> bool:
+    """ISO 13616 mod-97 check (spaces ignored)."""
+    iban = candidate.replace(" ", "")
+    if not 15 <= len(iban) <= 34:
+        return False
+    rearranged = iban[4:] + iban[:4]
+    remainder = 0
+    for ch in rearranged:
+        if ch.isdigit():
+            remainder = (remainder * 10 + ord(ch) - 48) % 97
+        else:
+            remainder = (remainder * 100 + ord(ch) - 55) % 97
+    return remainder == 1
+
+
+def _before(text: str, m: re.Match[str]) -> str:
+    return text[m.start() - 1] if m.start() > 0 else ""
+
+
+def _email_valid(text: str, m: re.Match[str]) -> bool:
+    return _before(text, m) in _LOCAL_PART_CHARS
+
+
+def _after(text: str, m: re.Match[str]) -> str:
+    return text[m.end()] if m.end() < len(text) else ""
+
+
+def _card_valid(text: str, m: re.Match[str]) -> bool:
+    """
+    Any whole digit groups of the run joined by one consistent single separator, 13-19 digits
+    in total and Luhn-valid. Nearby numbers (dates, CVVs, references) are separate groups, so
+    "4111111111111111 12/25" still yields the card. Groups cut off by the match length limit
+    (a digit right before or after the run) are not used.
+    """
+    parts = _CARD_SEPARATOR.split(m.group())
+    groups, separators = parts[0::2], parts[1::2]
+    first = 1 if _before(text, m).isdigit() else 0
+    last = len(groups) - (1 if _after(text, m).isdigit() else 0)
+    for i in range(first, last):
+        digits = 0
+        for j in range(i, last):
+            if j > i and (len(separators[j - 1]) != 1 or separators[j - 1] != separators[i]):
+                break
+            digits += len(groups[j])
+            if digits > 19:
+                break
+            if digits >= 13 and luhn_valid("".join(groups[i : j + 1])):
+                return True
+    return False
+
+
+def _iban_valid(text: str, m: re.Match[str]) -> bool:
+    return not _before(text, m).isalnum() and iban_valid(m.group())
+
+
+def _hostname_valid(text: str, m: re.Match[str]) -> bool:
+    return _before(text, m) in _LABEL_CHARS
+
+
+_VALIDATORS: dict[str, Callable[[str, re.Match[str]], bool]] = {
+    DETECTOR_EMAIL: _email_valid,
+    DETECTOR_CREDIT_CARD: _card_valid,
+    DETECTOR_IBAN: _iban_valid,
+    DETECTOR_INTERNAL_HOSTNAME: _hostname_valid,
+}
+
+
+@dataclass(frozen=True)
+class DetectorScanResult:
+    """Detector classes found in the prompt; budget_exceeded when the scan stopped early."""
+
+    classes: frozenset[str]
+    budget_exceeded: bool = False
+
+
+class DetectorScanner:
+    """Compiled detector set for one policy. Thread-safe (no mutable per-request state)."""
+
+    def __init__(
+        self,
+        detectors: tuple[str, ...],
+        internal_host_suffixes: tuple[str, ...] = (),
+        cpu_budget_ms: float = DEFAULT_CPU_BUDGET_MS,
+    ) -> None:
+        self.detectors = detectors
+        self.internal_host_suffixes = internal_host_suffixes
+        self.cpu_budget_ms = cpu_budget_ms
+        patterns = {k: v for k, v in _PATTERNS.items() if k in detectors}
+        if DETECTOR_INTERNAL_HOSTNAME in detectors:
+            # Anchored on ".<suffix>"; _hostname_valid requires a host label before it.
+            suffixes = "|".join(re.escape(s.lstrip(".")) for s in internal_host_suffixes)
+            patterns[DETECTOR_INTERNAL_HOSTNAME] = re.compile(
+                rf"\.(?:{suffixes})(?![A-Za-z0-9\-])", re.IGNORECASE
+            )
+        self._patterns = patterns
+
+    def _prefilter(self, text: str) -> list[str]:
+        """Classes that can possibly match this text (cheap C-level substring checks)."""
+        active = []
+        for name in self.detectors:
+            if name == DETECTOR_API_KEY:
+                ok = any(p in text for p in _API_KEY_PREFIXES)
+            elif name == DETECTOR_EMAIL:
+                ok = "@" in text
+            elif name == DETECTOR_CREDIT_CARD:
+                ok = _DIGIT_RUN.search(text) is not None
+            elif name == DETECTOR_IBAN:
+                ok = _IBAN_HEAD.search(text) is not None
+            else:
+                ok = "." in text
+            if ok:
+                active.append(name)
+        return active
+
+    def scan(self, text: str) -> DetectorScanResult:
+        """Window-by-window pass over `text`; stops when every active class is found or the budget is spent."""
+        return self.scan_segments((text,))
+
+    def scan_segments(self, segments: Iterable[str]) -> DetectorScanResult:
+        """
+        One streaming pass over several texts (e.g. every message of a conversation).
+
+        Found classes and the CPU budget carry across segments. Short segments are packed into
+        windows of at most WINDOW_CHARS, joined with a newline so no match spans two messages;
+        segments longer than a window are scanned in place. Memory stays bounded by one window.
+        """
+        state = _ScanState(list(self.detectors), time.thread_time() + self.cpu_budget_ms / 1000.0)
+        batch: list[str] = []
+        batch_chars = 0
+        for segment in segments:
+            if not segment:
+                continue
+            if batch and batch_chars + len(segment) > WINDOW_CHARS:
+                self._scan_text("\n".join(batch), state)
+                batch, batch_chars = [], 0
+            if len(segment) >= WINDOW_CHARS:
+                self._scan_text(segment, state)
+            else:
+                batch.append(segment)
+                batch_chars += len(segment) + 1
+            if state.done:
+                return state.result()
+        if batch:
+            self._scan_text("\n".join(batch), state)
+        return state.result()
+
+    def _scan_text(self, text: str, state: "_ScanState") -> None:
+        """Scan one text window by window, updating `state`; checks the budget before each window."""
+        pending = [name for name in self._prefilter(text) if name in state.pending]
+        pos = 0
+        length = len(text)
+        while pos < length and pending and not state.done:
+            if state.started and time.thread_time() > state.deadline:
+                state.budget_exceeded = True
+                return
+            state.started = True
+            end = min(length, pos + WINDOW_CHARS)
+            # Overlap keeps matches that straddle a window edge.
+            stop = min(length, end + MAX_MATCH_CHARS)
+            for name in pending:
+                validator = _VALIDATORS.get(name)
+                for m in self._patterns[name].finditer(text, pos, stop):
+                    if validator is None or validator(text, m):
+                        state.found.add(name)
+                        break
+            pending = [name for name in pending if name not in state.found]
+            state.pending = [name for name in state.pending if name not in state.found]
+            pos = end
+
+
+class _ScanState:
+    """Mutable per-scan state (one instance per request; never shared between threads)."""
+
+    __slots__ = ("pending", "deadline", "found", "started", "budget_exceeded")
+
+    def __init__(self, pending: list[str], deadline: float) -> None:
+        self.pending = pending
+        self.deadline = deadline
+        self.found: set[str] = set()
+        self.started = False
+        self.budget_exceeded = False
+
+    @property
+    def done(self) -> bool:
+        return self.budget_exceeded or not self.pending
+
+    def result(self) -> DetectorScanResult:
+        return DetectorScanResult(frozenset(self.found), budget_exceeded=self.budget_exceeded)
+
+
+def compile_detectors(
+    detectors: list,
+    internal_host_suffixes: list | None = None,
+    cpu_budget_ms: float | None = None,
+) -> DetectorScanner | None:
+    """
+    Build a DetectorScanner from policy values. Returns None when no detectors are enabled.
+    Raises DetectorConfigError on unknown classes or missing internal host suffixes.
+    """
+    names = tuple(dict.fromkeys(str(d).strip().lower() for d in detectors if str(d).strip()))
+    unknown = [n for n in names if n not in ALL_DETECTORS]
+    if unknown:
+        raise DetectorConfigError(
+            f"unknown detector(s): {', '.join(unknown)} (known: {', '.join(ALL_DETECTORS)})"
+        )
+    if not names:
+        return None
+    suffixes = tuple(str(s).strip().lower() for s in (internal_host_suffixes or []) if str(s).strip())
+    if DETECTOR_INTERNAL_HOSTNAME in names and not suffixes:
+        raise DetectorConfigError("'internal_hostname' detector requires 'internal_host_suffixes'")
+    budget = DEFAULT_CPU_BUDGET_MS if cpu_budget_ms is None else cpu_budget_ms
+    if budget <= 0:
+        raise DetectorConfigError("'detector_cpu_budget_ms' must be > 0")
+    return DetectorScanner(names, suffixes, budget)
@@ -1,50 +1,205 @@
-"""Decision orchestration: sensitivity → cost → default; returns provider + reason_codes."""
+"""Decision orchestration: decision cache → compiled rule pipeline → default; returns provider + reason_codes."""
 
-from typing import TypedDict
+import time
+from datetime import datetime
+from typing import Mapping, NotRequired, Sequence, TypedDict
 
-from app.core.config import PolicyConfig, get_policy_config, get_public_provider_from_url
-from app.decision.policies import cost_prefer_local, sensitivity_match
-from app.decision.reason_codes import (
-    COST_PREFER_LOCAL,
-    DEFAULT,
-    SENSITIVE_KEYWORD_MATCH,
+from app.core.config import (
+    DECISION_SCOPE_CONVERSATION,
+    PolicyConfig,
+    get_policy_config,
+    get_public_provider,
 )
+from app.core.telemetry import record_decision_cache, record_rule_evaluation
+from app.decision.cache import CachedDecision, decision_cache
+from app.decision.reason_codes import DEFAULT
+from app.decision.rules import DecisionContext, Rule, RuleOutcome, estimate_cost_usd, get_pipeline
+from app.decision.trace import OUTCOME_MATCH, OUTCOME_PASS, OUTCOME_SKIPPED, DecisionTrace, RuleTrace
 
 
 class DecisionResult(TypedDict):
     provider: str  # "local" | "openai" | "anthropic"
     reason_codes: list[str]
+    flags: NotRequired[list[str]]  # safe audit flags from rules (e.g. detectors=email)
+    estimated_cost_usd: NotRequired[float]  # public targets with a configured price only
+
+
+def _resolve_target(target: str) -> str:
+    """Map a rule/default target (local | public) to a concrete provider."""
+    if target == "local":
+        return "local"
+    return get_public_provider()
 
 
 def decide(
     prompt_text: str = "",
     prompt_length: int = 0,
     config: PolicyConfig | None = None,
+    *,
+    model: str | None = None,
+    headers: Mapping[str, str] | None = None,
+    now: datetime | None = None,
+    messages: Sequence[str] | None = None,
+    extra_segments: Sequence[str] = (),
+    prompt_hash: str | None = None,
+    tenant: str | None = None,
+    trace: DecisionTrace | None = None,
+    history_length: int = 0,
+    history_tokens: float = 0.0,
+    shadow: bool = False,
 ) -> DecisionResult:
     """
-    Deterministic routing: sensitivity first, then cost, then default.
+    Deterministic routing: evaluate the compiled rule pipeline in order (default:
+    sensitivity → cost); the first matching rule wins, otherwise the default provider.
     Same input + config → same output. Returns provider and reason_codes on every path.
+
+    messages: contents of every message in the request. With decision_scope "conversation",
+    sensitivity scans all of them and the cost rule uses their total length.
+    extra_segments: request fields outside the message texts (tool-call arguments, tools, ...
+    of a forwarded body). Sensitivity scans them in every scope; decisions with them are not
+    cached, since prompt_hash does not cover them.
+    prompt_hash: SHA-256 hex of prompt_text (as stored in audit). When given, the outcome is
+    memoized per policy generation; pipelines with time/header/budget rules are not cached.
+    tenant: resolved tenant id for budget rules.
+    history_length / history_tokens: size of earlier session messages that were already scanned.
+    With decision_scope "conversation" they are added to the cost rule's length and token
+    estimate, while sensitivity scans only `messages` (the new part of the conversation).
+    trace: when given, filled with per-rule outcome, inputs and elapsed ns. Tracing skips the
+    cache lookup (so every rule runs) but still stores the outcome.
+    shadow: evaluation of a candidate policy next to the live one. It neither reads nor fills
+    the decision cache and records no rule, cache or budget metrics, so the live series only
+    count live traffic.
     """
     if config is None:
         config = get_policy_config()
 
-    # 1. Sensitivity: any configured keyword in prompt → local
-    if sensitivity_match(prompt_text, config.sensitivity_keywords):
-        return {"provider": "local", "reason_codes": [SENSITIVE_KEYWORD_MATCH]}
-
-    # 2. Cost: prefer local when under configured cost threshold (USD-mode or length-mode).
-    if cost_prefer_local(
-        prompt_length=prompt_length,
-        cost_max_prompt_length_for_local=config.cost_max_prompt_length_for_local,
-        cost_max_usd_for_local=config.cost_max_usd_for_local,
-        llm_input_usd_per_1m_tokens=config.llm_input_usd_per_1m_tokens,
-        cost_chars_per_token=config.cost_chars_per_token,
+    pipeline = get_pipeline(config)
+    key = None
+    if (
+        not shadow
+        and decision_cache.maxsize > 0
+        and prompt_hash
+        and not extra_segments
+        and config.generation
+        and config.decision_scope != DECISION_SCOPE_CONVERSATION
     ):
-        return {"provider": "local", "reason_codes": [COST_PREFER_LOCAL]}
+        if all(rule.cacheable for rule in pipeline):
+            # The public provider (PUBLIC_PROVIDER or PUBLIC_LLM_URL) selects the cost rule's price.
+            public = get_public_provider()
+            key = (config.generation, prompt_hash, prompt_length, model, public)
+    if key is None or trace is not None:
+        if not shadow:
+            record_decision_cache("bypass")
+    else:
+        cached = decision_cache.get(key)
+        if cached is not None:
+            record_decision_cache("hit", cached.eval_seconds)
+            return _result(
+                _resolve_target(cached.target),
+                list(cached.reason_codes),
+                list(cached.flags),
+                cached.cost_usd,
+            )
+        record_decision_cache("miss")
 
-    # 3. Default: local or public (resolve public → openai|anthropic from PUBLIC_LLM_URL)
-    if config.default_provider == "local":
-        provider = "local"
+    segments: tuple[str, ...] = ()
+    if messages is not None and config.decision_scope == DECISION_SCOPE_CONVERSATION:
+        segments = tuple(messages)
+        prompt_length = history_length + sum(len(m) for m in segments)
     else:
-        provider = get_public_provider_from_url()
-    return {"provider": provider, "reason_codes": [DEFAULT]}
+        history_tokens = 0.0
+
+    ctx = DecisionContext(
+        prompt_text=prompt_text,
+        prompt_length=prompt_length,
+        config=config,
+        model=model,
+        headers={k.lower(): v for k, v in headers.items()} if headers else {},
+        now=now,
+        segments=segments,
+        extra_segments=tuple(extra_segments),
+        tenant=tenant,
+        history_tokens=history_tokens,
+        trace_inputs={} if trace is not None else None,
+        shadow=shadow,
+    )
+    eval_start = time.perf_counter_ns()
+    target, reason_codes = config.default_provider, [DEFAULT]
+    for i, rule in enumerate(pipeline):
+        start = time.perf_counter_ns()
+        outcome = rule.evaluate(ctx)
+        elapsed_ns = time.perf_counter_ns() - start
+        if not shadow:
+            record_rule_evaluation(rule.name, elapsed_ns / 1e9, matched=outcome is not None)
+        if outcome is not None:
+            target, codes = outcome
+            reason_codes = [codes] if isinstance(codes, str) else list(codes)
+        if trace is not None:
+            _trace_rule(trace, ctx, rule, outcome, reason_codes, elapsed_ns)
+        if outcome is not None:
+            if trace is not None:
+                trace.rules.extend(
+                    RuleTrace(r.name, r.type_name, OUTCOME_SKIPPED) for r in pipeline[i + 1 :]
+                )
+            break
+    eval_ns = time.perf_counter_ns() - eval_start
+    if trace is not None:
+        trace.cache = "bypass"
+        trace.total_ns = eval_ns
+
+    # "public" resolves to the public provider (PUBLIC_PROVIDER or PUBLIC_LLM_URL), also on cache hits.
+    provider = _resolve_target(target)
+    cost_usd = estimate_cost_usd(ctx, provider)
+    if key is not None:
+        decision_cache.put(
+            key,
+            CachedDecision(
+                target=target,
+                reason_codes=tuple(reason_codes),
+                flags=tuple(ctx.flags),
+                cost_usd=cost_usd,
+                eval_seconds=eval_ns / 1e9,
+            ),
+        )
+    return _result(provider, reason_codes, ctx.flags, cost_usd)
+
+
+def _trace_rule(
+    trace: DecisionTrace,
+    ctx: DecisionContext,
+    rule: Rule,
+    outcome: RuleOutcome | None,
+    reason_codes: list[str],
+    elapsed_ns: int,
+) -> None:
+    """Append one evaluated rule to the trace and reset the context's input scratchpad."""
+    inputs = dict(ctx.trace_inputs or {})
+    if ctx.trace_inputs is not None:
+        ctx.trace_inputs.clear()
+    trace.rules.append(
+        RuleTrace(
+            name=rule.name,
+            type=rule.type_name,
+            outcome=OUTCOME_MATCH if outcome is not None else OUTCOME_PASS,
+            elapsed_ns=elapsed_ns,
+            reason_codes=list(reason_codes) if outcome is not None else [],
+            inputs=inputs,
+        )
+    )
+
+
+def decision_string(provider: str, reason_codes: list[str]) -> str:
+    """Stable string for audit: provider=X,reason_codes=A,B."""
+    codes = ",".join(reason_codes) if reason_codes else ""
+    return f"provider={provider},reason_codes={codes}"
+
+
+def _result(
+    provider: str, reason_codes: list[str], flags: list[str], cost_usd: float = 0.0
+) -> DecisionResult:
+    result: DecisionResult = {"provider": provider, "reason_codes": reason_codes}
+    if flags:
+        result["flags"] = flags
+    if cost_usd > 0:
+        result["estimated_cost_usd"] = cost_usd
+    return result
@@ -0,0 +1,93 @@
+"""
+Local model fallbacks (policy `local_fallbacks`; compiled once per policy).
+
+Shape: {"models": {"<large model>": "<smaller model>", "default": "<model>"},
+        "queue_depth": 8, "latency_ms": 20000,
+        "recover_queue_depth": 2, "recover_latency_ms": 8000}
+While the local provider is saturated (queue depth or recent latency at or above its
+threshold) a request for a mapped model is served by the smaller one. It returns to the large
+model only when both signals are at or below the recover thresholds (hysteresis). "default"
+applies to requests without a model. latency_ms is optional; recover thresholds default to
+half of the entry thresholds.
+"""
+
+from dataclasses import dataclass
+
+DEFAULT_MODEL_KEY = "default"
+
+
+class FallbackConfigError(ValueError):
+    """Raised when local_fallbacks in the policy is invalid."""
+
+
+@dataclass(frozen=True)
+class LocalFallbacks:
+    """Compiled local_fallbacks: model map and saturation thresholds."""
+
+    models: dict[str, str]
+    queue_depth: int
+    recover_queue_depth: int
+    latency_ms: float | None = None
+    recover_latency_ms: float | None = None
+
+    def fallback_for(self, model: str | None) -> str | None:
+        """Smaller model for `model` (the "default" entry when no model is requested), or None."""
+        return self.models.get(model or DEFAULT_MODEL_KEY)
+
+
+def _number(raw: dict, key: str, integer: bool) -> float | None:
+    value = raw.get(key)
+    if value is None:
+        return None
+    kinds = (int,) if integer else (int, float)
+    if isinstance(value, bool) or not isinstance(value, kinds) or value < 0:
+        kind = "a non-negative integer" if integer else "a non-negative number"
+        raise FallbackConfigError(f"'{key}' must be {kind}")
+    return value
+
+
+def compile_local_fallbacks(raw: object) -> LocalFallbacks:
+    """Validate and compile local_fallbacks."""
+    if not isinstance(raw, dict):
+        raise FallbackConfigError(f"must be an object; got {type(raw).__name__}")
+    allowed = {"models", "queue_depth", "latency_ms", "recover_queue_depth", "recover_latency_ms"}
+    unknown = sorted(set(raw) - allowed)
+    if unknown:
+        raise FallbackConfigError(f"does not accept: {', '.join(unknown)}")
+    models_raw = raw.get("models")
+    if not isinstance(models_raw, dict) or not models_raw:
+        raise FallbackConfigError("'models' must be a non-empty object of model → fallback model")
+    models: dict[str, str] = {}
+    for model, fallback in models_raw.items():
+        if not isinstance(fallback, str) or not fallback.strip():
+            raise FallbackConfigError(f"'models.{model}' must be a model name")
+        if fallback.strip() == str(model).strip():
+            raise FallbackConfigError(f"'models.{model}' must differ from the model it replaces")
+        models[str(model).strip()] = fallback.strip()
+
+    queue_depth = _number(raw, "queue_depth", integer=True)
+    if not queue_depth:
+        raise FallbackConfigError("'queue_depth' is required and must be at least 1")
+    recover_queue_depth = _number(raw, "recover_queue_depth", integer=True)
+    if recover_queue_depth is None:
+        recover_queue_depth = queue_depth // 2
+    if recover_queue_depth >= queue_depth:
+        raise FallbackConfigError("'recover_queue_depth' must be below 'queue_depth'")
+
+    latency_ms = _number(raw, "latency_ms", integer=False) or None
+    recover_latency_ms = _number(raw, "recover_latency_ms", integer=False)
+    if latency_ms is None:
+        if recover_latency_ms is not None:
+            raise FallbackConfigError("'recover_latency_ms' requires 'latency_ms'")
+    elif recover_latency_ms is None:
+        recover_latency_ms = latency_ms / 2
+    elif recover_latency_ms >= latency_ms:
+        raise FallbackConfigError("'recover_latency_ms' must be below 'latency_ms'")
+
+    return LocalFallbacks(
+        models=models,
+        queue_depth=int(queue_depth),
+        recover_queue_depth=int(recover_queue_depth),
+        latency_ms=float(latency_ms) if latency_ms is not None else None,
+        recover_latency_ms=float(recover_latency_ms) if recover_latency_ms is not None else None,
+    )
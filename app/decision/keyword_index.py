@@ -0,0 +1,201 @@
+"""
+External sensitivity dictionaries: a compact, memory-mapped keyword index.
+
+Large term lists (customer names, project codenames) are compiled offline into a binary hash
+index and referenced from the policy file (sensitivity.keyword_index). The file is opened
+read-only with mmap, so every worker process shares the same page-cache pages and loading only
+validates the header. Terms match whole words (case-insensitive); multi-word terms match the
+same words separated by any non-word characters.
+
+Build:  python -m app.decision.keyword_index build terms.txt terms.kwidx
+
+File layout (little-endian):
+  header  MAGIC, version u32, term_count u32, max_words u32, slot_count u32, strings_size u64
+  slots   slot_count x (hash u64, string offset u32, length u16, flags u16); offset 0 = empty
+  strings UTF-8 phrases, offsets relative to the start of the strings section (+1)
+"""
+
+import hashlib
+import mmap
+import os
+import re
+import struct
+import sys
+from typing import Iterable
+
+MAGIC = b"PMKWIDX1"
+VERSION = 1
+_HEADER = struct.Struct("<8sIIIIQ")
+_SLOT = struct.Struct("<QIHH")
+
+FLAG_TERM = 1  # phrase is a dictionary term
+FLAG_PREFIX = 2  # phrase is the first word(s) of a longer term
+
+MAX_TERM_WORDS = 8
+MAX_TERM_BYTES = 1024
+
+_WORD = re.compile(r"\w+")
+
+
+class KeywordIndexError(ValueError):
+    """Raised when a keyword index file is missing, truncated, or not a keyword index."""
+
+
+def normalize_words(text: str) -> list[str]:
+    """Lower-cased word tokens; terms and prompts are normalized the same way."""
+    return _WORD.findall(text.lower())
+
+
+def _hash(phrase: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(phrase, digest_size=8).digest(), "little")
+
+
+class KeywordIndex:
+    """Read-only view over a memory-mapped keyword index file."""
+
+    def __init__(self, path: str, mm: mmap.mmap, term_count: int, max_words: int, slot_count: int) -> None:
+        self.path = path
+        self._mm = mm
+        self.term_count = term_count
+        self.max_words = max_words
+        self._mask = slot_count - 1
+        self._strings_base = _HEADER.size + slot_count * _SLOT.size
+        self.size_bytes = len(mm)
+
+    def _flags(self, phrase: str) -> int:
+        """FLAG_* bits for `phrase` (0 when absent)."""
+        data = phrase.encode("utf-8")
+        h = _hash(data)
+        mm = self._mm
+        idx = h & self._mask
+        while True:
+            slot_hash, offset, length, flags = _SLOT.unpack_from(mm, _HEADER.size + idx * _SLOT.size)
+            if offset == 0:
+                return 0
+            if slot_hash == h:
+                start = self._strings_base + offset - 1
+                if mm[start : start + length] == data:
+                    return flags
+            idx = (idx + 1) & self._mask
+
+    def __contains__(self, term: str) -> bool:
+        return bool(self._flags(" ".join(normalize_words(term))) & FLAG_TERM)
+
+    def matches(self, segments: Iterable[str]) -> bool:
+        """True if any segment contains a dictionary term as whole words."""
+        for segment in segments:
+            words = normalize_words(segment)
+            if not words:
+                continue
+            # One lookup per distinct word; longer phrases only start at known first words.
+            starts: set[str] = set()
+            for word in set(words):
+                flags = self._flags(word)
+                if flags & FLAG_TERM:
+                    return True
+                if flags & FLAG_PREFIX:
+                    starts.add(word)
+            if not starts:
+                continue
+            for i, word in enumerate(words):
+                if word not in starts:
+                    continue
+                phrase = word
+                for nxt in words[i + 1 : i + self.max_words]:
+                    phrase = f"{phrase} {nxt}"
+                    flags = self._flags(phrase)
+                    if flags & FLAG_TERM:
+                        return True
+                    if not flags & FLAG_PREFIX:
+                        break
+        return False
+
+
+def load_keyword_index(path: str) -> KeywordIndex:
+    """Memory-map and validate a keyword index file. Raises KeywordIndexError."""
+    try:
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < _HEADER.size:
+                raise KeywordIndexError(f"not a keyword index (too small): {path}")
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except OSError as e:
+        raise KeywordIndexError(f"cannot open keyword index: {path}. {e!s}") from e
+    magic, version, term_count, max_words, slot_count, strings_size = _HEADER.unpack_from(mm, 0)
+    expected = _HEADER.size + slot_count * _SLOT.size + strings_size
+    problem = None
+    if magic != MAGIC:
+        problem = "bad magic (not a keyword index)"
+    elif version != VERSION:
+        problem = f"unsupported version {version}"
+    elif slot_count == 0 or slot_count & (slot_count - 1):
+        problem = "slot count is not a power of two"
+    elif size != expected:
+        problem = f"size {size} does not match header ({expected})"
+    if problem:
+        mm.close()
+        raise KeywordIndexError(f"invalid keyword index {path}: {problem}")
+    return KeywordIndex(path, mm, term_count, max_words, slot_count)
+
+
+def build_keyword_index(terms: Iterable[str], out_path: str) -> int:
+    """Compile terms (one per item; blank items skipped) into an index file. Returns term count."""
+    entries: dict[str, int] = {}
+    max_words = 1
+    for raw in terms:
+        words = normalize_words(raw)
+        if not words:
+            continue
+        if len(words) > MAX_TERM_WORDS:
+            raise KeywordIndexError(f"term has more than {MAX_TERM_WORDS} words: {raw[:40]!r}")
+        max_words = max(max_words, len(words))
+        for n in range(1, len(words)):
+            prefix = " ".join(words[:n])
+            entries[prefix] = entries.get(prefix, 0) | FLAG_PREFIX
+        phrase = " ".join(words)
+        entries[phrase] = entries.get(phrase, 0) | FLAG_TERM
+
+    slot_count = 1
+    while slot_count < max(2, len(entries) * 2):  # load factor <= 0.5
+        slot_count *= 2
+    slots = bytearray(slot_count * _SLOT.size)
+    strings = bytearray()
+    mask = slot_count - 1
+    term_count = 0
+    for phrase, flags in entries.items():
+        data = phrase.encode("utf-8")
+        if len(data) > MAX_TERM_BYTES:
+            raise KeywordIndexError(f"term longer than {MAX_TERM_BYTES} bytes: {phrase[:40]!r}")
+        h = _hash(data)
+        idx = h & mask
+        while _SLOT.unpack_from(slots, idx * _SLOT.size)[1] != 0:
+            idx = (idx + 1) & mask
+        _SLOT.pack_into(slots, idx * _SLOT.size, h, len(strings) + 1, len(data), flags)
+        strings += data
+        term_count += bool(flags & FLAG_TERM)
+    if len(strings) >= 2**32 - 1:
+        raise KeywordIndexError("keyword index strings exceed 4 GiB")
+
+    tmp_path = f"{out_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, term_count, max_words, slot_count, len(strings)))
+        f.write(slots)
+        f.write(strings)
+    # Atomic replace: running workers keep their mapping of the old file.
+    os.replace(tmp_path, out_path)
+    return term_count
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = sys.argv[1:] if argv is None else argv
+    if len(args) != 3 or args[0] != "build":
+        print("usage: python -m app.decision.keyword_index build TERMS_TXT OUT_INDEX", file=sys.stderr)
+        return 2
+    with open(args[1], encoding="utf-8") as f:
+        count = build_keyword_index((line for line in f), args[2])
+    print(f"wrote {args[2]}: {count} terms, {os.path.getsize(args[2])} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
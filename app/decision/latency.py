@@ -0,0 +1,90 @@
+"""
+Online latency model per provider, for deadline-aware routing.
+
+latency ≈ intercept + slope × prompt_length (characters, as the decision engine measures it),
+fitted by exponentially weighted least squares: every new observation scales the weight of
+older ones by DECAY, so the model follows recent behaviour (about 1 / (1 - DECAY) calls).
+A provider needs MIN_WEIGHT of evidence before it is predicted; the slope is never negative
+(the weighted mean is used instead). In memory per process, fed after each successful call.
+"""
+
+import threading
+from typing import Mapping
+
+DECAY = 0.98
+MIN_WEIGHT = 5.0
+
+DEADLINE_HEADER = "x-deadline-ms"
+MAX_DEADLINE_MS = 600_000
+
+
+def deadline_ms(headers: Mapping[str, str] | None) -> int | None:
+    """X-Deadline-Ms as a positive integer (capped at MAX_DEADLINE_MS), or None."""
+    if not headers:
+        return None
+    raw = next((v for k, v in headers.items() if k.lower() == DEADLINE_HEADER), None)
+    if raw is None:
+        return None
+    try:
+        ms = int(raw.strip())
+    except ValueError:
+        return None
+    return min(ms, MAX_DEADLINE_MS) if ms > 0 else None
+
+
+class LatencyModel:
+    """Weighted least-squares line through (prompt_length, seconds) observations."""
+
+    def __init__(self, decay: float = DECAY) -> None:
+        self.decay = decay
+        self.weight = 0.0
+        self._sx = self._sy = self._sxx = self._sxy = 0.0
+
+    def observe(self, length: float, seconds: float) -> None:
+        d = self.decay
+        self.weight = self.weight * d + 1.0
+        self._sx = self._sx * d + length
+        self._sy = self._sy * d + seconds
+        self._sxx = self._sxx * d + length * length
+        self._sxy = self._sxy * d + length * seconds
+
+    def predict(self, length: float) -> float | None:
+        """Predicted seconds for a prompt of `length`, or None with too little evidence."""
+        if self.weight < MIN_WEIGHT:
+            return None
+        mean_x = self._sx / self.weight
+        mean_y = self._sy / self.weight
+        variance = self._sxx / self.weight - mean_x * mean_x
+        if variance <= 1e-9:
+            return mean_y
+        slope = (self._sxy / self.weight - mean_x * mean_y) / variance
+        if slope < 0:
+            return mean_y
+        return max(0.0, mean_y + slope * (length - mean_x))
+
+
+class LatencyModels:
+    """Thread-safe LatencyModel per provider (local, openai, anthropic)."""
+
+    def __init__(self) -> None:
+        self._models: dict[str, LatencyModel] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, provider: str, length: float, seconds: float) -> None:
+        with self._lock:
+            model = self._models.get(provider)
+            if model is None:
+                model = self._models[provider] = LatencyModel()
+            model.observe(length, seconds)
+
+    def predict(self, provider: str, length: float) -> float | None:
+        with self._lock:
+            model = self._models.get(provider)
+            return model.predict(length) if model is not None else None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._models.clear()
+
+
+latency_models = LatencyModels()
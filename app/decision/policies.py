@@ -1,15 +1,35 @@
 """Cost and sensitivity policy checks (config-driven; no hard-coded thresholds)."""
 
+from typing import Iterable
+
+# Characters lowered at a time; longer texts are matched window by window.
+LOWER_WINDOW_CHARS = 1 << 16
+
 
 def sensitivity_match(prompt_text: str, sensitivity_keywords: tuple[str, ...]) -> bool:
     """
     True if prompt contains any of the configured sensitivity keywords (case-insensitive).
-    Used to route to local when sensitive content is detected.
+    Used to route to local when sensitive content is detected. Long prompts are lowered one
+    window at a time (windows overlap by the longest keyword), so no prompt-sized copy is built.
     """
     if not prompt_text or not sensitivity_keywords:
         return False
-    lower = prompt_text.lower()
-    return any(kw in lower for kw in sensitivity_keywords)
+    overlap = max(len(kw) for kw in sensitivity_keywords) - 1
+    for start in range(0, len(prompt_text), LOWER_WINDOW_CHARS):
+        lower = prompt_text[start : start + LOWER_WINDOW_CHARS + overlap].lower()
+        if any(kw in lower for kw in sensitivity_keywords):
+            return True
+    return False
+
+
+def sensitivity_match_segments(segments: Iterable[str], sensitivity_keywords: tuple[str, ...]) -> bool:
+    """
+    True if any segment (e.g. any message of the conversation) contains a sensitivity keyword.
+    Segments are lowered one at a time, so no conversation-sized lowercase copy is built.
+    """
+    if not sensitivity_keywords:
+        return False
+    return any(sensitivity_match(seg, sensitivity_keywords) for seg in segments)
 
 
 def cost_prefer_local(
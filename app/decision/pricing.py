@@ -0,0 +1,91 @@
+"""
+Per-model pricing table for the cost rule (policy cost.pricing; compiled once per policy).
+
+Shape: {"<provider>": {"<model>": {"input_usd_per_1m_tokens": x, "output_usd_per_1m_tokens": y}}}
+where provider is a public provider backend (openai, anthropic, or one added in
+PROVIDER_BACKENDS) and model is the request's `model`.
+A model named "default" applies when the request has no model or an unlisted one.
+"""
+
+from dataclasses import dataclass
+
+from app.core.config import get_provider_backends
+
+DEFAULT_MODEL_KEY = "default"
+# Prompt-cache input relative to the input price (Anthropic: reads 10%, 5-minute writes 125%).
+CACHE_READ_PRICE_FACTOR = 0.1
+CACHE_WRITE_PRICE_FACTOR = 1.25
+
+
+class PricingConfigError(ValueError):
+    """Raised when cost.pricing in the policy is invalid."""
+
+
+@dataclass(frozen=True)
+class ModelPrice:
+    """USD per 1M tokens for one provider/model."""
+
+    input_usd_per_1m_tokens: float
+    output_usd_per_1m_tokens: float = 0.0
+
+    def cost_usd(self, input_tokens: float, output_tokens: float = 0.0) -> float:
+        return (input_tokens / 1_000_000) * self.input_usd_per_1m_tokens + (
+            output_tokens / 1_000_000
+        ) * self.output_usd_per_1m_tokens
+
+
+@dataclass(frozen=True)
+class PricingTable:
+    """Compiled cost.pricing: (provider, model) → ModelPrice."""
+
+    prices: dict[tuple[str, str], ModelPrice]
+
+    def lookup(self, provider: str, model: str | None) -> ModelPrice | None:
+        """Price for provider/model, else the provider's "default" entry, else None."""
+        if model:
+            price = self.prices.get((provider, model))
+            if price is not None:
+                return price
+        return self.prices.get((provider, DEFAULT_MODEL_KEY))
+
+    def model_keys(self) -> list[str]:
+        """Sorted "provider/model" keys (for /v1/routes)."""
+        return sorted(f"{p}/{m}" for p, m in self.prices)
+
+
+def _rate(where: str, entry: dict, key: str, required: bool) -> float:
+    raw = entry.get(key)
+    if raw is None:
+        if required:
+            raise PricingConfigError(f"{where}: '{key}' is required")
+        return 0.0
+    if isinstance(raw, bool) or not isinstance(raw, (int, float)) or raw < 0:
+        raise PricingConfigError(f"{where}: '{key}' must be a non-negative number")
+    return float(raw)
+
+
+def compile_pricing(raw: object) -> PricingTable | None:
+    """Validate and compile cost.pricing. Returns None when empty."""
+    if not isinstance(raw, dict):
+        raise PricingConfigError(f"must be an object; got {type(raw).__name__}")
+    prices: dict[tuple[str, str], ModelPrice] = {}
+    public_providers = [name for name in get_provider_backends() if name != "local"]
+    for provider, models in raw.items():
+        if provider not in public_providers:
+            raise PricingConfigError(
+                f"unknown provider '{provider}' (known: {', '.join(public_providers)})"
+            )
+        if not isinstance(models, dict):
+            raise PricingConfigError(f"'{provider}' must be an object of model → prices")
+        for model, entry in models.items():
+            where = f"'{provider}/{model}'"
+            if not isinstance(entry, dict):
+                raise PricingConfigError(f"{where} must be an object")
+            unknown = sorted(set(entry) - {"input_usd_per_1m_tokens", "output_usd_per_1m_tokens"})
+            if unknown:
+                raise PricingConfigError(f"{where} does not accept: {', '.join(unknown)}")
+            prices[(provider, str(model).strip())] = ModelPrice(
+                input_usd_per_1m_tokens=_rate(where, entry, "input_usd_per_1m_tokens", True),
+                output_usd_per_1m_tokens=_rate(where, entry, "output_usd_per_1m_tokens", False),
+            )
+    return PricingTable(prices) if prices else None
@@ -3,15 +3,73 @@
 # Sensitivity: prompt matched a configured keyword → route to local.
 SENSITIVE_KEYWORD_MATCH = "sensitive_keyword_match"
 
+# Sensitivity detectors: a validated PII/secret pattern was found → route to local (one code per class).
+SENSITIVE_API_KEY = "sensitive_api_key"
+SENSITIVE_EMAIL = "sensitive_email"
+SENSITIVE_CREDIT_CARD = "sensitive_credit_card"
+SENSITIVE_IBAN = "sensitive_iban"
+SENSITIVE_INTERNAL_HOSTNAME = "sensitive_internal_hostname"
+
+# Sensitivity detectors: per-request CPU budget ran out before the scan finished → local (fail closed).
+DETECTOR_BUDGET_EXCEEDED = "detector_budget_exceeded"
+
 # Cost: prompt under configured length threshold → prefer local.
 COST_PREFER_LOCAL = "cost_prefer_local"
 
+# Model allowlist rule: requested model is not in the rule's allowlist → rule's route.
+MODEL_NOT_ALLOWLISTED = "model_not_allowlisted"
+
+# Time-of-day rule: request arrived inside the rule's time window → rule's route.
+TIME_OF_DAY_MATCH = "time_of_day_match"
+
+# Header match rule: request header matched one of the rule's values → rule's route.
+HEADER_MATCH = "header_match"
+
+# Budget rule: public spend in the rule's window reached its limit → rule's route (local).
+BUDGET_EXHAUSTED = "budget_exhausted"
+
+# Deadline rule: only this route is predicted to answer within X-Deadline-Ms → that route.
+DEADLINE_CONSTRAINED = "deadline_constrained"
+
+# Session: an earlier turn of this conversation was routed local for sensitivity → local.
+SESSION_SENSITIVE = "session_sensitive"
+
+# Local fallbacks: the local provider was saturated → a smaller local model served the request.
+LOCAL_MODEL_DOWNGRADED = "local_model_downgraded"
+
 # Default: no sensitivity match and over cost threshold → route to default provider (local or public).
 DEFAULT = "default"
 
 # All known reason codes (for validation/documentation).
 ALL_REASON_CODES = (
     SENSITIVE_KEYWORD_MATCH,
+    SENSITIVE_API_KEY,
+    SENSITIVE_EMAIL,
+    SENSITIVE_CREDIT_CARD,
+    SENSITIVE_IBAN,
+    SENSITIVE_INTERNAL_HOSTNAME,
+    DETECTOR_BUDGET_EXCEEDED,
     COST_PREFER_LOCAL,
+    MODEL_NOT_ALLOWLISTED,
+    TIME_OF_DAY_MATCH,
+    HEADER_MATCH,
+    BUDGET_EXHAUSTED,
+    DEADLINE_CONSTRAINED,
+    SESSION_SENSITIVE,
+    LOCAL_MODEL_DOWNGRADED,
     DEFAULT,
 )
+
+# Codes from the sensitivity rule; a session that ever routed with one stays local.
+SENSITIVITY_REASON_CODES = frozenset(
+    (
+        SENSITIVE_KEYWORD_MATCH,
+        SENSITIVE_API_KEY,
+        SENSITIVE_EMAIL,
+        SENSITIVE_CREDIT_CARD,
+        SENSITIVE_IBAN,
+        SENSITIVE_INTERNAL_HOSTNAME,
+        DETECTOR_BUDGET_EXCEEDED,
+        SESSION_SENSITIVE,
+    )
+)
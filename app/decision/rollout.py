@@ -0,0 +1,88 @@
+"""
+Candidate policy rollout (policy `rollout` key): shadow evaluation or canary routing.
+
+shadow: every request is also decided by the candidate after the response is sent (decision
+only, no provider call); divergences are counted and a sample is recorded in audit.
+canary: a deterministic share of traffic (by request id or tenant) is decided by the candidate.
+"""
+
+import hashlib
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from app.core.config import PolicyConfig
+
+ROLLOUT_SHADOW = "shadow"
+ROLLOUT_CANARY = "canary"
+ROLLOUT_MODES = (ROLLOUT_SHADOW, ROLLOUT_CANARY)
+CANARY_KEYS = ("request_id", "tenant")
+
+# Canary percentages resolve to 1/100 of a percent.
+_BUCKETS = 10_000
+
+
+class RolloutConfigError(ValueError):
+    """Raised when the policy `rollout` object is invalid."""
+
+
+def _bucket(value: str) -> int:
+    """Stable bucket in [0, _BUCKETS) for a request id or tenant."""
+    digest = hashlib.blake2b(value.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % _BUCKETS
+
+
+@dataclass(frozen=True)
+class Rollout:
+    """Compiled rollout settings plus the compiled candidate policy."""
+
+    mode: str
+    candidate: "PolicyConfig"
+    candidate_path: str
+    canary_percent: float = 0.0
+    canary_key: str = "request_id"
+    shadow_sample_rate: float = 1.0
+
+    def in_canary(self, request_id: str, tenant: str | None) -> bool:
+        """True when this request is routed by the candidate (canary mode only)."""
+        if self.mode != ROLLOUT_CANARY or self.canary_percent <= 0:
+            return False
+        # Unattributed requests fall back to the request id (no all-or-nothing bucket for None).
+        key = tenant if self.canary_key == "tenant" and tenant else request_id
+        return _bucket(key) < self.canary_percent * (_BUCKETS / 100)
+
+    def sample_divergence(self, request_id: str) -> bool:
+        """Whether a shadow divergence for this request is recorded in audit."""
+        return _bucket("shadow:" + request_id) < self.shadow_sample_rate * _BUCKETS
+
+
+def _number(raw: dict, key: str, default: float, upper: float) -> float:
+    value = raw.get(key, default)
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not 0 <= value <= upper:
+        raise RolloutConfigError(f"'{key}' must be a number in 0..{upper:g}")
+    return float(value)
+
+
+def parse_rollout(raw: object) -> dict:
+    """Validate the rollout object (everything except loading the candidate file)."""
+    if not isinstance(raw, dict):
+        raise RolloutConfigError(f"must be an object; got {type(raw).__name__}")
+    unknown = sorted(set(raw) - {"candidate", "mode", "canary_percent", "canary_key", "shadow_sample_rate"})
+    if unknown:
+        raise RolloutConfigError(f"does not accept: {', '.join(unknown)}")
+    candidate = raw.get("candidate")
+    if not isinstance(candidate, str) or not candidate.strip():
+        raise RolloutConfigError("'candidate' must be a non-empty path string")
+    mode = str(raw.get("mode", ROLLOUT_SHADOW)).strip().lower()
+    if mode not in ROLLOUT_MODES:
+        raise RolloutConfigError(f"'mode' must be one of: {', '.join(ROLLOUT_MODES)}")
+    canary_key = str(raw.get("canary_key", "request_id")).strip().lower()
+    if canary_key not in CANARY_KEYS:
+        raise RolloutConfigError(f"'canary_key' must be one of: {', '.join(CANARY_KEYS)}")
+    return {
+        "candidate": candidate.strip(),
+        "mode": mode,
+        "canary_percent": _number(raw, "canary_percent", 0.0, 100),
+        "canary_key": canary_key,
+        "shadow_sample_rate": _number(raw, "shadow_sample_rate", 1.0, 1),
+    }
@@ -0,0 +1,618 @@
+"""
+Rule pipeline: registry of rule types and compilation of the policy `rules` list.
+
+Each entry in the policy file's `rules` array is compiled once at load time into a Rule
+object. The engine evaluates the compiled pipeline in order; the first rule that returns
+an outcome wins (short-circuit), otherwise the default provider applies.
+New rule types register themselves with @register_rule_type("name").
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, ClassVar, Mapping
+
+from app.core.config import get_public_provider
+from app.core.telemetry import record_budget_remaining
+from app.decision.budget import GLOBAL_KEY, RETENTION_SECONDS, spend_ledger, tenant_key
+from app.decision.detectors import (
+    ALL_DETECTORS,
+    DETECTOR_API_KEY,
+    DETECTOR_CREDIT_CARD,
+    DETECTOR_EMAIL,
+    DETECTOR_IBAN,
+    DETECTOR_INTERNAL_HOSTNAME,
+)
+from app.decision.latency import deadline_ms, latency_models
+from app.decision.policies import cost_prefer_local, sensitivity_match_segments
+from app.decision.pricing import ModelPrice
+from app.decision.reason_codes import (
+    BUDGET_EXHAUSTED,
+    COST_PREFER_LOCAL,
+    DEADLINE_CONSTRAINED,
+    DETECTOR_BUDGET_EXCEEDED,
+    HEADER_MATCH,
+    MODEL_NOT_ALLOWLISTED,
+    SENSITIVE_API_KEY,
+    SENSITIVE_CREDIT_CARD,
+    SENSITIVE_EMAIL,
+    SENSITIVE_IBAN,
+    SENSITIVE_INTERNAL_HOSTNAME,
+    SENSITIVE_KEYWORD_MATCH,
+    TIME_OF_DAY_MATCH,
+)
+from app.decision.tokens import (
+    TOKENIZER_BPE_ESTIMATE,
+    estimate_tokens,
+    estimate_tokens_heuristic,
+)
+
+if TYPE_CHECKING:
+    from app.core.config import PolicyConfig
+
+ROUTE_TARGETS = ("local", "public")
+
+# (route target "local" | "public", reason code or codes). "public" is resolved by the engine.
+RuleOutcome = tuple[str, str | tuple[str, ...]]
+
+DETECTOR_REASON_CODES = {
+    DETECTOR_API_KEY: SENSITIVE_API_KEY,
+    DETECTOR_EMAIL: SENSITIVE_EMAIL,
+    DETECTOR_CREDIT_CARD: SENSITIVE_CREDIT_CARD,
+    DETECTOR_IBAN: SENSITIVE_IBAN,
+    DETECTOR_INTERNAL_HOSTNAME: SENSITIVE_INTERNAL_HOSTNAME,
+}
+
+
+class RuleConfigError(ValueError):
+    """Raised when a rule spec is invalid (unknown type, missing or unexpected params)."""
+
+
+@dataclass(frozen=True)
+class DecisionContext:
+    """Inputs available to every rule for one decision. Rules may only append to `flags`."""
+
+    prompt_text: str
+    prompt_length: int
+    config: "PolicyConfig"
+    model: str | None = None
+    headers: Mapping[str, str] = field(default_factory=dict)  # lower-cased names
+    now: datetime | None = None
+    # Safe metadata flags rules add for audit (e.g. "detectors=email"); never prompt text.
+    flags: list[str] = field(default_factory=list)
+    # Tenant id (X-Tenant or hashed API key) for budget rules; None = unattributed.
+    tenant: str | None = None
+    # Texts the sensitivity rule scans (every message in conversation scope); empty = prompt_text.
+    segments: tuple[str, ...] = ()
+    # Request fields outside the message texts (e.g. tool-call arguments of a pass-through body);
+    # the sensitivity rule scans them in every scope, the cost rule ignores them.
+    extra_segments: tuple[str, ...] = ()
+    # Estimated tokens of earlier session messages not in `segments` (conversation scope).
+    history_tokens: float = 0.0
+    # Set by the engine only while tracing: inputs of the rule being evaluated (metadata only).
+    trace_inputs: dict[str, Any] | None = None
+    # Shadow evaluation of a candidate policy: rules record no live metrics.
+    shadow: bool = False
+
+    def scan_segments(self) -> tuple[str, ...]:
+        """Texts to scan for sensitive content, in conversation order."""
+        return self.segments or (self.prompt_text,)
+
+    def note(self, **values: Any) -> None:
+        """Record rule inputs for the decision trace (no-op unless tracing). Never pass text."""
+        if self.trace_inputs is not None:
+            self.trace_inputs.update(values)
+
+
+class Rule:
+    """Compiled rule. Subclasses implement evaluate() and optionally from_spec()/describe()."""
+
+    type_name: ClassVar[str] = ""
+    # False when the outcome depends on more than prompt, model and policy (time, headers);
+    # pipelines containing such a rule bypass the decision cache.
+    cacheable: ClassVar[bool] = True
+    # Rule types that, when present in the pipeline, must all come before this rule.
+    must_follow: ClassVar[tuple[str, ...]] = ()
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    @classmethod
+    def from_spec(cls, name: str, params: Mapping[str, Any]) -> "Rule":
+        """Build the rule from its policy params. Default: rule takes no params."""
+        _check_params(cls.type_name, params, allowed=())
+        return cls(name)
+
+    def evaluate(self, ctx: DecisionContext) -> RuleOutcome | None:
+        """Return (target, reason_code) when the rule matches, else None to fall through."""
+        raise NotImplementedError
+
+    def describe(self) -> dict[str, Any]:
+        """Safe, JSON-serializable view of the rule params (for /v1/routes)."""
+        return {}
+
+
+RULE_TYPES: dict[str, type[Rule]] = {}
+
+
+def register_rule_type(type_name: str):
+    """Class decorator: register a Rule subclass under `type_name` for use in policy files."""
+
+    def decorator(cls: type[Rule]) -> type[Rule]:
+        if type_name in RULE_TYPES:
+            raise ValueError(f"Rule type already registered: {type_name}")
+        cls.type_name = type_name
+        RULE_TYPES[type_name] = cls
+        return cls
+
+    return decorator
+
+
+def _check_params(type_name: str, params: Mapping[str, Any], allowed: tuple[str, ...]) -> None:
+    unknown = sorted(set(params) - set(allowed))
+    if unknown:
+        raise RuleConfigError(f"rule type '{type_name}' does not accept: {', '.join(unknown)}")
+
+
+def _route_param(type_name: str, params: Mapping[str, Any], default: str) -> str:
+    route = str(params.get("route", default)).strip().lower()
+    if route not in ROUTE_TARGETS:
+        raise RuleConfigError(f"rule type '{type_name}': 'route' must be 'local' or 'public'")
+    return route
+
+
+def _string_list_param(type_name: str, params: Mapping[str, Any], key: str) -> tuple[str, ...]:
+    raw = params.get(key)
+    if not isinstance(raw, list) or not raw:
+        raise RuleConfigError(f"rule type '{type_name}': '{key}' must be a non-empty array")
+    values = tuple(str(v).strip() for v in raw if str(v).strip())
+    if not values:
+        raise RuleConfigError(f"rule type '{type_name}': '{key}' must be a non-empty array")
+    return values
+
+
+@register_rule_type("sensitivity")
+class SensitivityRule(Rule):
+    """
+    Any configured sensitivity keyword (inline or in the external keyword index) → local.
+    Otherwise, when detectors are configured, any validated PII/secret class → local with one
+    reason code per class found (and detector_budget_exceeded if the scan ran out of CPU budget).
+    """
+
+    def evaluate(self, ctx: DecisionContext) -> RuleOutcome | None:
+        config = ctx.config
+        segments = ctx.scan_segments() + ctx.extra_segments
+        ctx.note(segments=len(segments), prompt_length=ctx.prompt_length)
+        if sensitivity_match_segments(segments, config.sensitivity_keywords):
+            ctx.note(matched="keywords")
+            return ("local", SENSITIVE_KEYWORD_MATCH)
+        index = config.sensitivity_keyword_index
+        if index is not None and index.matches(segments):
+            ctx.flags.append("keywords=index")
+            ctx.note(matched="keyword_index")
+            return ("local", SENSITIVE_KEYWORD_MATCH)
+        scanner = config.sensitivity_detectors
+        if scanner is None:
+            return None
+        result = scanner.scan_segments(segments)
+        found = [name for name in ALL_DETECTORS if name in result.classes]
+        codes = [DETECTOR_REASON_CODES[name] for name in found]
+        if found:
+            ctx.flags.append("detectors=" + ",".join(found))
+            ctx.note(detector_classes=found)
+        if result.budget_exceeded:
+            ctx.flags.append("scan=budget_exceeded")
+            ctx.note(scan_budget_exceeded=True)
+            codes.append(DETECTOR_BUDGET_EXCEEDED)
+        return ("local", tuple(codes)) if codes else None
+
+
+@register_rule_type("cost")
+class CostRule(Rule):
+    """
+    Prompt under the configured cost threshold (USD-mode or length-mode) → local.
+    USD mode prices the public target: the pricing-table entry for the resolved public provider
+    and requested model (input + expected output), else the global input price.
+    """
+
+    def evaluate(self, ctx: DecisionContext) -> RuleOutcome | None:
+        config = ctx.config
+        price = (
+            _target_price(config, ctx.model, get_public_provider())
+            if config.cost_max_usd_for_local is not None
+            else None
+        )
+        if price is None:
+            # Length mode.
+            prefer_local = cost_prefer_local(
+                prompt_length=ctx.prompt_length,
+                cost_max_prompt_length_for_local=config.cost_max_prompt_length_for_local,
+            )
+            ctx.note(
+                mode="length",
+                prompt_length=ctx.prompt_length,
+                max_prompt_length=config.cost_max_prompt_length_for_local,
+            )
+        else:
+            tokens = _input_tokens(ctx)
+            cost_usd = price.cost_usd(tokens, config.cost_expected_output_tokens)
+            prefer_local = cost_usd <= config.cost_max_usd_for_local
+            ctx.note(
+                mode="usd",
+                prompt_length=ctx.prompt_length,
+                input_tokens=round(tokens, 1),
+                cost_usd=round(cost_usd, 8),
+                max_usd=config.cost_max_usd_for_local,
+            )
+        return ("local", COST_PREFER_LOCAL) if prefer_local else None
+
+
+def _input_tokens(ctx: DecisionContext) -> float:
+    config = ctx.config
+    if config.cost_tokenizer == TOKENIZER_BPE_ESTIMATE:
+        return ctx.history_tokens + estimate_tokens(
+            ctx.scan_segments(), config.cost_tokenizer, config.cost_chars_per_token
+        )
+    return estimate_tokens_heuristic(ctx.prompt_length, config.cost_chars_per_token)
+
+
+def _target_price(config: "PolicyConfig", model: str | None, provider: str) -> ModelPrice | None:
+    """Price of the public target for this request (pricing table, then global input price)."""
+    if config.pricing is not None:
+        price = config.pricing.lookup(provider, model)
+        if price is not None:
+            return price
+    if config.llm_input_usd_per_1m_tokens is not None:
+        return ModelPrice(input_usd_per_1m_tokens=config.llm_input_usd_per_1m_tokens)
+    return None
+
+
+@register_rule_type("model_allowlist")
+class ModelAllowlistRule(Rule):
+    """
+    Requested model not in `models` → `route` (default local).
+    Requests without a model (provider default) are not matched.
+    """
+
+    def __init__(self, name: str, models: tuple[str, ...], route: str) -> None:
+        super().__init__(name)
+        self.models = frozenset(models)
+        self.route = route
+
+    @classmethod
+    def from_spec(cls, name: str, params: Mapping[str, Any]) -> "Rule":
+        _check_params(cls.type_name, params, allowed=("models", "route"))
+        return cls(
+            name,
+            models=_string_list_param(cls.type_name, params, "models"),
+            route=_route_param(cls.type_name, params, "local"),
+        )
+
+    def evaluate(self, ctx: DecisionContext) -> RuleOutcome | None:
+        ctx.note(model=ctx.model)
+        if ctx.model and ctx.model not in self.models:
+            return (self.route, MODEL_NOT_ALLOWLISTED)
+        return None
+
+    def describe(self) -> dict[str, Any]:
+        return {"models": sorted(self.models), "route": self.route}
+
+
+def _parse_hhmm(type_name: str, key: str, raw: Any) -> int:
+    """Parse "HH:MM" into minutes since midnight."""
+    try:
+        hours, minutes = str(raw).split(":")
+        value = int(hours) * 60 + int(minutes)
+    except (TypeError, ValueError):
+        raise RuleConfigError(f"rule type '{type_name}': '{key}' must be \"HH:MM\"") from None
+    if not 0 <= value < 24 * 60 or not 0 <= int(minutes) < 60:
+        raise RuleConfigError(f"rule type '{type_name}': '{key}' must be \"HH:MM\"")
+    return value
+
+
+@register_rule_type("time_of_day")
+class TimeOfDayRule(Rule):
+    """
+    Current time within [start, end) → `route` (default local).
+    Times are "HH:MM" at `utc_offset_minutes` (default 0 = UTC); windows may wrap midnight.
+    """
+
+    cacheable = False
+
+    def __init__(self, name: str, start: int, end: int, utc_offset_minutes: int, route: str) -> None:
+        super().__init__(name)
+        self.start = start
+        self.end = end
+        self.utc_offset_minutes = utc_offset_minutes
+        self.route = route
+
+    @classmethod
+    def from_spec(cls, name: str, params: Mapping[str, Any]) -> "Rule":
+        _check_params(cls.type_name, params, allowed=("start", "end", "utc_offset_minutes", "route"))
+        if "start" not in params or "end" not in params:
+            raise RuleConfigError(f"rule type '{cls.type_name}' requires 'start' and 'end'")
+        try:
+            offset = int(params.get("utc_offset_minutes", 0))
+        except (TypeError, ValueError):
+            raise RuleConfigError(
+                f"rule type '{cls.type_name}': 'utc_offset_minutes' must be an integer"
+            ) from None
+        return cls(
+            name,
+            start=_parse_hhmm(cls.type_name, "start", params["start"]),
+            end=_parse_hhmm(cls.type_name, "end", params["end"]),
+            utc_offset_minutes=offset,
+            route=_route_param(cls.type_name, params, "local"),
+        )
+
+    def evaluate(self, ctx: DecisionContext) -> RuleOutcome | None:
+        now = ctx.now or datetime.now(timezone.utc)
+        local = now.astimezone(timezone.utc) + timedelta(minutes=self.utc_offset_minutes)
+        minute = local.hour * 60 + local.minute
+        ctx.note(local_time=f"{local.hour:02d}:{local.minute:02d}")
+        if self.start <= self.end:
+            inside = self.start <= minute < self.end
+        else:
+            inside = minute >= self.start or minute < self.end
+        return (self.route, TIME_OF_DAY_MATCH) if inside else None
+
+    def describe(self) -> dict[str, Any]:
+        return {
+            "start": f"{self.start // 60:02d}:{self.start % 60:02d}",
+            "end": f"{self.end // 60:02d}:{self.end % 60:02d}",
+            "utc_offset_minutes": self.utc_offset_minutes,
+            "route": self.route,
+        }
+
+
+@register_rule_type("header_match")
+class HeaderMatchRule(Rule):
+    """Request header `header` equals one of `values` → `route` (default local)."""
+
+    cacheable = False
+
+    def __init__(self, name: str, header: str, values: tuple[str, ...], route: str) -> None:
+        super().__init__(name)
+        self.header = header.lower()
+        self.values = frozenset(values)
+        self.route = route
+
+    @classmethod
+    def from_spec(cls, name: str, params: Mapping[str, Any]) -> "Rule":
+        _check_params(cls.type_name, params, allowed=("header", "values", "route"))
+        header = str(params.get("header") or "").strip()
+        if not header:
+            raise RuleConfigError(f"rule type '{cls.type_name}' requires 'header'")
+        return cls(
+            name,
+            header=header,
+            values=_string_list_param(cls.type_name, params, "values"),
+            route=_route_param(cls.type_name, params, "local"),
+        )
+
+    def evaluate(self, ctx: DecisionContext) -> RuleOutcome | None:
+        value = ctx.headers.get(self.header)
+        ctx.note(header_present=value is not None)  # never the value
+        if value is not None and value.strip() in self.values:
+            return (self.route, HEADER_MATCH)
+        return None
+
+    def describe(self) -> dict[str, Any]:
+        return {"header": self.header, "value_count": len(self.values), "route": self.route}
+
+
+@register_rule_type("budget")
+class BudgetRule(Rule):
+    """
+    Public spend in the sliding window reached the limit → `route` (default local).
+    scope "tenant" (default) tracks each tenant separately (`tenant_limits_usd` overrides
+    `limit_usd` per tenant; unattributed requests are not matched); "global" tracks all spend.
+    """
+
+    cacheable = False
+
+    def __init__(
+        self,
+        name: str,
+        limit_usd: float,
+        scope: str,
+        window_hours: int,
+        tenant_limits_usd: Mapping[str, float],
+        route: str,
+    ) -> None:
+        super().__init__(name)
+        self.limit_usd = limit_usd
+        self.scope = scope
+        self.window_hours = window_hours
+        self.tenant_limits_usd = dict(tenant_limits_usd)
+        self.route = route
+
+    @classmethod
+    def from_spec(cls, name: str, params: Mapping[str, Any]) -> "Rule":
+        _check_params(
+            cls.type_name,
+            params,
+            allowed=("limit_usd", "scope", "window_hours", "tenant_limits_usd", "route"),
+        )
+        limit = _usd_param(cls.type_name, "limit_usd", params.get("limit_usd"))
+        scope = str(params.get("scope", "tenant")).strip().lower()
+        if scope not in ("tenant", "global"):
+            raise RuleConfigError(f"rule type '{cls.type_name}': 'scope' must be 'tenant' or 'global'")
+        window = params.get("window_hours", 720)
+        max_hours = RETENTION_SECONDS // 3600
+        if isinstance(window, bool) or not isinstance(window, int) or not 1 <= window <= max_hours:
+            raise RuleConfigError(
+                f"rule type '{cls.type_name}': 'window_hours' must be an integer in 1..{max_hours}"
+            )
+        overrides_raw = params.get("tenant_limits_usd") or {}
+        if not isinstance(overrides_raw, dict) or (overrides_raw and scope != "tenant"):
+            raise RuleConfigError(
+                f"rule type '{cls.type_name}': 'tenant_limits_usd' must be an object (tenant scope only)"
+            )
+        overrides = {
+            str(t).strip().lower(): _usd_param(cls.type_name, f"tenant_limits_usd.{t}", v)
+            for t, v in overrides_raw.items()
+        }
+        return cls(
+            name,
+            limit_usd=limit,
+            scope=scope,
+            window_hours=window,
+            tenant_limits_usd=overrides,
+            route=_route_param(cls.type_name, params, "local"),
+        )
+
+    def budget_keys(self) -> list[tuple[str, float]]:
+        """(ledger key, limit) pairs to report: global, or configured and seen tenants."""
+        if self.scope == "global":
+            return [(GLOBAL_KEY, self.limit_usd)]
+        prefix = tenant_key("")
+        tenants = set(self.tenant_limits_usd) | {k[len(prefix) :] for k in spend_ledger.keys(prefix)}
+        return [(tenant_key(t), self.limit_for(t)) for t in sorted(tenants)]
+
+    def limit_for(self, tenant: str) -> float:
+        return self.tenant_limits_usd.get(tenant, self.limit_usd)
+
+    def spent_usd(self, key: str) -> float:
+        return spend_ledger.spent(key, self.window_hours * 3600)
+
+    def remaining_usd(self, key: str, limit: float) -> float:
+        return max(0.0, limit - self.spent_usd(key))
+
+    def evaluate(self, ctx: DecisionContext) -> RuleOutcome | None:
+        if self.scope == "global":
+            key, limit = GLOBAL_KEY, self.limit_usd
+        elif ctx.tenant:
+            key, limit = tenant_key(ctx.tenant), self.limit_for(ctx.tenant)
+        else:
+            ctx.note(budget_key=None)
+            return None
+        remaining = self.remaining_usd(key, limit)
+        if not ctx.shadow:
+            record_budget_remaining(self.name, key, remaining)
+        ctx.note(budget_key=key, limit_usd=limit, remaining_usd=round(remaining, 6))
+        return (self.route, BUDGET_EXHAUSTED) if remaining <= 0 else None
+
+    def describe(self) -> dict[str, Any]:
+        return {
+            "scope": self.scope,
+            "limit_usd": self.limit_usd,
+            "window_hours": self.window_hours,
+            "tenant_limit_count": len(self.tenant_limits_usd),
+            "route": self.route,
+        }
+
+
+@register_rule_type("deadline")
+class DeadlineRule(Rule):
+    """
+    With an X-Deadline-Ms header, a route whose predicted latency × `headroom` (default 1.2)
+    exceeds the deadline is excluded. When exactly one of local and the public provider is left
+    → that route. Providers without enough observations count as in time. Must come after
+    every sensitivity rule (checked at load), so sensitive prompts stay local.
+    """
+
+    cacheable = False
+    must_follow = ("sensitivity",)
+
+    def __init__(self, name: str, headroom: float) -> None:
+        super().__init__(name)
+        self.headroom = headroom
+
+    @classmethod
+    def from_spec(cls, name: str, params: Mapping[str, Any]) -> "Rule":
+        _check_params(cls.type_name, params, allowed=("headroom",))
+        headroom = params.get("headroom", 1.2)
+        if isinstance(headroom, bool) or not isinstance(headroom, (int, float)) or headroom < 1:
+            raise RuleConfigError(f"rule type '{cls.type_name}': 'headroom' must be a number >= 1")
+        return cls(name, headroom=float(headroom))
+
+    def evaluate(self, ctx: DecisionContext) -> RuleOutcome | None:
+        budget_ms = deadline_ms(ctx.headers)
+        ctx.note(deadline_ms=budget_ms)
+        if budget_ms is None:
+            return None
+        providers = {"local": "local", "public": get_public_provider()}
+        predicted = {
+            route: latency_models.predict(provider, ctx.prompt_length) for route, provider in providers.items()
+        }
+        in_time = [
+            route
+            for route, seconds in predicted.items()
+            if seconds is None or seconds * 1000.0 * self.headroom <= budget_ms
+        ]
+        ctx.note(
+            predicted_ms={r: round(s * 1000.0) if s is not None else None for r, s in predicted.items()},
+            in_time=in_time,
+        )
+        # Both in time: no constraint. Neither: let routing proceed (the call may still be skipped).
+        return (in_time[0], DEADLINE_CONSTRAINED) if len(in_time) == 1 else None
+
+    def describe(self) -> dict[str, Any]:
+        return {"headroom": self.headroom}
+
+
+def _usd_param(type_name: str, key: str, raw: Any) -> float:
+    if isinstance(raw, bool) or not isinstance(raw, (int, float)) or raw < 0:
+        raise RuleConfigError(f"rule type '{type_name}': '{key}' must be a non-negative number")
+    return float(raw)
+
+
+def estimate_cost_usd(ctx: DecisionContext, provider: str) -> float:
+    """Estimated USD for sending this request to `provider` (0 for local or unpriced targets)."""
+    if provider == "local":
+        return 0.0
+    price = _target_price(ctx.config, ctx.model, provider)
+    if price is None:
+        return 0.0
+    return price.cost_usd(_input_tokens(ctx), ctx.config.cost_expected_output_tokens)
+
+
+def usage_cost_usd(
+    config: "PolicyConfig", provider: str, model: str | None, input_tokens: float, output_tokens: int
+) -> float | None:
+    """USD for provider-reported token counts, or None when the target has no configured price."""
+    if provider == "local":
+        return 0.0
+    price = _target_price(config, model, provider)
+    if price is None:
+        return None
+    return price.cost_usd(input_tokens, output_tokens)
+
+
+def compile_rules(specs: list[Any]) -> tuple[Rule, ...]:
+    """
+    Compile policy rule specs ({"type": ..., "name"?: ..., **params}) into Rule objects.
+    Raises RuleConfigError on unknown types, bad params, or duplicate names.
+    """
+    compiled: list[Rule] = []
+    seen: set[str] = set()
+    for i, spec in enumerate(specs):
+        if not isinstance(spec, dict):
+            raise RuleConfigError(f"rules[{i}] must be an object; got {type(spec).__name__}")
+        params = dict(spec)
+        type_name = str(params.pop("type", "") or "").strip()
+        if not type_name:
+            raise RuleConfigError(f"rules[{i}] must contain 'type'")
+        rule_cls = RULE_TYPES.get(type_name)
+        if rule_cls is None:
+            known = ", ".join(sorted(RULE_TYPES))
+            raise RuleConfigError(f"rules[{i}]: unknown rule type '{type_name}' (known: {known})")
+        name = str(params.pop("name", "") or type_name).strip()
+        if name in seen:
+            raise RuleConfigError(f"rules[{i}]: duplicate rule name '{name}'")
+        seen.add(name)
+        compiled.append(rule_cls.from_spec(name, params))
+    for i, rule in enumerate(compiled):
+        for type_name in rule.must_follow:
+            if any(later.type_name == type_name for later in compiled[i + 1 :]):
+                raise RuleConfigError(f"rule '{rule.name}' must come after every '{type_name}' rule")
+    return tuple(compiled)
+
+
+# Used when the policy file has no `rules` key: sensitivity → cost (then default).
+DEFAULT_PIPELINE = compile_rules([{"type": "sensitivity"}, {"type": "cost"}])
+
+
+def get_pipeline(config: "PolicyConfig") -> tuple[Rule, ...]:
+    """Compiled rules for this policy (DEFAULT_PIPELINE when the file has no `rules`)."""
+    return config.rules if config.rules is not None else DEFAULT_PIPELINE
@@ -0,0 +1,70 @@
+"""
+Offline input-token estimation for the cost rule (no vocabulary files, no network).
+
+Two estimators:
+- heuristic: tokens ≈ characters / chars_per_token (the original cost-rule behavior).
+- bpe_estimate: splits text the way GPT-style BPE pre-tokenizers do (words with their leading
+  space, 1–3 digit groups, punctuation runs, whitespace runs) and counts tokens per piece
+  (short common-length words are one token, long words and non-Latin scripts split further).
+  Per-piece counts are memoized, so repeated vocabulary in a prompt costs one dict lookup.
+
+Both are estimates; provider-reported usage remains the billing source of truth.
+"""
+
+import re
+from functools import lru_cache
+
+TOKENIZER_HEURISTIC = "heuristic"
+TOKENIZER_BPE_ESTIMATE = "bpe_estimate"
+TOKENIZERS = (TOKENIZER_HEURISTIC, TOKENIZER_BPE_ESTIMATE)
+
+# Contractions, words (optional leading space), 1-3 digit groups, punctuation runs, whitespace.
+_PIECE = re.compile(
+    r"'(?:[sdmt]|ll|ve|re)"
+    r"| ?[^\W\d_]+"
+    r"|[0-9]{1,3}"
+    r"| ?[^\s\w]+|_+"
+    r"|\s+"
+)
+_CJK_START = 0x2E80  # CJK, kana, hangul and later blocks: roughly one token per character
+
+
+@lru_cache(maxsize=65536)
+def _piece_tokens(piece: str) -> int:
+    if piece.isascii():
+        word = piece.lstrip(" ")
+        if not word or word.isspace():
+            return 1
+        if word.isdigit():
+            return 1
+        if word.isalpha():
+            # Common words up to ~8 letters are single tokens; longer ones split every ~8.
+            return 1 + (len(word) - 1) // 8
+        # Punctuation / symbol runs: pairs usually merge ("),", "?!").
+        return (len(word) + 1) // 2
+    wide = sum(1 for ch in piece if ord(ch) >= _CJK_START)
+    narrow = len(piece) - wide
+    # Accented Latin/Cyrillic/Greek words split more often than ASCII ones.
+    return max(1, wide + (narrow + 4) // 5)
+
+
+def estimate_tokens_bpe(text: str) -> int:
+    """Approximate BPE token count of `text` (GPT-style pre-tokenization + per-piece rules)."""
+    if not text:
+        return 0
+    count = _piece_tokens
+    return sum(count(p) for p in _PIECE.findall(text))
+
+
+def estimate_tokens_heuristic(char_count: int, chars_per_token: int) -> float:
+    """tokens ≈ characters / chars_per_token (non-negative; chars_per_token ≤ 0 → 4)."""
+    if chars_per_token <= 0:
+        chars_per_token = 4
+    return max(0, char_count) / float(chars_per_token)
+
+
+def estimate_tokens(texts: tuple[str, ...], tokenizer: str, chars_per_token: int) -> float:
+    """Estimated input tokens for `texts` with the configured tokenizer."""
+    if tokenizer == TOKENIZER_BPE_ESTIMATE:
+        return float(sum(estimate_tokens_bpe(t) for t in texts))
+    return estimate_tokens_heuristic(sum(len(t) for t in texts), chars_per_token)
@@ -0,0 +1,60 @@
+"""
+Opt-in decision trace: per-rule outcome, safe inputs, and elapsed nanoseconds.
+
+Inputs are metadata only (lengths, token/cost estimates, detector classes, budget keys);
+never prompt text, matched text, keywords, or header values. Stored compactly in audit.
+"""
+
+import json
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+OUTCOME_MATCH = "match"
+OUTCOME_PASS = "pass"
+OUTCOME_SKIPPED = "skipped"  # an earlier rule matched
+
+
+@dataclass
+class RuleTrace:
+    """One rule in the pipeline for one decision."""
+
+    name: str
+    type: str
+    outcome: str
+    elapsed_ns: int = 0
+    reason_codes: list[str] = field(default_factory=list)
+    inputs: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def ran(self) -> bool:
+        return self.outcome != OUTCOME_SKIPPED
+
+
+@dataclass
+class DecisionTrace:
+    """Filled in by decide() when passed in; `cache` is hit, miss, or bypass."""
+
+    cache: str = "bypass"
+    total_ns: int = 0
+    rules: list[RuleTrace] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "cache": self.cache,
+            "total_ns": self.total_ns,
+            "rules": [{**asdict(r), "ran": r.ran} for r in self.rules],
+        }
+
+    def to_compact_json(self) -> str:
+        """Audit form: short keys, no whitespace, empty fields dropped."""
+        rules = []
+        for r in self.rules:
+            entry: dict[str, Any] = {"n": r.name, "o": r.outcome[0], "ns": r.elapsed_ns}
+            if r.reason_codes:
+                entry["rc"] = r.reason_codes
+            if r.inputs:
+                entry["in"] = r.inputs
+            rules.append(entry)
+        return json.dumps(
+            {"c": self.cache, "ns": self.total_ns, "r": rules}, separators=(",", ":"), default=str
+        )
@@ -1,17 +1,47 @@
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI
 from fastapi.responses import FileResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 
+from app.api.middleware import AdmissionMiddleware, BodyLimitMiddleware
 from app.api.routes.audit import router as audit_router
+from app.api.routes.batch import router as batch_router
 from app.core.policy_file import PolicyFileError
 from app.api.routes.chat import router as chat_router
+from app.api.routes.completions import router as completions_router
 from app.api.routes.health import router as health_router
+from app.api.routes.jobs import router as jobs_router
 from app.api.routes.metrics import router as metrics_router
 from app.api.routes.routes import router as routes_router
+from app.providers.transport import close_clients
+from app.services.admission import loop_lag_monitor
+from app.services.budget_sync import BudgetSync
+from app.services.jobs import JobWorkers
 
-app = FastAPI(title="Policy Mesh")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Sync the spend ledger from the audit log while the app runs, run chat job workers, and
+    measure event-loop lag for admission control. Pooled provider clients are closed on shutdown.
+    """
+    loop_lag_monitor.start()
+    budget_sync = BudgetSync()
+    budget_sync.start()
+    job_workers = JobWorkers()
+    job_workers.start()
+    yield
+    job_workers.stop()
+    budget_sync.stop()
+    await loop_lag_monitor.stop()
+    close_clients()
+
+
+app = FastAPI(title="Policy Mesh", lifespan=lifespan)
+app.add_middleware(BodyLimitMiddleware)
+app.add_middleware(AdmissionMiddleware)
 
 
 @app.exception_handler(PolicyFileError)
@@ -25,6 +55,9 @@ def policy_file_error_handler(request, exc: PolicyFileError):
 
 app.include_router(health_router)
 app.include_router(chat_router)
+app.include_router(completions_router)
+app.include_router(jobs_router)
+app.include_router(batch_router)
 app.include_router(audit_router)
 app.include_router(metrics_router)
 app.include_router(routes_router)
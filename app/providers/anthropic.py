@@ -1,24 +1,39 @@
-"""Anthropic Messages API client via httpx; same contract as OpenAI/Ollama."""
+"""
+Anthropic Messages API client via httpx; same contract as OpenAI/Ollama.
+Repeated system prompts and conversation prefixes get cache_control breakpoints (prompt_cache).
+"""
 
 import httpx
 
 from app.core.config import (
+    ProviderTimeouts,
+    get_anthropic_prompt_cache_enabled,
+    get_anthropic_prompt_cache_min_chars,
     get_public_llm_api_key,
     get_public_llm_url,
-    get_provider_timeout_seconds,
 )
 from app.providers.base import (
     FAILURE_AUTH_ERROR,
     FAILURE_CLIENT_ERROR,
-    FAILURE_SERVER_ERROR,
-    FAILURE_TIMEOUT,
     FAILURE_UNKNOWN,
     ChatResult,
+    http_timeout,
+    provider_client,
+    success,
+    usage_from,
 )
+from app.providers.prompt_cache import add_cache_breakpoints
+from app.providers.transport import RetryHook, send
 
 ANTHROPIC_DEFAULT_BASE = "https://api.anthropic.com"
 ANTHROPIC_API_VERSION = "2023-06-01"
 DEFAULT_MAX_TOKENS = 1024
+USAGE_FIELDS = {
+    "input_tokens": "input_tokens",
+    "output_tokens": "output_tokens",
+    "cache_read_input_tokens": "cache_read_input_tokens",
+    "cache_creation_input_tokens": "cache_creation_input_tokens",
+}
 
 
 def _anthropic_base_url() -> str:
@@ -53,72 +68,52 @@ def chat(
     *,
     api_key: str | None = None,
     base_url: str | None = None,
-    timeout: float | None = None,
+    timeout: float | ProviderTimeouts | None = None,
     client: httpx.Client | None = None,
+    retry: RetryHook | None = None,
 ) -> ChatResult:
     """
     Call Anthropic Messages API. Uses PUBLIC_LLM_API_KEY and PUBLIC_LLM_URL (or Anthropic default).
     messages: [{"role": "user"|"assistant"|"system", "content": "..."}]
     model: e.g. "claude-3-5-sonnet-20241022"; default "claude-3-5-sonnet-20241022" if omitted.
     """
-    key = api_key or get_public_llm_api_key()
+    key = get_public_llm_api_key() if api_key is None else api_key
     if not key:
         return {"success": False, "failure_category": FAILURE_AUTH_ERROR, "message": "PUBLIC_LLM_API_KEY not set"}
     url_base = (base_url or _anthropic_base_url()).rstrip("/")
-    timeout_sec = timeout if timeout is not None else get_provider_timeout_seconds()
+    timeout_sec = http_timeout(timeout, "anthropic")
     model_name = model or "claude-3-5-sonnet-20241022"
     system_text, anthropic_messages = _to_anthropic_messages(messages)
     if not anthropic_messages:
         return {"success": False, "failure_category": FAILURE_CLIENT_ERROR, "message": "At least one user or assistant message required"}
 
+    system: str | list[dict] | None = system_text
+    if get_anthropic_prompt_cache_enabled():
+        system, anthropic_messages = add_cache_breakpoints(
+            model_name, system_text, anthropic_messages, get_anthropic_prompt_cache_min_chars()
+        )
+
     payload: dict = {
         "model": model_name,
         "max_tokens": DEFAULT_MAX_TOKENS,
         "messages": anthropic_messages,
     }
-    if system_text:
-        payload["system"] = system_text
+    if system:
+        payload["system"] = system
 
     full_url = f"{url_base}/v1/messages"
-    if client is not None:
-        return _request(client, full_url, key, payload, timeout_sec)
-    with httpx.Client(timeout=timeout_sec) as c:
-        return _request(c, full_url, key, payload, timeout_sec)
-
-
-def _request(
-    client: httpx.Client,
-    full_url: str,
-    api_key: str,
-    payload: dict,
-    timeout_sec: float,
-) -> ChatResult:
     headers = {
-        "x-api-key": api_key,
+        "x-api-key": key,
         "anthropic-version": ANTHROPIC_API_VERSION,
         "Content-Type": "application/json",
     }
-    try:
-        resp = client.post(full_url, json=payload, headers=headers, timeout=timeout_sec)
-    except httpx.TimeoutException:
-        return {"success": False, "failure_category": FAILURE_TIMEOUT, "message": "Request timed out"}
-    except httpx.RequestError as e:
-        return {"success": False, "failure_category": FAILURE_UNKNOWN, "message": str(e)}
-
-    if resp.status_code == 401:
-        return {"success": False, "failure_category": FAILURE_AUTH_ERROR, "message": "Unauthorized"}
-    if 400 <= resp.status_code < 500:
-        return {"success": False, "failure_category": FAILURE_CLIENT_ERROR, "message": resp.text or None}
-    if resp.status_code >= 500:
-        return {"success": False, "failure_category": FAILURE_SERVER_ERROR, "message": resp.text or None}
-    if resp.status_code != 200:
-        return {"success": False, "failure_category": FAILURE_UNKNOWN, "message": resp.text or None}
+    if client is not None:
+        return send(client, full_url, payload, headers, timeout_sec, _parse, retry=retry)
+    with provider_client(timeout_sec) as c:
+        return send(c, full_url, payload, headers, timeout_sec, _parse, retry=retry)
 
-    try:
-        data = resp.json()
-    except Exception as e:
-        return {"success": False, "failure_category": FAILURE_UNKNOWN, "message": str(e)}
 
+def _parse(data: object) -> ChatResult:
     content_blocks = data.get("content") if isinstance(data, dict) else None
     if isinstance(content_blocks, list):
         text_parts = []
@@ -126,5 +121,10 @@ def _request(
             if isinstance(block, dict) and block.get("type") == "text":
                 text_parts.append(str(block.get("text", "")))
         if text_parts:
-            return {"success": True, "content": "\n".join(text_parts)}
+            usage = data.get("usage")  # type: ignore[union-attr]
+            return success(
+                "\n".join(text_parts),
+                data,  # type: ignore[arg-type]
+                usage_from(usage, USAGE_FIELDS) if isinstance(usage, dict) else {},
+            )
     return {"success": False, "failure_category": FAILURE_UNKNOWN, "message": "Invalid response shape"}
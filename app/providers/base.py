@@ -1,36 +1,296 @@
 """Shared provider interface: chat method, return shape, failure categories."""
 
-from typing import Protocol, TypedDict
+import json
+from typing import TYPE_CHECKING, Any, Iterator, NotRequired, Protocol, TypedDict
+
+import httpx
+
+from app.core.config import PoolSettings, ProviderTimeouts, get_max_provider_response_bytes, get_provider_timeouts
+from app.providers.tracing import TransportTiming, active_trace
+
+if TYPE_CHECKING:
+    from app.providers.transport import RetryHook
+
+
+class ChatUsage(TypedDict, total=False):
+    """Provider-reported usage (keys present only when the provider reports them)."""
+
+    input_tokens: int
+    output_tokens: int
+    generation_seconds: float  # time spent generating output (Ollama eval_duration)
+    cache_read_input_tokens: int  # input tokens served from the prompt cache (Anthropic)
+    cache_creation_input_tokens: int  # input tokens written to the prompt cache (Anthropic)
 
 
 class ChatSuccess(TypedDict):
     success: bool  # True
     content: str
+    model: NotRequired[str]  # model that served the request, as reported by the provider
+    usage: NotRequired[ChatUsage]
+    transport: NotRequired[TransportTiming]  # added by transport.send
 
 
 class ChatFailure(TypedDict):
     success: bool  # False
     failure_category: str
     message: str | None
+    timeout_phase: NotRequired[str]  # connect, read, write or pool (timeouts only)
+    transport: NotRequired[TransportTiming]
 
 
 ChatResult = ChatSuccess | ChatFailure
 
+
+def usage_from(data: dict[str, Any], fields: dict[str, str]) -> ChatUsage:
+    """Pick non-negative integer counts from `data` (fields: provider key → ChatUsage key)."""
+    usage: ChatUsage = {}
+    for source, target in fields.items():
+        value = data.get(source)
+        if isinstance(value, int) and not isinstance(value, bool) and value >= 0:
+            usage[target] = value  # type: ignore[literal-required]
+    return usage
+
+
+def success(content: str, data: dict[str, Any], usage: ChatUsage) -> ChatSuccess:
+    """Build a ChatSuccess with the reported model and usage when present."""
+    result: ChatSuccess = {"success": True, "content": content}
+    model = data.get("model")
+    if isinstance(model, str) and model:
+        result["model"] = model
+    if usage:
+        result["usage"] = usage
+    return result
+
+
 # Failure categories for audit and callers (consistent across providers).
 FAILURE_TIMEOUT = "timeout"
+FAILURE_DEADLINE_EXCEEDED = "deadline_exceeded"  # skipped: the client deadline cannot be met
 FAILURE_CLIENT_ERROR = "client_error"  # 4xx
 FAILURE_SERVER_ERROR = "server_error"  # 5xx
 FAILURE_AUTH_ERROR = "auth_error"      # 401
+FAILURE_RESPONSE_TOO_LARGE = "response_too_large"  # body over MAX_PROVIDER_RESPONSE_BYTES
 FAILURE_UNKNOWN = "unknown"
 
 
+_TIMEOUT_PHASES: tuple[tuple[type[httpx.TimeoutException], str], ...] = (
+    (httpx.ConnectTimeout, "connect"),
+    (httpx.ReadTimeout, "read"),
+    (httpx.WriteTimeout, "write"),
+    (httpx.PoolTimeout, "pool"),
+)
+
+
+def http_timeout(timeout: float | ProviderTimeouts | None, provider: str) -> httpx.Timeout:
+    """httpx timeout for a call: split config for `provider` when None, one value for every phase when a float."""
+    if timeout is None:
+        timeout = get_provider_timeouts(provider)
+    if isinstance(timeout, ProviderTimeouts):
+        return httpx.Timeout(connect=timeout.connect, read=timeout.read, write=timeout.write, pool=timeout.pool)
+    return httpx.Timeout(timeout)
+
+
+def timeout_failure(exc: httpx.TimeoutException) -> ChatFailure:
+    """ChatFailure for an httpx timeout, naming the phase that timed out."""
+    phase = next((name for cls, name in _TIMEOUT_PHASES if isinstance(exc, cls)), "read")
+    return {
+        "success": False,
+        "failure_category": FAILURE_TIMEOUT,
+        "message": "Request timed out",
+        "timeout_phase": phase,
+    }
+
+
+def status_failure(status_code: int, message: str | None = None) -> ChatFailure:
+    """ChatFailure for a non-200 provider response, categorized like the adapters do."""
+    if status_code == 401:
+        category = FAILURE_AUTH_ERROR
+    elif 400 <= status_code < 500:
+        category = FAILURE_CLIENT_ERROR
+    elif status_code >= 500:
+        category = FAILURE_SERVER_ERROR
+    else:
+        category = FAILURE_UNKNOWN
+    return {"success": False, "failure_category": category, "message": message}
+
+
+class ResponseTooLarge(httpx.TransportError):
+    """Raised while reading a provider response body larger than MAX_PROVIDER_RESPONSE_BYTES."""
+
+
+def too_large_failure(exc: ResponseTooLarge) -> ChatFailure:
+    return {"success": False, "failure_category": FAILURE_RESPONSE_TOO_LARGE, "message": str(exc)}
+
+
+class _CappedStream(httpx.SyncByteStream):
+    """Response body stream that raises ResponseTooLarge once more than `limit` bytes arrived."""
+
+    def __init__(self, stream: httpx.SyncByteStream, limit: int) -> None:
+        self._stream = stream
+        self._limit = limit
+
+    def __iter__(self):
+        received = 0
+        for chunk in self._stream:
+            received += len(chunk)
+            if received > self._limit:
+                raise ResponseTooLarge(f"Provider response exceeds MAX_PROVIDER_RESPONSE_BYTES ({self._limit})")
+            yield chunk
+
+    def close(self) -> None:
+        self._stream.close()
+
+
+class CappedTransport(httpx.BaseTransport):
+    """
+    Transport that bounds provider response bodies: a Content-Length over `limit` fails before
+    the body is read, and a body without one stops being read once it passes `limit`.
+    """
+
+    def __init__(self, limit: int, transport: httpx.BaseTransport | None = None) -> None:
+        self._limit = limit
+        self._transport = transport or httpx.HTTPTransport()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        response = self._transport.handle_request(request)
+        length = response.headers.get("content-length", "")
+        if length.isdigit() and int(length) > self._limit:
+            response.close()
+            raise ResponseTooLarge(
+                f"Provider response exceeds MAX_PROVIDER_RESPONSE_BYTES ({self._limit})", request=request
+            )
+        assert isinstance(response.stream, httpx.SyncByteStream)
+        return httpx.Response(
+            response.status_code,
+            headers=response.headers,
+            stream=_CappedStream(response.stream, self._limit),
+            extensions=response.extensions,
+        )
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+def provider_client(timeout: httpx.Timeout, pool: PoolSettings | None = None) -> httpx.Client:
+    """
+    httpx client with response bodies capped at MAX_PROVIDER_RESPONSE_BYTES: for one adapter
+    call, or (with `pool`) the long-lived pooled client of a provider backend.
+    """
+    limits = (
+        httpx.Limits(
+            max_connections=pool.max_connections,
+            max_keepalive_connections=pool.max_keepalive,
+            keepalive_expiry=pool.keepalive_expiry,
+        )
+        if pool is not None
+        else httpx.Limits(max_connections=100, max_keepalive_connections=20)
+    )
+    limit = get_max_provider_response_bytes()
+    transport = httpx.HTTPTransport(limits=limits)
+    return httpx.Client(timeout=timeout, transport=CappedTransport(limit, transport) if limit else transport)
+
+
+# Payload strings at least this long are encoded window by window (see post_json).
+STREAM_PAYLOAD_CHARS = 1 << 20
+_ENCODE_WINDOW_CHARS = 1 << 16
+
+
+class _JsonChunks:
+    """
+    JSON encoding of `payload` as a re-iterable sequence of small byte chunks. Long strings are
+    escaped one window at a time (JSON escaping is per character), so no payload-sized str or
+    bytes copy exists; `length` is the exact encoded size, from a first pass.
+    """
+
+    def __init__(self, payload: Any) -> None:
+        self._payload = payload
+        self.length = sum(len(chunk) for chunk in self)
+
+    def __iter__(self) -> Iterator[bytes]:
+        return _json_chunks(self._payload)
+
+
+def _json_chunks(value: Any) -> Iterator[bytes]:
+    if isinstance(value, str) and len(value) > _ENCODE_WINDOW_CHARS:
+        yield b'"'
+        for start in range(0, len(value), _ENCODE_WINDOW_CHARS):
+            yield json.dumps(value[start : start + _ENCODE_WINDOW_CHARS])[1:-1].encode()
+        yield b'"'
+    elif isinstance(value, dict):
+        yield b"{"
+        for i, (key, item) in enumerate(value.items()):
+            yield (b"," if i else b"") + json.dumps(str(key)).encode() + b":"
+            yield from _json_chunks(item)
+        yield b"}"
+    elif isinstance(value, (list, tuple)):
+        yield b"["
+        for i, item in enumerate(value):
+            if i:
+                yield b","
+            yield from _json_chunks(item)
+        yield b"]"
+    else:
+        yield json.dumps(value).encode()
+
+
+def _longest_text(value: Any) -> int:
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, dict):
+        return max((_longest_text(v) for v in value.values()), default=0)
+    if isinstance(value, (list, tuple)):
+        return max((_longest_text(v) for v in value), default=0)
+    return 0
+
+
+def post_json(
+    client: httpx.Client,
+    url: str,
+    payload: dict[str, Any],
+    headers: dict[str, str] | None,
+    timeout: httpx.Timeout,
+) -> httpx.Response:
+    """
+    POST `payload` as JSON. Payloads with a string of STREAM_PAYLOAD_CHARS or more are sent
+    from window-encoded chunks with an explicit Content-Length (not chunked), instead of
+    httpx building the whole JSON text and then its bytes. Within `tracing.capture()`, the
+    request's transport phases and body sizes are recorded.
+    """
+    trace = active_trace()
+    extensions = {"trace": trace} if trace is not None else None
+    if _longest_text(payload) < STREAM_PAYLOAD_CHARS:
+        response = client.post(url, json=payload, headers=headers, timeout=timeout, extensions=extensions)
+    else:
+        body = _JsonChunks(payload)
+        headers = {**(headers or {}), "Content-Type": "application/json", "Content-Length": str(body.length)}
+        response = client.post(url, content=body, headers=headers, timeout=timeout, extensions=extensions)
+    if trace is not None:
+        trace.record_response(response)
+    return response
+
+
+# Pass-through requests ask for identity encoding so response bytes can be relayed and read as-is.
+PASSTHROUGH_HEADERS = {"Content-Type": "application/json", "Accept-Encoding": "identity"}
+
+
 class BaseChatProvider(Protocol):
-    """Interface implemented by Ollama and OpenAI adapters."""
+    """Interface implemented by the adapter modules (Ollama, OpenAI, Anthropic); see registry.ADAPTERS."""
 
-    def chat(self, messages: list[dict[str, str]], model: str | None = None) -> ChatResult:
+    def chat(
+        self,
+        messages: list[dict[str, str]],
+        model: str | None = None,
+        *,
+        api_key: str | None = None,
+        base_url: str | None = None,
+        timeout: float | ProviderTimeouts | None = None,
+        client: httpx.Client | None = None,
+        retry: "RetryHook | None" = None,
+    ) -> ChatResult:
         """
         Send chat messages and return content or failure.
         messages: list of {"role": "user"|"assistant"|"system", "content": "..."}
         model: optional model name (provider-specific default if omitted).
+        api_key / base_url: None = the adapter's configured default.
+        client: pooled client to send on (a one-off client when None).
         """
         ...
@@ -1,75 +1,82 @@
-"""Ollama API client: POST /api/chat; configurable base URL and timeout."""
+"""Ollama API client: POST /api/chat; configurable base URL and split timeouts."""
 
 import httpx
 
-from app.core.config import get_local_llm_api_key, get_local_llm_url, get_provider_timeout_seconds
+from app.core.config import ProviderTimeouts, get_local_llm_api_key, get_local_llm_url
 from app.providers.base import (
-    FAILURE_AUTH_ERROR,
-    FAILURE_CLIENT_ERROR,
-    FAILURE_SERVER_ERROR,
-    FAILURE_TIMEOUT,
     FAILURE_UNKNOWN,
+    PASSTHROUGH_HEADERS,
     ChatResult,
+    ChatUsage,
+    http_timeout,
+    provider_client,
+    success,
+    usage_from,
 )
+from app.providers.transport import RetryHook, send
+
+OLLAMA_DEFAULT_BASE = "http://localhost:11434"
+USAGE_FIELDS = {"prompt_eval_count": "input_tokens", "eval_count": "output_tokens"}
+
+
+def _usage(data: dict) -> ChatUsage:
+    """Token counts plus generation time from Ollama's own timings (eval_duration is in ns)."""
+    usage = usage_from(data, USAGE_FIELDS)
+    eval_ns = data.get("eval_duration")
+    if isinstance(eval_ns, (int, float)) and not isinstance(eval_ns, bool) and eval_ns > 0:
+        usage["generation_seconds"] = eval_ns / 1e9
+    return usage
+
+
+def completions_request(
+    client: httpx.Client,
+    body: bytes,
+    *,
+    api_key: str | None = None,
+    base_url: str | None = None,
+    timeout: httpx.Timeout | None = None,
+) -> httpx.Request:
+    """POST to Ollama's OpenAI-compatible /v1/chat/completions with the client's `body` unchanged."""
+    url = base_url or get_local_llm_url()
+    headers = dict(PASSTHROUGH_HEADERS)
+    key = get_local_llm_api_key() if api_key is None else api_key
+    if key:
+        headers["Authorization"] = f"Bearer {key}"
+    return client.build_request("POST", f"{url}/v1/chat/completions", content=body, headers=headers, timeout=timeout)
 
 
 def chat(
     messages: list[dict[str, str]],
     model: str | None = None,
     *,
+    api_key: str | None = None,
     base_url: str | None = None,
-    timeout: float | None = None,
+    timeout: float | ProviderTimeouts | None = None,
     client: httpx.Client | None = None,
+    retry: RetryHook | None = None,
 ) -> ChatResult:
     """
-    Send chat to Ollama /api/chat. Uses config if base_url/timeout/client not provided.
+    Send chat to Ollama /api/chat. Uses config if api_key/base_url/timeout/client not provided
+    (api_key "" sends no Authorization header).
     messages: [{"role": "user"|"assistant"|"system", "content": "..."}]
     model: e.g. "llama2"; default "llama2" if omitted.
     """
     url = base_url or get_local_llm_url()
-    timeout_sec = timeout if timeout is not None else get_provider_timeout_seconds()
+    timeout_sec = http_timeout(timeout, "local")
     model_name = model or "llama2"
     payload = {"model": model_name, "messages": messages, "stream": False}
-    api_key = get_local_llm_api_key()
+    key = get_local_llm_api_key() if api_key is None else api_key
+    headers = {"Authorization": f"Bearer {key}"} if key else None
 
     if client is not None:
-        return _request(client, f"{url}/api/chat", payload, timeout_sec, api_key)
-
-    with httpx.Client(timeout=timeout_sec) as c:
-        return _request(c, f"{url}/api/chat", payload, timeout_sec, api_key)
-
-
-def _request(
-    client: httpx.Client,
-    full_url: str,
-    payload: dict,
-    timeout_sec: float,
-    api_key: str | None = None,
-) -> ChatResult:
-    headers = {"Authorization": f"Bearer {api_key}"} if api_key else None
-    try:
-        resp = client.post(full_url, json=payload, headers=headers, timeout=timeout_sec)
-    except httpx.TimeoutException:
-        return {"success": False, "failure_category": FAILURE_TIMEOUT, "message": "Request timed out"}
-    except httpx.RequestError as e:
-        return {"success": False, "failure_category": FAILURE_UNKNOWN, "message": str(e)}
-
-    if resp.status_code == 401:
-        return {"success": False, "failure_category": FAILURE_AUTH_ERROR, "message": "Unauthorized"}
-    if 400 <= resp.status_code < 500:
-        return {"success": False, "failure_category": FAILURE_CLIENT_ERROR, "message": resp.text or None}
-    if resp.status_code >= 500:
-        return {"success": False, "failure_category": FAILURE_SERVER_ERROR, "message": resp.text or None}
+        return send(client, f"{url}/api/chat", payload, headers, timeout_sec, _parse, retry=retry)
 
-    if resp.status_code != 200:
-        return {"success": False, "failure_category": FAILURE_UNKNOWN, "message": resp.text or None}
+    with provider_client(timeout_sec) as c:
+        return send(c, f"{url}/api/chat", payload, headers, timeout_sec, _parse, retry=retry)
 
-    try:
-        data = resp.json()
-    except Exception as e:
-        return {"success": False, "failure_category": FAILURE_UNKNOWN, "message": str(e)}
 
+def _parse(data: object) -> ChatResult:
     message = data.get("message") if isinstance(data, dict) else None
     if isinstance(message, dict) and "content" in message:
-        return {"success": True, "content": str(message["content"])}
+        return success(str(message["content"]), data, _usage(data))  # type: ignore[arg-type]
     return {"success": False, "failure_category": FAILURE_UNKNOWN, "message": "Invalid response shape"}
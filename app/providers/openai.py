@@ -3,18 +3,50 @@
 import httpx
 
 from app.core.config import (
+    ProviderTimeouts,
     get_public_llm_api_key,
     get_public_llm_url,
-    get_provider_timeout_seconds,
 )
 from app.providers.base import (
     FAILURE_AUTH_ERROR,
-    FAILURE_CLIENT_ERROR,
-    FAILURE_SERVER_ERROR,
-    FAILURE_TIMEOUT,
     FAILURE_UNKNOWN,
+    PASSTHROUGH_HEADERS,
     ChatResult,
+    http_timeout,
+    provider_client,
+    success,
+    usage_from,
 )
+from app.providers.transport import RetryHook, send
+
+OPENAI_DEFAULT_BASE = "https://api.openai.com"
+USAGE_FIELDS = {"prompt_tokens": "input_tokens", "completion_tokens": "output_tokens"}
+
+
+def completions_request(
+    client: httpx.Client,
+    body: bytes,
+    *,
+    api_key: str | None = None,
+    base_url: str | None = None,
+    timeout: httpx.Timeout | None = None,
+) -> httpx.Request | None:
+    """
+    POST /v1/chat/completions carrying the client's request `body` unchanged (pass-through).
+    None when `api_key` is not given and PUBLIC_LLM_API_KEY is not set; api_key "" sends no
+    Authorization header (self-hosted servers).
+    """
+    key = get_public_llm_api_key() if api_key is None else api_key
+    if api_key is None and not key:
+        return None
+    url_base = (base_url or get_public_llm_url()).rstrip("/")
+    headers = dict(PASSTHROUGH_HEADERS)
+    if key:
+        headers["Authorization"] = f"Bearer {key}"
+    return client.build_request(
+        "POST", f"{url_base}/v1/chat/completions", content=body, headers=headers, timeout=timeout
+    )
+
 
 def chat(
     messages: list[dict[str, str]],
@@ -22,62 +54,44 @@ def chat(
     *,
     api_key: str | None = None,
     base_url: str | None = None,
-    timeout: float | None = None,
+    timeout: float | ProviderTimeouts | None = None,
     client: httpx.Client | None = None,
+    retry: RetryHook | None = None,
 ) -> ChatResult:
     """
-    Send chat completions to public LLM (PUBLIC_LLM_URL; provider inferred from URL). Uses config if not provided.
+    Send chat completions to an OpenAI-compatible API (default PUBLIC_LLM_URL). Uses config if
+    not provided; api_key "" sends no Authorization header (self-hosted servers).
     messages: [{"role": "user"|"assistant"|"system", "content": "..."}]
     model: e.g. "gpt-4"; default "gpt-3.5-turbo" if omitted.
     """
-    key = api_key or get_public_llm_api_key()
-    if not key:
+    key = get_public_llm_api_key() if api_key is None else api_key
+    if api_key is None and not key:
         return {"success": False, "failure_category": FAILURE_AUTH_ERROR, "message": "PUBLIC_LLM_API_KEY not set"}
     url_base = (base_url or get_public_llm_url()).rstrip("/")
-    timeout_sec = timeout if timeout is not None else get_provider_timeout_seconds()
+    timeout_sec = http_timeout(timeout, "openai")
     model_name = model or "gpt-3.5-turbo"
     payload = {"model": model_name, "messages": messages}
+    full_url = f"{url_base}/v1/chat/completions"
+    headers = {"Content-Type": "application/json"}
+    if key:
+        headers["Authorization"] = f"Bearer {key}"
 
     if client is not None:
-        return _request(client, f"{url_base}/v1/chat/completions", key, payload, timeout_sec)
-
-    with httpx.Client(timeout=timeout_sec) as c:
-        return _request(c, f"{url_base}/v1/chat/completions", key, payload, timeout_sec)
-
-
-def _request(
-    client: httpx.Client,
-    full_url: str,
-    api_key: str,
-    payload: dict,
-    timeout_sec: float,
-) -> ChatResult:
-    headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
-    try:
-        resp = client.post(full_url, json=payload, headers=headers, timeout=timeout_sec)
-    except httpx.TimeoutException:
-        return {"success": False, "failure_category": FAILURE_TIMEOUT, "message": "Request timed out"}
-    except httpx.RequestError as e:
-        return {"success": False, "failure_category": FAILURE_UNKNOWN, "message": str(e)}
-
-    if resp.status_code == 401:
-        return {"success": False, "failure_category": FAILURE_AUTH_ERROR, "message": "Unauthorized"}
-    if 400 <= resp.status_code < 500:
-        return {"success": False, "failure_category": FAILURE_CLIENT_ERROR, "message": resp.text or None}
-    if resp.status_code >= 500:
-        return {"success": False, "failure_category": FAILURE_SERVER_ERROR, "message": resp.text or None}
+        return send(client, full_url, payload, headers, timeout_sec, _parse, retry=retry)
 
-    if resp.status_code != 200:
-        return {"success": False, "failure_category": FAILURE_UNKNOWN, "message": resp.text or None}
+    with provider_client(timeout_sec) as c:
+        return send(c, full_url, payload, headers, timeout_sec, _parse, retry=retry)
 
-    try:
-        data = resp.json()
-    except Exception as e:
-        return {"success": False, "failure_category": FAILURE_UNKNOWN, "message": str(e)}
 
+def _parse(data: object) -> ChatResult:
     choices = data.get("choices") if isinstance(data, dict) else None
     if isinstance(choices, list) and len(choices) > 0:
         msg = choices[0].get("message") if isinstance(choices[0], dict) else None
         if isinstance(msg, dict) and "content" in msg:
-            return {"success": True, "content": str(msg["content"])}
+            usage = data.get("usage")  # type: ignore[union-attr]
+            return success(
+                str(msg["content"]),
+                data,  # type: ignore[arg-type]
+                usage_from(usage, USAGE_FIELDS) if isinstance(usage, dict) else {},
+            )
     return {"success": False, "failure_category": FAILURE_UNKNOWN, "message": "Invalid response shape"}
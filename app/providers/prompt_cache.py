@@ -0,0 +1,99 @@
+"""
+Prompt-cache breakpoints for Anthropic (cache_control) chosen from recently seen prefixes.
+
+A cache write costs more than plain input, so a breakpoint only pays off when the same prefix
+is sent again within the cache lifetime. Each worker remembers SHA-256 hashes of the prefixes
+it has sent (system prompt per model, and the conversation up to every message boundary) for
+CACHE_TTL_SECONDS. A request gets a breakpoint on its system prompt when that system prompt
+was seen recently, and on the message before the last one when a long prefix of its
+conversation was seen recently (a repeated context or the next turn of a conversation).
+Only hashes are kept, never prompt text.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+# Anthropic's ephemeral cache lives 5 minutes, refreshed on every hit.
+CACHE_TTL_SECONDS = 300.0
+MAX_TRACKED_PREFIXES = 10_000
+
+
+class PrefixTracker:
+    """Bounded, thread-safe set of recently seen prefix hashes with one TTL."""
+
+    def __init__(self, maxsize: int = MAX_TRACKED_PREFIXES, ttl_seconds: float = CACHE_TTL_SECONDS) -> None:
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._seen: OrderedDict[str, float] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def recent(self, keys: list[str], now: float | None = None) -> bool:
+        """Whether any of `keys` was recorded within the TTL."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            return any(now - self._seen.get(k, -self.ttl_seconds) < self.ttl_seconds for k in keys)
+
+    def record(self, keys: list[str], now: float | None = None) -> None:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            for key in keys:
+                self._seen[key] = now
+                self._seen.move_to_end(key)
+            while len(self._seen) > self.maxsize:
+                self._seen.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._seen.clear()
+
+
+prefix_tracker = PrefixTracker()
+
+
+def _cached_block(text: str) -> list[dict]:
+    return [{"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}]
+
+
+def add_cache_breakpoints(
+    model: str,
+    system_text: str | None,
+    messages: list[dict],
+    min_chars: int,
+    tracker: PrefixTracker = prefix_tracker,
+) -> tuple[str | list[dict] | None, list[dict]]:
+    """
+    Return (system, messages) for the Anthropic payload with cache_control on the system prompt
+    and/or the second-to-last message when their prefix (>= min_chars) was sent recently.
+    Every long prefix of this request is recorded for the next one.
+    """
+    system: str | list[dict] | None = system_text
+    head = hashlib.sha256(f"{model}\0{system_text or ''}".encode())
+    size = len(system_text or "")
+    if system_text and size >= min_chars:
+        key = head.hexdigest()
+        if tracker.recent([key]):
+            system = _cached_block(system_text)
+        tracker.record([key])
+
+    # Running hash: prefix_keys[i] covers system + messages[: i + 1].
+    prefix_keys: list[str] = []
+    for m in messages:
+        head.update(f"\0{m['role']}\0{m['content']}".encode())
+        size += len(m["content"])
+        if size >= min_chars:
+            prefix_keys.append(head.copy().hexdigest())
+        else:
+            prefix_keys.append("")
+    long_prefixes = [k for k in prefix_keys if k]
+    if not long_prefixes:
+        return system, messages
+    out = messages
+    if len(messages) >= 2 and prefix_keys[-2] and tracker.recent(long_prefixes[:-1]):
+        out = [*messages]
+        out[-2] = {"role": messages[-2]["role"], "content": _cached_block(messages[-2]["content"])}
+    # The prefix before the last message is this request's breakpoint; the full conversation is
+    # the next turn's prefix.
+    tracker.record([k for k in prefix_keys[-2:] if k])
+    return system, out
@@ -0,0 +1,121 @@
+"""
+Provider registry: backend name → adapter kind, base URL, API key, pool and retries.
+
+Built-in backends: local (ollama; LOCAL_LLM_URL, LOCAL_LLM_API_KEY), openai and anthropic
+(PUBLIC_LLM_URL, PUBLIC_LLM_API_KEY; anthropic uses its own default URL unless PUBLIC_LLM_URL
+points at Anthropic). PROVIDER_BACKENDS adds backends or changes a built-in's kind, e.g.
+"vllm=openai,llamacpp=openai,claude_eu=anthropic"; each is configured by PROVIDER_URL_<NAME>,
+PROVIDER_API_KEY_<NAME>, PROVIDER_POOL_<NAME>, PROVIDER_RETRIES_<NAME> and
+PROVIDER_TIMEOUTS_<NAME>. Routes to "public" go to PUBLIC_PROVIDER.
+
+A new API dialect is one adapter module with `chat` (and `completions_request` when it speaks
+the OpenAI chat completions API) added to ADAPTERS.
+"""
+
+from dataclasses import dataclass
+
+import httpx
+
+from app.core.config import (
+    BUILTIN_PROVIDER_BACKENDS,
+    PoolSettings,
+    ProviderTimeouts,
+    get_local_llm_api_key,
+    get_local_llm_url,
+    get_provider_api_key,
+    get_provider_backends,
+    get_provider_pool,
+    get_provider_retries,
+    get_provider_url,
+)
+from app.providers import anthropic, ollama, openai
+from app.providers.base import FAILURE_AUTH_ERROR, FAILURE_UNKNOWN, BaseChatProvider, ChatResult, http_timeout
+from app.providers.transport import client_for, connect_retries
+
+
+# Adapter kind → adapter module.
+ADAPTERS: dict[str, BaseChatProvider] = {"ollama": ollama, "openai": openai, "anthropic": anthropic}  # type: ignore[dict-item]
+
+# Adapter kinds whose servers speak the OpenAI chat completions API (pass-through relay).
+PASSTHROUGH_KINDS = ("ollama", "openai")
+
+_DEFAULT_URLS = {
+    "ollama": ollama.OLLAMA_DEFAULT_BASE,
+    "openai": openai.OPENAI_DEFAULT_BASE,
+    "anthropic": anthropic.ANTHROPIC_DEFAULT_BASE,
+}
+
+
+@dataclass(frozen=True)
+class Backend:
+    """One configured provider backend."""
+
+    name: str
+    kind: str
+    base_url: str | None  # None = the adapter's configured default
+    api_key: str | None  # None = the adapter's configured default; "" = no key
+    pool: PoolSettings
+    retries: int
+
+
+def get_backend(provider: str) -> Backend | None:
+    """The configured backend named `provider`, or None when there is none."""
+    kind = get_provider_backends().get(provider)
+    if kind is None:
+        return None
+    url = get_provider_url(provider)
+    api_key = get_provider_api_key(provider)
+    if BUILTIN_PROVIDER_BACKENDS.get(provider) != kind:
+        # Added backends (and built-ins switched to another kind) never fall back to the
+        # adapter's configured URL or key: those belong to another backend.
+        if provider == "local":
+            url = url or get_local_llm_url()
+            api_key = api_key or get_local_llm_api_key()
+        url = url or _DEFAULT_URLS[kind]
+        api_key = api_key or ""
+    return Backend(
+        name=provider,
+        kind=kind,
+        base_url=url,
+        api_key=api_key,
+        pool=get_provider_pool(provider),
+        retries=get_provider_retries(provider),
+    )
+
+
+def backend_client(backend: Backend) -> httpx.Client:
+    """Pooled client of `backend` (see transport.client_for)."""
+    return client_for(backend.name, backend.pool, http_timeout(None, backend.name))
+
+
+def completions_request(
+    backend: Backend, client: httpx.Client, body: bytes, timeout: httpx.Timeout
+) -> httpx.Request | None:
+    """Pass-through request for a backend of a PASSTHROUGH_KINDS kind; None when its API key is missing."""
+    adapter = ollama if backend.kind == "ollama" else openai
+    return adapter.completions_request(client, body, api_key=backend.api_key, base_url=backend.base_url, timeout=timeout)
+
+
+def chat(
+    provider: str,
+    messages: list[dict[str, str]],
+    model: str | None = None,
+    *,
+    timeout: float | ProviderTimeouts | None = None,
+) -> ChatResult:
+    """Call backend `provider` through its adapter, on the backend's pooled client."""
+    backend = get_backend(provider)
+    if backend is None:
+        return {"success": False, "failure_category": FAILURE_UNKNOWN, "message": f"Unknown provider '{provider}'"}
+    if backend.kind == "anthropic" and backend.api_key == "":
+        message = f"PROVIDER_API_KEY_{provider.upper()} not set"
+        return {"success": False, "failure_category": FAILURE_AUTH_ERROR, "message": message}
+    return ADAPTERS[backend.kind].chat(
+        messages,
+        model=model,
+        api_key=backend.api_key,
+        base_url=backend.base_url,
+        timeout=timeout if timeout is not None else http_timeout(None, provider),
+        client=backend_client(backend),
+        retry=connect_retries(backend.retries),
+    )
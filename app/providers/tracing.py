@@ -0,0 +1,111 @@
+"""
+Transport timing for provider calls, from httpcore trace events (httpx "trace" extension).
+
+Phases, in milliseconds:
+- connect: DNS resolution and TCP connect (httpcore reports them as one step);
+- tls: TLS handshake;
+- write: sending the request headers and body;
+- ttfb: waiting for the response headers after the request was sent;
+- read: reading the response body.
+Plus request and response body bytes. A call on a reused pooled connection has no connect or
+tls phase; a failed call keeps the phases it reached (e.g. connect only).
+
+The orchestrator opens `capture()` around an adapter call; `post_json` attaches the active
+trace to its request. The active trace is a ContextVar, so concurrent calls do not mix.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, TypedDict
+
+import httpx
+
+PHASES = ("connect", "tls", "write", "ttfb", "read")
+
+# httpcore trace step → phase (HTTP/1.1 and HTTP/2 step names).
+_STEPS = {
+    "connection.connect_tcp": "connect",
+    "connection.connect_unix_socket": "connect",
+    "connection.start_tls": "tls",
+    "http11.send_request_headers": "write",
+    "http11.send_request_body": "write",
+    "http2.send_request_headers": "write",
+    "http2.send_request_body": "write",
+    "http11.receive_response_headers": "ttfb",
+    "http2.receive_response_headers": "ttfb",
+    "http11.receive_response_body": "read",
+    "http2.receive_response_body": "read",
+}
+
+
+class TransportTiming(TypedDict, total=False):
+    connect_ms: float
+    tls_ms: float
+    write_ms: float
+    ttfb_ms: float
+    read_ms: float
+    bytes_sent: int
+    bytes_received: int
+
+
+class TransportTrace:
+    """httpx trace callback that sums the duration of each phase of one call."""
+
+    def __init__(self) -> None:
+        self._started: dict[str, float] = {}
+        self._phases: dict[str, float] = {}
+        self.bytes_sent: int | None = None
+        self.bytes_received: int | None = None
+
+    def __call__(self, event_name: str, info: dict[str, Any]) -> None:
+        step, _, stage = event_name.rpartition(".")
+        phase = _STEPS.get(step)
+        if phase is None:
+            return
+        now = time.perf_counter()
+        if stage == "started":
+            self._started[step] = now
+        elif step in self._started:  # complete or failed
+            elapsed_ms = (now - self._started.pop(step)) * 1000.0
+            self._phases[phase] = self._phases.get(phase, 0.0) + elapsed_ms
+
+    def record_response(self, response: httpx.Response) -> None:
+        """Body bytes of a response that was read, and of the request that produced it."""
+        self.bytes_received = response.num_bytes_downloaded
+        try:
+            length = response.request.headers.get("content-length")
+        except RuntimeError:  # response not built from a sent request
+            return
+        if length is not None and length.isdigit():
+            self.bytes_sent = int(length)
+
+    def timing(self) -> TransportTiming | None:
+        """Recorded phases and byte counts; None when nothing was recorded (e.g. no request sent)."""
+        timing: TransportTiming = {}
+        for phase in PHASES:
+            if phase in self._phases:
+                timing[f"{phase}_ms"] = round(self._phases[phase], 3)  # type: ignore[literal-required]
+        if self.bytes_sent is not None:
+            timing["bytes_sent"] = self.bytes_sent
+        if self.bytes_received is not None:
+            timing["bytes_received"] = self.bytes_received
+        return timing or None
+
+
+_active: ContextVar[TransportTrace | None] = ContextVar("provider_transport_trace", default=None)
+
+
+@contextmanager
+def capture() -> Iterator[TransportTrace]:
+    """Trace the provider requests sent by `post_json` within the block."""
+    trace = TransportTrace()
+    token = _active.set(trace)
+    try:
+        yield trace
+    finally:
+        _active.reset(token)
+
+
+def active_trace() -> TransportTrace | None:
+    return _active.get()
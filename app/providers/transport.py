@@ -0,0 +1,141 @@
+"""
+Shared provider transport: pooled clients per backend, and the request path every adapter
+uses (POST, error and status mapping, transport timing, retries).
+
+Adapters build the URL, headers and payload and parse a 200 body; `send` does the rest, so a
+new backend only has to describe its API dialect.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Protocol
+
+import httpx
+
+from app.core.config import PoolSettings
+from app.providers.base import (
+    FAILURE_UNKNOWN,
+    ChatFailure,
+    ChatResult,
+    ResponseTooLarge,
+    post_json,
+    provider_client,
+    status_failure,
+    timeout_failure,
+    too_large_failure,
+)
+from app.providers.tracing import capture
+
+
+class RetryHook(Protocol):
+    """Decides whether a failed attempt is tried again."""
+
+    def __call__(self, attempt: int, result: ChatFailure, exc: Exception | None) -> float | None:
+        """
+        attempt: attempts made so far (1 after the first); exc: the transport error, None when
+        the provider answered. Returns seconds to wait before the next attempt, or None to stop.
+        """
+        ...
+
+
+def connect_retries(retries: int, backoff_seconds: float = 0.1) -> RetryHook | None:
+    """
+    Up to `retries` more attempts when the connection could not be opened (connect error or
+    connect timeout), so the request was never sent and retrying cannot duplicate it.
+    """
+    if retries <= 0:
+        return None
+
+    def hook(attempt: int, result: ChatFailure, exc: Exception | None) -> float | None:
+        if attempt > retries or not isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout)):
+            return None
+        return backoff_seconds * attempt
+
+    return hook
+
+
+def send(
+    client: httpx.Client,
+    url: str,
+    payload: dict[str, Any],
+    headers: dict[str, str] | None,
+    timeout: httpx.Timeout,
+    parse: Callable[[Any], ChatResult],
+    *,
+    retry: RetryHook | None = None,
+) -> ChatResult:
+    """
+    POST `payload` and map the outcome to a ChatResult: timeouts, oversized and failed
+    transports, non-200 statuses and undecodable bodies are failures; a 200 JSON body goes to
+    `parse`. The result carries the transport timing of all attempts under "transport".
+    """
+    attempt = 0
+    with capture() as trace:
+        while True:
+            attempt += 1
+            result, exc = _attempt(client, url, payload, headers, timeout, parse)
+            if result.get("success") or retry is None:
+                break
+            delay = retry(attempt, result, exc)  # type: ignore[arg-type]
+            if delay is None:
+                break
+            time.sleep(delay)
+    timing = trace.timing()
+    if timing is not None:
+        result = {**result, "transport": timing}  # type: ignore[assignment]
+    return result
+
+
+def _attempt(
+    client: httpx.Client,
+    url: str,
+    payload: dict[str, Any],
+    headers: dict[str, str] | None,
+    timeout: httpx.Timeout,
+    parse: Callable[[Any], ChatResult],
+) -> tuple[ChatResult, Exception | None]:
+    try:
+        resp = post_json(client, url, payload, headers, timeout)
+    except httpx.TimeoutException as e:
+        return timeout_failure(e), e
+    except ResponseTooLarge as e:
+        return too_large_failure(e), e
+    except httpx.RequestError as e:
+        return {"success": False, "failure_category": FAILURE_UNKNOWN, "message": str(e)}, e
+
+    if resp.status_code != 200:
+        message = "Unauthorized" if resp.status_code == 401 else resp.text or None
+        return status_failure(resp.status_code, message), None
+    try:
+        data = resp.json()
+    except Exception as e:
+        return {"success": False, "failure_category": FAILURE_UNKNOWN, "message": str(e)}, None
+    return parse(data), None
+
+
+_clients: dict[str, httpx.Client] = {}
+_clients_lock = threading.Lock()
+
+
+def client_for(provider: str, pool: PoolSettings, timeout: httpx.Timeout) -> httpx.Client:
+    """
+    Long-lived pooled client of backend `provider`, created on first use with `pool` limits
+    (later pool changes need a restart). Requests pass their own timeouts; `timeout` is only
+    the client default.
+    """
+    client = _clients.get(provider)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(provider)
+            if client is None:
+                client = _clients[provider] = provider_client(timeout, pool)
+    return client
+
+
+def close_clients() -> None:
+    """Close every pooled backend client (app shutdown; tests)."""
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        client.close()
@@ -0,0 +1,108 @@
+"""
+Admission control for chat traffic: shed new requests early instead of letting latency
+climb until clients time out.
+
+Three signals are compared with their thresholds (any threshold of 0 disables that signal):
+- event-loop lag: how late a 100 ms sleep on the event loop wakes up (LoopLagMonitor);
+- threadpool demand: (busy + waiting) / threads of the pool that runs sync endpoints;
+- provider queue depth: requests waiting for a provider slot in the scheduler.
+Pressure is the highest signal as a multiple of its threshold. Batch-class requests are shed
+from pressure 1, interactive ones only from ADMISSION_INTERACTIVE_FACTOR (default 2), so the
+lowest priority goes first. Health and metrics routes are never shed.
+"""
+
+import asyncio
+import contextlib
+from dataclasses import dataclass
+
+import anyio.to_thread
+
+from app.core.config import (
+    get_admission_interactive_factor,
+    get_admission_loop_lag_ms,
+    get_admission_queue_depth,
+    get_admission_threadpool_utilization,
+)
+from app.core.telemetry import set_admission_signals
+from app.services.scheduler import PRIORITY_BATCH, queue_depth
+
+LOOP_LAG_INTERVAL_SECONDS = 0.1
+# A spike is halved per interval instead of dropped, so one slow tick still counts briefly.
+LOOP_LAG_DECAY = 0.5
+
+
+@dataclass(frozen=True)
+class Signals:
+    """One reading of the controller's inputs."""
+
+    loop_lag_seconds: float
+    threadpool_utilization: float
+    queue_depth: int
+
+    def pressure(self) -> float:
+        """Highest signal as a multiple of its threshold (0 when every signal is disabled)."""
+        ratios = []
+        lag_ms = get_admission_loop_lag_ms()
+        if lag_ms > 0:
+            ratios.append(self.loop_lag_seconds * 1000.0 / lag_ms)
+        utilization = get_admission_threadpool_utilization()
+        if utilization > 0:
+            ratios.append(self.threadpool_utilization / utilization)
+        depth = get_admission_queue_depth()
+        if depth > 0:
+            ratios.append(self.queue_depth / depth)
+        return max(ratios, default=0.0)
+
+
+def should_shed(signals: Signals, priority: str) -> bool:
+    """True when a new request of `priority` should get 503 under `signals`."""
+    pressure = signals.pressure()
+    if priority == PRIORITY_BATCH:
+        return pressure >= 1.0
+    return pressure >= get_admission_interactive_factor()
+
+
+class LoopLagMonitor:
+    """Background task on the event loop that keeps a decaying maximum of measured lag."""
+
+    def __init__(self, interval: float = LOOP_LAG_INTERVAL_SECONDS) -> None:
+        self.interval = interval
+        self.lag_seconds = 0.0
+        self._task: asyncio.Task | None = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            sample = max(0.0, loop.time() - start - self.interval)
+            self.lag_seconds = max(sample, self.lag_seconds * LOOP_LAG_DECAY)
+
+    def start(self) -> None:
+        """Start measuring; call from the running event loop (app lifespan)."""
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+        self.lag_seconds = 0.0
+
+
+loop_lag_monitor = LoopLagMonitor()
+
+
+def current_signals() -> Signals:
+    """Read all signals and publish them as gauges. Call from the event loop."""
+    stats = anyio.to_thread.current_default_thread_limiter().statistics()
+    total = stats.total_tokens or 1
+    signals = Signals(
+        loop_lag_seconds=loop_lag_monitor.lag_seconds,
+        threadpool_utilization=(stats.borrowed_tokens + stats.tasks_waiting) / total,
+        queue_depth=queue_depth(),
+    )
+    set_admission_signals(signals.loop_lag_seconds, signals.threadpool_utilization, signals.queue_depth)
+    return signals
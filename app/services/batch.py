@@ -0,0 +1,110 @@
+"""
+POST /v1/chat/batch: many independent chats in one HTTP request.
+
+Every request is routed with decide() up front, then provider calls run concurrently with a
+separate limit per provider (BATCH_LOCAL_CONCURRENCY for the local GPU, BATCH_PUBLIC_CONCURRENCY
+for openai/anthropic), so a large batch cannot flood Ollama while public calls wait. Results
+are yielded as NDJSON lines in completion order, each tagged with its request index. Audit
+events for the whole batch are written in one bulk insert once the last call has finished
+(also when the client disconnects early: calls already running are awaited and audited, calls
+not yet started are cancelled).
+"""
+
+import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Iterator, Mapping
+
+from fastapi import BackgroundTasks
+
+from app.api.schemas.batch import ChatBatchItem
+from app.api.schemas.chat import ChatRequest, ChatResponse
+from app.audit.context import AuditRequestContext
+from app.audit.service import persist_audit_events
+from app.core.config import get_batch_concurrency
+from app.services.chat_orchestrator import (
+    PreparedChat,
+    execute_chat,
+    failed_chat,
+    prepare_chat,
+    record_spend,
+    schedule_shadow,
+)
+from app.services.scheduler import PRIORITY_BATCH
+
+logger = logging.getLogger(__name__)
+
+
+def run_batch(
+    bodies: list[ChatRequest],
+    headers: Mapping[str, str] | None = None,
+    background: BackgroundTasks | None = None,
+) -> Iterator[str]:
+    """
+    Route every request, then yield one NDJSON line (ChatBatchItem) per request as its
+    provider call completes. Shadow evaluations are queued on `background` (after the stream).
+    """
+    prepared = [prepare_chat(body, headers, PRIORITY_BATCH) for body in bodies]
+    by_provider: dict[str, list[int]] = {}
+    for i, p in enumerate(prepared):
+        by_provider.setdefault(p.provider, []).append(i)
+    return _stream(prepared, by_provider, background)
+
+
+def _stream(
+    prepared: list[PreparedChat], by_provider: dict[str, list[int]], background: BackgroundTasks | None
+) -> Iterator[str]:
+    executors = {
+        provider: ThreadPoolExecutor(
+            max_workers=min(get_batch_concurrency(provider), len(indexes)),
+            thread_name_prefix=f"batch-{provider}",
+        )
+        for provider, indexes in by_provider.items()
+    }
+    futures: dict[Future, int] = {
+        executors[provider].submit(_execute, prepared[i]): i
+        for provider, indexes in by_provider.items()
+        for i in indexes
+    }
+    contexts: dict[int, AuditRequestContext] = {}
+    try:
+        for future in as_completed(futures):
+            i = futures[future]
+            response = _collect(future, contexts, i)
+            yield ChatBatchItem(index=i, **response.model_dump()).model_dump_json() + "\n"
+    finally:
+        for executor in executors.values():
+            executor.shutdown(wait=True, cancel_futures=True)
+        for future, i in futures.items():
+            if i not in contexts and future.done() and not future.cancelled():
+                _collect(future, contexts, i)
+        _persist(contexts)
+        for i in sorted(contexts):
+            schedule_shadow(prepared[i], background)
+
+
+def _execute(prepared: PreparedChat) -> tuple[ChatResponse, AuditRequestContext]:
+    start = time.perf_counter()
+    try:
+        return execute_chat(prepared)
+    except Exception as exc:
+        # One broken item must not end the stream; it gets an error line and a failure audit event.
+        logger.warning("batch item failed (%s)", type(exc).__name__)
+        return failed_chat(prepared, (time.perf_counter() - start) * 1000.0)
+
+
+def _collect(future: Future, contexts: dict[int, AuditRequestContext], index: int) -> ChatResponse:
+    response, ctx = future.result()
+    contexts[index] = ctx
+    return response
+
+
+def _persist(contexts: dict[int, AuditRequestContext]) -> None:
+    ordered = [contexts[i] for i in sorted(contexts)]
+    try:
+        persist_audit_events(ordered)
+    except Exception as exc:
+        # The responses are already streamed; report instead of breaking the stream.
+        # Only the exception type is logged: driver messages can echo connection details.
+        logger.warning("batch audit insert failed (%s)", type(exc).__name__)
+    record_spend(ordered)
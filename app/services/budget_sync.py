@@ -0,0 +1,82 @@
+"""
+Spend ledger sync from the audit log: on startup, then every BUDGET_SYNC_SECONDS.
+
+The ledger is rebuilt from audit_events: cost_usd summed per tenant and hour over the
+ledger's retention window. Every worker writes its spend there, so each sync brings in the
+spend of all workers, not only this one's; between syncs a worker sees the others' spend up
+to one interval late. Spend enters the ledger only after its audit event is written (see
+chat_orchestrator.record_spend), and this worker's records newer than the read are kept
+across the rebuild (SpendLedger.replace). No-op when audit is disabled.
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
+
+from app.audit.repository import sum_spend_by_hour
+from app.core.config import get_audit_enabled, get_budget_sync_seconds, get_database_url
+from app.decision.budget import SpendLedger, spend_ledger
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+
+def restore_spend_ledger(
+    ledger: SpendLedger = spend_ledger, session: "Session | None" = None, now: float | None = None
+) -> int:
+    """Rebuild `ledger` from audit spend within its retention window. Returns (tenant, hour) row count."""
+    now = time.time() if now is None else now
+    since = datetime.fromtimestamp(now - ledger.retention_seconds, timezone.utc)
+    marker = ledger.sync_marker()
+    rows = sum_spend_by_hour(since, session=session)
+    ledger.replace(rows, marker)
+    return len(rows)
+
+
+class BudgetSync:
+    """Owns the spend ledger sync thread for one process (started from the app lifespan)."""
+
+    def __init__(self, ledger: SpendLedger = spend_ledger) -> None:
+        self.ledger = ledger
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @staticmethod
+    def enabled() -> bool:
+        return get_audit_enabled() and bool(get_database_url())
+
+    def start(self) -> None:
+        if not self.enabled():
+            return
+        if not self._sync():
+            logger.warning("budgets start empty until the next spend ledger sync")
+        interval = get_budget_sync_seconds()
+        if interval > 0:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, args=(interval,), name="budget-sync", daemon=True)
+            self._thread.start()
+
+    def _run(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            self._sync()
+
+    def _sync(self) -> bool:
+        try:
+            restore_spend_ledger(self.ledger)
+            return True
+        except Exception as exc:
+            # The ledger keeps its current state; routing must not fail because the DB is down.
+            # Only the exception type is logged: driver messages can echo connection details.
+            logger.warning("spend ledger sync failed (%s)", type(exc).__name__)
+            return False
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=5)
+        self._thread = None
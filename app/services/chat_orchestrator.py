@@ -3,17 +3,75 @@
 """
 
 import hashlib
+import json
+import random
 import time
 import uuid
+from dataclasses import dataclass, field
+from typing import Any, Mapping, Sequence
 
-from app.api.schemas.chat import ChatRequest, ChatResponse
+from fastapi import BackgroundTasks
+
+from app.api.schemas.chat import ChatRequest, ChatResponse, ChatUsageView, DecisionTraceView
 from app.audit.context import AuditRequestContext
 from app.audit.service import persist_audit_event
-from app.core.telemetry import record_chat_request
-from app.decision.engine import decide
-from app.providers import anthropic as anthropic_provider
-from app.providers import ollama as ollama_provider
-from app.providers import openai as openai_provider
+from app.core.config import (
+    DECISION_SCOPE_CONVERSATION,
+    PolicyConfig,
+    get_decision_trace_sample_rate,
+    get_policy_config,
+)
+from app.core.telemetry import (
+    record_canary_request,
+    record_chat_request,
+    record_deadline_skip,
+    record_model_downgrade,
+    record_oversize,
+    record_provider_timeout,
+    record_public_spend,
+    record_queue_wait,
+    record_timeout_plan,
+    record_transport_timing,
+    record_usage,
+)
+from app.core.tenancy import resolve_tenant
+from app.decision.budget import spend_ledger
+from app.decision.engine import DecisionResult, decide, decision_string
+from app.decision.latency import latency_models
+from app.decision.pricing import CACHE_READ_PRICE_FACTOR, CACHE_WRITE_PRICE_FACTOR
+from app.decision.reason_codes import LOCAL_MODEL_DOWNGRADED, SENSITIVITY_REASON_CODES, SESSION_SENSITIVE
+from app.decision.rollout import ROLLOUT_CANARY, ROLLOUT_SHADOW
+from app.decision.rules import usage_cost_usd
+from app.decision.tokens import TOKENIZER_BPE_ESTIMATE, estimate_tokens
+from app.decision.trace import DecisionTrace
+from app.providers import registry as provider_registry
+from app.providers.base import (
+    FAILURE_DEADLINE_EXCEEDED,
+    FAILURE_RESPONSE_TOO_LARGE,
+    FAILURE_TIMEOUT,
+    FAILURE_UNKNOWN,
+    ChatResult,
+)
+from app.services.local_load import local_load
+from app.services.scheduler import (
+    PRIORITY_INTERACTIVE,
+    SlotTimeout,
+    resolve_priority,
+    scheduler_for,
+    tenant_weight,
+)
+from app.services.sessions import Session, SessionError, append_turn, check_size, session_store
+from app.services.shadow import evaluate_shadow
+from app.services.timeouts import (
+    latency_windows,
+    parse_deadline,
+    plan_timeouts,
+    prompt_bucket,
+    slot_wait_limit,
+)
+
+TRACE_HEADER = "x-decision-trace"
+HASH_WINDOW_CHARS = 1 << 20
 
 
 def _prompt_from_request(body: ChatRequest) -> tuple[str, int]:
@@ -26,10 +84,12 @@ def _prompt_from_request(body: ChatRequest) -> tuple[str, int]:
     return prompt_text, len(prompt_text)
 
 
-def _decision_string(provider: str, reason_codes: list[str]) -> str:
-    """Stable string for audit: provider=X,reason_codes=A,B."""
-    codes = ",".join(reason_codes) if reason_codes else ""
-    return f"provider={provider},reason_codes={codes}"
+def _sha256_text(text: str) -> str:
+    """SHA-256 hex of UTF-8 `text`, encoded in windows so a huge prompt is not copied whole."""
+    digest = hashlib.sha256()
+    for start in range(0, len(text), HASH_WINDOW_CHARS):
+        digest.update(text[start : start + HASH_WINDOW_CHARS].encode())
+    return digest.hexdigest()
 
 
 def _messages_for_provider(body: ChatRequest) -> list[dict[str, str]]:
@@ -37,64 +97,502 @@ def _messages_for_provider(body: ChatRequest) -> list[dict[str, str]]:
     return [{"role": m.role, "content": m.content} for m in body.messages]
 
 
-def handle_chat_request(body: ChatRequest) -> ChatResponse:
+def _usage_view(
+    result: dict, decision: DecisionResult, config: PolicyConfig, provider: str, model: str | None
+) -> ChatUsageView:
     """
-    Run full orchestration: decide → provider → audit → metrics → response.
-    Returns ChatResponse with provider, reason_codes, and content (success) or error (failure).
+    Usage for a successful call. Cost uses reported token counts priced like the cost rule
+    (prompt-cache reads and writes at their share of the input price); when the provider
+    reports none (or the target is unpriced), the decision-time estimate.
     """
+    usage = result.get("usage") or {}
+    input_tokens = usage.get("input_tokens")
+    output_tokens = usage.get("output_tokens")
+    generation_seconds = usage.get("generation_seconds")
+    tokens_per_second = (
+        output_tokens / generation_seconds if output_tokens and generation_seconds else None
+    )
+    cost_usd = None
+    if input_tokens is not None or output_tokens is not None:
+        billed_input = (
+            (input_tokens or 0)
+            + usage.get("cache_read_input_tokens", 0) * CACHE_READ_PRICE_FACTOR
+            + usage.get("cache_creation_input_tokens", 0) * CACHE_WRITE_PRICE_FACTOR
+        )
+        cost_usd = usage_cost_usd(config, provider, model, billed_input, output_tokens or 0)
+    if cost_usd is None:
+        cost_usd = decision.get("estimated_cost_usd", 0.0)
+    return ChatUsageView(
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        tokens_per_second=tokens_per_second,
+        cost_usd=cost_usd,
+    )
+
+
+def _trace_requested(headers: Mapping[str, str] | None) -> bool:
+    """X-Decision-Trace: 1|true enables the trace; otherwise DECISION_TRACE_SAMPLE_RATE samples."""
+    if headers:
+        value = next((v for k, v in headers.items() if k.lower() == TRACE_HEADER), None)
+        if value is not None and value.strip().lower() in ("1", "true"):
+            return True
+    rate = get_decision_trace_sample_rate()
+    return rate > 0 and random.random() < rate
+
+
+@dataclass
+class PreparedChat:
+    """A request after routing, before the provider call (see prepare_chat / execute_chat)."""
+
+    request_id: str
+    body: ChatRequest
+    tenant: str | None
+    prompt_text: str
+    prompt_length: int
+    prompt_hash: str | None
+    config: PolicyConfig
+    policy_variant: str | None
+    decide_kwargs: dict[str, Any]
+    decision: DecisionResult
+    trace: DecisionTrace | None
+    priority: str = PRIORITY_INTERACTIVE
+    deadline: float | None = None  # time.monotonic() from X-Deadline-Ms
+    # Session turns: the claimed session, its earlier messages (sent to the provider before
+    # body.messages), their total length, and the token estimate of what this turn scanned.
+    session: Session | None = None
+    history: list[dict[str, str]] = field(default_factory=list)
+    history_chars: int = 0
+    scanned_tokens: float = 0.0
+
+    @property
+    def provider(self) -> str:
+        return self.decision["provider"]
+
+    @property
+    def decision_length(self) -> int:
+        """Prompt length as the decision engine measured it (all messages in conversation scope)."""
+        if self.config.decision_scope == DECISION_SCOPE_CONVERSATION:
+            return self.history_chars + sum(len(m.content) for m in self.body.messages)
+        return self.prompt_length
+
+
+def prepare_chat(
+    body: ChatRequest,
+    headers: Mapping[str, str] | None = None,
+    default_priority: str = PRIORITY_INTERACTIVE,
+    extra_segments: Sequence[str] = (),
+) -> PreparedChat:
+    """
+    Resolve tenant, priority class, session and policy (canary selection included) and decide
+    the route. `extra_segments` are request texts outside `body.messages` that sensitivity must
+    also scan. Raises SessionError for session requests that cannot be served; a claimed
+    session stays claimed until release_session().
+    """
+    tenant = resolve_tenant(headers)
+    session = None
+    if body.session_id is not None:
+        if body.start_session:
+            raise SessionError(422, "Send either start_session or session_id, not both")
+        session = session_store.claim(body.session_id, tenant)
+    elif body.start_session:
+        session = session_store.start(tenant)
+    try:
+        return _prepare_chat(body, headers, default_priority, tenant, session, extra_segments)
+    except BaseException:
+        if session is not None:
+            session_store.release(session)
+        raise
+
+
+def release_session(prepared: PreparedChat) -> None:
+    """Let the next turn of the prepared request's session run (no-op without a session)."""
+    if prepared.session is not None:
+        session_store.release(prepared.session)
+
+
+def _prepare_chat(
+    body: ChatRequest,
+    headers: Mapping[str, str] | None,
+    default_priority: str,
+    tenant: str | None,
+    session: Session | None,
+    extra_segments: Sequence[str],
+) -> PreparedChat:
+    deadline = parse_deadline(headers)
     request_id = str(uuid.uuid4())
     prompt_text, prompt_length = _prompt_from_request(body)
-    decision = decide(prompt_text=prompt_text, prompt_length=prompt_length)
-    provider_key = decision["provider"]
+    # Hashed once: keys the decision cache and is stored in audit.
+    prompt_hash = _sha256_text(prompt_text) if prompt_text else None
+    # Loaded once: the same policy prices the decision and the reported usage.
+    config = get_policy_config(tenant)
+    rollout = config.rollout
+    policy_variant = None
+    if rollout is not None and rollout.mode == ROLLOUT_CANARY:
+        policy_variant = "candidate" if rollout.in_canary(request_id, tenant) else "active"
+        record_canary_request(policy_variant)
+        if policy_variant == "candidate":
+            config = rollout.candidate
+    segments = [m.content for m in body.messages]
+    history: list[dict[str, str]] = []
+    history_length = history_chars = 0
+    if session is not None:
+        check_size(session, _messages_for_provider(body))
+        # Only what no earlier turn scanned: the last assistant reply and the new messages.
+        unscanned = [m["content"] for m in session.unscanned()]
+        segments = unscanned + segments
+        history = list(session.messages)
+        history_chars = session.chars
+        history_length = session.chars - sum(len(c) for c in unscanned)
+    decide_kwargs = {
+        "prompt_text": prompt_text,
+        "prompt_length": prompt_length,
+        "model": body.model,
+        "headers": headers,
+        "messages": segments,
+        "extra_segments": tuple(extra_segments),
+        "prompt_hash": prompt_hash,
+        "tenant": tenant,
+        "history_length": history_length,
+        "history_tokens": session.tokens if session is not None else 0.0,
+    }
+    trace = DecisionTrace() if _trace_requested(headers) else None
+    if session is not None and session.sensitive:
+        # Earlier turns already went to the local model; this one must not leave it.
+        decision: DecisionResult = {"provider": "local", "reason_codes": [SESSION_SENSITIVE]}
+    else:
+        decision = decide(config=config, trace=trace, **decide_kwargs)
+        if session is not None and SENSITIVITY_REASON_CODES.intersection(decision["reason_codes"]):
+            session.sensitive = True
+    scanned_tokens = 0.0
+    if session is not None and config.cost_tokenizer == TOKENIZER_BPE_ESTIMATE:
+        scanned_tokens = estimate_tokens(tuple(segments), config.cost_tokenizer, config.cost_chars_per_token)
+    return PreparedChat(
+        request_id=request_id,
+        body=body,
+        tenant=tenant,
+        prompt_text=prompt_text,
+        prompt_length=prompt_length,
+        prompt_hash=prompt_hash,
+        config=config,
+        policy_variant=policy_variant,
+        decide_kwargs=decide_kwargs,
+        decision=decision,
+        trace=trace,
+        priority=resolve_priority(headers, tenant, default_priority),
+        deadline=deadline,
+        session=session,
+        history=history,
+        history_chars=history_chars,
+        scanned_tokens=scanned_tokens,
+    )
+
+
+def deadline_failure(provider: str) -> ChatResult:
+    record_deadline_skip(provider)
+    return {"success": False, "failure_category": FAILURE_DEADLINE_EXCEEDED, "message": "Deadline cannot be met"}
+
+
+def _local_fallback(prepared: PreparedChat) -> str | None:
+    """Smaller model to use instead of the requested one while the local provider is saturated."""
+    fallbacks = prepared.config.local_fallbacks
+    if prepared.provider != "local" or fallbacks is None:
+        return None
+    # Evaluated on every local request so the state can recover, mapped model or not.
+    saturated = local_load.update(fallbacks, sum(scheduler_for("local").waiting().values()))
+    return fallbacks.fallback_for(prepared.body.model) if saturated else None
+
+
+def call_provider(
+    prepared: PreparedChat, messages: list[dict[str, str]], model: str | None
+) -> tuple[ChatResult, float, float]:
+    """
+    Call the routed provider with `model` within its scheduler slot and timeout plan.
+    Returns (result, latency_ms, queue_wait_seconds); latency excludes the slot wait.
+    """
+    provider_key = prepared.provider
+    prompt_chars = sum(len(m["content"]) for m in messages)
+    # Checked before queueing so a hopeless request does not take a slot.
+    if plan_timeouts(provider_key, prompt_chars, prepared.deadline).skip:
+        return deadline_failure(provider_key), 0.0, 0.0
+    # Waits for a provider slot (priority class, then tenant fair share), at most the pool
+    # timeout or the time left before the deadline.
+    scheduler = scheduler_for(provider_key)
+    wait_limit, by_deadline = slot_wait_limit(provider_key, prepared.deadline)
+    try:
+        with scheduler.slot(
+            prepared.tenant, prepared.priority, tenant_weight(prepared.tenant), wait_limit
+        ) as queue_wait:
+            # Planned again after the wait: the deadline has moved closer.
+            plan = plan_timeouts(provider_key, prompt_chars, prepared.deadline)
+            if plan.skip:
+                result: ChatResult = deadline_failure(provider_key)
+                latency_ms = 0.0
+            else:
+                record_timeout_plan(provider_key, plan.source, plan.timeouts.read)
+                start = time.perf_counter()
+                result = provider_registry.chat(provider_key, messages, model=model, timeout=plan.timeouts)
+                latency_ms = (time.perf_counter() - start) * 1000.0
+    except SlotTimeout as exc:
+        # Raised only while waiting for the slot: nothing was sent.
+        return slot_timeout_failure(prepared, by_deadline, exc.waited), 0.0, exc.waited
+    observe_call(prepared, prompt_chars, result, latency_ms, queue_wait)
+    return result, latency_ms, queue_wait
+
+
+def slot_timeout_failure(prepared: PreparedChat, by_deadline: bool, waited: float) -> ChatResult:
+    """Result for a request that gave up waiting for a provider slot (nothing was sent)."""
+    provider_key = prepared.provider
+    record_queue_wait(provider_key, prepared.priority, waited)
+    if by_deadline:
+        return deadline_failure(provider_key)
+    record_provider_timeout(provider_key, "pool")
+    return {
+        "success": False,
+        "failure_category": FAILURE_TIMEOUT,
+        "message": "No provider slot free within the pool timeout",
+        "timeout_phase": "pool",
+    }
+
+
+def observe_call(
+    prepared: PreparedChat, prompt_chars: int, result: ChatResult, latency_ms: float, queue_wait: float
+) -> None:
+    """Feed a finished provider call into slot-wait, timeout, latency and local-load tracking."""
+    provider_key = prepared.provider
+    record_queue_wait(provider_key, prepared.priority, queue_wait)
+    if "transport" in result:
+        record_transport_timing(provider_key, result["transport"])
+    if result.get("success"):
+        latency_windows.observe(provider_key, prompt_bucket(prompt_chars), latency_ms / 1000.0)
+        latency_models.observe(provider_key, prepared.decision_length, latency_ms / 1000.0)
+    elif result.get("failure_category") == FAILURE_TIMEOUT:
+        record_provider_timeout(provider_key, result.get("timeout_phase") or "read")
+    elif result.get("failure_category") == FAILURE_RESPONSE_TOO_LARGE:
+        record_oversize("provider_response")
+    if provider_key == "local" and (result.get("success") or result.get("failure_category") == FAILURE_TIMEOUT):
+        # A timed-out call still shows how slow the local GPU is.
+        local_load.observe(latency_ms)
+
+
+@dataclass
+class ChatCall:
+    """One provider call for a prepared request: what is sent, and the codes/flags to audit."""
+
+    messages: list[dict[str, str]]  # session history + new messages
+    new_messages: list[dict[str, str]]
+    model: str | None
+    reason_codes: list[str]
+    flags: list[str]
+
+
+def begin_call(prepared: PreparedChat) -> ChatCall:
+    """Assemble the provider call: session history, local model fallback, audit flags."""
+    decision = prepared.decision
     reason_codes = decision["reason_codes"]
-    messages = _messages_for_provider(body)
-    model = body.model
+    new_messages = _messages_for_provider(prepared.body)
+    model = prepared.body.model
+    flags = list(decision.get("flags") or [])
+    if prepared.session is not None:
+        flags.append(f"session_turn={prepared.session.turns + 1}")
+    fallback = _local_fallback(prepared)
+    if fallback is not None:
+        # Copied, not appended in place: the decision may be shared through the decision cache.
+        reason_codes = [*reason_codes, LOCAL_MODEL_DOWNGRADED]
+        flags.append(f"model_downgraded={model or 'default'}")
+        record_model_downgrade(model, fallback)
+        model = fallback
+    return ChatCall([*prepared.history, *new_messages], new_messages, model, reason_codes, flags)
 
-    start = time.perf_counter()
-    if provider_key == "local":
-        result = ollama_provider.chat(messages, model=model)
-    elif provider_key == "anthropic":
-        result = anthropic_provider.chat(messages, model=model)
-    else:
-        result = openai_provider.chat(messages, model=model)
-    latency_ms = (time.perf_counter() - start) * 1000.0
 
-    decision_str = _decision_string(provider_key, reason_codes)
-    prompt_hash = hashlib.sha256(prompt_text.encode()).hexdigest() if prompt_text else None
-    prompt_flags = None  # placeholder for future flags
+def execute_chat(prepared: PreparedChat) -> tuple[ChatResponse, AuditRequestContext]:
+    """
+    Call the routed provider, record usage and metrics. Returns the response and the audit
+    context; persisting the audit event (then record_spend) is left to the caller (single or
+    bulk insert).
+    """
+    call = begin_call(prepared)
+    result, latency_ms, queue_wait = call_provider(prepared, call.messages, call.model)
+    return finish_chat(prepared, call, result, latency_ms, queue_wait)
+
+
+def finish_chat(
+    prepared: PreparedChat, call: ChatCall, result: ChatResult, latency_ms: float, queue_wait: float
+) -> tuple[ChatResponse, AuditRequestContext]:
+    """Record usage and metrics for a finished call; build the response and audit context."""
+    decision = prepared.decision
+    config = prepared.config
+    provider_key = decision["provider"]
+    reason_codes, flags, model, messages = call.reason_codes, call.flags, call.model, call.messages
+    session = prepared.session
+
+    decision_str = decision_string(provider_key, reason_codes)
+    # Safe metadata flags from the decision (e.g. detectors=api_key,email); never prompt text.
+    prompt_flags = ";".join(flags) or None
 
+    usage = None
+    served_model = model
     if result.get("success"):
         status = "success"
         failure_category = None
+        served_model = result.get("model") or model
+        usage = _usage_view(result, decision, config, provider_key, model or served_model)
+        reported = result.get("usage") or {}
+        record_usage(
+            provider_key,
+            served_model,
+            usage.input_tokens,
+            usage.output_tokens,
+            usage.tokens_per_second,
+            sum(len(m["content"]) for m in messages),
+            reported.get("cache_read_input_tokens"),
+            reported.get("cache_creation_input_tokens"),
+        )
+        # Failed calls are not billed; budgets count the spend in record_spend.
+        if usage.cost_usd:
+            record_public_spend(provider_key, served_model, usage.cost_usd)
     else:
         status = "failure"
         failure_category = result.get("failure_category") or "unknown"
 
+    trace = prepared.trace
     ctx = AuditRequestContext(
-        request_id=request_id,
+        request_id=prepared.request_id,
         decision=decision_str,
         status=status,
         latency_ms=latency_ms,
         failure_category=failure_category,
-        prompt_hash=prompt_hash,
-        prompt_length=prompt_length if prompt_text else None,
+        prompt_hash=prepared.prompt_hash,
+        prompt_length=prepared.prompt_length if prepared.prompt_text else None,
         prompt_flags=prompt_flags,
+        tenant=prepared.tenant,
+        cost_usd=(usage.cost_usd or None) if usage else None,
+        model=served_model,
+        input_tokens=usage.input_tokens if usage else None,
+        output_tokens=usage.output_tokens if usage else None,
+        tokens_per_second=usage.tokens_per_second if usage else None,
+        policy_variant=prepared.policy_variant,
+        decision_trace=trace.to_compact_json() if trace else None,
+        priority=prepared.priority,
+        queue_wait_ms=queue_wait * 1000.0,
+        transport_timing=json.dumps(result["transport"], separators=(",", ":")) if "transport" in result else None,
     )
-    persist_audit_event(ctx)
-    record_chat_request(request_id, provider_key, reason_codes, status, latency_ms)
+    record_chat_request(prepared.request_id, provider_key, reason_codes, status, latency_ms)
 
+    trace_view = DecisionTraceView.model_validate(trace.to_dict()) if trace else None
+    session_id = session.id if session is not None else None
     if result.get("success"):
-        return ChatResponse(
-            request_id=request_id,
+        if session is not None:
+            append_turn(session, call.new_messages, result.get("content", ""), prepared.scanned_tokens)
+        response = ChatResponse(
+            request_id=prepared.request_id,
             provider=provider_key,
             reason_codes=reason_codes,
             content=result.get("content", ""),
             error=None,
+            model=served_model,
+            usage=usage,
+            trace=trace_view,
+            session_id=session_id,
         )
-    return ChatResponse(
-        request_id=request_id,
-        provider=provider_key,
+    else:
+        # The turn is not added: the client retries the same new messages.
+        response = ChatResponse(
+            request_id=prepared.request_id,
+            provider=provider_key,
+            reason_codes=reason_codes,
+            content=None,
+            error=result.get("message") or result.get("failure_category", "unknown"),
+            trace=trace_view,
+            session_id=session_id,
+        )
+    return response, ctx
+
+
+def failed_chat(prepared: PreparedChat, latency_ms: float) -> tuple[ChatResponse, AuditRequestContext]:
+    """
+    Response and failure audit context for a prepared request whose execution raised, so the
+    routing decision is audited like any other failed call (failure_category "unknown").
+    """
+    decision = prepared.decision
+    reason_codes = decision["reason_codes"]
+    ctx = AuditRequestContext(
+        request_id=prepared.request_id,
+        decision=decision_string(prepared.provider, reason_codes),
+        status="failure",
+        latency_ms=latency_ms,
+        failure_category=FAILURE_UNKNOWN,
+        prompt_hash=prepared.prompt_hash,
+        prompt_length=prepared.prompt_length if prepared.prompt_text else None,
+        prompt_flags=";".join(decision.get("flags") or []) or None,
+        tenant=prepared.tenant,
+        model=prepared.body.model,
+        policy_variant=prepared.policy_variant,
+        decision_trace=prepared.trace.to_compact_json() if prepared.trace else None,
+        priority=prepared.priority,
+    )
+    record_chat_request(prepared.request_id, prepared.provider, reason_codes, "failure", latency_ms)
+    response = ChatResponse(
+        request_id=prepared.request_id,
+        provider=prepared.provider,
         reason_codes=reason_codes,
-        content=None,
-        error=result.get("message") or result.get("failure_category", "unknown"),
+        error="internal_error",
     )
+    return response, ctx
+
+
+def record_spend(contexts: Sequence[AuditRequestContext]) -> None:
+    """
+    Count audited public spend toward budgets. Called after the audit events are written (or
+    the write failed), never before: a ledger restore reads audit rows, so spend is not
+    counted both from the ledger and from a row it already sees.
+    """
+    for ctx in contexts:
+        if ctx.cost_usd:
+            spend_ledger.add(ctx.tenant, ctx.cost_usd)
+
+
+def schedule_shadow(prepared: PreparedChat, background: BackgroundTasks | None = None) -> None:
+    """Queue the shadow candidate's decision for this request (shadow rollouts only)."""
+    rollout = prepared.config.rollout
+    if rollout is None or rollout.mode != ROLLOUT_SHADOW:
+        return
+    # Decision-only comparison; kept off the response path when the caller allows it.
+    args = (rollout, prepared.request_id, prepared.decision, prepared.decide_kwargs)
+    if background is not None:
+        background.add_task(evaluate_shadow, *args)
+    else:
+        evaluate_shadow(*args)
+
+
+def handle_chat_request(
+    body: ChatRequest,
+    headers: Mapping[str, str] | None = None,
+    background: BackgroundTasks | None = None,
+    default_priority: str = PRIORITY_INTERACTIVE,
+) -> ChatResponse:
+    """
+    Run full orchestration: decide → provider → audit → metrics → response.
+    headers: request headers, available to header-based routing rules.
+    background: where post-response work (shadow policy evaluation) is queued; when None it
+    runs inline before returning.
+    default_priority: scheduler class when neither X-Priority nor the tenant sets one.
+    Raises SessionError for a session request that cannot be served.
+    Returns ChatResponse with provider, reason_codes, and content (success) or error (failure).
+    """
+    prepared = prepare_chat(body, headers, default_priority)
+    start = time.perf_counter()
+    try:
+        response, ctx = execute_chat(prepared)
+    except Exception:
+        # Audited as a failure before the error propagates (500), like a batch item.
+        _, ctx = failed_chat(prepared, (time.perf_counter() - start) * 1000.0)
+        persist_audit_event(ctx)
+        raise
+    finally:
+        release_session(prepared)
+    try:
+        persist_audit_event(ctx)
+    finally:
+        record_spend([ctx])
+    schedule_shadow(prepared, background)
+    return response
@@ -0,0 +1,393 @@
+"""
+POST /v1/chat/completions: OpenAI-compatible pass-through with the normal routing and audit.
+
+The request is decided like /v1/chat (text of the messages; other fields are not read). When
+the route's backend speaks the OpenAI API (openai-kind backends such as vLLM or llama.cpp, or
+Ollama's /v1/chat/completions), the
+client's request bytes are sent upstream unchanged and the upstream response bytes are relayed
+as they arrive, without decoding: streamed (SSE) and non-streamed responses alike, error
+statuses included. Only the first HEAD_BYTES and the last TAIL_BYTES are kept, to read the
+served model and the trailing `usage` object for accounting (streams report usage only when the
+client sets stream_options.include_usage). Anthropic is transcoded: the call goes through the
+regular adapter and the reply is returned as an OpenAI chat.completion (or a one-chunk stream).
+
+The provider slot is held until the relay finishes; the audit event is written then.
+"""
+
+import json
+import logging
+import re
+import time
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from typing import Any, Iterator, Mapping
+
+import httpx
+from fastapi import BackgroundTasks
+from pydantic import ValidationError
+
+from app.api.schemas.chat import ChatMessage, ChatRequest, ChatResponse
+from app.audit.service import persist_audit_event
+from app.core.telemetry import record_chat_completion, record_timeout_plan
+from app.providers import openai as openai_provider
+from app.providers import registry as provider_registry
+from app.providers.base import (
+    FAILURE_AUTH_ERROR,
+    FAILURE_DEADLINE_EXCEEDED,
+    FAILURE_TIMEOUT,
+    FAILURE_UNKNOWN,
+    ChatResult,
+    ResponseTooLarge,
+    http_timeout,
+    status_failure,
+    success,
+    timeout_failure,
+    too_large_failure,
+    usage_from,
+)
+from app.providers.registry import PASSTHROUGH_KINDS, Backend
+from app.providers.tracing import TransportTrace
+from app.services.chat_orchestrator import (
+    ChatCall,
+    PreparedChat,
+    begin_call,
+    call_provider,
+    deadline_failure,
+    finish_chat,
+    observe_call,
+    prepare_chat,
+    record_spend,
+    schedule_shadow,
+    slot_timeout_failure,
+)
+from app.services.scheduler import SlotTimeout, scheduler_for, tenant_weight
+from app.services.timeouts import plan_timeouts, slot_wait_limit
+
+logger = logging.getLogger(__name__)
+
+HEAD_BYTES = 2048
+TAIL_BYTES = 8192
+
+_USAGE = re.compile(rb'"usage"\s*:\s*\{')
+_MODEL = re.compile(rb'"model"\s*:\s*"([^"\\]{1,200})"')
+_ROLES = frozenset({"system", "developer", "user", "assistant", "tool", "function"})
+
+
+class CompletionError(Exception):
+    """A request rejected before routing; rendered as an OpenAI error object."""
+
+    def __init__(self, status_code: int, message: str) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+        self.message = message
+
+
+@dataclass
+class CompletionStart:
+    """Status and headers of the response, known before its body is relayed."""
+
+    status_code: int
+    media_type: str
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+def error_body(message: str, error_type: str = "invalid_request_error") -> bytes:
+    """OpenAI-style error object."""
+    return json.dumps({"error": {"message": message, "type": error_type, "code": None}}).encode()
+
+
+def _text(content: Any) -> str:
+    """Text of an OpenAI message content: a string, or the text parts of a content array."""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "\n".join(
+            str(part.get("text", "")) for part in content if isinstance(part, dict) and part.get("type") == "text"
+        )
+    return ""
+
+
+def parse_completion_body(raw: bytes) -> tuple[dict[str, Any], ChatRequest]:
+    """The decoded request and its routing view (message texts and model). Raises CompletionError (400)."""
+    try:
+        data = json.loads(raw)
+    except ValueError:
+        raise CompletionError(400, "Request body must be a JSON object") from None
+    if not isinstance(data, dict) or not isinstance(data.get("messages"), list):
+        raise CompletionError(400, "'messages' must be an array")
+    try:
+        body = ChatRequest(
+            messages=[
+                ChatMessage(role=str(m.get("role") or "user"), content=_text(m.get("content")))
+                for m in data["messages"]
+                if isinstance(m, dict)
+            ],
+            model=data["model"] if isinstance(data.get("model"), str) else None,
+        )
+    except ValidationError:
+        raise CompletionError(400, "'messages' must contain at least one message") from None
+    return data, body
+
+
+def _strings(value: Any) -> Iterator[str]:
+    """Every string in a decoded JSON value: strings, and the keys and values of nested objects."""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            yield key
+            yield from _strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _strings(item)
+
+
+def unscanned_texts(data: dict[str, Any]) -> list[str]:
+    """
+    Strings of a completion body that parse_completion_body does not put in the message texts:
+    tool calls and their arguments, tool definitions, non-text content parts and any other
+    field. They are forwarded as sent, so the sensitivity rule scans them too. Only `model` and
+    the standard message roles are left out: plain text-only bodies then add nothing.
+    """
+    texts: list[str] = []
+    for key, value in data.items():
+        if key not in ("model", "messages"):
+            texts.extend(_strings(value))
+    for message in data["messages"]:
+        if not isinstance(message, dict):
+            continue
+        for key, value in message.items():
+            if key == "role" and value in _ROLES:
+                continue
+            if key != "content" or not isinstance(value, (str, list)):
+                texts.extend(_strings(value))
+            elif isinstance(value, list):
+                for part in value:
+                    if not (isinstance(part, dict) and part.get("type") == "text"):
+                        texts.extend(_strings(part))
+    return texts
+
+
+def run_completion(
+    raw: bytes, headers: Mapping[str, str] | None = None, background: BackgroundTasks | None = None
+) -> tuple[CompletionStart, Iterator[bytes]]:
+    """
+    Route the request and open the upstream response. Returns the response start and the body
+    iterator, which holds the provider slot and writes the audit event when exhausted or closed.
+    Shadow evaluations are queued on `background`. Raises CompletionError for a malformed body.
+    """
+    data, body = parse_completion_body(raw)
+    prepared = prepare_chat(body, headers, extra_segments=unscanned_texts(data))
+    call = begin_call(prepared)
+    backend = provider_registry.get_backend(prepared.provider)
+    if backend is None or backend.kind not in PASSTHROUGH_KINDS:
+        record_chat_completion("transcode")
+        start, chunks = _transcode(prepared, call, bool(data.get("stream")))
+        schedule_shadow(prepared, background)
+        return start, chunks
+    record_chat_completion("relay")
+    if call.model != body.model:
+        # Local model fallback: the only case the request body is rewritten.
+        raw = json.dumps({**data, "model": call.model}).encode()
+    relay = _relay(prepared, call, backend, raw, background)
+    # Runs up to the upstream response headers, so the status is known and the generator has
+    # started (its cleanup then runs even if the client goes away before reading).
+    start = next(relay)
+    assert isinstance(start, CompletionStart)
+    return start, relay  # type: ignore[return-value]
+
+
+def _route_headers(prepared: PreparedChat, call: ChatCall) -> dict[str, str]:
+    return {
+        "X-Request-Id": prepared.request_id,
+        "X-Route-Provider": prepared.provider,
+        "X-Route-Reason-Codes": ",".join(call.reason_codes),
+    }
+
+
+class _Edges:
+    """First HEAD_BYTES and last TAIL_BYTES of a relayed body."""
+
+    def __init__(self) -> None:
+        self.head = bytearray()
+        self.tail = bytearray()
+
+    def feed(self, chunk: bytes) -> None:
+        if len(self.head) < HEAD_BYTES:
+            self.head += chunk[: HEAD_BYTES - len(self.head)]
+        self.tail += chunk
+        if len(self.tail) > TAIL_BYTES:
+            del self.tail[:-TAIL_BYTES]
+
+    def usage(self) -> dict[str, Any]:
+        """The last complete `usage` object in the tail, else {}."""
+        for match in reversed(list(_USAGE.finditer(self.tail))):
+            start = match.end() - 1
+            try:
+                value, _ = json.JSONDecoder().raw_decode(self.tail[start:].decode("utf-8", "replace"))
+            except ValueError:
+                continue
+            if isinstance(value, dict):
+                return value
+        return {}
+
+    def model(self) -> str | None:
+        """Served model: the last one named in the tail (stream chunks), else in the head."""
+        for part in (self.tail, self.head):
+            found = _MODEL.findall(part)
+            if found:
+                return found[-1].decode("utf-8", "replace")
+        return None
+
+
+def _relay(
+    prepared: PreparedChat, call: ChatCall, backend: Backend, raw: bytes, background: BackgroundTasks | None
+) -> Iterator[CompletionStart | bytes]:
+    """Yield the CompletionStart, then the upstream body chunks; account and audit at the end."""
+    provider_key = prepared.provider
+    prompt_chars = sum(len(m["content"]) for m in call.messages)
+    headers = _route_headers(prepared, call)
+    result: ChatResult = {"success": False, "failure_category": FAILURE_UNKNOWN, "message": "Relay ended early"}
+    latency_ms = queue_wait = 0.0
+    slotted = False
+    edges = _Edges()
+    transport = TransportTrace()
+    try:
+        # Checked before queueing so a hopeless request does not take a slot.
+        if plan_timeouts(provider_key, prompt_chars, prepared.deadline).skip:
+            result = deadline_failure(provider_key)
+            yield from _error(result, headers)
+            return
+        with ExitStack() as stack:
+            scheduler = scheduler_for(provider_key)
+            wait_limit, by_deadline = slot_wait_limit(provider_key, prepared.deadline)
+            try:
+                queue_wait = stack.enter_context(
+                    scheduler.slot(prepared.tenant, prepared.priority, tenant_weight(prepared.tenant), wait_limit)
+                )
+            except SlotTimeout as exc:
+                queue_wait = exc.waited
+                result = slot_timeout_failure(prepared, by_deadline, exc.waited)
+                yield from _error(result, headers)
+                return
+            slotted = True
+            # Planned again after the wait: the deadline has moved closer.
+            plan = plan_timeouts(provider_key, prompt_chars, prepared.deadline)
+            if plan.skip:
+                result = deadline_failure(provider_key)
+                yield from _error(result, headers)
+                return
+            record_timeout_plan(provider_key, plan.source, plan.timeouts.read)
+            client = provider_registry.backend_client(backend)
+            timeout = http_timeout(plan.timeouts, provider_key)
+            request = provider_registry.completions_request(backend, client, raw, timeout)
+            if request is None:
+                result = {"success": False, "failure_category": FAILURE_AUTH_ERROR, "message": "PUBLIC_LLM_API_KEY not set"}
+                yield from _error(result, headers)
+                return
+            request.extensions["trace"] = transport
+            transport.bytes_sent = len(raw)
+            start = time.perf_counter()
+            try:
+                resp = client.send(request, stream=True)
+            except httpx.TimeoutException as e:
+                result = timeout_failure(e)
+                yield from _error(result, headers)
+                return
+            except ResponseTooLarge as e:
+                result = too_large_failure(e)
+                yield from _error(result, headers)
+                return
+            except httpx.RequestError:
+                result = {"success": False, "failure_category": FAILURE_UNKNOWN, "message": "Upstream request failed"}
+                yield from _error(result, headers)
+                return
+            stack.callback(resp.close)
+            yield CompletionStart(resp.status_code, resp.headers.get("content-type", "application/json"), headers)
+            try:
+                for chunk in resp.iter_raw():
+                    edges.feed(chunk)
+                    yield chunk
+            except httpx.TimeoutException as e:
+                # The status is already sent; the client sees a truncated body.
+                result = timeout_failure(e)
+                return
+            except ResponseTooLarge as e:
+                result = too_large_failure(e)
+                return
+            except httpx.RequestError:
+                result = {"success": False, "failure_category": FAILURE_UNKNOWN, "message": "Upstream stream failed"}
+                return
+            finally:
+                latency_ms = (time.perf_counter() - start) * 1000.0
+                transport.bytes_received = resp.num_bytes_downloaded
+            if resp.status_code == 200:
+                usage = edges.usage()
+                result = success("", {"model": edges.model()}, usage_from(usage, openai_provider.USAGE_FIELDS))
+            else:
+                result = status_failure(resp.status_code)
+    finally:
+        timing = transport.timing()
+        if timing is not None:
+            result = {**result, "transport": timing}  # type: ignore[assignment]
+        if slotted:
+            observe_call(prepared, prompt_chars, result, latency_ms, queue_wait)
+        _, ctx = finish_chat(prepared, call, result, latency_ms, queue_wait)
+        try:
+            persist_audit_event(ctx)
+        except Exception as exc:
+            # The response is already on the wire; report instead of breaking it.
+            # Only the exception type is logged: driver messages can echo connection details.
+            logger.warning("chat completion audit failed (%s)", type(exc).__name__)
+        record_spend([ctx])
+        schedule_shadow(prepared, background)
+
+
+def _error_status(result: ChatResult) -> int:
+    category = result.get("failure_category")
+    if category in (FAILURE_TIMEOUT, FAILURE_DEADLINE_EXCEEDED):
+        return 504
+    return 502
+
+
+def _error(result: ChatResult, headers: dict[str, str]) -> Iterator[CompletionStart | bytes]:
+    yield CompletionStart(_error_status(result), "application/json", headers)
+    yield error_body(result.get("message") or "Provider call failed", "api_error")
+
+
+def _transcode(prepared: PreparedChat, call: ChatCall, stream: bool) -> tuple[CompletionStart, Iterator[bytes]]:
+    """Call a provider that does not speak the OpenAI API and answer in OpenAI format."""
+    result, latency_ms, queue_wait = call_provider(prepared, call.messages, call.model)
+    response, ctx = finish_chat(prepared, call, result, latency_ms, queue_wait)
+    try:
+        persist_audit_event(ctx)
+    finally:
+        record_spend([ctx])
+    headers = _route_headers(prepared, call)
+    if response.error is not None:
+        status = 504 if ctx.failure_category in (FAILURE_TIMEOUT, FAILURE_DEADLINE_EXCEEDED) else 502
+        return CompletionStart(status, "application/json", headers), iter([error_body(response.error, "api_error")])
+    if stream:
+        chunk = _completion(response, prepared, chunk=True)
+        body = b"data: " + json.dumps(chunk).encode() + b"\n\ndata: [DONE]\n\n"
+        return CompletionStart(200, "text/event-stream", headers), iter([body])
+    return CompletionStart(200, "application/json", headers), iter([json.dumps(_completion(response, prepared)).encode()])
+
+
+def _completion(response: ChatResponse, prepared: PreparedChat, chunk: bool = False) -> dict[str, Any]:
+    """OpenAI chat.completion (or one chat.completion.chunk) for a ChatResponse."""
+    message = {"role": "assistant", "content": response.content or ""}
+    choice: dict[str, Any] = {"index": 0, "finish_reason": "stop"}
+    choice["delta" if chunk else "message"] = message
+    out: dict[str, Any] = {
+        "id": f"chatcmpl-{prepared.request_id}",
+        "object": "chat.completion.chunk" if chunk else "chat.completion",
+        "created": int(time.time()),
+        "model": response.model or prepared.body.model or "",
+        "choices": [choice],
+    }
+    usage = response.usage
+    if usage is not None and (usage.input_tokens is not None or usage.output_tokens is not None):
+        prompt, completion = usage.input_tokens or 0, usage.output_tokens or 0
+        out["usage"] = {"prompt_tokens": prompt, "completion_tokens": completion, "total_tokens": prompt + completion}
+    return out
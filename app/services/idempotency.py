@@ -0,0 +1,275 @@
+"""
+Idempotency-Key for /v1/chat: a retried request gets the first result instead of a second
+provider call.
+
+Keys are scoped by tenant and kept only as SHA-256 (never the raw header). The first request
+claims the key; concurrent duplicates wait for its result (in process on an Event, across
+workers by polling the Postgres row); later duplicates get the stored ChatResponse with the
+original request_id. Only successful responses are stored: after a provider failure the key
+is released so the next retry calls the provider again. Reusing a key for a different body
+is rejected.
+
+In memory, entries sit in an insertion-ordered map bounded by IDEMPOTENCY_CACHE_SIZE. All
+entries share one TTL, so expired ones are always at the front and purging stops at the first
+live entry. In-flight entries are never dropped, neither for space nor on expiry: that would
+let their retry call the provider a second time, so a map full of in-flight keys rejects new
+ones.
+
+Postgres (when audit is enabled) makes keys visible to every worker; expired rows are deleted
+at most once a minute per worker. An in-flight claim there is leased for
+IDEMPOTENCY_LEASE_SECONDS: if its worker dies mid-request, the next retry after the lease
+takes the key over instead of getting 409 until the record expires.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Callable
+
+from app.api.schemas.chat import ChatRequest, ChatResponse
+from app.audit.repository import (
+    claim_idempotency_key,
+    complete_idempotency_key,
+    delete_expired_idempotency_keys,
+    get_idempotency_record,
+    release_idempotency_key,
+)
+from app.core.config import (
+    get_audit_enabled,
+    get_database_url,
+    get_idempotency_cache_size,
+    get_idempotency_lease_seconds,
+    get_idempotency_ttl_seconds,
+    get_idempotency_wait_seconds,
+)
+from app.core.telemetry import record_idempotency
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = "idempotency-key"
+MAX_KEY_LENGTH = 255
+_POLL_SECONDS = 0.1
+_PURGE_INTERVAL_SECONDS = 60.0
+
+
+class IdempotencyError(Exception):
+    """A keyed request that cannot be served; `status_code` is the HTTP status to return."""
+
+    def __init__(self, status_code: int, detail: str) -> None:
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+@dataclass
+class _Entry:
+    """One key: the body fingerprint and, once the first request succeeded, its response."""
+
+    fingerprint: str
+    expires_at: float  # epoch seconds
+    response: str | None = None  # ChatResponse JSON
+    done: threading.Event = field(default_factory=threading.Event)
+
+
+class IdempotencyStore:
+    """Thread-safe, size-bounded map of scoped key → _Entry with one TTL for every entry."""
+
+    def __init__(self, maxsize: int, ttl_seconds: float) -> None:
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def claim(self, key: str, fingerprint: str, now: float) -> tuple[_Entry, bool]:
+        """Return (entry, True) when the caller now owns `key`, else the live entry and False."""
+        with self._lock:
+            self._purge(now)
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.fingerprint != fingerprint:
+                    raise IdempotencyError(422, "Idempotency-Key was already used with a different request body")
+                return entry, False
+            while len(self._entries) >= self.maxsize:
+                if not self._evict_completed():
+                    raise IdempotencyError(503, "Too many Idempotency-Key requests in progress")
+            entry = self._entries[key] = _Entry(fingerprint, now + self.ttl_seconds)
+            return entry, True
+
+    def complete(self, entry: _Entry, response: str) -> None:
+        entry.response = response
+        entry.done.set()
+
+    def release(self, key: str, entry: _Entry) -> None:
+        """Forget an in-flight entry (its request failed) and wake waiters so one can retry."""
+        with self._lock:
+            if self._entries.get(key) is entry:
+                del self._entries[key]
+        entry.done.set()
+
+    def _evict_completed(self) -> bool:
+        """Drop the oldest completed entry; False when every entry is still in flight."""
+        for key, entry in self._entries.items():
+            if entry.done.is_set():
+                del self._entries[key]
+                return True
+        return False
+
+    def _purge(self, now: float) -> None:
+        """Drop expired completed entries from the front; expired in-flight ones stay until released."""
+        expired = []
+        for key, entry in self._entries.items():
+            if entry.expires_at > now:
+                break
+            if entry.done.is_set():
+                expired.append(key)
+        for key in expired:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+idempotency_store = IdempotencyStore(get_idempotency_cache_size(), get_idempotency_ttl_seconds())
+_last_purge = 0.0
+
+
+def scoped_key(raw_key: str, tenant: str | None) -> str:
+    """SHA-256 of tenant + Idempotency-Key, so tenants cannot replay each other's results."""
+    return hashlib.sha256(f"{tenant or ''}\n{raw_key}".encode()).hexdigest()
+
+
+def request_fingerprint(body: ChatRequest) -> str:
+    """SHA-256 of the canonical request body (a reused key must carry the same body)."""
+    return hashlib.sha256(body.model_dump_json().encode()).hexdigest()
+
+
+def _durable() -> bool:
+    return get_audit_enabled() and bool(get_database_url())
+
+
+def _durable_claim(key: str, fingerprint: str, expires_at: float, deadline: float) -> str | None:
+    """
+    Claim `key` in Postgres. Returns the stored response when another worker already completed
+    it (waiting while that worker is in flight), or None when this worker owns the key.
+    """
+    expires = datetime.fromtimestamp(expires_at, timezone.utc)
+
+    def claim() -> tuple[str, str | None] | None:
+        lease = datetime.fromtimestamp(time.time() + get_idempotency_lease_seconds(), timezone.utc)
+        return claim_idempotency_key(key, fingerprint, expires, lease)
+
+    existing = claim()
+    while existing is not None:
+        stored_fingerprint, response = existing
+        if stored_fingerprint != fingerprint:
+            raise IdempotencyError(422, "Idempotency-Key was already used with a different request body")
+        if response is not None:
+            return response
+        if time.monotonic() >= deadline:
+            raise IdempotencyError(409, "A request with this Idempotency-Key is still in progress")
+        time.sleep(_POLL_SECONDS)
+        existing = get_idempotency_record(key)
+        if existing is None:
+            # The other worker's request failed and released the key, or its lease lapsed.
+            existing = claim()
+    return None
+
+
+def _purge_durable(now: float) -> None:
+    global _last_purge
+    if now - _last_purge < _PURGE_INTERVAL_SECONDS:
+        return
+    _last_purge = now
+    delete_expired_idempotency_keys(datetime.fromtimestamp(now, timezone.utc))
+
+
+def run_idempotent(
+    raw_key: str,
+    tenant: str | None,
+    fingerprint: str,
+    handler: Callable[[], ChatResponse],
+    store: IdempotencyStore | None = None,
+) -> tuple[ChatResponse, bool]:
+    """
+    Run `handler` at most once per (tenant, key) while the result is stored.
+    Returns (response, replayed). Raises IdempotencyError for a reused key with another body
+    (422), when the in-flight request does not finish within IDEMPOTENCY_WAIT_SECONDS (409), or
+    when the in-memory store is full of in-flight keys (503).
+    """
+    store = idempotency_store if store is None else store
+    key = scoped_key(raw_key, tenant)
+    deadline = time.monotonic() + get_idempotency_wait_seconds()
+    waited = False
+    while True:
+        try:
+            entry, owner = store.claim(key, fingerprint, time.time())
+        except IdempotencyError as exc:
+            record_idempotency("conflict" if exc.status_code == 422 else "full")
+            raise
+        if owner:
+            break
+        if entry.response is None:
+            waited = True
+            if not entry.done.wait(max(0.0, deadline - time.monotonic())):
+                record_idempotency("timeout")
+                raise IdempotencyError(409, "A request with this Idempotency-Key is still in progress")
+        if entry.response is not None:
+            record_idempotency("wait" if waited else "replay")
+            return ChatResponse.model_validate_json(entry.response), True
+        # The first request failed and released the key: claim it again.
+
+    durable = _durable()
+    if durable:
+        try:
+            stored = _durable_claim(key, fingerprint, entry.expires_at, deadline)
+        except IdempotencyError as exc:
+            store.release(key, entry)
+            record_idempotency("conflict" if exc.status_code == 422 else "timeout")
+            raise
+        except Exception as exc:
+            # Fall back to this worker's memory; a DB outage must not block chat.
+            # Only the exception type is logged: driver messages can echo connection details.
+            logger.warning("idempotency claim failed (%s); using in-memory keys only", type(exc).__name__)
+            durable = False
+            stored = None
+        if stored is not None:
+            store.complete(entry, stored)
+            record_idempotency("replay")
+            return ChatResponse.model_validate_json(stored), True
+
+    record_idempotency("new")
+    try:
+        response = handler()
+    except BaseException:
+        _release(key, entry, store, durable)
+        raise
+    if response.error is not None:
+        # Not billed and not final: let the client's retry call the provider again.
+        _release(key, entry, store, durable)
+        return response, False
+    serialized = response.model_dump_json()
+    store.complete(entry, serialized)
+    if durable:
+        try:
+            complete_idempotency_key(key, serialized)
+            _purge_durable(time.time())
+        except Exception as exc:
+            logger.warning("idempotency store failed (%s)", type(exc).__name__)
+    return response, False
+
+
+def _release(key: str, entry: _Entry, store: IdempotencyStore, durable: bool) -> None:
+    store.release(key, entry)
+    if durable:
+        try:
+            release_idempotency_key(key)
+        except Exception as exc:
+            logger.warning("idempotency release failed (%s)", type(exc).__name__)
@@ -0,0 +1,376 @@
+"""
+Asynchronous chat jobs: POST /v1/chat/jobs enqueues, a worker pool runs the normal chat
+orchestration, GET /v1/chat/jobs/{id} reports status and result.
+
+The queue is a bounded priority heap (high → normal → low, FIFO within a class); a full
+queue rejects new jobs instead of growing. Once started, a job's provider call is scheduled
+in the class given by SCHEDULER_PRIORITY (high → interactive, normal/low → batch). Jobs are
+visible only to the tenant that submitted them. Job state lives in memory (fast path for status
+polls) and, when audit is enabled, in the chat_jobs table so any worker can answer GET.
+Request bodies and headers are held in memory only until the job starts (never persisted),
+so queued jobs cannot move to another process: on shutdown they are marked failed. Jobs are
+kept for JOB_RESULT_TTL_SECONDS after submission. An optional callback_url (allowlisted hosts
+only) receives the job view when the job finishes.
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Mapping
+from urllib.parse import urlparse
+
+import httpx
+
+from app.api.schemas.chat import ChatRequest, ChatResponse
+from app.api.schemas.jobs import ChatJobRequest, ChatJobView
+from app.audit.models import ChatJob
+from app.audit.repository import (
+    delete_chat_job,
+    delete_expired_chat_jobs,
+    get_chat_job,
+    save_chat_job,
+)
+from app.core.config import (
+    get_audit_enabled,
+    get_database_url,
+    get_job_callback_allowed_hosts,
+    get_job_queue_max,
+    get_job_result_ttl_seconds,
+    get_job_workers,
+)
+from app.core.telemetry import record_chat_job, set_chat_jobs_queued
+from app.core.tenancy import resolve_tenant
+from app.services.chat_orchestrator import handle_chat_request
+from app.services.scheduler import PRIORITY_BATCH, PRIORITY_INTERACTIVE
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_ORDER = {"high": 0, "normal": 1, "low": 2}
+# Job priority → provider scheduler class (the default for the job's chat; X-Priority wins).
+SCHEDULER_PRIORITY = {"high": PRIORITY_INTERACTIVE, "normal": PRIORITY_BATCH, "low": PRIORITY_BATCH}
+# Finished jobs kept in memory per process; older ones are served from Postgres.
+MAX_FINISHED_IN_MEMORY = 10_000
+CALLBACK_ATTEMPTS = 3
+CALLBACK_TIMEOUT_SECONDS = 10.0
+_PURGE_INTERVAL_SECONDS = 60.0
+
+
+class JobQueueFull(Exception):
+    """Raised when the job backlog is at JOB_QUEUE_MAX."""
+
+
+class JobWorkersUnavailable(Exception):
+    """Raised when no job workers run in this process (JOB_WORKERS=0), so a job would never start."""
+
+
+class JobCallbackError(ValueError):
+    """Raised when callback_url is not an http(s) URL on an allowlisted host."""
+
+
+@dataclass
+class Job:
+    """One job. `body` and `headers` are dropped once the job starts."""
+
+    id: str
+    priority: str
+    tenant: str | None
+    created_at: datetime
+    body: ChatRequest | None
+    headers: dict[str, str] | None
+    callback_url: str | None = None
+    status: str = "queued"
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    result: ChatResponse | None = None
+    error: str | None = None
+
+    def view(self) -> ChatJobView:
+        return ChatJobView(
+            job_id=self.id,
+            status=self.status,
+            priority=self.priority,
+            created_at=self.created_at,
+            started_at=self.started_at,
+            finished_at=self.finished_at,
+            result=self.result,
+            error=self.error,
+        )
+
+    def row(self) -> ChatJob:
+        return ChatJob(
+            id=self.id,
+            status=self.status,
+            priority=self.priority,
+            tenant=self.tenant,
+            result=self.result.model_dump_json() if self.result is not None else None,
+            error=self.error,
+            created_at=self.created_at,
+            started_at=self.started_at,
+            finished_at=self.finished_at,
+        )
+
+
+class JobQueue:
+    """Bounded priority queue of jobs, shared by the worker threads of one process."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._heap: list[tuple[int, int, Job]] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self.consumers = 0  # worker threads taking jobs (JobWorkers.start / stop)
+
+    def put(self, job: Job) -> None:
+        with self._cond:
+            if len(self._heap) >= self.maxsize:
+                raise JobQueueFull(f"job queue is full ({self.maxsize} queued)")
+            heapq.heappush(self._heap, (PRIORITY_ORDER[job.priority], next(self._seq), job))
+            set_chat_jobs_queued(len(self._heap))
+            self._cond.notify()
+
+    def get(self, timeout: float) -> Job | None:
+        """Highest-priority job, waiting up to `timeout` seconds; None when there is none."""
+        with self._cond:
+            if not self._heap:
+                self._cond.wait(timeout)
+            if not self._heap:
+                return None
+            job = heapq.heappop(self._heap)[2]
+            set_chat_jobs_queued(len(self._heap))
+            return job
+
+    def wake_all(self) -> None:
+        with self._cond:
+            self._cond.notify_all()
+
+    def clear(self) -> None:
+        with self._cond:
+            self._heap.clear()
+            set_chat_jobs_queued(0)
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+
+job_queue = JobQueue(get_job_queue_max())
+_jobs: OrderedDict[str, Job] = OrderedDict()
+_jobs_lock = threading.Lock()
+_last_purge = 0.0
+
+
+def _durable() -> bool:
+    return get_audit_enabled() and bool(get_database_url())
+
+
+def _persist(job: Job) -> None:
+    if not _durable():
+        return
+    try:
+        save_chat_job(job.row())
+    except Exception as exc:
+        # The in-memory job still answers polls on this process.
+        # Only the exception type is logged: driver messages can echo connection details.
+        logger.warning("chat job %s not persisted (%s)", job.status, type(exc).__name__)
+
+
+def _remember(job: Job) -> None:
+    with _jobs_lock:
+        _jobs[job.id] = job
+        _jobs.move_to_end(job.id)
+        # Queued/running jobs are bounded by the queue; only finished ones are dropped.
+        while len(_jobs) > MAX_FINISHED_IN_MEMORY:
+            oldest = next(iter(_jobs.values()))
+            if oldest.finished_at is None:
+                break
+            _jobs.popitem(last=False)
+
+
+def _forget(job: Job) -> None:
+    with _jobs_lock:
+        _jobs.pop(job.id, None)
+    if _durable():
+        try:
+            delete_chat_job(job.id)
+        except Exception as exc:
+            logger.warning("chat job cleanup failed (%s)", type(exc).__name__)
+
+
+def _check_callback(url: str) -> None:
+    parsed = urlparse(url)
+    if parsed.scheme not in ("http", "https") or not parsed.hostname:
+        raise JobCallbackError("callback_url must be an http(s) URL")
+    if parsed.hostname.lower() not in get_job_callback_allowed_hosts():
+        raise JobCallbackError("callback_url host is not in JOB_CALLBACK_ALLOWED_HOSTS")
+
+
+def submit_job(body: ChatJobRequest, headers: Mapping[str, str] | None = None) -> Job:
+    """
+    Enqueue a chat job. Raises JobCallbackError for a disallowed callback_url,
+    JobWorkersUnavailable when no workers run here, and JobQueueFull when the backlog is at
+    JOB_QUEUE_MAX.
+    """
+    if job_queue.consumers <= 0:
+        record_chat_job("rejected")
+        raise JobWorkersUnavailable("no chat job workers are running (JOB_WORKERS=0)")
+    if body.callback_url is not None:
+        _check_callback(body.callback_url)
+    job = Job(
+        id=str(uuid.uuid4()),
+        priority=body.priority,
+        tenant=resolve_tenant(headers),
+        created_at=datetime.now(timezone.utc),
+        body=ChatRequest(messages=body.messages, model=body.model),
+        headers=dict(headers) if headers else None,
+        callback_url=body.callback_url,
+    )
+    if len(job_queue) >= job_queue.maxsize:
+        record_chat_job("rejected")
+        raise JobQueueFull(f"job queue is full ({job_queue.maxsize} queued)")
+    # Recorded before it is queued so a worker's "running" update cannot be overwritten.
+    _remember(job)
+    _persist(job)
+    try:
+        job_queue.put(job)
+    except JobQueueFull:
+        # Lost the race for the last slot after the check above.
+        _forget(job)
+        record_chat_job("rejected")
+        raise
+    return job
+
+
+def get_job_view(job_id: str, tenant: str | None) -> ChatJobView | None:
+    """
+    Job status from memory, else from Postgres (jobs submitted to other workers). None when
+    unknown, expired, or submitted by another tenant.
+    """
+    job = _jobs.get(job_id)
+    if job is not None:
+        return job.view() if job.tenant == tenant else None
+    if not _durable():
+        return None
+    row = get_chat_job(job_id)
+    if row is None or row.tenant != tenant:
+        return None
+    return ChatJobView(
+        job_id=row.id,
+        status=row.status,
+        priority=row.priority,
+        created_at=row.created_at,
+        started_at=row.started_at,
+        finished_at=row.finished_at,
+        result=ChatResponse.model_validate_json(row.result) if row.result else None,
+        error=row.error,
+    )
+
+
+def run_job(job: Job) -> None:
+    """Execute one job with the chat orchestrator, then persist and notify."""
+    body, headers = job.body, job.headers
+    job.body = job.headers = None
+    job.status = "running"
+    job.started_at = datetime.now(timezone.utc)
+    _persist(job)
+    try:
+        job.result = handle_chat_request(
+            body, headers=headers, default_priority=SCHEDULER_PRIORITY[job.priority]
+        )
+        job.status = "completed"
+    except Exception as exc:
+        job.status = "failed"
+        job.error = type(exc).__name__
+    job.finished_at = datetime.now(timezone.utc)
+    _remember(job)
+    _persist(job)
+    record_chat_job(job.status)
+    if job.callback_url:
+        _send_callback(job)
+    _purge_expired()
+
+
+def _send_callback(job: Job) -> None:
+    payload = job.view().model_dump(mode="json")
+    for attempt in range(CALLBACK_ATTEMPTS):
+        try:
+            resp = httpx.post(job.callback_url, json=payload, timeout=CALLBACK_TIMEOUT_SECONDS)
+            if resp.status_code < 500:
+                return
+        except httpx.RequestError:
+            pass
+        if attempt + 1 < CALLBACK_ATTEMPTS:
+            time.sleep(2**attempt)
+    logger.warning("chat job callback failed after %d attempts", CALLBACK_ATTEMPTS)
+
+
+def _purge_expired() -> None:
+    global _last_purge
+    now = time.time()
+    if now - _last_purge < _PURGE_INTERVAL_SECONDS:
+        return
+    _last_purge = now
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=get_job_result_ttl_seconds())
+    with _jobs_lock:
+        expired = [j.id for j in _jobs.values() if j.finished_at is not None and j.created_at < cutoff]
+        for job_id in expired:
+            del _jobs[job_id]
+    if _durable():
+        try:
+            delete_expired_chat_jobs(cutoff)
+        except Exception as exc:
+            logger.warning("chat job purge failed (%s)", type(exc).__name__)
+
+
+def clear_jobs() -> None:
+    """Drop all in-memory jobs and queued work (tests)."""
+    job_queue.clear()
+    with _jobs_lock:
+        _jobs.clear()
+
+
+class JobWorkers:
+    """Owns the worker threads for one process (started from the app lifespan)."""
+
+    def __init__(self, queue: JobQueue = job_queue, count: int | None = None) -> None:
+        self.queue = queue
+        self.count = get_job_workers() if count is None else count
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    def start(self) -> None:
+        if self.count <= 0:
+            return
+        self._stop.clear()
+        for i in range(self.count):
+            thread = threading.Thread(target=self._run, name=f"chat-job-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        self.queue.consumers += self.count
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            job = self.queue.get(timeout=0.5)
+            if job is not None:
+                run_job(job)
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._threads:
+            self.queue.consumers -= self.count
+        self.queue.wake_all()
+        for thread in self._threads:
+            thread.join(timeout=5)
+        self._threads = []
+        # Queued bodies exist only in this process: fail them rather than leave them queued.
+        while (job := self.queue.get(timeout=0)) is not None:
+            job.body = job.headers = None
+            job.status = "failed"
+            job.error = "shutdown"
+            job.finished_at = datetime.now(timezone.utc)
+            _persist(job)
+            record_chat_job("failed")
@@ -0,0 +1,60 @@
+"""
+Local provider saturation with hysteresis, for local model fallbacks (policy local_fallbacks).
+
+Signals: requests waiting for a local scheduler slot, and an exponentially weighted moving
+average of local call latency. The monitor enters the saturated state when either signal
+reaches its threshold and leaves it only when both are at or below the recover thresholds,
+so the orchestrator does not flip between the large and the small model on every request.
+State is per process (one local GPU per deployment).
+"""
+
+import threading
+
+from app.core.telemetry import record_local_saturation
+from app.decision.fallbacks import LocalFallbacks
+
+# Weight of the newest local call in the latency average.
+LATENCY_EWMA_ALPHA = 0.2
+
+
+class LocalLoad:
+    """Saturation state of the local provider for this process."""
+
+    def __init__(self) -> None:
+        self.saturated = False
+        self.latency_ms: float | None = None
+        self._lock = threading.Lock()
+
+    def observe(self, latency_ms: float) -> None:
+        """Feed one local call latency (any model) into the moving average."""
+        with self._lock:
+            if self.latency_ms is None:
+                self.latency_ms = latency_ms
+            else:
+                self.latency_ms += LATENCY_EWMA_ALPHA * (latency_ms - self.latency_ms)
+
+    def update(self, fallbacks: LocalFallbacks, queue_depth: int) -> bool:
+        """Re-evaluate saturation for the current queue depth; returns whether it is saturated."""
+        with self._lock:
+            latency = self.latency_ms or 0.0
+            if not self.saturated:
+                if queue_depth >= fallbacks.queue_depth or (
+                    fallbacks.latency_ms is not None and latency >= fallbacks.latency_ms
+                ):
+                    self.saturated = True
+                    record_local_saturation(True, entered=True)
+            elif queue_depth <= fallbacks.recover_queue_depth and (
+                fallbacks.recover_latency_ms is None or latency <= fallbacks.recover_latency_ms
+            ):
+                self.saturated = False
+                record_local_saturation(False)
+            return self.saturated
+
+    def reset(self) -> None:
+        with self._lock:
+            self.saturated = False
+            self.latency_ms = None
+        record_local_saturation(False)
+
+
+local_load = LocalLoad()
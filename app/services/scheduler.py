@@ -0,0 +1,160 @@
+"""
+Provider admission: priority classes plus weighted fair share across tenants.
+
+Each provider has a fixed number of slots per process (SCHEDULER_LOCAL_SLOTS for the local
+GPU, SCHEDULER_PUBLIC_SLOTS per public provider). A request takes a slot for its provider
+call and returns it afterwards; nothing is preempted. When all slots are busy, a freed slot
+goes to the waiting "interactive" requests first, then "batch". Within a class, tenants are
+served by start-time fair queuing: each request gets a start tag max(class virtual time,
+tenant's previous finish tag) and finishes at start + 1 / weight, and the smallest start tag
+goes first. A tenant flooding the queue only pushes its own tags forward, so other tenants'
+requests keep their place. A waiter gives up after its wait limit (the provider's pool
+timeout, or less when its X-Deadline-Ms is closer) and leaves the queue.
+
+Priority: X-Priority header, else the tenant's configured class
+(SCHEDULER_TENANT_PRIORITIES, also keyed by API key tenant ids), else the endpoint default
+(interactive for /v1/chat, batch for batch and job requests).
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator, Mapping
+
+from app.core.config import get_scheduler_slots, get_tenant_priorities, get_tenant_weights
+
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_BATCH = "batch"
+PRIORITIES = (PRIORITY_INTERACTIVE, PRIORITY_BATCH)  # dispatch order
+PRIORITY_HEADER = "x-priority"
+# Finish tags older than the class virtual time no longer matter; prune past this many.
+_MAX_TRACKED_TENANTS = 1024
+
+
+def resolve_priority(headers: Mapping[str, str] | None, tenant: str | None, default: str) -> str:
+    """Priority class for a request: valid X-Priority header, tenant attribute, then `default`."""
+    if headers:
+        value = next((v for k, v in headers.items() if k.lower() == PRIORITY_HEADER), None)
+        if value is not None and value.strip().lower() in PRIORITIES:
+            return value.strip().lower()
+    if tenant:
+        configured = get_tenant_priorities().get(tenant)
+        if configured in PRIORITIES:
+            return configured
+    return default
+
+
+class SlotTimeout(Exception):
+    """No slot was free within the wait limit; the request has left the queue."""
+
+    def __init__(self, waited: float) -> None:
+        super().__init__(f"no provider slot within {waited:.3f}s")
+        self.waited = waited
+
+
+@dataclass
+class _Waiter:
+    granted: threading.Event = field(default_factory=threading.Event)
+
+
+class FairScheduler:
+    """Slots for one provider; `slot()` blocks until this request may call the provider."""
+
+    def __init__(self, slots: int) -> None:
+        self.slots = slots
+        self._free = slots
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+        self._queues: dict[str, list[tuple[float, int, _Waiter]]] = {p: [] for p in PRIORITIES}
+        self._virtual: dict[str, float] = {p: 0.0 for p in PRIORITIES}
+        self._finish: dict[tuple[str, str], float] = {}
+
+    @contextmanager
+    def slot(
+        self, tenant: str | None, priority: str, weight: float = 1.0, timeout: float | None = None
+    ) -> Iterator[float]:
+        """
+        Hold one slot for the block; yields the seconds spent waiting for it. Raises SlotTimeout
+        when no slot is granted within `timeout` seconds (None waits indefinitely).
+        """
+        start = time.perf_counter()
+        entry = None
+        with self._lock:
+            tag = self._start_tag(tenant or "", priority, weight)
+            if self._free > 0 and not any(self._queues.values()):
+                self._free -= 1
+                self._virtual[priority] = tag
+            else:
+                entry = (tag, next(self._seq), _Waiter())
+                heapq.heappush(self._queues[priority], entry)
+        if entry is not None and not entry[2].granted.wait(timeout):
+            with self._lock:
+                # A release may have granted the slot just after the wait gave up: keep it then.
+                if not entry[2].granted.is_set():
+                    queue = self._queues[priority]
+                    queue.remove(entry)
+                    heapq.heapify(queue)
+                    raise SlotTimeout(time.perf_counter() - start)
+        try:
+            yield time.perf_counter() - start
+        finally:
+            self._release()
+
+    def _start_tag(self, tenant: str, priority: str, weight: float) -> float:
+        key = (priority, tenant)
+        tag = max(self._virtual[priority], self._finish.get(key, 0.0))
+        self._finish[key] = tag + 1.0 / weight
+        if len(self._finish) > _MAX_TRACKED_TENANTS:
+            self._finish = {
+                k: v for k, v in self._finish.items() if v > self._virtual[k[0]]
+            }
+        return tag
+
+    def _release(self) -> None:
+        with self._lock:
+            for priority in PRIORITIES:
+                queue = self._queues[priority]
+                if queue:
+                    tag, _, waiter = heapq.heappop(queue)
+                    self._virtual[priority] = tag
+                    waiter.granted.set()
+                    return
+            self._free += 1
+
+    def waiting(self) -> dict[str, int]:
+        with self._lock:
+            return {p: len(q) for p, q in self._queues.items()}
+
+
+_schedulers: dict[str, FairScheduler] = {}
+_schedulers_lock = threading.Lock()
+
+
+def scheduler_for(provider: str) -> FairScheduler:
+    """Process-wide scheduler for `provider` (local, openai, anthropic)."""
+    scheduler = _schedulers.get(provider)
+    if scheduler is None:
+        with _schedulers_lock:
+            scheduler = _schedulers.get(provider)
+            if scheduler is None:
+                scheduler = _schedulers[provider] = FairScheduler(get_scheduler_slots(provider))
+    return scheduler
+
+
+def queue_depth() -> int:
+    """Requests waiting for a slot across all providers in this process."""
+    return sum(sum(s.waiting().values()) for s in list(_schedulers.values()))
+
+
+def tenant_weight(tenant: str | None) -> float:
+    """Configured fair-share weight (SCHEDULER_TENANT_WEIGHTS), default 1."""
+    return get_tenant_weights().get(tenant or "", 1.0)
+
+
+def reset_schedulers() -> None:
+    """Drop all schedulers so slot settings are re-read (tests)."""
+    with _schedulers_lock:
+        _schedulers.clear()
@@ -0,0 +1,161 @@
+"""
+Server-side chat sessions: the client sends only the new messages of each turn.
+
+POST /v1/chat with start_session=true creates a session and returns its session_id; later
+turns send session_id plus the new messages. The gateway keeps the history and the state
+routing needs, so a turn scans and hashes only what is new:
+- the running character count and token estimate of the history (cost rule);
+- how many messages were already scanned (the assistant reply is scanned with the next turn);
+- whether any turn was routed local for sensitivity: such a session stays local.
+
+History is raw conversation text, so it lives in worker memory only and is never persisted.
+Sessions are scoped by tenant, expire after SESSION_TTL_SECONDS idle, and the least recently
+used idle session is dropped past SESSION_MAX (a session whose turn is running is never
+dropped; when all of them are busy, a new session gets 503). A worker that does not hold the
+session answers 404 and the client starts a new session with the full history. One turn per
+session runs at a time; a concurrent turn gets 409.
+"""
+
+import hashlib
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from app.core.config import get_session_max, get_session_max_chars, get_session_ttl_seconds
+from app.core.telemetry import record_session_request, set_chat_sessions_active
+
+
+class SessionError(Exception):
+    """A session turn that cannot be served; `status_code` is the HTTP status to return."""
+
+    def __init__(self, status_code: int, detail: str) -> None:
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+@dataclass
+class Session:
+    """One conversation. Mutated only by the turn that holds `busy`."""
+
+    id: str
+    expires_at: float  # time.monotonic()
+    messages: list[dict[str, str]] = field(default_factory=list)
+    chars: int = 0
+    tokens: float = 0.0
+    scanned: int = 0  # messages[:scanned] were part of an earlier decision
+    sensitive: bool = False
+    turns: int = 0
+    busy: bool = False
+
+    def unscanned(self) -> list[dict[str, str]]:
+        return self.messages[self.scanned :]
+
+
+class SessionStore:
+    """Thread-safe LRU of scoped session key → Session with a sliding idle TTL."""
+
+    def __init__(self, maxsize: int, ttl_seconds: float) -> None:
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._sessions: OrderedDict[str, Session] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def start(self, tenant: str | None, now: float | None = None) -> Session:
+        """Create a session for `tenant`, already claimed for its first turn. Raises SessionError 503 when full."""
+        now = time.monotonic() if now is None else now
+        session = Session(id=str(uuid.uuid4()), expires_at=now + self.ttl_seconds, busy=True)
+        with self._lock:
+            self._purge(now)
+            while len(self._sessions) >= self.maxsize:
+                if not self._evict_idle():
+                    record_session_request("full")
+                    raise SessionError(503, "Too many chat sessions with a turn in progress")
+            self._sessions[_scoped(session.id, tenant)] = session
+            set_chat_sessions_active(len(self._sessions))
+        record_session_request("started")
+        return session
+
+    def claim(self, session_id: str, tenant: str | None, now: float | None = None) -> Session:
+        """Claim a live session for one turn. Raises SessionError 404 (unknown) or 409 (busy)."""
+        now = time.monotonic() if now is None else now
+        key = _scoped(session_id, tenant)
+        with self._lock:
+            self._purge(now)
+            session = self._sessions.get(key)
+            if session is None:
+                record_session_request("not_found")
+                raise SessionError(
+                    404, "Unknown or expired session_id; start a new session with the full history"
+                )
+            if session.busy:
+                record_session_request("conflict")
+                raise SessionError(409, "A turn of this session is still in progress")
+            session.busy = True
+            session.expires_at = now + self.ttl_seconds
+            self._sessions.move_to_end(key)
+        record_session_request("continued")
+        return session
+
+    def release(self, session: Session) -> None:
+        with self._lock:
+            session.busy = False
+
+    def _evict_idle(self) -> bool:
+        """Drop the least recently used idle session; False when every session has a turn running."""
+        for key, session in self._sessions.items():
+            if not session.busy:
+                del self._sessions[key]
+                return True
+        return False
+
+    def _purge(self, now: float) -> None:
+        """Drop expired idle sessions from the front; a busy one stays until its turn ends."""
+        # Ordered by last use, so expired sessions are at the front.
+        expired = []
+        for key, session in self._sessions.items():
+            if session.expires_at > now:
+                break
+            if not session.busy:
+                expired.append(key)
+        for key in expired:
+            del self._sessions[key]
+        set_chat_sessions_active(len(self._sessions))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sessions.clear()
+            set_chat_sessions_active(0)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+session_store = SessionStore(get_session_max(), get_session_ttl_seconds())
+
+
+def _scoped(session_id: str, tenant: str | None) -> str:
+    """SHA-256 of tenant + session id, so one tenant cannot continue another's session."""
+    return hashlib.sha256(f"{tenant or ''}\n{session_id}".encode()).hexdigest()
+
+
+def check_size(session: Session, new_messages: list[dict[str, str]]) -> None:
+    """Raise SessionError 413 when the new messages would push history past SESSION_MAX_CHARS."""
+    limit = get_session_max_chars()
+    if session.chars + sum(len(m["content"]) for m in new_messages) > limit:
+        raise SessionError(413, f"Session history exceeds SESSION_MAX_CHARS ({limit})")
+
+
+def append_turn(session: Session, new_messages: list[dict[str, str]], reply: str, tokens: float) -> None:
+    """
+    Add a completed turn: the client's new messages (scanned by this turn's decision) and the
+    assistant reply (scanned with the next turn). `tokens` estimates what this turn scanned.
+    """
+    session.scanned = len(session.messages) + len(new_messages)
+    session.messages.extend(new_messages)
+    session.messages.append({"role": "assistant", "content": reply})
+    session.chars += sum(len(m["content"]) for m in new_messages) + len(reply)
+    session.tokens += tokens
+    session.turns += 1
@@ -0,0 +1,50 @@
+"""
+Shadow evaluation of a candidate policy, run after the /v1/chat response is sent.
+
+The candidate only decides (no provider call). Matches and divergences are counted; a
+sampled divergence is written onto the request's audit event as shadow_decision.
+"""
+
+import logging
+import time
+from typing import Any
+
+from app.audit.repository import set_shadow_decision
+from app.core.config import get_audit_enabled, get_database_url
+from app.core.telemetry import record_shadow_decision
+from app.decision.engine import DecisionResult, decide, decision_string
+from app.decision.rollout import Rollout
+
+logger = logging.getLogger(__name__)
+
+
+def evaluate_shadow(
+    rollout: Rollout,
+    request_id: str,
+    active: DecisionResult,
+    decide_kwargs: dict[str, Any],
+) -> str:
+    """Decide with the candidate and compare with `active`. Returns match, diverge, or error."""
+    start = time.perf_counter()
+    try:
+        shadow = decide(config=rollout.candidate, shadow=True, **decide_kwargs)
+    except Exception:
+        record_shadow_decision("error", time.perf_counter() - start)
+        return "error"
+    result = (
+        "match"
+        if (shadow["provider"], shadow["reason_codes"]) == (active["provider"], active["reason_codes"])
+        else "diverge"
+    )
+    record_shadow_decision(result, time.perf_counter() - start)
+    if (
+        result == "diverge"
+        and rollout.sample_divergence(request_id)
+        and get_audit_enabled()
+        and get_database_url()
+    ):
+        try:
+            set_shadow_decision(request_id, decision_string(shadow["provider"], shadow["reason_codes"]))
+        except Exception as exc:
+            logger.warning("shadow decision not recorded (%s)", type(exc).__name__)
+    return result
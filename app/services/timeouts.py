@@ -0,0 +1,134 @@
+"""
+Provider call timeouts: split per phase, optionally adaptive, bounded by the client's deadline.
+
+Static mode uses PROVIDER_TIMEOUTS_<PROVIDER> (connect/read/write/pool). Adaptive mode
+(PROVIDER_TIMEOUT_MODE=adaptive) sets the read timeout to a high percentile of recent
+successful latencies for the same provider and prompt-size bucket, times a headroom
+multiplier, clamped to [floor, ceiling]; until a bucket has enough samples it uses the static
+value. An X-Deadline-Ms header (milliseconds, counted from when the gateway starts the
+request) caps every phase at the time left, and the call is skipped with
+failure_category deadline_exceeded when no time is left or the bucket's median latency
+already exceeds it.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, replace
+from typing import Mapping
+
+from app.core.config import (
+    ProviderTimeouts,
+    get_adaptive_timeout_ceiling_seconds,
+    get_adaptive_timeout_floor_seconds,
+    get_adaptive_timeout_multiplier,
+    get_adaptive_timeout_percentile,
+    get_provider_timeout_mode,
+    get_provider_timeouts,
+)
+from app.decision.latency import deadline_ms
+
+WINDOW_SIZE = 256  # latest successful calls kept per (provider, bucket)
+MIN_SAMPLES = 20  # below this a bucket is not used for adaptive timeouts or skipping
+# Upper bounds (total message characters) of the prompt-size buckets; larger prompts are "xl".
+PROMPT_BUCKETS = ((1_000, "s"), (8_000, "m"), (32_000, "l"))
+
+SOURCE_STATIC = "static"
+SOURCE_ADAPTIVE = "adaptive"
+SOURCE_DEADLINE = "deadline"
+
+
+def prompt_bucket(chars: int) -> str:
+    """Size bucket for a prompt of `chars` characters (all messages)."""
+    return next((name for limit, name in PROMPT_BUCKETS if chars < limit), "xl")
+
+
+def parse_deadline(headers: Mapping[str, str] | None) -> float | None:
+    """Absolute time.monotonic() deadline from X-Deadline-Ms, or None (absent or invalid)."""
+    ms = deadline_ms(headers)
+    return time.monotonic() + ms / 1000.0 if ms is not None else None
+
+
+class LatencyWindows:
+    """Recent successful call latencies per (provider, prompt bucket), bounded per key."""
+
+    def __init__(self, size: int = WINDOW_SIZE) -> None:
+        self.size = size
+        self._windows: dict[tuple[str, str], deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, provider: str, bucket: str, seconds: float) -> None:
+        with self._lock:
+            window = self._windows.get((provider, bucket))
+            if window is None:
+                window = self._windows[(provider, bucket)] = deque(maxlen=self.size)
+            window.append(seconds)
+
+    def percentile(self, provider: str, bucket: str, pct: float) -> float | None:
+        """Nearest-rank percentile in seconds, or None with fewer than MIN_SAMPLES samples."""
+        with self._lock:
+            window = self._windows.get((provider, bucket))
+            samples = sorted(window) if window else []
+        if len(samples) < MIN_SAMPLES:
+            return None
+        rank = max(1, math.ceil(pct / 100.0 * len(samples)))
+        return samples[rank - 1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._windows.clear()
+
+
+latency_windows = LatencyWindows()
+
+
+@dataclass(frozen=True)
+class TimeoutPlan:
+    """Timeouts for one provider call and where the read timeout came from, or skip=True."""
+
+    timeouts: ProviderTimeouts
+    source: str
+    skip: bool = False
+
+
+def slot_wait_limit(provider: str, deadline: float | None = None) -> tuple[float, bool]:
+    """
+    Longest wait for a scheduler slot of `provider`: its pool timeout, or the time left before
+    `deadline` when that is sooner. Returns (seconds, limited_by_deadline).
+    """
+    pool = get_provider_timeouts(provider).pool
+    if deadline is not None:
+        remaining = max(0.0, deadline - time.monotonic())
+        if remaining < pool:
+            return remaining, True
+    return pool, False
+
+
+def plan_timeouts(provider: str, prompt_chars: int, deadline: float | None = None) -> TimeoutPlan:
+    """Timeouts for calling `provider` now with a prompt of `prompt_chars` characters."""
+    timeouts = get_provider_timeouts(provider)
+    source = SOURCE_STATIC
+    bucket = prompt_bucket(prompt_chars)
+    if get_provider_timeout_mode() == "adaptive":
+        observed = latency_windows.percentile(provider, bucket, get_adaptive_timeout_percentile())
+        if observed is not None:
+            read = observed * get_adaptive_timeout_multiplier()
+            read = min(get_adaptive_timeout_ceiling_seconds(provider), max(get_adaptive_timeout_floor_seconds(), read))
+            timeouts = replace(timeouts, read=read)
+            source = SOURCE_ADAPTIVE
+    if deadline is None:
+        return TimeoutPlan(timeouts, source)
+    remaining = deadline - time.monotonic()
+    median = latency_windows.percentile(provider, bucket, 50)
+    if remaining <= 0 or (median is not None and median > remaining):
+        return TimeoutPlan(timeouts, source, skip=True)
+    if remaining < timeouts.read:
+        source = SOURCE_DEADLINE
+    capped = ProviderTimeouts(
+        connect=min(timeouts.connect, remaining),
+        read=min(timeouts.read, remaining),
+        write=min(timeouts.write, remaining),
+        pool=min(timeouts.pool, remaining),
+    )
+    return TimeoutPlan(capped, source)
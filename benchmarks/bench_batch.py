@@ -0,0 +1,62 @@
+"""
+Batch vs single-request throughput on a fake provider.
+
+Run from the repo root: python -m benchmarks.bench_batch
+The provider is replaced by an in-process fake that sleeps FAKE_LATENCY_MS per call (no
+network). Compares N sequential POST /v1/chat calls, N single calls from a thread pool sized
+like the batch fan-out, and one POST /v1/chat/batch. Audit is off (DATABASE_URL unset).
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
+FAKE_LATENCY_MS = 20
+SIZES = (50, 200)
+
+
+def _fake_chat(messages, model=None, timeout=None, **_):
+    time.sleep(FAKE_LATENCY_MS / 1000)
+    return {"success": True, "content": "ok", "usage": {"input_tokens": 8, "output_tokens": 2}}
+
+
+def main() -> None:
+    os.environ.setdefault("POLICY_FILE", str(Path(__file__).resolve().parents[1] / "app" / "policies.example.json"))
+    os.environ.pop("DATABASE_URL", None)
+    from fastapi.testclient import TestClient
+
+    from app.core.config import get_batch_concurrency
+    from app.main import app
+
+    client = TestClient(app)
+    fan_out = get_batch_concurrency("local")
+
+    def single(i: int) -> None:
+        client.post("/v1/chat", json={"messages": [{"role": "user", "content": f"question {i}"}]})
+
+    print(f"fake provider latency {FAKE_LATENCY_MS} ms, local fan-out {fan_out}")
+    print(f"{'requests':>9} {'sequential req/s':>17} {'pooled singles req/s':>21} {'batch req/s':>12}")
+    with patch("app.providers.ollama.chat", _fake_chat):
+        for n in SIZES:
+            start = time.perf_counter()
+            for i in range(n):
+                single(i)
+            sequential = n / (time.perf_counter() - start)
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=fan_out) as pool:
+                list(pool.map(single, range(n)))
+            pooled = n / (time.perf_counter() - start)
+
+            payload = {"requests": [{"messages": [{"role": "user", "content": f"question {i}"}]} for i in range(n)]}
+            start = time.perf_counter()
+            response = client.post("/v1/chat/batch", json=payload)
+            assert len(response.text.splitlines()) == n
+            batch = n / (time.perf_counter() - start)
+            print(f"{n:>9} {sequential:>17.1f} {pooled:>21.1f} {batch:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Decision overhead for long conversations: last_user vs conversation scope.
+
+Run from the repo root: python -m benchmarks.bench_conversation
+Synthetic 200- and 400-turn conversations (no real PII). Conversation-scope cost should grow
+linearly with total input size; the "join+lower" column is the naive full-copy baseline.
+"""
+
+import time
+from dataclasses import replace
+
+from app.core.config import PolicyConfig
+from app.decision.detectors import ALL_DETECTORS, compile_detectors
+from app.decision.engine import decide
+
+_TURN = (
+    "Can you review the quarterly numbers for region 4 and compare them with last year? "
+    "Shipping volume was 1200 units and the order ref is AB12 line 7. "
+)
+
+
+def _conversation(turns: int, turn_chars: int) -> list[str]:
+    text = (_TURN * (turn_chars // len(_TURN) + 1))[:turn_chars]
+    return [text for _ in range(turns)]
+
+
+def _best_ms(fn, repeat: int = 20) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000.0
+
+
+def main() -> None:
+    scanner = compile_detectors(
+        list(ALL_DETECTORS), internal_host_suffixes=["corp.example"], cpu_budget_ms=1e9
+    )
+    base = PolicyConfig(
+        sensitivity_keywords=("confidential", "internal only"),
+        cost_max_prompt_length_for_local=0,
+        default_provider="local",
+        cost_max_usd_for_local=None,
+        llm_input_usd_per_1m_tokens=None,
+        cost_chars_per_token=4,
+        sensitivity_detectors=scanner,
+    )
+    conversation_scope = replace(base, decision_scope="conversation")
+    print(f"{'turns':>6} {'chars/turn':>10} {'total KB':>9} {'last_user ms':>13} {'conversation ms':>16} {'join+lower ms':>14}")
+    for turns in (200, 400):
+        for turn_chars in (200, 2000):
+            messages = _conversation(turns, turn_chars)
+            last = messages[-1]
+
+            def naive() -> None:
+                joined = "\n".join(messages).lower()
+                any(kw in joined for kw in base.sensitivity_keywords)
+                scanner.scan(joined)
+
+            last_ms = _best_ms(lambda: decide(last, len(last), base, messages=messages))
+            conv_ms = _best_ms(lambda: decide(last, len(last), conversation_scope, messages=messages))
+            naive_ms = _best_ms(naive)
+            total_kb = turns * turn_chars / 1000
+            print(f"{turns:>6} {turn_chars:>10} {total_kb:>9.0f} {last_ms:>13.3f} {conv_ms:>16.3f} {naive_ms:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+External keyword index: build size, load time, and per-prompt lookup cost.
+
+Run from the repo root: python -m benchmarks.bench_keyword_index
+Synthetic codenames only (no real names). Load time is open + mmap + header check; lookups
+touch only the pages they need, so it does not grow with the dictionary size.
+"""
+
+import os
+import random
+import tempfile
+import time
+
+from app.decision.keyword_index import build_keyword_index, load_keyword_index
+
+_SYLLABLES = ("ka", "zu", "mer", "tol", "vin", "dra", "quo", "lex", "pim", "sor", "bel", "nax")
+
+
+def _terms(count: int, seed: int = 11) -> list[str]:
+    rng = random.Random(seed)
+    terms = []
+    for _ in range(count):
+        words = [
+            "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4)))
+            for _ in range(rng.randint(1, 3))
+        ]
+        terms.append(" ".join(words))
+    return terms
+
+
+def _prompt(size_chars: int) -> str:
+    text = "please summarize the quarterly report for region four and the shipping plan "
+    return (text * (size_chars // len(text) + 1))[:size_chars]
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'terms':>9} {'build s':>8} {'MB':>7} {'load ms':>8} {'1KB µs':>8} {'100KB ms':>9}")
+        for count in (100_000, 1_000_000):
+            path = os.path.join(tmp, f"terms-{count}.kwidx")
+            start = time.perf_counter()
+            build_keyword_index(_terms(count), path)
+            build_s = time.perf_counter() - start
+            start = time.perf_counter()
+            index = load_keyword_index(path)
+            load_ms = (time.perf_counter() - start) * 1000
+            small, large = [_prompt(1_000)], [_prompt(100_000)]
+            start = time.perf_counter()
+            for _ in range(200):
+                index.matches(small)
+            small_us = (time.perf_counter() - start) / 200 * 1e6
+            start = time.perf_counter()
+            index.matches(large)
+            large_ms = (time.perf_counter() - start) * 1000
+            size_mb = index.size_bytes / 1_000_000
+            print(f"{count:>9} {build_s:>8.1f} {size_mb:>7.1f} {load_ms:>8.3f} {small_us:>8.1f} {large_ms:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
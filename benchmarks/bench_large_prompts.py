@@ -0,0 +1,76 @@
+"""
+Peak memory of POST /v1/chat for 1, 10 and 50 MB prompts (tracemalloc).
+
+Run from the repo root: python -m benchmarks.bench_large_prompts
+The Ollama adapter runs against an in-process transport that reads the request stream and
+discards it, like a socket would (no network); audit is off. Each request body is encoded
+before measuring, so the peak covers the server side only: body read, parsing, routing,
+provider payload. "peak / body" is how many body-sized copies were alive at once. The last
+table posts the same bodies with the default MAX_REQUEST_BODY_BYTES, where oversized
+prompts are rejected (413) before the body is read.
+"""
+
+import json
+import os
+import tracemalloc
+from pathlib import Path
+from unittest.mock import patch
+
+import httpx
+
+SIZES_MB = (1, 10, 50)
+
+
+class _DrainTransport(httpx.BaseTransport):
+    """Consumes the request body chunk by chunk and answers like Ollama."""
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        for _ in request.stream:
+            pass
+        return httpx.Response(200, json={"message": {"role": "assistant", "content": "ok"}})
+
+
+def _body(mb: int) -> bytes:
+    prompt = ("Quarterly figures for region 4 look stable overall. " * (mb * 20_000 + 1))[: mb * 1_000_000]
+    return json.dumps({"messages": [{"role": "user", "content": prompt}]}).encode()
+
+
+def _measure(client, body: bytes) -> tuple[int, float]:
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    response = client.post("/v1/chat", content=body, headers={"Content-Type": "application/json"})
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return response.status_code, peak / 1e6
+
+
+def main() -> None:
+    os.environ.setdefault("POLICY_FILE", str(Path(__file__).resolve().parents[1] / "app" / "policies.example.json"))
+    os.environ.pop("DATABASE_URL", None)
+    from fastapi.testclient import TestClient
+
+    from app.core.config import get_max_request_body_bytes
+    from app.main import app
+
+    client = TestClient(app)
+    decision = {"provider": "local", "reason_codes": ["bench"]}
+    default_limit = get_max_request_body_bytes()
+    with (
+        patch("app.services.chat_orchestrator.decide", return_value=decision),
+        patch("app.providers.transport.provider_client", lambda timeout, pool: httpx.Client(transport=_DrainTransport(), timeout=timeout)),
+    ):
+        for title, limit in (("limit disabled", "0"), (f"default limit ({default_limit} bytes)", None)):
+            if limit is None:
+                os.environ.pop("MAX_REQUEST_BODY_BYTES", None)
+            else:
+                os.environ["MAX_REQUEST_BODY_BYTES"] = limit
+            print(title)
+            print(f"{'prompt MB':>10} {'status':>7} {'peak MB':>9} {'peak / body':>12}")
+            for mb in SIZES_MB:
+                body = _body(mb)
+                status, peak = _measure(client, body)
+                print(f"{mb:>10} {status:>7} {peak:>9.1f} {peak * 1e6 / len(body):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+CPU per request: /v1/chat (decode and re-encode) vs /v1/chat/completions (byte relay).
+
+Run from the repo root: python -m benchmarks.bench_passthrough
+The OpenAI upstream is an in-process httpx.MockTransport (no network) answering with a
+completion of COMPLETION_CHARS characters, as one JSON body and as an SSE stream of
+CHUNK_CHARS-character deltas. Reports process CPU time (all threads) per request, measured
+around sequential requests. Audit is off (DATABASE_URL unset).
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+COMPLETION_CHARS = (4_000, 256_000, 1_000_000)
+CHUNK_CHARS = 16
+REQUESTS = 50
+
+
+def _bodies(chars: int) -> tuple[bytes, bytes]:
+    content = ("lorem ipsum " * (chars // 12 + 1))[:chars]
+    usage = {"prompt_tokens": 12, "completion_tokens": chars // 4, "total_tokens": 12 + chars // 4}
+    whole = json.dumps(
+        {
+            "id": "chatcmpl-bench",
+            "object": "chat.completion",
+            "model": "gpt-bench",
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": usage,
+        }
+    ).encode()
+    events = [
+        {"model": "gpt-bench", "choices": [{"index": 0, "delta": {"content": content[i : i + CHUNK_CHARS]}}]}
+        for i in range(0, chars, CHUNK_CHARS)
+    ]
+    events.append({"model": "gpt-bench", "choices": [], "usage": usage})
+    stream = b"".join(b"data: " + json.dumps(e).encode() + b"\n\n" for e in events) + b"data: [DONE]\n\n"
+    return whole, stream
+
+
+def _cpu_ms(send) -> float:
+    start = time.process_time()
+    for _ in range(REQUESTS):
+        send()
+    return (time.process_time() - start) * 1000.0 / REQUESTS
+
+
+def main() -> None:
+    os.environ.setdefault("POLICY_FILE", str(Path(__file__).resolve().parents[1] / "app" / "policies.example.json"))
+    os.environ.pop("DATABASE_URL", None)
+    os.environ.setdefault("PUBLIC_LLM_API_KEY", "bench")
+    import httpx
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+    from app.providers.transport import close_clients
+
+    client = TestClient(app)
+    message = {"messages": [{"role": "user", "content": "Summarize the report"}], "model": "gpt-bench"}
+    decision = {"provider": "openai", "reason_codes": ["bench"]}
+
+    print(f"{REQUESTS} sequential requests per cell, CPU ms per request")
+    print(f"{'completion chars':>17} {'/v1/chat':>9} {'relay json':>11} {'relay sse':>10}")
+    for chars in COMPLETION_CHARS:
+        whole, stream = _bodies(chars)
+        upstream = {"body": whole}
+        transport = httpx.MockTransport(
+            lambda r: httpx.Response(200, stream=httpx.ByteStream(upstream["body"]), headers={"content-type": "application/json"})
+        )
+        with (
+            patch("app.services.chat_orchestrator.decide", return_value=decision),
+            patch("app.providers.transport.provider_client", lambda timeout, pool: httpx.Client(transport=transport, timeout=timeout)),
+        ):
+            chat = _cpu_ms(lambda: client.post("/v1/chat", json=message))
+            relay_json = _cpu_ms(lambda: client.post("/v1/chat/completions", json=message))
+            upstream["body"] = stream
+            relay_sse = _cpu_ms(lambda: client.post("/v1/chat/completions", json={**message, "stream": True}))
+        close_clients()  # the pooled client holds this cell's transport
+        print(f"{chars:>17} {chat:>9.2f} {relay_json:>11.2f} {relay_sse:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Token estimator speed and accuracy report (bpe_estimate vs the chars/4 heuristic).
+
+Run from the repo root: python -m benchmarks.bench_tokens
+If `tiktoken` is installed with its encodings cached locally, both estimators are scored
+against real cl100k_base counts; otherwise the report shows how far they diverge per text
+kind. tiktoken is not a project dependency.
+"""
+
+import time
+
+from app.decision.tokens import estimate_tokens_bpe, estimate_tokens_heuristic
+
+SAMPLES = {
+    "prose": (
+        "Please review the quarterly report for the northern region and summarize the main "
+        "risks. Revenue grew while shipping costs rose, and the team expects delays next month. "
+    ),
+    "code": (
+        "def total(items):\n    return sum(i.price * i.qty for i in items if i.qty > 0)\n\n"
+        "for row in rows:\n    print(f\"{row['id']:>6} {row['name']}\")\n"
+    ),
+    "numbers": "order 20931 line 7 qty 1200 total 349.99 ref 8841-2210-77 date 2026-10-19 ",
+    "json": '{"id": 42, "items": [{"sku": "AB-12", "qty": 3}, {"sku": "CD-7", "qty": 1}], "ok": true} ',
+    "accented": "Le café était fermé; nous avons marché jusqu'à la gare près du musée. ",
+    "cjk": "今日は会議の資料を確認してください。来週までに返信をお願いします。",
+}
+
+
+def _reference():
+    try:
+        import tiktoken
+
+        enc = tiktoken.get_encoding("cl100k_base")
+        return lambda text: len(enc.encode(text))
+    except Exception:  # not installed, or encodings not cached (offline)
+        return None
+
+
+def _speed_us(text: str, repeat: int = 500) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        estimate_tokens_bpe(text)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main() -> None:
+    reference = _reference()
+    print("accuracy" + ("" if reference else " (no tiktoken reference: estimates only)"))
+    header = f"{'kind':>9} {'chars':>6} {'bpe_est':>8} {'chars/4':>8}"
+    print(header + (f" {'cl100k':>7} {'bpe err':>8} {'heur err':>9}" if reference else ""))
+    for kind, sample in SAMPLES.items():
+        text = sample * 8
+        est = estimate_tokens_bpe(text)
+        heur = estimate_tokens_heuristic(len(text), 4)
+        line = f"{kind:>9} {len(text):>6} {est:>8} {heur:>8.0f}"
+        if reference:
+            ref = reference(text)
+            line += f" {ref:>7} {(est - ref) / ref:>+8.0%} {(heur - ref) / ref:>+9.0%}"
+        print(line)
+
+    print("\nspeed (bpe_estimate, warm piece cache)")
+    print(f"{'prompt':>8} {'µs':>9}")
+    base = "".join(SAMPLES.values())
+    for size in (1_000, 4_000, 16_000, 100_000):
+        text = (base * (size // len(base) + 1))[:size]
+        print(f"{size:>7}c {_speed_us(text, 200 if size < 100_000 else 20):>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
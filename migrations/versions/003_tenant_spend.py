@@ -0,0 +1,28 @@
+"""audit_events tenant and cost_usd
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "003"
+down_revision: Union[str, None] = "002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("audit_events", sa.Column("tenant", sa.String(128), nullable=True))
+    op.add_column("audit_events", sa.Column("cost_usd", sa.Float(), nullable=True))
+    op.create_index(op.f("ix_audit_events_created_at"), "audit_events", ["created_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_audit_events_created_at"), table_name="audit_events")
+    op.drop_column("audit_events", "cost_usd")
+    op.drop_column("audit_events", "tenant")
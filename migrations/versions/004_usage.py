@@ -0,0 +1,30 @@
+"""audit_events model, input_tokens, output_tokens, tokens_per_second
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "004"
+down_revision: Union[str, None] = "003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("audit_events", sa.Column("model", sa.String(128), nullable=True))
+    op.add_column("audit_events", sa.Column("input_tokens", sa.Integer(), nullable=True))
+    op.add_column("audit_events", sa.Column("output_tokens", sa.Integer(), nullable=True))
+    op.add_column("audit_events", sa.Column("tokens_per_second", sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("audit_events", "tokens_per_second")
+    op.drop_column("audit_events", "output_tokens")
+    op.drop_column("audit_events", "input_tokens")
+    op.drop_column("audit_events", "model")
@@ -0,0 +1,26 @@
+"""audit_events policy_variant and shadow_decision
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "005"
+down_revision: Union[str, None] = "004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("audit_events", sa.Column("policy_variant", sa.String(16), nullable=True))
+    op.add_column("audit_events", sa.Column("shadow_decision", sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("audit_events", "shadow_decision")
+    op.drop_column("audit_events", "policy_variant")
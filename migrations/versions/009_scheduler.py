@@ -0,0 +1,26 @@
+"""audit_events priority and queue_wait_ms
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "009"
+down_revision: Union[str, None] = "008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("audit_events", sa.Column("priority", sa.String(16), nullable=True))
+    op.add_column("audit_events", sa.Column("queue_wait_ms", sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("audit_events", "queue_wait_ms")
+    op.drop_column("audit_events", "priority")
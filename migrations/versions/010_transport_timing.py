@@ -0,0 +1,24 @@
+"""audit_events transport_timing
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "010"
+down_revision: Union[str, None] = "009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("audit_events", sa.Column("transport_timing", sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("audit_events", "transport_timing")
@@ -14,6 +14,100 @@ DEFAULT_POLICY_JSON = """{
 }"""
 
 
+@pytest.fixture(autouse=True)
+def clear_decision_cache():
+    """Start every test with an empty decision cache (entries are keyed by policy content)."""
+    from app.decision.cache import decision_cache
+
+    decision_cache.clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def clear_spend_ledger():
+    """Start every test with no recorded spend (budget rules read the process-wide ledger)."""
+    from app.decision.budget import spend_ledger
+
+    spend_ledger.clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def clear_idempotency_store():
+    """Start every test with no stored Idempotency-Key results."""
+    from app.services.idempotency import idempotency_store
+
+    idempotency_store.clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def reset_provider_schedulers():
+    """Start every test with fresh provider schedulers (no held slots, no fair-share history)."""
+    from app.services.scheduler import reset_schedulers
+
+    reset_schedulers()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def close_provider_clients():
+    """Start every test without pooled provider clients (tests swap in mock transports)."""
+    from app.providers.transport import close_clients
+
+    close_clients()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def clear_latency_windows():
+    """Start every test without observed provider latencies (static timeouts, no deadline routing or skips)."""
+    from app.decision.latency import latency_models
+    from app.services.timeouts import latency_windows
+
+    latency_windows.clear()
+    latency_models.clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def reset_local_load():
+    """Start every test with the local provider unsaturated (no model fallbacks)."""
+    from app.services.local_load import local_load
+
+    local_load.reset()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def clear_prompt_cache_prefixes():
+    """Start every test with no remembered Anthropic prefixes (no cache breakpoints yet)."""
+    from app.providers.prompt_cache import prefix_tracker
+
+    prefix_tracker.clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def clear_chat_sessions():
+    """Start every test without chat sessions."""
+    from app.services.sessions import session_store
+
+    session_store.clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def clear_chat_jobs(monkeypatch: pytest.MonkeyPatch):
+    """Start every test with an empty job queue and no remembered jobs."""
+    from app.services.jobs import clear_jobs, job_queue
+
+    clear_jobs()
+    # Tests run queued jobs themselves with run_job instead of starting workers.
+    monkeypatch.setattr(job_queue, "consumers", 1)
+    yield
+
+
 @pytest.fixture(autouse=True)
 def policy_file_env(monkeypatch: pytest.MonkeyPatch, tmp_path):
     """
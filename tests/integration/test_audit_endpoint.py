@@ -19,7 +19,7 @@ def test_get_audit_event_returns_safe_fields_when_found() -> None:
         failure_category=None,
         prompt_hash="abc",
         prompt_length=5,
-        prompt_flags=None,
+        prompt_flags="detectors=email",
         created_at=datetime.now(timezone.utc),
     )
     with (
@@ -39,12 +39,26 @@ def test_get_audit_event_returns_safe_fields_when_found() -> None:
         "failure_category",
         "prompt_hash",
         "prompt_length",
+        "prompt_flags",
+        "tenant",
+        "cost_usd",
+        "model",
+        "input_tokens",
+        "output_tokens",
+        "tokens_per_second",
+        "policy_variant",
+        "shadow_decision",
+        "decision_trace",
+        "priority",
+        "queue_wait_ms",
+        "transport_timing",
         "created_at",
     }
     assert body["request_id"] == "req-123"
     assert body["decision"] == "provider=local,reason_codes=cost_prefer_local"
     assert body["status"] == "success"
     assert body["failure_category"] is None
+    assert body["prompt_flags"] == "detectors=email"
     assert "prompt" not in body and "raw_prompt" not in body
 
 
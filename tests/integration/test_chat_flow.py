@@ -1,13 +1,15 @@
 """End-to-end /v1/chat orchestration tests with mocked decide, providers, and audit.
 
-All tests use mocked providers (decide, ollama_provider, openai_provider, persist_audit_event);
+All tests use mocked providers (decide, the adapters' chat functions, persist_audit_event);
 no real network calls. Coverage: route behavior (local + openai success), fallback behavior
 (provider failure → error + audit failure_category), audit write assertions, schema validation.
 """
 
+import json
 import re
 from unittest.mock import patch
 
+import httpx
 from fastapi.testclient import TestClient
 
 from app.audit.context import AuditRequestContext
@@ -18,11 +20,11 @@ def test_chat_local_happy_path_returns_provider_reason_codes_content() -> None:
     """Route behavior (local): mocked decide → local, ollama.chat success → 200, provider, reason_codes, content; audit written with status=success."""
     with (
         patch("app.services.chat_orchestrator.decide") as mock_decide,
-        patch("app.services.chat_orchestrator.ollama_provider") as mock_ollama,
+        patch("app.providers.ollama.chat") as mock_ollama,
         patch("app.services.chat_orchestrator.persist_audit_event") as mock_persist,
     ):
         mock_decide.return_value = {"provider": "local", "reason_codes": ["cost_prefer_local"]}
-        mock_ollama.chat.return_value = {"success": True, "content": "Hello from Ollama"}
+        mock_ollama.return_value = {"success": True, "content": "Hello from Ollama"}
 
         client = TestClient(app)
         response = client.post(
@@ -39,7 +41,7 @@ def test_chat_local_happy_path_returns_provider_reason_codes_content() -> None:
     assert data["content"] == "Hello from Ollama"
     assert data.get("error") is None
     mock_decide.assert_called_once()
-    mock_ollama.chat.assert_called_once()
+    mock_ollama.assert_called_once()
     mock_persist.assert_called_once()
     ctx: AuditRequestContext = mock_persist.call_args[0][0]
     assert ctx.request_id
@@ -54,11 +56,11 @@ def test_chat_anthropic_happy_path_returns_provider_reason_codes_content() -> No
     """Route behavior (anthropic): mocked decide → anthropic, anthropic.chat success → 200, provider, reason_codes, content; audit written."""
     with (
         patch("app.services.chat_orchestrator.decide") as mock_decide,
-        patch("app.services.chat_orchestrator.anthropic_provider") as mock_anthropic,
+        patch("app.providers.anthropic.chat") as mock_anthropic,
         patch("app.services.chat_orchestrator.persist_audit_event") as mock_persist,
     ):
         mock_decide.return_value = {"provider": "anthropic", "reason_codes": ["default"]}
-        mock_anthropic.chat.return_value = {"success": True, "content": "Hello from Claude"}
+        mock_anthropic.return_value = {"success": True, "content": "Hello from Claude"}
 
         client = TestClient(app)
         response = client.post(
@@ -75,7 +77,7 @@ def test_chat_anthropic_happy_path_returns_provider_reason_codes_content() -> No
     assert data["content"] == "Hello from Claude"
     assert data.get("error") is None
     mock_decide.assert_called_once()
-    mock_anthropic.chat.assert_called_once()
+    mock_anthropic.assert_called_once()
     mock_persist.assert_called_once()
     ctx: AuditRequestContext = mock_persist.call_args[0][0]
     assert "provider=anthropic" in ctx.decision
@@ -86,11 +88,11 @@ def test_chat_openai_happy_path_returns_provider_reason_codes_content() -> None:
     """Route behavior (openai): mocked decide → openai, openai.chat success → 200, provider, reason_codes, content; audit written with status=success."""
     with (
         patch("app.services.chat_orchestrator.decide") as mock_decide,
-        patch("app.services.chat_orchestrator.openai_provider") as mock_openai,
+        patch("app.providers.openai.chat") as mock_openai,
         patch("app.services.chat_orchestrator.persist_audit_event") as mock_persist,
     ):
         mock_decide.return_value = {"provider": "openai", "reason_codes": ["default"]}
-        mock_openai.chat.return_value = {"success": True, "content": "Hello from OpenAI"}
+        mock_openai.return_value = {"success": True, "content": "Hello from OpenAI"}
 
         client = TestClient(app)
         response = client.post(
@@ -107,7 +109,7 @@ def test_chat_openai_happy_path_returns_provider_reason_codes_content() -> None:
     assert data["content"] == "Hello from OpenAI"
     assert data.get("error") is None
     mock_decide.assert_called_once()
-    mock_openai.chat.assert_called_once()
+    mock_openai.assert_called_once()
     mock_persist.assert_called_once()
     ctx: AuditRequestContext = mock_persist.call_args[0][0]
     assert ctx.request_id
@@ -122,11 +124,11 @@ def test_chat_provider_failure_returns_error_and_audit_with_failure_category() -
     """Fallback behavior: provider failure → 200 with error; audit write with status=failure and failure_category."""
     with (
         patch("app.services.chat_orchestrator.decide") as mock_decide,
-        patch("app.services.chat_orchestrator.openai_provider") as mock_openai,
+        patch("app.providers.openai.chat") as mock_openai,
         patch("app.services.chat_orchestrator.persist_audit_event") as mock_persist,
     ):
         mock_decide.return_value = {"provider": "openai", "reason_codes": ["default"]}
-        mock_openai.chat.return_value = {
+        mock_openai.return_value = {
             "success": False,
             "failure_category": "timeout",
             "message": "Request timed out",
@@ -159,3 +161,679 @@ def test_chat_validates_request_schema() -> None:
     assert r.status_code == 422
     r2 = client.post("/v1/chat", json={})
     assert r2.status_code == 422
+
+
+def test_chat_stores_decision_flags_in_audit_prompt_flags() -> None:
+    """Detector flags from the decision are persisted in the audit prompt_flags column."""
+    with (
+        patch("app.services.chat_orchestrator.decide") as mock_decide,
+        patch("app.providers.ollama.chat") as mock_ollama,
+        patch("app.services.chat_orchestrator.persist_audit_event") as mock_persist,
+    ):
+        mock_decide.return_value = {
+            "provider": "local",
+            "reason_codes": ["sensitive_email"],
+            "flags": ["detectors=email"],
+        }
+        mock_ollama.return_value = {"success": True, "content": "ok"}
+
+        client = TestClient(app)
+        response = client.post(
+            "/v1/chat",
+            json={"messages": [{"role": "user", "content": "Hi"}]},
+        )
+
+    assert response.status_code == 200
+    assert response.json()["reason_codes"] == ["sensitive_email"]
+    ctx: AuditRequestContext = mock_persist.call_args[0][0]
+    assert ctx.prompt_flags == "detectors=email"
+
+
+def test_chat_passes_every_message_to_decide() -> None:
+    """The orchestrator hands all message contents to decide (used by conversation scope)."""
+    with (
+        patch("app.services.chat_orchestrator.decide") as mock_decide,
+        patch("app.providers.ollama.chat") as mock_ollama,
+        patch("app.services.chat_orchestrator.persist_audit_event"),
+    ):
+        mock_decide.return_value = {"provider": "local", "reason_codes": ["default"]}
+        mock_ollama.return_value = {"success": True, "content": "ok"}
+
+        client = TestClient(app)
+        response = client.post(
+            "/v1/chat",
+            json={
+                "messages": [
+                    {"role": "system", "content": "Be brief."},
+                    {"role": "user", "content": "Hi"},
+                    {"role": "assistant", "content": "Hello"},
+                    {"role": "user", "content": "Bye"},
+                ]
+            },
+        )
+
+    assert response.status_code == 200
+    kwargs = mock_decide.call_args.kwargs
+    assert kwargs["prompt_text"] == "Bye"
+    assert kwargs["messages"] == ["Be brief.", "Hi", "Hello", "Bye"]
+
+
+def test_chat_unexpected_error_is_audited_as_failure() -> None:
+    """An exception after routing still writes a failure audit event with the decision, then returns 500."""
+    with (
+        patch("app.providers.ollama.chat", side_effect=RuntimeError("boom")),
+        patch("app.services.chat_orchestrator.persist_audit_event") as mock_persist,
+    ):
+        response = TestClient(app, raise_server_exceptions=False).post(
+            "/v1/chat", json={"messages": [{"role": "user", "content": "Hi"}]}
+        )
+    assert response.status_code == 500
+    ctx: AuditRequestContext = mock_persist.call_args[0][0]
+    assert ctx.status == "failure" and ctx.failure_category == "unknown"
+    assert ctx.decision.startswith("provider=local,")
+
+
+def test_chat_records_tenant_and_public_spend() -> None:
+    """Public calls record the estimated cost for the tenant in the audit row, then in the ledger."""
+    from app.decision.budget import spend_ledger
+
+    with (
+        patch("app.services.chat_orchestrator.decide") as mock_decide,
+        patch("app.providers.openai.chat") as mock_openai,
+        patch("app.services.chat_orchestrator.persist_audit_event") as mock_persist,
+    ):
+        mock_decide.return_value = {
+            "provider": "openai",
+            "reason_codes": ["default"],
+            "estimated_cost_usd": 0.25,
+        }
+        mock_openai.return_value = {"success": True, "content": "ok"}
+        # Not yet in the ledger while the audit row is written (a restore would count it twice).
+        spent_at_audit: list[float] = []
+        mock_persist.side_effect = lambda ctx: spent_at_audit.append(spend_ledger.spent("tenant:acme", 3600))
+
+        client = TestClient(app)
+        response = client.post(
+            "/v1/chat",
+            json={"messages": [{"role": "user", "content": "Hi"}]},
+            headers={"X-Tenant": "acme"},
+        )
+
+    assert response.status_code == 200
+    assert mock_decide.call_args.kwargs["tenant"] == "acme"
+    ctx: AuditRequestContext = mock_persist.call_args[0][0]
+    assert ctx.tenant == "acme"
+    assert ctx.cost_usd == 0.25
+    assert spend_ledger.spent("tenant:acme", 3600) == 0.25
+    assert spent_at_audit == [0.0]
+
+
+def test_chat_prices_reported_usage_and_audits_tokens(monkeypatch, tmp_path) -> None:
+    """Reported tokens are priced via cost.pricing, returned in usage, and audited."""
+    import json
+
+    from app.decision.budget import spend_ledger
+    from tests.conftest import DEFAULT_POLICY_JSON
+
+    policy = json.loads(DEFAULT_POLICY_JSON)
+    policy["cost"]["pricing"] = {
+        "openai": {"default": {"input_usd_per_1m_tokens": 1.0, "output_usd_per_1m_tokens": 4.0}}
+    }
+    path = tmp_path / "priced.json"
+    path.write_text(json.dumps(policy), encoding="utf-8")
+    monkeypatch.setenv("POLICY_FILE", str(path))
+
+    with (
+        patch("app.services.chat_orchestrator.decide") as mock_decide,
+        patch("app.providers.openai.chat") as mock_openai,
+        patch("app.services.chat_orchestrator.persist_audit_event") as mock_persist,
+    ):
+        mock_decide.return_value = {
+            "provider": "openai",
+            "reason_codes": ["default"],
+            "estimated_cost_usd": 9.0,
+        }
+        mock_openai.return_value = {
+            "success": True,
+            "content": "ok",
+            "model": "gpt-4o-mini-2024-07-18",
+            "usage": {"input_tokens": 1_000_000, "output_tokens": 500_000},
+        }
+        response = TestClient(app).post(
+            "/v1/chat",
+            json={"messages": [{"role": "user", "content": "Hi"}]},
+            headers={"X-Tenant": "acme"},
+        )
+
+    data = response.json()
+    assert data["model"] == "gpt-4o-mini-2024-07-18"
+    assert data["usage"]["input_tokens"] == 1_000_000
+    assert data["usage"]["cost_usd"] == 3.0
+    ctx: AuditRequestContext = mock_persist.call_args[0][0]
+    assert (ctx.input_tokens, ctx.output_tokens, ctx.cost_usd) == (1_000_000, 500_000, 3.0)
+    assert ctx.model == "gpt-4o-mini-2024-07-18"
+    assert spend_ledger.spent("tenant:acme", 3600) == 3.0
+
+
+def test_chat_local_usage_reports_tokens_per_second() -> None:
+    """Ollama timings yield tokens_per_second; local calls cost nothing."""
+    with (
+        patch("app.services.chat_orchestrator.decide") as mock_decide,
+        patch("app.providers.ollama.chat") as mock_ollama,
+        patch("app.services.chat_orchestrator.persist_audit_event") as mock_persist,
+    ):
+        mock_decide.return_value = {"provider": "local", "reason_codes": ["default"]}
+        mock_ollama.return_value = {
+            "success": True,
+            "content": "ok",
+            "usage": {"input_tokens": 20, "output_tokens": 80, "generation_seconds": 2.0},
+        }
+        response = TestClient(app).post(
+            "/v1/chat", json={"messages": [{"role": "user", "content": "Hi"}]}
+        )
+
+    usage = response.json()["usage"]
+    assert usage["tokens_per_second"] == 40.0
+    assert usage["cost_usd"] == 0.0
+    ctx: AuditRequestContext = mock_persist.call_args[0][0]
+    assert ctx.tokens_per_second == 40.0
+    assert ctx.cost_usd is None
+
+
+def test_chat_decides_with_the_tenant_policy(monkeypatch, tmp_path) -> None:
+    """With POLICY_DIR, the request's tenant selects the policy passed to decide."""
+    import json
+
+    from tests.conftest import DEFAULT_POLICY_JSON
+
+    acme = json.loads(DEFAULT_POLICY_JSON)
+    acme["sensitivity"]["keywords"] = ["acme-only"]
+    (tmp_path / "default.json").write_text(DEFAULT_POLICY_JSON, encoding="utf-8")
+    (tmp_path / "acme.json").write_text(json.dumps(acme), encoding="utf-8")
+    monkeypatch.setenv("POLICY_DIR", str(tmp_path))
+
+    with (
+        patch("app.services.chat_orchestrator.decide") as mock_decide,
+        patch("app.providers.ollama.chat") as mock_ollama,
+        patch("app.services.chat_orchestrator.persist_audit_event"),
+    ):
+        mock_decide.return_value = {"provider": "local", "reason_codes": ["default"]}
+        mock_ollama.return_value = {"success": True, "content": "ok"}
+        TestClient(app).post(
+            "/v1/chat",
+            json={"messages": [{"role": "user", "content": "Hi"}]},
+            headers={"X-Tenant": "acme"},
+        )
+
+    assert mock_decide.call_args.kwargs["config"].sensitivity_keywords == ("acme-only",)
+
+
+def _rollout_policy(tmp_path, monkeypatch, **rollout) -> None:
+    import json
+
+    from tests.conftest import DEFAULT_POLICY_JSON
+
+    candidate = json.loads(DEFAULT_POLICY_JSON)
+    candidate["cost"]["default_provider"] = "public"
+    active = json.loads(DEFAULT_POLICY_JSON)
+    active["rollout"] = {"candidate": "candidate.json", **rollout}
+    (tmp_path / "candidate.json").write_text(json.dumps(candidate), encoding="utf-8")
+    (tmp_path / "active.json").write_text(json.dumps(active), encoding="utf-8")
+    monkeypatch.setenv("POLICY_FILE", str(tmp_path / "active.json"))
+
+
+def test_chat_shadow_evaluates_candidate_after_response(monkeypatch, tmp_path) -> None:
+    """Shadow mode: the active policy routes; the candidate is evaluated as a background task."""
+    _rollout_policy(tmp_path, monkeypatch, mode="shadow")
+    with (
+        patch("app.providers.ollama.chat") as mock_ollama,
+        patch("app.services.chat_orchestrator.persist_audit_event"),
+        patch("app.services.chat_orchestrator.evaluate_shadow") as mock_shadow,
+    ):
+        mock_ollama.return_value = {"success": True, "content": "ok"}
+        response = TestClient(app).post(
+            "/v1/chat", json={"messages": [{"role": "user", "content": "Hi"}]}
+        )
+
+    assert response.json()["provider"] == "local"
+    mock_shadow.assert_called_once()
+    rollout, request_id, active, _ = mock_shadow.call_args[0]
+    assert request_id == response.json()["request_id"]
+    assert active["provider"] == "local"
+    assert rollout.candidate.default_provider == "public"
+
+
+def test_chat_canary_routes_by_candidate_and_audits_variant(monkeypatch, tmp_path) -> None:
+    """Canary at 100%: the candidate decides and audit records policy_variant=candidate."""
+    _rollout_policy(tmp_path, monkeypatch, mode="canary", canary_percent=100)
+    with (
+        patch("app.providers.openai.chat") as mock_openai,
+        patch("app.services.chat_orchestrator.persist_audit_event") as mock_persist,
+    ):
+        mock_openai.return_value = {"success": True, "content": "ok"}
+        response = TestClient(app).post(
+            "/v1/chat", json={"messages": [{"role": "user", "content": "x" * 2000}]}
+        )
+
+    assert response.json()["provider"] == "openai"
+    ctx: AuditRequestContext = mock_persist.call_args[0][0]
+    assert ctx.policy_variant == "candidate"
+
+
+def test_chat_decision_trace_header_returns_and_audits_trace() -> None:
+    """X-Decision-Trace: 1 adds per-rule trace to the response and compact trace to audit."""
+    with (
+        patch("app.providers.ollama.chat") as mock_ollama,
+        patch("app.services.chat_orchestrator.persist_audit_event") as mock_persist,
+    ):
+        mock_ollama.return_value = {"success": True, "content": "ok"}
+        response = TestClient(app).post(
+            "/v1/chat",
+            json={"messages": [{"role": "user", "content": "Hi"}]},
+            headers={"X-Decision-Trace": "1"},
+        )
+
+    trace = response.json()["trace"]
+    assert trace["cache"] == "bypass"
+    assert [(r["name"], r["outcome"]) for r in trace["rules"]] == [
+        ("sensitivity", "pass"),
+        ("cost", "match"),
+    ]
+    assert all(r["elapsed_ns"] >= 0 for r in trace["rules"])
+    ctx: AuditRequestContext = mock_persist.call_args[0][0]
+    assert ctx.decision_trace is not None
+    assert "Hi" not in ctx.decision_trace
+
+
+def test_chat_audits_priority_class_and_queue_wait() -> None:
+    """X-Priority selects the scheduler class; audit records it with the slot wait."""
+    with (
+        patch("app.providers.ollama.chat") as mock_ollama,
+        patch("app.services.chat_orchestrator.persist_audit_event") as mock_persist,
+    ):
+        mock_ollama.return_value = {"success": True, "content": "ok"}
+        client = TestClient(app)
+        client.post("/v1/chat", json={"messages": [{"role": "user", "content": "Hi"}]})
+        client.post(
+            "/v1/chat",
+            json={"messages": [{"role": "user", "content": "Hi"}]},
+            headers={"X-Priority": "batch"},
+        )
+
+    first, second = (c[0][0] for c in mock_persist.call_args_list)
+    assert first.priority == "interactive"
+    assert second.priority == "batch"
+    assert first.queue_wait_ms is not None and first.queue_wait_ms >= 0
+
+
+def test_chat_without_trace_header_has_no_trace(monkeypatch) -> None:
+    """Tracing is opt-in: no header and sample rate 0 → no trace in response or audit."""
+    monkeypatch.setenv("DECISION_TRACE_SAMPLE_RATE", "0")
+    with (
+        patch("app.providers.ollama.chat") as mock_ollama,
+        patch("app.services.chat_orchestrator.persist_audit_event") as mock_persist,
+    ):
+        mock_ollama.return_value = {"success": True, "content": "ok"}
+        response = TestClient(app).post(
+            "/v1/chat", json={"messages": [{"role": "user", "content": "Hi"}]}
+        )
+
+    assert response.json()["trace"] is None
+    assert mock_persist.call_args[0][0].decision_trace is None
+
+
+def test_chat_idempotency_key_replays_without_second_provider_call() -> None:
+    """A retried request with the same Idempotency-Key returns the stored response and request_id."""
+    with (
+        patch("app.providers.ollama.chat") as mock_ollama,
+        patch("app.services.chat_orchestrator.persist_audit_event") as mock_persist,
+    ):
+        mock_ollama.return_value = {"success": True, "content": "ok"}
+        client = TestClient(app)
+        payload = {"messages": [{"role": "user", "content": "Hi"}]}
+        first = client.post("/v1/chat", json=payload, headers={"Idempotency-Key": "retry-1"})
+        second = client.post("/v1/chat", json=payload, headers={"Idempotency-Key": "retry-1"})
+
+    assert first.json() == second.json()
+    assert second.headers["X-Request-Id"] == first.json()["request_id"]
+    assert second.headers.get("Idempotent-Replayed") == "true"
+    assert "Idempotent-Replayed" not in first.headers
+    assert mock_ollama.call_count == 1
+    assert mock_persist.call_count == 1
+
+
+def test_chat_idempotency_key_reused_for_other_body_returns_422() -> None:
+    """Reusing an Idempotency-Key with a different body is rejected."""
+    with (
+        patch("app.providers.ollama.chat") as mock_ollama,
+        patch("app.services.chat_orchestrator.persist_audit_event"),
+    ):
+        mock_ollama.return_value = {"success": True, "content": "ok"}
+        client = TestClient(app)
+        client.post(
+            "/v1/chat", json={"messages": [{"role": "user", "content": "Hi"}]}, headers={"Idempotency-Key": "k"}
+        )
+        response = client.post(
+            "/v1/chat", json={"messages": [{"role": "user", "content": "Bye"}]}, headers={"Idempotency-Key": "k"}
+        )
+
+    assert response.status_code == 422
+    assert mock_ollama.call_count == 1
+
+
+def test_chat_job_submit_then_poll_result() -> None:
+    """POST /v1/chat/jobs returns 202 with a job id; after a worker runs it, GET has the result."""
+    from app.services.jobs import job_queue, run_job
+
+    client = TestClient(app)
+    submitted = client.post(
+        "/v1/chat/jobs",
+        json={"messages": [{"role": "user", "content": "Hi"}], "priority": "high"},
+        headers={"X-Tenant": "acme"},
+    )
+    assert submitted.status_code == 202
+    job_id = submitted.json()["job_id"]
+    assert submitted.json()["status"] == "queued"
+
+    with (
+        patch("app.providers.ollama.chat") as mock_ollama,
+        patch("app.services.chat_orchestrator.persist_audit_event"),
+    ):
+        mock_ollama.return_value = {"success": True, "content": "done"}
+        run_job(job_queue.get(timeout=0))
+
+    polled = client.get(f"/v1/chat/jobs/{job_id}", headers={"X-Tenant": "acme"}).json()
+    assert polled["status"] == "completed"
+    assert polled["result"]["content"] == "done"
+    assert polled["result"]["provider"] == "local"
+    assert client.get(f"/v1/chat/jobs/{job_id}", headers={"X-Tenant": "globex"}).status_code == 404
+    assert client.get(f"/v1/chat/jobs/{job_id}").status_code == 404
+    assert client.get("/v1/chat/jobs/unknown", headers={"X-Tenant": "acme"}).status_code == 404
+
+
+def test_chat_job_queue_full_returns_503(monkeypatch) -> None:
+    """A full backlog rejects new jobs with 503 and Retry-After."""
+    from app.services.jobs import job_queue
+
+    monkeypatch.setattr(job_queue, "maxsize", 0)
+    response = TestClient(app).post("/v1/chat/jobs", json={"messages": [{"role": "user", "content": "Hi"}]})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "5"
+
+
+def test_chat_job_without_workers_returns_503(monkeypatch) -> None:
+    """With JOB_WORKERS=0 nothing would run a job, so submissions get 503 instead of a job id."""
+    from app.services.jobs import job_queue
+
+    monkeypatch.setattr(job_queue, "consumers", 0)
+    response = TestClient(app).post("/v1/chat/jobs", json={"messages": [{"role": "user", "content": "Hi"}]})
+    assert response.status_code == 503
+    assert len(job_queue) == 0
+
+
+def test_chat_batch_streams_ndjson_and_limits_size(monkeypatch) -> None:
+    """POST /v1/chat/batch returns one JSON line per request; oversize batches get 422."""
+    with (
+        patch("app.providers.ollama.chat") as mock_ollama,
+        patch("app.services.batch.persist_audit_events") as mock_bulk,
+    ):
+        mock_ollama.return_value = {"success": True, "content": "ok"}
+        client = TestClient(app)
+        payload = {"requests": [{"messages": [{"role": "user", "content": f"q{i}"}]} for i in range(3)]}
+        response = client.post("/v1/chat/batch", json=payload)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(line["index"] for line in lines) == [0, 1, 2]
+    assert all(line["content"] == "ok" for line in lines)
+    assert len(mock_bulk.call_args[0][0]) == 3
+
+    monkeypatch.setenv("BATCH_MAX_ITEMS", "2")
+    assert client.post("/v1/chat/batch", json=payload).status_code == 422
+
+
+def test_chat_overload_sheds_batch_first_and_keeps_health(monkeypatch) -> None:
+    """Under moderate overload batch-class chat gets 503 + Retry-After; interactive and health pass."""
+    from app.services.admission import Signals
+
+    monkeypatch.setenv("ADMISSION_QUEUE_DEPTH", "10")
+    monkeypatch.setattr("app.api.middleware.current_signals", lambda: Signals(0.0, 0.0, 15))
+    with (
+        patch("app.providers.ollama.chat") as mock_ollama,
+        patch("app.services.chat_orchestrator.persist_audit_event"),
+    ):
+        mock_ollama.return_value = {"success": True, "content": "ok"}
+        client = TestClient(app)
+        body = {"messages": [{"role": "user", "content": "Hi"}]}
+        shed = client.post("/v1/chat", json=body, headers={"X-Priority": "batch"})
+        batch = client.post("/v1/chat/batch", json={"requests": [body]})
+        interactive = client.post("/v1/chat", json=body)
+        health = client.get("/v1/health")
+
+    assert shed.status_code == 503
+    assert shed.headers["Retry-After"] == "2"
+    assert batch.status_code == 503
+    assert interactive.status_code == 200
+    assert health.status_code == 200
+    assert mock_ollama.call_count == 1
+
+
+def test_chat_deadline_skips_provider_that_cannot_make_it() -> None:
+    """X-Deadline-Ms below the provider's observed median latency fails fast without a call."""
+    from app.services.timeouts import MIN_SAMPLES, latency_windows
+
+    for _ in range(MIN_SAMPLES):
+        latency_windows.observe("local", "s", 2.0)
+    with (
+        patch("app.providers.ollama.chat") as mock_ollama,
+        patch("app.services.chat_orchestrator.persist_audit_event") as mock_persist,
+    ):
+        response = TestClient(app).post(
+            "/v1/chat",
+            json={"messages": [{"role": "user", "content": "Hi"}]},
+            headers={"X-Deadline-Ms": "500"},
+        )
+
+    assert response.status_code == 200
+    assert response.json()["error"] == "Deadline cannot be met"
+    mock_ollama.assert_not_called()
+    ctx: AuditRequestContext = mock_persist.call_args[0][0]
+    assert ctx.failure_category == "deadline_exceeded"
+
+
+def test_chat_successful_calls_feed_the_latency_model() -> None:
+    """Each successful provider call is observed, so the deadline rule can predict the provider."""
+    from app.decision.latency import latency_models
+
+    with (
+        patch("app.providers.ollama.chat") as mock_ollama,
+        patch("app.services.chat_orchestrator.persist_audit_event"),
+    ):
+        mock_ollama.return_value = {"success": True, "content": "ok"}
+        client = TestClient(app)
+        for _ in range(6):
+            client.post("/v1/chat", json={"messages": [{"role": "user", "content": "Hi"}]})
+
+    assert latency_models.predict("local", 2) is not None
+    assert latency_models.predict("openai", 2) is None
+
+
+def test_chat_downgrades_local_model_while_saturated(tmp_path, monkeypatch) -> None:
+    """Saturated local provider: the fallback model serves the request and is recorded."""
+    import json
+
+    from app.services.local_load import local_load
+    from tests.conftest import DEFAULT_POLICY_JSON
+
+    policy = json.loads(DEFAULT_POLICY_JSON)
+    policy["local_fallbacks"] = {"models": {"llama3:70b": "llama3:8b"}, "queue_depth": 4, "latency_ms": 5000}
+    (tmp_path / "fallbacks.json").write_text(json.dumps(policy), encoding="utf-8")
+    monkeypatch.setenv("POLICY_FILE", str(tmp_path / "fallbacks.json"))
+    local_load.observe(9000)
+    with (
+        patch("app.providers.ollama.chat") as mock_ollama,
+        patch("app.services.chat_orchestrator.persist_audit_event") as mock_persist,
+    ):
+        mock_ollama.return_value = {"success": True, "content": "ok"}
+        response = TestClient(app).post(
+            "/v1/chat", json={"messages": [{"role": "user", "content": "Hi"}], "model": "llama3:70b"}
+        )
+
+    assert mock_ollama.call_args.kwargs["model"] == "llama3:8b"
+    assert "local_model_downgraded" in response.json()["reason_codes"]
+    ctx: AuditRequestContext = mock_persist.call_args[0][0]
+    assert ctx.model == "llama3:8b"
+    assert "model_downgraded=llama3:70b" in ctx.prompt_flags
+    assert "local_model_downgraded" in ctx.decision
+
+
+def test_chat_prices_prompt_cache_tokens(monkeypatch, tmp_path) -> None:
+    """Anthropic cache reads cost 10% and cache writes 125% of the input price."""
+    import json
+
+    from tests.conftest import DEFAULT_POLICY_JSON
+
+    policy = json.loads(DEFAULT_POLICY_JSON)
+    policy["cost"]["pricing"] = {"anthropic": {"default": {"input_usd_per_1m_tokens": 1.0}}}
+    path = tmp_path / "priced.json"
+    path.write_text(json.dumps(policy), encoding="utf-8")
+    monkeypatch.setenv("POLICY_FILE", str(path))
+
+    with (
+        patch("app.services.chat_orchestrator.decide") as mock_decide,
+        patch("app.providers.anthropic.chat") as mock_anthropic,
+        patch("app.services.chat_orchestrator.persist_audit_event"),
+    ):
+        mock_decide.return_value = {"provider": "anthropic", "reason_codes": ["default"]}
+        mock_anthropic.return_value = {
+            "success": True,
+            "content": "ok",
+            "usage": {
+                "input_tokens": 1_000_000,
+                "output_tokens": 0,
+                "cache_read_input_tokens": 10_000_000,
+                "cache_creation_input_tokens": 4_000_000,
+            },
+        }
+        response = TestClient(app).post("/v1/chat", json={"messages": [{"role": "user", "content": "Hi"}]})
+
+    assert response.json()["usage"]["cost_usd"] == 7.0
+
+
+def _session_policy(tmp_path, monkeypatch) -> None:
+    import json
+
+    from tests.conftest import DEFAULT_POLICY_JSON
+
+    policy = json.loads(DEFAULT_POLICY_JSON)
+    policy["sensitivity"]["keywords"] = ["project-x"]
+    policy["cost"]["max_prompt_length_for_local"] = 0
+    policy["cost"]["default_provider"] = "public"
+    policy["decision_scope"] = "conversation"
+    (tmp_path / "sessions.json").write_text(json.dumps(policy), encoding="utf-8")
+    monkeypatch.setenv("POLICY_FILE", str(tmp_path / "sessions.json"))
+
+
+def test_chat_session_sends_stored_history_with_new_messages(tmp_path, monkeypatch) -> None:
+    """The second turn sends only its new message; the provider gets the whole conversation."""
+    _session_policy(tmp_path, monkeypatch)
+    with (
+        patch("app.providers.openai.chat") as mock_openai,
+        patch("app.services.chat_orchestrator.persist_audit_event") as mock_persist,
+    ):
+        mock_openai.return_value = {"success": True, "content": "First answer"}
+        client = TestClient(app)
+        first = client.post(
+            "/v1/chat", json={"messages": [{"role": "user", "content": "Question one"}], "start_session": True}
+        )
+        session_id = first.json()["session_id"]
+        second = client.post(
+            "/v1/chat", json={"messages": [{"role": "user", "content": "Question two"}], "session_id": session_id}
+        )
+
+    assert second.status_code == 200
+    assert second.json()["session_id"] == session_id
+    assert mock_openai.call_args[0][0] == [
+        {"role": "user", "content": "Question one"},
+        {"role": "assistant", "content": "First answer"},
+        {"role": "user", "content": "Question two"},
+    ]
+    ctx: AuditRequestContext = mock_persist.call_args[0][0]
+    assert ctx.prompt_length == len("Question two")
+    assert "session_turn=2" in ctx.prompt_flags
+
+
+def test_chat_session_stays_local_after_a_sensitive_turn(tmp_path, monkeypatch) -> None:
+    """Once a turn matched sensitivity, later turns of the session route local."""
+    _session_policy(tmp_path, monkeypatch)
+    with (
+        patch("app.providers.ollama.chat") as mock_ollama,
+        patch("app.providers.openai.chat") as mock_openai,
+        patch("app.services.chat_orchestrator.persist_audit_event"),
+    ):
+        mock_ollama.return_value = {"success": True, "content": "ok"}
+        client = TestClient(app)
+        first = client.post(
+            "/v1/chat",
+            json={"messages": [{"role": "user", "content": "About project-x"}], "start_session": True},
+        )
+        second = client.post(
+            "/v1/chat",
+            json={"messages": [{"role": "user", "content": "Harmless"}], "session_id": first.json()["session_id"]},
+        )
+
+    assert first.json()["reason_codes"] == ["sensitive_keyword_match"]
+    assert second.json()["provider"] == "local"
+    assert second.json()["reason_codes"] == ["session_sensitive"]
+    mock_openai.assert_not_called()
+
+
+def test_chat_unknown_session_returns_404_and_batch_rejects_sessions() -> None:
+    """An unknown session_id is 404; batch requests cannot use sessions (422)."""
+    client = TestClient(app)
+    unknown = client.post("/v1/chat", json={"messages": [{"role": "user", "content": "Hi"}], "session_id": "nope"})
+    batch = client.post(
+        "/v1/chat/batch",
+        json={"requests": [{"messages": [{"role": "user", "content": "Hi"}], "start_session": True}]},
+    )
+
+    assert unknown.status_code == 404
+    assert batch.status_code == 422
+
+
+def test_chat_completions_relays_openai_stream_through_the_route() -> None:
+    """/v1/chat/completions: SSE bytes from the routed provider reach the client unchanged, with route headers."""
+    real_client = httpx.Client
+    upstream = (
+        b'data: {"model":"gpt-test","choices":[{"delta":{"content":"Hel"}}]}\n\n'
+        b'data: {"model":"gpt-test","choices":[{"delta":{"content":"lo"}}]}\n\n'
+        b'data: {"model":"gpt-test","choices":[],"usage":{"prompt_tokens":3,"completion_tokens":2}}\n\n'
+        b"data: [DONE]\n\n"
+    )
+    transport = httpx.MockTransport(
+        lambda r: httpx.Response(200, stream=httpx.ByteStream(upstream), headers={"content-type": "text/event-stream"})
+    )
+    client = TestClient(app)
+    with (
+        patch("app.services.chat_orchestrator.decide") as mock_decide,
+        patch("app.providers.transport.provider_client", lambda timeout, pool: real_client(transport=transport, timeout=timeout)),
+        patch("app.services.completions.persist_audit_event") as mock_persist,
+    ):
+        mock_decide.return_value = {"provider": "local", "reason_codes": ["cost_prefer_local"]}
+        response = client.post(
+            "/v1/chat/completions",
+            json={"model": "gpt-test", "stream": True, "messages": [{"role": "user", "content": "Hi"}]},
+        )
+        bad = client.post("/v1/chat/completions", json={"model": "gpt-test"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.headers["X-Route-Provider"] == "local"
+    assert response.headers["X-Route-Reason-Codes"] == "cost_prefer_local"
+    assert response.content == upstream
+    ctx: AuditRequestContext = mock_persist.call_args[0][0]
+    assert ctx.request_id == response.headers["X-Request-Id"]
+    assert (ctx.status, ctx.input_tokens, ctx.output_tokens) == ("success", 3, 2)
+    assert bad.status_code == 400
+    assert "error" in bad.json()
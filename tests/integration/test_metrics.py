@@ -22,11 +22,11 @@ def test_metrics_after_chat_request_increments_counter_and_observes_latency() ->
     """After a mocked POST /v1/chat, GET /v1/metrics shows incremented counter and histogram observation."""
     with (
         patch("app.services.chat_orchestrator.decide") as mock_decide,
-        patch("app.services.chat_orchestrator.ollama_provider") as mock_ollama,
+        patch("app.providers.ollama.chat") as mock_ollama,
         patch("app.services.chat_orchestrator.persist_audit_event"),
     ):
         mock_decide.return_value = {"provider": "local", "reason_codes": ["cost_prefer_local"]}
-        mock_ollama.chat.return_value = {"success": True, "content": "Hi"}
+        mock_ollama.return_value = {"success": True, "content": "Hi"}
 
         client = TestClient(app)
         chat_resp = client.post(
@@ -44,3 +44,26 @@ def test_metrics_after_chat_request_increments_counter_and_observes_latency() ->
     # Prometheus format: metric name followed by labels and value
     assert "chat_requests_total{" in body or "chat_requests_total " in body
     assert "chat_request_latency_seconds{" in body or "chat_request_latency_seconds " in body
+
+
+def test_metrics_include_reported_token_usage() -> None:
+    """Provider-reported usage shows up as llm_tokens_total and llm_output_tokens_per_second."""
+    with (
+        patch("app.services.chat_orchestrator.decide") as mock_decide,
+        patch("app.providers.ollama.chat") as mock_ollama,
+        patch("app.services.chat_orchestrator.persist_audit_event"),
+    ):
+        mock_decide.return_value = {"provider": "local", "reason_codes": ["default"]}
+        mock_ollama.return_value = {
+            "success": True,
+            "content": "Hi",
+            "model": "llama3",
+            "usage": {"input_tokens": 3, "output_tokens": 10, "generation_seconds": 0.5},
+        }
+        client = TestClient(app)
+        client.post("/v1/chat", json={"messages": [{"role": "user", "content": "Hello"}]})
+
+    body = client.get("/v1/metrics").text
+    assert 'llm_tokens_total{direction="output",model="llama3",provider="local"}' in body
+    assert 'llm_output_tokens_per_second_count{model="llama3",provider="local"}' in body
+    assert "llm_input_chars_per_token_bucket" in body
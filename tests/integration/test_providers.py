@@ -44,12 +44,11 @@ def test_ollama_chat_4xx_returns_client_error() -> None:
     mock_client = MagicMock()
     mock_client.post.return_value = mock_resp
 
-    result = ollama_module._request(
-        mock_client,
-        "http://fake/api/chat",
-        {"model": "llama2", "messages": []},
-        10.0,
-        None,
+    result = ollama_module.chat(
+        [{"role": "user", "content": "Hi"}],
+        base_url="http://fake",
+        timeout=10.0,
+        client=mock_client,
     )
 
     assert result["success"] is False
@@ -62,12 +61,11 @@ def test_ollama_chat_5xx_returns_server_error() -> None:
     mock_client = MagicMock()
     mock_client.post.return_value = mock_resp
 
-    result = ollama_module._request(
-        mock_client,
-        "http://fake/api/chat",
-        {"model": "llama2", "messages": []},
-        10.0,
-        None,
+    result = ollama_module.chat(
+        [{"role": "user", "content": "Hi"}],
+        base_url="http://fake",
+        timeout=10.0,
+        client=mock_client,
     )
 
     assert result["success"] is False
@@ -79,18 +77,31 @@ def test_ollama_chat_timeout_returns_timeout_category() -> None:
     mock_client = MagicMock()
     mock_client.post.side_effect = httpx.TimeoutException("timed out")
 
-    result = ollama_module._request(
-        mock_client,
-        "http://fake/api/chat",
-        {"model": "llama2", "messages": []},
-        10.0,
-        None,
+    result = ollama_module.chat(
+        [{"role": "user", "content": "Hi"}],
+        base_url="http://fake",
+        timeout=10.0,
+        client=mock_client,
     )
 
     assert result["success"] is False
     assert result["failure_category"] == FAILURE_TIMEOUT
 
 
+def test_ollama_chat_uses_split_timeouts_and_reports_timeout_phase(monkeypatch) -> None:
+    """Ollama: PROVIDER_TIMEOUTS_LOCAL sets per-phase timeouts; a connect timeout is named."""
+    monkeypatch.setenv("PROVIDER_TIMEOUTS_LOCAL", "connect=2,read=120")
+    mock_client = MagicMock()
+    mock_client.post.side_effect = httpx.ConnectTimeout("timed out")
+
+    result = ollama_module.chat([{"role": "user", "content": "Hi"}], base_url="http://fake", client=mock_client)
+
+    timeout = mock_client.post.call_args.kwargs["timeout"]
+    assert (timeout.connect, timeout.read, timeout.write, timeout.pool) == (2.0, 120.0, 10.0, 5.0)
+    assert result["failure_category"] == FAILURE_TIMEOUT
+    assert result["timeout_phase"] == "connect"
+
+
 # ---- OpenAI ----
 
 
@@ -138,12 +149,12 @@ def test_openai_chat_401_returns_auth_error() -> None:
     mock_client = MagicMock()
     mock_client.post.return_value = mock_resp
 
-    result = openai_module._request(
-        mock_client,
-        "https://api.openai.com/v1/chat/completions",
-        "sk-fake",
-        {"model": "gpt-3.5-turbo", "messages": []},
-        10.0,
+    result = openai_module.chat(
+        [{"role": "user", "content": "Hi"}],
+        api_key="sk-fake",
+        base_url="https://api.openai.com",
+        timeout=10.0,
+        client=mock_client,
     )
 
     assert result["success"] is False
@@ -156,12 +167,12 @@ def test_openai_chat_5xx_returns_server_error() -> None:
     mock_client = MagicMock()
     mock_client.post.return_value = mock_resp
 
-    result = openai_module._request(
-        mock_client,
-        "https://api.openai.com/v1/chat/completions",
-        "sk-fake",
-        {"model": "gpt-3.5-turbo", "messages": []},
-        10.0,
+    result = openai_module.chat(
+        [{"role": "user", "content": "Hi"}],
+        api_key="sk-fake",
+        base_url="https://api.openai.com",
+        timeout=10.0,
+        client=mock_client,
     )
 
     assert result["success"] is False
@@ -173,12 +184,12 @@ def test_openai_chat_timeout_returns_timeout_category() -> None:
     mock_client = MagicMock()
     mock_client.post.side_effect = httpx.TimeoutException("timed out")
 
-    result = openai_module._request(
-        mock_client,
-        "https://api.openai.com/v1/chat/completions",
-        "sk-fake",
-        {"model": "gpt-3.5-turbo", "messages": []},
-        10.0,
+    result = openai_module.chat(
+        [{"role": "user", "content": "Hi"}],
+        api_key="sk-fake",
+        base_url="https://api.openai.com",
+        timeout=10.0,
+        client=mock_client,
     )
 
     assert result["success"] is False
@@ -187,24 +198,74 @@ def test_openai_chat_timeout_returns_timeout_category() -> None:
 
 def test_both_providers_share_interface() -> None:
     """Both providers return ChatResult with success and either content or failure_category."""
-    ollama_ok = ollama_module._request(
-        MagicMock(post=MagicMock(return_value=httpx.Response(
+    ollama_ok = ollama_module.chat(
+        [{"role": "user", "content": "Hi"}],
+        base_url="http://f",
+        timeout=1.0,
+        client=MagicMock(post=MagicMock(return_value=httpx.Response(
             200, json={"message": {"content": "x"}}
         ))),
-        "http://f/api/chat",
-        {"model": "x", "messages": []},
-        1.0,
-        None,
     )
-    openai_ok = openai_module._request(
-        MagicMock(post=MagicMock(return_value=httpx.Response(
+    openai_ok = openai_module.chat(
+        [{"role": "user", "content": "Hi"}],
+        api_key="key",
+        base_url="https://f",
+        timeout=1.0,
+        client=MagicMock(post=MagicMock(return_value=httpx.Response(
             200, json={"choices": [{"message": {"content": "y"}}]}
         ))),
-        "https://f/v1/chat/completions",
-        "key",
-        {"model": "x", "messages": []},
-        1.0,
     )
     assert "success" in ollama_ok and "success" in openai_ok
     assert ollama_ok["success"] is True and openai_ok["success"] is True
     assert ollama_ok["content"] == "x" and openai_ok["content"] == "y"
+
+
+def test_ollama_reports_usage_and_generation_time() -> None:
+    """Ollama: prompt_eval_count/eval_count become token usage; eval_duration (ns) becomes seconds."""
+    body = {
+        "model": "llama3",
+        "message": {"content": "x"},
+        "prompt_eval_count": 26,
+        "eval_count": 50,
+        "eval_duration": 2_000_000_000,
+    }
+    result = ollama_module.chat(
+        [{"role": "user", "content": "Hi"}],
+        base_url="http://f",
+        timeout=1.0,
+        client=MagicMock(post=MagicMock(return_value=httpx.Response(200, json=body))),
+    )
+    assert result["model"] == "llama3"
+    assert result["usage"] == {"input_tokens": 26, "output_tokens": 50, "generation_seconds": 2.0}
+
+
+def test_openai_reports_usage() -> None:
+    """OpenAI: usage.prompt_tokens/completion_tokens become input/output tokens."""
+    body = {
+        "model": "gpt-4o-mini-2024-07-18",
+        "choices": [{"message": {"content": "y"}}],
+        "usage": {"prompt_tokens": 12, "completion_tokens": 7, "total_tokens": 19},
+    }
+    result = openai_module.chat(
+        [{"role": "user", "content": "Hi"}],
+        api_key="key",
+        base_url="https://f",
+        timeout=1.0,
+        client=MagicMock(post=MagicMock(return_value=httpx.Response(200, json=body))),
+    )
+    assert result["model"] == "gpt-4o-mini-2024-07-18"
+    assert result["usage"] == {"input_tokens": 12, "output_tokens": 7}
+
+
+def test_provider_without_usage_omits_usage_key() -> None:
+    """Responses without usage data (or with malformed counts) carry no usage."""
+    body = {"choices": [{"message": {"content": "y"}}], "usage": {"prompt_tokens": "12"}}
+    result = openai_module.chat(
+        [{"role": "user", "content": "Hi"}],
+        api_key="key",
+        base_url="https://f",
+        timeout=1.0,
+        client=MagicMock(post=MagicMock(return_value=httpx.Response(200, json=body))),
+    )
+    assert result["success"] is True
+    assert "usage" not in result and "model" not in result
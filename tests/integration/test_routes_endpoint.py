@@ -23,6 +23,7 @@ def test_get_routes_returns_200_and_expected_keys() -> None:
     assert body["sensitivity_keyword_count"] >= 0
     assert body["cost_max_prompt_length_for_local"] >= 0
     assert body["default_provider"] in ("local", "public")
+    assert body["budgets"] == []
 
 
 def test_get_routes_reflects_policy_file_sensitivity_keywords(
@@ -95,18 +96,65 @@ def test_get_routes_does_not_expose_secrets() -> None:
     assert resp.status_code == 200
     body = resp.json()
     assert set(body.keys()) == {
+        "tenant",
+        "policy_source",
         "rule_order",
+        "pipeline",
         "sensitivity_keyword_count",
+        "sensitivity_detectors",
+        "sensitivity_keyword_index_terms",
+        "sensitivity_keyword_index_bytes",
+        "decision_scope",
         "cost_max_prompt_length_for_local",
         "default_provider",
         "usd_cost_mode_active",
         "cost_max_usd_for_local",
         "llm_input_usd_per_1m_tokens",
+        "cost_tokenizer",
+        "cost_expected_output_tokens",
+        "pricing_models",
         "cost_chars_per_token",
         "available_public_provider",
+        "rollout",
+        "budgets",
     }
 
 
+def test_get_routes_default_pipeline_without_rules_key() -> None:
+    """Policy without `rules` renders the default compiled pipeline: sensitivity → cost."""
+    client = TestClient(app)
+    resp = client.get("/v1/routes")
+    assert resp.status_code == 200
+    pipeline = resp.json()["pipeline"]
+    assert [(r["name"], r["type"]) for r in pipeline] == [("sensitivity", "sensitivity"), ("cost", "cost")]
+
+
+def test_get_routes_renders_configured_pipeline(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """Configured `rules` are rendered in order with safe params; rule_order ends with default."""
+    policy = json.loads(DEFAULT_POLICY_JSON)
+    policy["rules"] = [
+        {"type": "header_match", "name": "eu-team", "header": "X-Team", "values": ["eu"]},
+        {"type": "sensitivity"},
+        {"type": "model_allowlist", "models": ["gpt-4o-mini"]},
+    ]
+    path = tmp_path / "policies.json"
+    path.write_text(json.dumps(policy), encoding="utf-8")
+    monkeypatch.setenv("POLICY_FILE", str(path))
+    client = TestClient(app)
+    resp = client.get("/v1/routes")
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["rule_order"] == ["eu-team", "sensitivity", "model_allowlist", "default"]
+    assert body["pipeline"][0] == {
+        "name": "eu-team",
+        "type": "header_match",
+        "params": {"header": "x-team", "value_count": 1, "route": "local"},
+    }
+    assert body["pipeline"][2]["params"] == {"models": ["gpt-4o-mini"], "route": "local"}
+
+
 def test_get_routes_policy_file_unset_returns_error(monkeypatch: pytest.MonkeyPatch) -> None:
     """When POLICY_FILE is unset, endpoint that needs policy returns 500."""
     monkeypatch.setenv("POLICY_FILE", "")
@@ -156,3 +204,63 @@ def test_decision_engine_uses_file_policy(
     result = decide(prompt_text="This is secret data", prompt_length=10, config=config)
     assert result["provider"] == "local"
     assert "sensitive_keyword_match" in result["reason_codes"]
+
+
+def test_get_routes_reports_keyword_index_terms_and_size(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """An external keyword index is summarized (term count, bytes); terms are not exposed."""
+    from app.decision.keyword_index import build_keyword_index
+
+    index_path = tmp_path / "terms.kwidx"
+    build_keyword_index(["Bluefalcon", "Project Night Owl", "Zeta"], str(index_path))
+    policy = json.loads(DEFAULT_POLICY_JSON)
+    policy["sensitivity"]["keyword_index"] = str(index_path)
+    path = tmp_path / "policies.json"
+    path.write_text(json.dumps(policy), encoding="utf-8")
+    monkeypatch.setenv("POLICY_FILE", str(path))
+    body = TestClient(app).get("/v1/routes").json()
+    assert body["sensitivity_keyword_index_terms"] == 3
+    assert body["sensitivity_keyword_index_bytes"] == index_path.stat().st_size
+    assert "bluefalcon" not in json.dumps(body).lower()
+
+
+def test_get_routes_reports_budget_state(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """Budget rules list spend and remaining budget per tenant with recorded spend."""
+    from app.decision.budget import spend_ledger
+
+    policy = json.loads(DEFAULT_POLICY_JSON)
+    policy["rules"] = [{"type": "budget", "limit_usd": 10}]
+    path = tmp_path / "policies.json"
+    path.write_text(json.dumps(policy), encoding="utf-8")
+    monkeypatch.setenv("POLICY_FILE", str(path))
+    spend_ledger.add("acme", 4.0)
+
+    resp = TestClient(app).get("/v1/routes")
+    assert resp.status_code == 200
+    (budget,) = resp.json()["budgets"]
+    assert budget["key"] == "tenant:acme"
+    assert budget["spent_usd"] == pytest.approx(4.0)
+    assert budget["remaining_usd"] == pytest.approx(6.0)
+    assert budget["window_hours"] == 720
+
+
+def test_get_routes_tenant_parameter_selects_tenant_policy(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """With POLICY_DIR, ?tenant= shows that tenant's policy, falling back to default."""
+    default = json.loads(DEFAULT_POLICY_JSON)
+    acme = json.loads(DEFAULT_POLICY_JSON)
+    acme["sensitivity"]["keywords"] = ["a", "b"]
+    (tmp_path / "default.json").write_text(json.dumps(default), encoding="utf-8")
+    (tmp_path / "acme.json").write_text(json.dumps(acme), encoding="utf-8")
+    monkeypatch.setenv("POLICY_DIR", str(tmp_path))
+    client = TestClient(app)
+
+    body = client.get("/v1/routes", params={"tenant": "ACME"}).json()
+    assert (body["tenant"], body["policy_source"]) == ("acme", "tenant")
+    assert body["sensitivity_keyword_count"] == 2
+    other = client.get("/v1/routes", params={"tenant": "globex"}).json()
+    assert other["policy_source"] == "default"
+    assert other["sensitivity_keyword_count"] == 0
+    assert client.get("/v1/routes", params={"tenant": "../etc"}).status_code == 422
@@ -0,0 +1,59 @@
+"""Unit tests for admission control: pressure from signals, shed order, event-loop lag."""
+
+import asyncio
+import time
+
+import pytest
+
+from app.services.admission import LoopLagMonitor, Signals, should_shed
+
+
+@pytest.fixture(autouse=True)
+def thresholds(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("ADMISSION_LOOP_LAG_MS", "100")
+    monkeypatch.setenv("ADMISSION_THREADPOOL_UTILIZATION", "0.9")
+    monkeypatch.setenv("ADMISSION_QUEUE_DEPTH", "10")
+    monkeypatch.setenv("ADMISSION_INTERACTIVE_FACTOR", "2")
+
+
+def test_pressure_is_highest_signal_relative_to_threshold() -> None:
+    """Each signal is divided by its threshold; the largest ratio wins."""
+    assert Signals(0.05, 0.45, 2).pressure() == pytest.approx(0.5)
+    assert Signals(0.0, 0.0, 25).pressure() == pytest.approx(2.5)
+    assert Signals(0.3, 0.0, 0).pressure() == pytest.approx(3.0)
+
+
+def test_disabled_signals_are_ignored(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A threshold of 0 turns its signal off; all off means never shed."""
+    monkeypatch.setenv("ADMISSION_QUEUE_DEPTH", "0")
+    assert Signals(0.0, 0.0, 1000).pressure() == 0.0
+    monkeypatch.setenv("ADMISSION_LOOP_LAG_MS", "0")
+    monkeypatch.setenv("ADMISSION_THREADPOOL_UTILIZATION", "0")
+    assert not should_shed(Signals(10.0, 5.0, 1000), "batch")
+
+
+def test_batch_is_shed_before_interactive() -> None:
+    """Batch goes at pressure 1; interactive only at the interactive factor."""
+    moderate = Signals(0.0, 1.2, 0)  # pressure 1.33
+    assert should_shed(moderate, "batch")
+    assert not should_shed(moderate, "interactive")
+    severe = Signals(0.0, 0.0, 20)  # pressure 2
+    assert should_shed(severe, "interactive")
+    assert not should_shed(Signals(0.0, 0.0, 9), "batch")
+
+
+def test_loop_lag_monitor_measures_blocked_loop() -> None:
+    """Blocking the event loop shows up as lag on the monitor's next wake-up."""
+
+    async def scenario() -> float:
+        monitor = LoopLagMonitor(interval=0.01)
+        monitor.start()
+        await asyncio.sleep(0.02)
+        time.sleep(0.1)  # blocks the loop
+        await asyncio.sleep(0.005)
+        lag = monitor.lag_seconds
+        await monitor.stop()
+        assert monitor.lag_seconds == 0.0
+        return lag
+
+    assert asyncio.run(scenario()) >= 0.05
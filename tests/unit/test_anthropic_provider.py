@@ -19,6 +19,7 @@ def test_anthropic_chat_success_returns_content() -> None:
         json={
             "content": [{"type": "text", "text": "Hello from Claude"}],
             "model": "claude-3-5-sonnet-20241022",
+            "usage": {"input_tokens": 10, "output_tokens": 4},
         },
     )
     mock_client = MagicMock()
@@ -34,6 +35,7 @@ def test_anthropic_chat_success_returns_content() -> None:
 
     assert result["success"] is True
     assert result["content"] == "Hello from Claude"
+    assert result["usage"] == {"input_tokens": 10, "output_tokens": 4}
     mock_client.post.assert_called_once()
     call_kw = mock_client.post.call_args[1]
     assert call_kw["headers"].get("x-api-key") == "sk-fake"
@@ -61,12 +63,12 @@ def test_anthropic_chat_401_returns_auth_error() -> None:
     mock_client = MagicMock()
     mock_client.post.return_value = mock_resp
 
-    result = anthropic_module._request(
-        mock_client,
-        "https://api.anthropic.com/v1/messages",
-        "sk-fake",
-        {"model": "claude-3-5-sonnet", "max_tokens": 1024, "messages": [{"role": "user", "content": "Hi"}]},
-        10.0,
+    result = anthropic_module.chat(
+        [{"role": "user", "content": "Hi"}],
+        api_key="sk-fake",
+        base_url="https://api.anthropic.com",
+        timeout=10.0,
+        client=mock_client,
     )
 
     assert result["success"] is False
@@ -78,12 +80,12 @@ def test_anthropic_chat_timeout_returns_timeout_category() -> None:
     mock_client = MagicMock()
     mock_client.post.side_effect = httpx.TimeoutException("timed out")
 
-    result = anthropic_module._request(
-        mock_client,
-        "https://api.anthropic.com/v1/messages",
-        "sk-fake",
-        {"model": "claude-3-5-sonnet", "max_tokens": 1024, "messages": [{"role": "user", "content": "Hi"}]},
-        10.0,
+    result = anthropic_module.chat(
+        [{"role": "user", "content": "Hi"}],
+        api_key="sk-fake",
+        base_url="https://api.anthropic.com",
+        timeout=10.0,
+        client=mock_client,
     )
 
     assert result["success"] is False
@@ -96,12 +98,12 @@ def test_anthropic_chat_4xx_returns_client_error() -> None:
     mock_client = MagicMock()
     mock_client.post.return_value = mock_resp
 
-    result = anthropic_module._request(
-        mock_client,
-        "https://api.anthropic.com/v1/messages",
-        "sk-fake",
-        {"model": "claude-3-5-sonnet", "max_tokens": 1024, "messages": [{"role": "user", "content": "Hi"}]},
-        10.0,
+    result = anthropic_module.chat(
+        [{"role": "user", "content": "Hi"}],
+        api_key="sk-fake",
+        base_url="https://api.anthropic.com",
+        timeout=10.0,
+        client=mock_client,
     )
 
     assert result["success"] is False
@@ -130,3 +132,64 @@ def test_anthropic_maps_system_messages_to_system_param() -> None:
     call_json = mock_client.post.call_args[1]["json"]
     assert call_json["system"] == "You are helpful."
     assert call_json["messages"] == [{"role": "user", "content": "Hi"}]
+
+
+def _post_json(messages: list[dict[str, str]], usage: dict | None = None) -> tuple[dict, dict]:
+    mock_resp = httpx.Response(
+        200, json={"content": [{"type": "text", "text": "OK"}], "usage": usage or {"input_tokens": 1}}
+    )
+    mock_client = MagicMock()
+    mock_client.post.return_value = mock_resp
+    result = anthropic_module.chat(messages, api_key="sk-fake", base_url="https://api.anthropic.com", client=mock_client)
+    return mock_client.post.call_args[1]["json"], result
+
+
+def test_anthropic_repeated_long_system_prompt_gets_cache_breakpoint(monkeypatch) -> None:
+    """A long system prompt is sent plain the first time and with cache_control once it repeats."""
+    monkeypatch.setenv("ANTHROPIC_PROMPT_CACHE_MIN_CHARS", "100")
+    messages = [{"role": "system", "content": "Rules. " * 50}, {"role": "user", "content": "Hi"}]
+
+    first, _ = _post_json(messages)
+    second, _ = _post_json(messages)
+
+    assert isinstance(first["system"], str)
+    assert second["system"] == [
+        {"type": "text", "text": ("Rules. " * 50).strip(), "cache_control": {"type": "ephemeral"}}
+    ]
+
+
+def test_anthropic_next_conversation_turn_caches_prefix(monkeypatch) -> None:
+    """The next turn of a long conversation marks the message before the new user turn."""
+    monkeypatch.setenv("ANTHROPIC_PROMPT_CACHE_MIN_CHARS", "100")
+    turn1 = [{"role": "user", "content": "Summarize: " + "x" * 200}]
+    turn2 = [*turn1, {"role": "assistant", "content": "Done."}, {"role": "user", "content": "Shorter?"}]
+
+    first, _ = _post_json(turn1)
+    second, _ = _post_json(turn2)
+
+    assert first["messages"] == turn1
+    assert second["messages"][1]["content"] == [
+        {"type": "text", "text": "Done.", "cache_control": {"type": "ephemeral"}}
+    ]
+    assert second["messages"][2] == {"role": "user", "content": "Shorter?"}
+
+
+def test_anthropic_short_or_disabled_prompts_have_no_breakpoints(monkeypatch) -> None:
+    """Prefixes under the size threshold, or ANTHROPIC_PROMPT_CACHE=0, are never marked."""
+    long_system = [{"role": "system", "content": "s" * 5000}, {"role": "user", "content": "Hi"}]
+    short = [{"role": "system", "content": "Be brief."}, {"role": "user", "content": "Hi"}]
+    for _ in range(2):
+        short_json, _ = _post_json(short)
+    assert short_json["system"] == "Be brief."
+
+    monkeypatch.setenv("ANTHROPIC_PROMPT_CACHE", "0")
+    for _ in range(2):
+        disabled_json, _ = _post_json(long_system)
+    assert isinstance(disabled_json["system"], str)
+
+
+def test_anthropic_reports_cache_token_usage() -> None:
+    """cache_read_input_tokens and cache_creation_input_tokens are passed through in usage."""
+    usage = {"input_tokens": 5, "output_tokens": 2, "cache_read_input_tokens": 1200, "cache_creation_input_tokens": 0}
+    _, result = _post_json([{"role": "user", "content": "Hi"}], usage)
+    assert result["usage"] == usage
@@ -0,0 +1,103 @@
+"""Unit tests for batch chat: completion-order streaming, per-provider fan-out limits, bulk audit."""
+
+import json
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.api.schemas.chat import ChatMessage, ChatRequest
+from app.services.batch import run_batch
+
+
+def _bodies(*contents: str) -> list[ChatRequest]:
+    return [ChatRequest(messages=[ChatMessage(role="user", content=c)]) for c in contents]
+
+
+class _FakeProvider:
+    """Sleeps per message ('slow' 50 ms, else 5 ms) and tracks peak concurrency."""
+
+    def __init__(self) -> None:
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def chat(self, messages, model=None, timeout=None, **_):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.05 if messages[-1]["content"] == "slow" else 0.005)
+        with self._lock:
+            self.active -= 1
+        return {"success": True, "content": messages[-1]["content"].upper()}
+
+
+def _run(bodies: list[ChatRequest], provider: _FakeProvider) -> list[dict]:
+    with patch("app.providers.ollama.chat", provider.chat):
+        return [json.loads(line) for line in run_batch(bodies)]
+
+
+def test_results_stream_in_completion_order_with_index() -> None:
+    """A slow first request is yielded after faster later ones; every index appears once."""
+    items = _run(_bodies("slow", "a", "b"), _FakeProvider())
+    assert items[-1]["index"] == 0 and items[-1]["content"] == "SLOW"
+    assert sorted(i["index"] for i in items) == [0, 1, 2]
+    assert all(i["provider"] == "local" and i["request_id"] for i in items)
+
+
+def test_local_fan_out_is_limited(monkeypatch: pytest.MonkeyPatch) -> None:
+    """At most BATCH_LOCAL_CONCURRENCY local calls run at once."""
+    monkeypatch.setenv("BATCH_LOCAL_CONCURRENCY", "2")
+    provider = _FakeProvider()
+    items = _run(_bodies(*["slow"] * 6), provider)
+    assert len(items) == 6
+    assert provider.peak == 2
+
+
+def test_audit_events_are_written_in_one_bulk_insert() -> None:
+    """One persist_audit_events call with every item; no per-request inserts."""
+    with (
+        patch("app.services.batch.persist_audit_events") as mock_bulk,
+        patch("app.services.chat_orchestrator.persist_audit_event") as mock_single,
+    ):
+        items = _run(_bodies("a", "b", "c"), _FakeProvider())
+    mock_single.assert_not_called()
+    mock_bulk.assert_called_once()
+    contexts = mock_bulk.call_args[0][0]
+    assert [c.request_id for c in contexts] == [i["request_id"] for i in sorted(items, key=lambda i: i["index"])]
+
+
+def test_item_exception_yields_error_line_and_continues() -> None:
+    """An unexpected exception in one item becomes an internal_error line and a failure audit event; others complete."""
+    provider = _FakeProvider()
+    original = provider.chat
+
+    def flaky(messages, model=None, timeout=None, **_):
+        if messages[-1]["content"] == "boom":
+            raise RuntimeError("boom")
+        return original(messages, model)
+
+    provider.chat = flaky
+    with patch("app.services.batch.persist_audit_events") as mock_bulk:
+        items = _run(_bodies("a", "boom"), provider)
+    by_index = {i["index"]: i for i in items}
+    assert by_index[1]["error"] == "internal_error"
+    assert by_index[0]["content"] == "A"
+    contexts = {c.request_id: c for c in mock_bulk.call_args[0][0]}
+    assert len(contexts) == 2
+    failed = contexts[by_index[1]["request_id"]]
+    assert failed.status == "failure" and failed.failure_category == "unknown"
+    assert failed.decision.startswith("provider=local,") and failed.prompt_hash is not None
+
+
+def test_closing_stream_early_still_audits_finished_calls() -> None:
+    """A client that stops reading after one line: started calls are awaited and audited."""
+    with (
+        patch("app.providers.ollama.chat", _FakeProvider().chat),
+        patch("app.services.batch.persist_audit_events") as mock_bulk,
+    ):
+        stream = run_batch(_bodies("a", "slow"))
+        next(stream)
+        stream.close()
+    assert len(mock_bulk.call_args[0][0]) == 2
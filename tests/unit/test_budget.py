@@ -0,0 +1,211 @@
+"""Unit tests for spend budgets: ledger windows, tenant resolution, budget rule, restore from audit."""
+
+import threading
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from app.core.config import PolicyConfig
+from app.core.tenancy import resolve_tenant
+from app.decision.budget import BUCKET_SECONDS, GLOBAL_KEY, SpendLedger, spend_ledger, tenant_key
+from app.decision.engine import decide
+from app.decision.reason_codes import BUDGET_EXHAUSTED, DEFAULT
+from app.decision.rules import RuleConfigError, compile_rules
+from app.services.budget_sync import BudgetSync, restore_spend_ledger
+
+NOW = 1_760_000_000.0
+
+
+def _config(rule: dict) -> PolicyConfig:
+    return PolicyConfig(
+        sensitivity_keywords=(),
+        cost_max_prompt_length_for_local=1000,
+        default_provider="public",
+        cost_max_usd_for_local=None,
+        llm_input_usd_per_1m_tokens=None,
+        cost_chars_per_token=4,
+        rules=compile_rules([{"type": "budget", **rule}]),
+    )
+
+
+def test_ledger_counts_spend_toward_global_and_tenant() -> None:
+    """A tenant's spend is visible under both its tenant key and the global key."""
+    ledger = SpendLedger()
+    ledger.add("acme", 1.5, at=NOW)
+    ledger.add(None, 0.5, at=NOW)
+    assert ledger.spent(tenant_key("acme"), 3600, now=NOW) == pytest.approx(1.5)
+    assert ledger.spent(GLOBAL_KEY, 3600, now=NOW) == pytest.approx(2.0)
+    assert ledger.keys("tenant:") == ["tenant:acme"]
+
+
+def test_ledger_window_excludes_old_buckets() -> None:
+    """Spend older than the window (bucket granularity) is not counted."""
+    ledger = SpendLedger()
+    ledger.add("acme", 1.0, at=NOW - 3 * BUCKET_SECONDS)
+    ledger.add("acme", 2.0, at=NOW)
+    assert ledger.spent(GLOBAL_KEY, BUCKET_SECONDS, now=NOW) == pytest.approx(2.0)
+    assert ledger.spent(GLOBAL_KEY, 4 * BUCKET_SECONDS, now=NOW) == pytest.approx(3.0)
+
+
+def test_ledger_prunes_buckets_past_retention() -> None:
+    """A new hour drops buckets older than the retention window, and empty keys with them."""
+    ledger = SpendLedger(retention_seconds=2 * BUCKET_SECONDS)
+    ledger.add("acme", 4.0, at=NOW - 10 * BUCKET_SECONDS)
+    assert ledger.keys() == [GLOBAL_KEY, "tenant:acme"]
+    ledger.add("globex", 1.0, at=NOW)
+    assert ledger.keys() == [GLOBAL_KEY, "tenant:globex"]
+    assert ledger.spent(GLOBAL_KEY, 20 * BUCKET_SECONDS, now=NOW) == pytest.approx(1.0)
+
+
+def test_ledger_ignores_non_positive_spend() -> None:
+    """Zero-cost (local) requests never create ledger entries."""
+    ledger = SpendLedger()
+    ledger.add("acme", 0.0, at=NOW)
+    assert ledger.keys() == []
+
+
+@pytest.mark.parametrize(
+    ("headers", "expected"),
+    [
+        ({"X-Tenant": "Acme-Prod"}, "acme-prod"),
+        ({"x-tenant": "bad tenant!", "Authorization": "Bearer k1"}, "key-"),
+        ({"X-Tenant": "acme", "X-API-Key": "k1"}, "key-"),
+        ({"X-API-Key": "k1"}, "key-"),
+        ({"Authorization": "Basic abc"}, None),
+        ({}, None),
+    ],
+)
+def test_resolve_tenant(headers: dict, expected: str | None) -> None:
+    """API keys become a short hash and override X-Tenant; X-Tenant names keyless requests; otherwise unattributed."""
+    tenant = resolve_tenant(headers)
+    if expected and expected.startswith("key-"):
+        assert tenant is not None and tenant.startswith("key-") and len(tenant) == 16
+        assert "k1" not in tenant
+    else:
+        assert tenant == expected
+
+
+def test_api_key_tenant_is_stable_and_shared_across_header_styles() -> None:
+    """Bearer token and X-API-Key with the same key resolve to the same tenant."""
+    assert resolve_tenant({"Authorization": "Bearer k1"}) == resolve_tenant({"X-API-Key": "k1"})
+
+
+def test_api_key_tenant_mapping(monkeypatch: pytest.MonkeyPatch) -> None:
+    """API_KEY_TENANTS maps a key id to a tenant; X-Tenant cannot pick another tenant for that key."""
+    key_id = resolve_tenant({"X-API-Key": "k1"})
+    monkeypatch.setenv("API_KEY_TENANTS", f"{key_id}=Acme,key-000000000000=bad tenant!")
+    assert resolve_tenant({"X-API-Key": "k1", "X-Tenant": "globex"}) == "acme"
+    assert resolve_tenant({"Authorization": "Bearer k2", "X-Tenant": "acme"}).startswith("key-")
+
+
+def test_tenant_budget_routes_exhausted_tenant_local() -> None:
+    """Once a tenant's spend reaches its limit it is routed local; other tenants are not."""
+    config = _config({"limit_usd": 1.0})
+    spend_ledger.add("acme", 1.0)
+    exhausted = decide("hi", 2, config, tenant="acme")
+    assert exhausted["provider"] == "local"
+    assert exhausted["reason_codes"] == [BUDGET_EXHAUSTED]
+    other = decide("hi", 2, config, tenant="globex")
+    assert other["reason_codes"] == [DEFAULT]
+
+
+def test_tenant_budget_skips_unattributed_requests() -> None:
+    """Tenant-scoped budgets do not match requests without a tenant."""
+    config = _config({"limit_usd": 0})
+    assert decide("hi", 2, config)["reason_codes"] == [DEFAULT]
+
+
+def test_tenant_limit_override_applies() -> None:
+    """tenant_limits_usd overrides limit_usd for that tenant."""
+    config = _config({"limit_usd": 1.0, "tenant_limits_usd": {"Acme": 5.0}})
+    spend_ledger.add("acme", 2.0)
+    assert decide("hi", 2, config, tenant="acme")["reason_codes"] == [DEFAULT]
+    (rule,) = config.rules
+    assert dict(rule.budget_keys())["tenant:acme"] == 5.0
+
+
+def test_global_budget_counts_all_tenants() -> None:
+    """A global budget is exhausted by combined spend and applies to everyone."""
+    config = _config({"scope": "global", "limit_usd": 2.0})
+    spend_ledger.add("acme", 1.0)
+    spend_ledger.add("globex", 1.0)
+    assert decide("hi", 2, config)["reason_codes"] == [BUDGET_EXHAUSTED]
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {},
+        {"limit_usd": -1},
+        {"limit_usd": 1, "scope": "team"},
+        {"limit_usd": 1, "window_hours": 0},
+        {"limit_usd": 1, "window_hours": 10_000},
+        {"limit_usd": 1, "scope": "global", "tenant_limits_usd": {"acme": 2}},
+        {"limit_usd": 1, "tenant_limits_usd": {"acme": "lots"}},
+    ],
+)
+def test_budget_rule_rejects_invalid_params(params: dict) -> None:
+    """Invalid budget parameters fail at compile time."""
+    with pytest.raises(RuleConfigError):
+        compile_rules([{"type": "budget", **params}])
+
+
+def test_restore_rebuilds_from_hourly_audit_spend_of_all_workers() -> None:
+    """Restore = audit spend summed per tenant and hour over the retention window, replacing ledger state."""
+    hour = datetime.fromtimestamp(NOW - BUCKET_SECONDS, timezone.utc)
+    ledger = SpendLedger()
+    ledger.add("stale", 9.0, at=NOW)
+    with patch(
+        "app.services.budget_sync.sum_spend_by_hour",
+        return_value=[("acme", hour, 3.0), (None, hour, 1.0), ("acme", hour + timedelta(hours=1), 0.5)],
+    ) as mock_sum:
+        assert restore_spend_ledger(ledger, now=NOW) == 3
+    assert mock_sum.call_args[0][0] == datetime.fromtimestamp(NOW - ledger.retention_seconds, timezone.utc)
+    assert ledger.spent(tenant_key("acme"), 2 * BUCKET_SECONDS, now=NOW) == pytest.approx(3.5)
+    assert ledger.spent(GLOBAL_KEY, 2 * BUCKET_SECONDS, now=NOW) == pytest.approx(4.5)
+    assert ledger.keys("tenant:") == ["tenant:acme"]
+
+
+def test_resync_adds_other_workers_spend_and_keeps_spend_recorded_during_the_read() -> None:
+    """Each sync replaces the ledger with audit totals; this worker's spend newer than the read survives."""
+    hour = datetime.fromtimestamp(NOW, timezone.utc)
+    ledger = SpendLedger()
+    with patch("app.services.budget_sync.sum_spend_by_hour", return_value=[]):
+        restore_spend_ledger(ledger, now=NOW)
+    ledger.add("acme", 1.0, at=NOW)
+
+    def read(since, session=None):
+        # Written by this worker while the query runs: not in the rows below.
+        ledger.add("acme", 0.25, at=NOW)
+        # The 1.0 above plus 2.0 of another worker.
+        return [("acme", hour, 3.0)]
+
+    with patch("app.services.budget_sync.sum_spend_by_hour", side_effect=read):
+        restore_spend_ledger(ledger, now=NOW)
+    assert ledger.spent(tenant_key("acme"), BUCKET_SECONDS, now=NOW) == pytest.approx(3.25)
+    with patch("app.services.budget_sync.sum_spend_by_hour", return_value=[("acme", hour, 3.25)]):
+        restore_spend_ledger(ledger, now=NOW)
+    assert ledger.spent(tenant_key("acme"), BUCKET_SECONDS, now=NOW) == pytest.approx(3.25)
+
+
+def test_budget_sync_resyncs_periodically(monkeypatch: pytest.MonkeyPatch) -> None:
+    """BudgetSync re-reads the audit log every BUDGET_SYNC_SECONDS until stopped."""
+    monkeypatch.setenv("BUDGET_SYNC_SECONDS", "1")
+    monkeypatch.setattr(BudgetSync, "enabled", staticmethod(lambda: True))
+    synced = threading.Event()
+    calls = []
+
+    def read(since, session=None):
+        calls.append(since)
+        if len(calls) >= 2:
+            synced.set()
+        return []
+
+    with patch("app.services.budget_sync.sum_spend_by_hour", side_effect=read):
+        sync = BudgetSync(SpendLedger())
+        sync.start()
+        try:
+            assert synced.wait(5)
+        finally:
+            sync.stop()
@@ -0,0 +1,109 @@
+"""Unit tests for deadline-aware routing: online latency model and the deadline rule."""
+
+import pytest
+
+from app.core.config import PolicyConfig
+from app.decision.engine import decide
+from app.decision.latency import MIN_WEIGHT, LatencyModel, deadline_ms, latency_models
+from app.decision.reason_codes import DEADLINE_CONSTRAINED, DEFAULT, SENSITIVE_KEYWORD_MATCH
+from app.decision.rules import RuleConfigError, compile_rules
+
+
+def _config(rules: list) -> PolicyConfig:
+    return PolicyConfig(
+        sensitivity_keywords=("secret",),
+        cost_max_prompt_length_for_local=0,
+        default_provider="public",
+        cost_max_usd_for_local=None,
+        llm_input_usd_per_1m_tokens=None,
+        cost_chars_per_token=4,
+        rules=compile_rules(rules),
+    )
+
+
+def _train(provider: str, base: float, per_char: float, n: int = 20) -> None:
+    for length in range(100, 100 + 50 * n, 50):
+        latency_models.observe(provider, length, base + per_char * length)
+
+
+def test_latency_model_fits_linear_latency() -> None:
+    """Intercept and slope are recovered from exact observations."""
+    model = LatencyModel()
+    for length in (100, 200, 400, 800, 1600, 3200):
+        model.observe(length, 0.5 + 0.001 * length)
+    assert model.predict(10_000) == pytest.approx(10.5)
+
+
+def test_latency_model_needs_evidence_and_never_predicts_negative_slope() -> None:
+    """No prediction below MIN_WEIGHT; a negative fitted slope falls back to the mean."""
+    model = LatencyModel()
+    model.observe(100, 1.0)
+    assert model.predict(100) is None
+    for length, seconds in ((100, 3.0), (200, 2.0), (300, 1.0), (400, 0.5), (500, 0.2)):
+        model.observe(length, seconds)
+    assert model.weight >= MIN_WEIGHT
+    mean = model.predict(0)
+    assert mean == model.predict(10_000)
+
+
+def test_latency_model_follows_recent_observations() -> None:
+    """Old observations decay: after a slowdown the prediction moves to the new latency."""
+    model = LatencyModel()
+    for _ in range(50):
+        model.observe(100, 1.0)
+    for _ in range(200):
+        model.observe(100, 4.0)
+    assert model.predict(100) == pytest.approx(4.0, rel=0.05)
+
+
+def test_deadline_rule_routes_to_only_provider_in_time() -> None:
+    """Local predicted too slow for the deadline → public with deadline_constrained."""
+    _train("local", 2.0, 0.0)
+    _train("openai", 0.3, 0.0)
+    config = _config([{"type": "sensitivity"}, {"type": "deadline"}, {"type": "cost"}])
+    result = decide(prompt_text="hello", prompt_length=5, config=config, headers={"X-Deadline-Ms": "1000"})
+    assert result == {"provider": "openai", "reason_codes": [DEADLINE_CONSTRAINED]}
+
+
+def test_deadline_rule_passes_without_header_or_when_both_fit() -> None:
+    """No header, both providers in time, or no observations → fall through."""
+    config = _config([{"type": "sensitivity"}, {"type": "deadline"}])
+    assert decide(prompt_text="hi", prompt_length=2, config=config)["reason_codes"] == [DEFAULT]
+    headers = {"X-Deadline-Ms": "5000"}
+    assert decide(prompt_text="hi", prompt_length=2, config=config, headers=headers)["reason_codes"] == [DEFAULT]
+    _train("local", 1.0, 0.0)
+    _train("openai", 1.0, 0.0)
+    assert decide(prompt_text="hi", prompt_length=2, config=config, headers=headers)["reason_codes"] == [DEFAULT]
+
+
+def test_deadline_rule_headroom_and_prompt_length() -> None:
+    """Prediction grows with prompt length and is scaled by headroom before comparing."""
+    _train("local", 0.1, 0.001)  # 1000 chars → 1.1 s
+    _train("openai", 0.2, 0.0)
+    config = _config([{"type": "deadline", "headroom": 1.5}])
+    headers = {"X-Deadline-Ms": "1500"}
+    short = decide(prompt_text="x" * 100, prompt_length=100, config=config, headers=headers)
+    long = decide(prompt_text="x" * 1000, prompt_length=1000, config=config, headers=headers)
+    assert short["reason_codes"] == [DEFAULT]
+    assert long == {"provider": "openai", "reason_codes": [DEADLINE_CONSTRAINED]}
+
+
+def test_sensitivity_keeps_precedence_over_deadline() -> None:
+    """A sensitive prompt stays local; a deadline rule placed before sensitivity is rejected."""
+    _train("local", 5.0, 0.0)
+    _train("openai", 0.1, 0.0)
+    config = _config([{"type": "sensitivity"}, {"type": "deadline"}])
+    result = decide(prompt_text="secret", prompt_length=6, config=config, headers={"X-Deadline-Ms": "500"})
+    assert result["reason_codes"] == [SENSITIVE_KEYWORD_MATCH]
+    with pytest.raises(RuleConfigError, match="must come after every 'sensitivity' rule"):
+        compile_rules([{"type": "deadline"}, {"type": "sensitivity"}])
+    with pytest.raises(RuleConfigError, match="headroom"):
+        compile_rules([{"type": "deadline", "headroom": 0.5}])
+
+
+def test_deadline_header_parsing() -> None:
+    """Positive integers only, capped at ten minutes."""
+    assert deadline_ms({"x-deadline-ms": "250"}) == 250
+    assert deadline_ms({"X-Deadline-Ms": "99999999"}) == 600_000
+    assert deadline_ms({"X-Deadline-Ms": "-5"}) is None
+    assert deadline_ms({"X-Deadline-Ms": "1.5"}) is None
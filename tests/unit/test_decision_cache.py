@@ -0,0 +1,111 @@
+"""Unit tests for the decision cache: LRU bounds, hits, policy-generation invalidation, bypass."""
+
+import hashlib
+from dataclasses import replace
+from unittest.mock import patch
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.core.config import PolicyConfig
+from app.decision import engine
+from app.decision.cache import CachedDecision, DecisionCache, decision_cache
+from app.decision.engine import decide
+from app.decision.reason_codes import SENSITIVE_KEYWORD_MATCH
+from app.decision.rules import compile_rules
+
+PROMPT = "please review the internal plan"
+PROMPT_HASH = hashlib.sha256(PROMPT.encode()).hexdigest()
+
+
+def _config(generation: str | None = "gen-1", **kwargs) -> PolicyConfig:
+    return PolicyConfig(
+        sensitivity_keywords=("internal",),
+        cost_max_prompt_length_for_local=0,
+        default_provider="public",
+        cost_max_usd_for_local=None,
+        llm_input_usd_per_1m_tokens=None,
+        cost_chars_per_token=4,
+        generation=generation,
+        **kwargs,
+    )
+
+
+def _cache_count(result: str) -> float:
+    return REGISTRY.get_sample_value("decision_cache_requests_total", {"result": result}) or 0.0
+
+
+def _decide(config: PolicyConfig, **kwargs):
+    return decide(PROMPT, len(PROMPT), config, prompt_hash=PROMPT_HASH, **kwargs)
+
+
+def test_lru_evicts_least_recently_used() -> None:
+    """Capacity is bounded; a get refreshes recency."""
+    cache = DecisionCache(maxsize=2)
+    entry = CachedDecision("local", ("default",), (), 0.0, 0.001)
+    cache.put(("g", "a", 1, None, "openai"), entry)
+    cache.put(("g", "b", 1, None, "openai"), entry)
+    assert cache.get(("g", "a", 1, None, "openai")) is entry
+    cache.put(("g", "c", 1, None, "openai"), entry)
+    assert cache.get(("g", "b", 1, None, "openai")) is None
+    assert cache.get(("g", "a", 1, None, "openai")) is entry
+    assert len(cache) == 2
+    disabled = DecisionCache(maxsize=0)
+    disabled.put(("g", "a", 1, None, "openai"), entry)
+    assert disabled.get(("g", "a", 1, None, "openai")) is None
+
+
+def test_repeat_prompt_is_served_from_cache() -> None:
+    """Second identical request skips rule evaluation and counts a hit plus saved time."""
+    config = _config()
+    hits, saved = _cache_count("hit"), REGISTRY.get_sample_value("decision_cache_saved_seconds_total")
+    first = _decide(config)
+    with patch.object(engine, "record_rule_evaluation") as mock_record:
+        second = _decide(config)
+    assert first == second == {"provider": "local", "reason_codes": [SENSITIVE_KEYWORD_MATCH]}
+    mock_record.assert_not_called()
+    assert _cache_count("hit") == hits + 1
+    assert REGISTRY.get_sample_value("decision_cache_saved_seconds_total") > saved
+
+
+def test_policy_generation_change_invalidates() -> None:
+    """A new policy generation misses even for the same prompt."""
+    _decide(_config())
+    misses = _cache_count("miss")
+    result = _decide(replace(_config("gen-2"), sensitivity_keywords=()))
+    assert _cache_count("miss") == misses + 1
+    assert result["reason_codes"] == ["default"]
+
+
+def test_model_is_part_of_the_key() -> None:
+    """model_allowlist depends on the model, so different models do not share entries."""
+    config = _config(rules=compile_rules([{"type": "model_allowlist", "models": ["m1"]}]))
+    assert _decide(config, model="m1")["reason_codes"] == ["default"]
+    assert _decide(config, model="m2")["reason_codes"] == ["model_not_allowlisted"]
+
+
+@pytest.mark.parametrize(
+    "config",
+    [
+        _config(generation=None),
+        _config(decision_scope="conversation"),
+        _config(rules=compile_rules([{"type": "header_match", "header": "x-team", "values": ["a"]}])),
+        _config(rules=compile_rules([{"type": "time_of_day", "start": "00:00", "end": "12:00"}])),
+    ],
+)
+def test_non_cacheable_requests_bypass(config: PolicyConfig) -> None:
+    """Code-built configs, conversation scope, and time/header rules are never cached."""
+    bypass = _cache_count("bypass")
+    _decide(config)
+    _decide(config)
+    assert _cache_count("bypass") == bypass + 2
+    assert len(decision_cache) == 0
+
+
+def test_public_target_resolved_on_each_hit(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Cached entries store "public"; the concrete provider follows PUBLIC_LLM_URL."""
+    config = replace(_config(), sensitivity_keywords=())
+    monkeypatch.setenv("PUBLIC_LLM_URL", "https://api.openai.com")
+    assert _decide(config)["provider"] == "openai"
+    monkeypatch.setenv("PUBLIC_LLM_URL", "https://api.anthropic.com")
+    assert _decide(config)["provider"] == "anthropic"
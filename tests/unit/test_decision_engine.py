@@ -20,6 +20,7 @@ def _config(
     cost_max_usd_for_local: float | None = None,
     llm_input_usd_per_1m_tokens: float | None = None,
     cost_chars_per_token: int = 4,
+    decision_scope: str = "last_user",
 ) -> PolicyConfig:
     return PolicyConfig(
         sensitivity_keywords=keywords,
@@ -28,6 +29,7 @@ def _config(
         cost_max_usd_for_local=cost_max_usd_for_local,
         llm_input_usd_per_1m_tokens=llm_input_usd_per_1m_tokens,
         cost_chars_per_token=cost_chars_per_token,
+        decision_scope=decision_scope,
     )
 
 
@@ -64,7 +66,7 @@ def test_cost_branch_under_threshold_returns_local() -> None:
 
 
 def test_cost_branch_over_threshold_returns_default() -> None:
-    """Cost: prompt length over threshold → default (public resolves to openai via get_public_provider_from_url)."""
+    """Cost: prompt length over threshold → default (public resolves to openai via get_public_provider)."""
     config = _config(keywords=(), max_length=50)
     result = decide(prompt_text="x" * 100, prompt_length=100, config=config)
     assert result["provider"] == "openai"
@@ -88,18 +90,18 @@ def test_default_provider_configurable() -> None:
 
 
 def test_default_provider_public_resolves_to_anthropic() -> None:
-    """When default_provider is public, decision returns get_public_provider_from_url() (e.g. anthropic)."""
+    """When default_provider is public, decision returns get_public_provider() (e.g. anthropic)."""
     config = _config(keywords=(), max_length=10, default_provider="public")
-    with patch("app.decision.engine.get_public_provider_from_url", return_value="anthropic"):
+    with patch("app.decision.engine.get_public_provider", return_value="anthropic"):
         result = decide(prompt_text="Long prompt", prompt_length=100, config=config)
     assert result["provider"] == "anthropic"
     assert result["reason_codes"] == [DEFAULT]
 
 
 def test_default_provider_public_resolves_to_openai() -> None:
-    """When default_provider is public, decision returns get_public_provider_from_url() (e.g. openai)."""
+    """When default_provider is public, decision returns get_public_provider() (e.g. openai)."""
     config = _config(keywords=(), max_length=10, default_provider="public")
-    with patch("app.decision.engine.get_public_provider_from_url", return_value="openai"):
+    with patch("app.decision.engine.get_public_provider", return_value="openai"):
         result = decide(prompt_text="Long prompt", prompt_length=100, config=config)
     assert result["provider"] == "openai"
     assert result["reason_codes"] == [DEFAULT]
@@ -169,3 +171,31 @@ def test_cost_fallback_to_length_mode_when_usd_config_missing() -> None:
     over = decide(prompt_text="x" * 100, prompt_length=100, config=config)
     assert over["provider"] == "openai"
     assert over["reason_codes"] == [DEFAULT]
+
+
+HISTORY = ["You are a helpful assistant.", "Here is the internal roadmap.", "Noted.", "Summarize it"]
+
+
+def test_last_user_scope_ignores_earlier_messages() -> None:
+    """Default scope: a keyword in an earlier message does not affect the decision."""
+    config = _config(keywords=("internal",), max_length=10)
+    result = decide(prompt_text=HISTORY[-1], prompt_length=12, config=config, messages=HISTORY)
+    assert result == {"provider": "openai", "reason_codes": [DEFAULT]}
+
+
+def test_conversation_scope_scans_every_message() -> None:
+    """Conversation scope: a keyword in any message (incl. system/assistant) routes local."""
+    config = _config(keywords=("internal",), max_length=10, decision_scope="conversation")
+    result = decide(prompt_text=HISTORY[-1], prompt_length=12, config=config, messages=HISTORY)
+    assert result == {"provider": "local", "reason_codes": [SENSITIVE_KEYWORD_MATCH]}
+
+
+def test_conversation_scope_cost_uses_total_input_length() -> None:
+    """Conversation scope: the cost rule sees the total length of all messages, not the last one."""
+    total = sum(len(m) for m in HISTORY)
+    config = _config(max_length=total - 1, decision_scope="conversation")
+    result = decide(prompt_text=HISTORY[-1], prompt_length=12, config=config, messages=HISTORY)
+    assert result["reason_codes"] == [DEFAULT]
+    config = _config(max_length=total, decision_scope="conversation")
+    result = decide(prompt_text=HISTORY[-1], prompt_length=12, config=config, messages=HISTORY)
+    assert result["reason_codes"] == [COST_PREFER_LOCAL]
@@ -0,0 +1,170 @@
+"""Unit tests for the compiled rule pipeline: rule types, order, short-circuit, registry."""
+
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+
+from app.core.config import PolicyConfig
+from app.decision.engine import decide
+from app.decision.reason_codes import (
+    COST_PREFER_LOCAL,
+    DEFAULT,
+    HEADER_MATCH,
+    MODEL_NOT_ALLOWLISTED,
+    TIME_OF_DAY_MATCH,
+)
+from app.decision.rules import (
+    DEFAULT_PIPELINE,
+    RULE_TYPES,
+    Rule,
+    RuleConfigError,
+    compile_rules,
+    register_rule_type,
+)
+
+
+def _config(rules: list | None = None, keywords: tuple[str, ...] = (), max_length: int = 10) -> PolicyConfig:
+    return PolicyConfig(
+        sensitivity_keywords=keywords,
+        cost_max_prompt_length_for_local=max_length,
+        default_provider="public",
+        cost_max_usd_for_local=None,
+        llm_input_usd_per_1m_tokens=None,
+        cost_chars_per_token=4,
+        rules=compile_rules(rules) if rules is not None else None,
+    )
+
+
+def test_default_pipeline_is_sensitivity_then_cost() -> None:
+    """Without a `rules` key the engine evaluates sensitivity, then cost."""
+    assert [r.type_name for r in DEFAULT_PIPELINE] == ["sensitivity", "cost"]
+
+
+def test_pipeline_order_is_respected() -> None:
+    """Cost before sensitivity: a short sensitive prompt is decided by cost."""
+    config = _config(rules=[{"type": "cost"}, {"type": "sensitivity"}], keywords=("secret",), max_length=100)
+    result = decide(prompt_text="secret", prompt_length=6, config=config)
+    assert result == {"provider": "local", "reason_codes": [COST_PREFER_LOCAL]}
+
+
+def test_empty_pipeline_goes_to_default() -> None:
+    """`rules: []` disables all rules: every request goes to the default provider."""
+    config = _config(rules=[], keywords=("secret",), max_length=100)
+    result = decide(prompt_text="secret", prompt_length=6, config=config)
+    assert result == {"provider": "openai", "reason_codes": [DEFAULT]}
+
+
+def test_short_circuit_skips_later_rules() -> None:
+    """Once a rule matches, later rules are not evaluated."""
+    calls: list[str] = []
+
+    class _Spy(Rule):
+        def evaluate(self, ctx):
+            calls.append(self.name)
+            return None
+
+    config = _config(rules=[{"type": "sensitivity"}], keywords=("secret",))
+    spy = _Spy("spy")
+    config = PolicyConfig(**{**config.__dict__, "rules": config.rules + (spy,)})
+    decide(prompt_text="secret", prompt_length=6, config=config)
+    assert calls == []
+    decide(prompt_text="hello world!", prompt_length=12, config=config)
+    assert calls == ["spy"]
+
+
+def test_model_allowlist_routes_unlisted_model_local() -> None:
+    """model_allowlist: unlisted model → local; listed or unspecified model falls through."""
+    config = _config(rules=[{"type": "model_allowlist", "models": ["gpt-4o-mini"]}])
+    listed = decide(prompt_text="x" * 50, prompt_length=50, config=config, model="gpt-4o-mini")
+    unlisted = decide(prompt_text="x" * 50, prompt_length=50, config=config, model="gpt-4o")
+    unspecified = decide(prompt_text="x" * 50, prompt_length=50, config=config)
+    assert listed["reason_codes"] == [DEFAULT]
+    assert unlisted == {"provider": "local", "reason_codes": [MODEL_NOT_ALLOWLISTED]}
+    assert unspecified["reason_codes"] == [DEFAULT]
+
+
+def test_header_match_is_case_insensitive_on_name() -> None:
+    """header_match: header names compare case-insensitively, values exactly."""
+    config = _config(rules=[{"type": "header_match", "header": "X-Data-Class", "values": ["restricted"]}])
+    hit = decide(prompt_text="x" * 50, prompt_length=50, config=config, headers={"x-data-class": "restricted"})
+    miss = decide(prompt_text="x" * 50, prompt_length=50, config=config, headers={"X-Data-Class": "public"})
+    assert hit == {"provider": "local", "reason_codes": [HEADER_MATCH]}
+    assert miss["reason_codes"] == [DEFAULT]
+
+
+def test_header_match_route_public_resolves_provider() -> None:
+    """A rule with route=public resolves to the provider inferred from PUBLIC_LLM_URL."""
+    config = _config(
+        rules=[{"type": "header_match", "header": "X-Route", "values": ["cloud"], "route": "public"}],
+    )
+    with patch("app.decision.engine.get_public_provider", return_value="anthropic"):
+        result = decide(prompt_text="x", prompt_length=1, config=config, headers={"X-Route": "cloud"})
+    assert result == {"provider": "anthropic", "reason_codes": [HEADER_MATCH]}
+
+
+@pytest.mark.parametrize(
+    ("hour", "minute", "inside"),
+    [(21, 59, False), (22, 0, True), (2, 30, True), (5, 59, True), (6, 0, False), (12, 0, False)],
+)
+def test_time_of_day_window_wraps_midnight(hour: int, minute: int, inside: bool) -> None:
+    """time_of_day: [22:00, 06:00) wraps midnight; end is exclusive."""
+    config = _config(rules=[{"type": "time_of_day", "start": "22:00", "end": "06:00"}])
+    now = datetime(2026, 3, 1, hour, minute, tzinfo=timezone.utc)
+    result = decide(prompt_text="x" * 50, prompt_length=50, config=config, now=now)
+    assert (result["reason_codes"] == [TIME_OF_DAY_MATCH]) is inside
+
+
+def test_time_of_day_applies_utc_offset() -> None:
+    """time_of_day: window is interpreted at utc_offset_minutes."""
+    config = _config(
+        rules=[{"type": "time_of_day", "start": "09:00", "end": "17:00", "utc_offset_minutes": 120}],
+    )
+    # 08:00 UTC is 10:00 at UTC+2 → inside the window.
+    now = datetime(2026, 3, 1, 8, 0, tzinfo=timezone.utc)
+    result = decide(prompt_text="x" * 50, prompt_length=50, config=config, now=now)
+    assert result == {"provider": "local", "reason_codes": [TIME_OF_DAY_MATCH]}
+
+
+def test_registry_accepts_new_rule_types() -> None:
+    """A registered custom rule type can be compiled from a policy spec and evaluated."""
+
+    @register_rule_type("test_prompt_prefix")
+    class _PrefixRule(Rule):
+        def __init__(self, name: str, prefix: str) -> None:
+            super().__init__(name)
+            self.prefix = prefix
+
+        @classmethod
+        def from_spec(cls, name, params):
+            return cls(name, prefix=str(params["prefix"]))
+
+        def evaluate(self, ctx):
+            return ("local", "test_prefix") if ctx.prompt_text.startswith(self.prefix) else None
+
+    try:
+        config = _config(rules=[{"type": "test_prompt_prefix", "prefix": "!local"}])
+        result = decide(prompt_text="!local hi", prompt_length=9, config=config)
+        assert result == {"provider": "local", "reason_codes": ["test_prefix"]}
+        with pytest.raises(ValueError):
+            register_rule_type("test_prompt_prefix")(_PrefixRule)
+    finally:
+        RULE_TYPES.pop("test_prompt_prefix", None)
+
+
+def test_compile_rules_rejects_unknown_type() -> None:
+    """Unknown rule types fail compilation (surfaced as PolicyFileError by the loader)."""
+    with pytest.raises(RuleConfigError, match="unknown rule type"):
+        compile_rules([{"type": "nope"}])
+
+
+def test_rule_evaluation_time_is_observed() -> None:
+    """Each evaluated rule reports its evaluation time; rules after the match are not observed."""
+    config = _config(rules=[{"type": "sensitivity"}, {"type": "cost"}], keywords=("secret",))
+    with patch("app.decision.engine.record_rule_evaluation") as mock_record:
+        decide(prompt_text="secret", prompt_length=6, config=config)
+    assert mock_record.call_count == 1
+    name, seconds = mock_record.call_args[0]
+    assert name == "sensitivity"
+    assert seconds >= 0
+    assert mock_record.call_args[1] == {"matched": True}
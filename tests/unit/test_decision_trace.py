@@ -0,0 +1,96 @@
+"""Unit tests for the decision trace: per-rule entries, skipped rules, metadata-only inputs."""
+
+import hashlib
+import json
+
+from app.core.config import PolicyConfig
+from app.decision.detectors import compile_detectors
+from app.decision.engine import decide
+from app.decision.rules import compile_rules
+from app.decision.trace import DecisionTrace
+
+PROMPT = "contact ops@example.com about the rollout"
+
+
+def _config(**kwargs) -> PolicyConfig:
+    return PolicyConfig(
+        sensitivity_keywords=("internal",),
+        cost_max_prompt_length_for_local=10,
+        default_provider="public",
+        cost_max_usd_for_local=None,
+        llm_input_usd_per_1m_tokens=None,
+        cost_chars_per_token=4,
+        generation="gen-1",
+        **kwargs,
+    )
+
+
+def test_trace_lists_every_rule_and_skips_after_match() -> None:
+    """Rules before the match pass, the match carries its codes, later rules are skipped."""
+    rules = compile_rules(
+        [
+            {"type": "header_match", "header": "x-route", "values": ["local"]},
+            {"type": "sensitivity"},
+            {"type": "cost"},
+        ]
+    )
+    config = _config(sensitivity_detectors=compile_detectors(["email"]), rules=rules)
+    trace = DecisionTrace()
+    result = decide(PROMPT, len(PROMPT), config, trace=trace)
+
+    assert result["provider"] == "local"
+    assert [(r.name, r.outcome, r.ran) for r in trace.rules] == [
+        ("header_match", "pass", True),
+        ("sensitivity", "match", True),
+        ("cost", "skipped", False),
+    ]
+    assert trace.rules[0].inputs == {"header_present": False}
+    assert trace.rules[1].reason_codes == ["sensitive_email"]
+    assert trace.rules[1].inputs["detector_classes"] == ["email"]
+    assert trace.rules[2].elapsed_ns == 0
+    assert trace.total_ns >= sum(r.elapsed_ns for r in trace.rules) > 0
+
+
+def test_trace_never_contains_prompt_or_matched_text() -> None:
+    """Neither the response form nor the compact audit form includes prompt or matched text."""
+    config = _config(sensitivity_detectors=compile_detectors(["email"]))
+    trace = DecisionTrace()
+    decide(PROMPT, len(PROMPT), config, trace=trace)
+
+    for dumped in (json.dumps(trace.to_dict()), trace.to_compact_json()):
+        assert "example.com" not in dumped
+        assert "rollout" not in dumped
+
+
+def test_trace_reports_cost_inputs() -> None:
+    """The cost rule records its mode, prompt length and threshold."""
+    trace = DecisionTrace()
+    decide("a much longer prompt", 20, _config(), trace=trace)
+
+    cost = next(r for r in trace.rules if r.type == "cost")
+    assert cost.outcome == "pass"
+    assert cost.inputs == {"mode": "length", "prompt_length": 20, "max_prompt_length": 10}
+
+
+def test_tracing_bypasses_cache_lookup() -> None:
+    """A cached decision is recomputed when traced, so every rule appears with timings."""
+    prompt_hash = hashlib.sha256(b"internal").hexdigest()
+    config = _config()
+    decide("internal", 8, config, prompt_hash=prompt_hash)
+    trace = DecisionTrace()
+    decide("internal", 8, config, prompt_hash=prompt_hash, trace=trace)
+
+    assert trace.cache == "bypass"
+    assert [r.outcome for r in trace.rules] == ["match", "skipped"]
+
+
+def test_compact_json_uses_short_keys() -> None:
+    """The audit form is a single compact line keyed c/ns/r."""
+    trace = DecisionTrace()
+    decide("internal", 8, _config(), trace=trace)
+    compact = json.loads(trace.to_compact_json())
+
+    assert set(compact) == {"c", "ns", "r"}
+    assert compact["r"][0]["n"] == "sensitivity"
+    assert compact["r"][0]["o"] == "m"
+    assert compact["r"][1] == {"n": "cost", "o": "s", "ns": 0}
@@ -0,0 +1,250 @@
+"""Unit tests for Idempotency-Key handling: replay, concurrent wait, failures, bounds, Postgres claim."""
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from app.api.schemas.chat import ChatMessage, ChatRequest, ChatResponse
+from app.services.idempotency import (
+    IdempotencyError,
+    IdempotencyStore,
+    request_fingerprint,
+    run_idempotent,
+    scoped_key,
+)
+
+
+def _ok(request_id: str = "req-1") -> ChatResponse:
+    return ChatResponse(request_id=request_id, provider="local", reason_codes=["default"], content="ok")
+
+
+def _failed() -> ChatResponse:
+    return ChatResponse(request_id="req-f", provider="openai", reason_codes=["default"], error="timeout")
+
+
+class _Handler:
+    """Counts calls; optionally blocks until released (to simulate an in-flight request)."""
+
+    def __init__(self, responses: list[ChatResponse], gate: threading.Event | None = None) -> None:
+        self.responses = responses
+        self.gate = gate
+        self.calls = 0
+
+    def __call__(self) -> ChatResponse:
+        self.calls += 1
+        if self.gate is not None:
+            self.gate.wait(5)
+        return self.responses[min(self.calls, len(self.responses)) - 1]
+
+
+def test_duplicate_replays_stored_response() -> None:
+    """The second request with the same key returns the first response without calling the handler."""
+    store = IdempotencyStore(maxsize=10, ttl_seconds=60)
+    handler = _Handler([_ok("req-1"), _ok("req-2")])
+    first, replayed_first = run_idempotent("k1", None, "fp", handler, store)
+    second, replayed_second = run_idempotent("k1", None, "fp", handler, store)
+    assert (replayed_first, replayed_second) == (False, True)
+    assert second.request_id == first.request_id == "req-1"
+    assert handler.calls == 1
+
+
+def test_key_reused_with_different_body_is_rejected() -> None:
+    """Same key, different body → 422."""
+    store = IdempotencyStore(maxsize=10, ttl_seconds=60)
+    run_idempotent("k1", None, "fp-a", _Handler([_ok()]), store)
+    with pytest.raises(IdempotencyError) as exc:
+        run_idempotent("k1", None, "fp-b", _Handler([_ok()]), store)
+    assert exc.value.status_code == 422
+
+
+def test_keys_are_scoped_by_tenant() -> None:
+    """Two tenants using the same key do not see each other's results."""
+    assert scoped_key("k1", "acme") != scoped_key("k1", "globex")
+    store = IdempotencyStore(maxsize=10, ttl_seconds=60)
+    handler = _Handler([_ok("req-a"), _ok("req-b")])
+    run_idempotent("k1", "acme", "fp", handler, store)
+    response, replayed = run_idempotent("k1", "globex", "fp", handler, store)
+    assert not replayed and response.request_id == "req-b"
+
+
+def test_failed_response_is_not_stored() -> None:
+    """A provider failure releases the key; the retry calls the handler again."""
+    store = IdempotencyStore(maxsize=10, ttl_seconds=60)
+    handler = _Handler([_failed(), _ok("req-2")])
+    run_idempotent("k1", None, "fp", handler, store)
+    response, replayed = run_idempotent("k1", None, "fp", handler, store)
+    assert not replayed and response.request_id == "req-2"
+    assert handler.calls == 2
+
+
+def test_concurrent_duplicate_waits_for_in_flight_result() -> None:
+    """A duplicate arriving while the first is in flight gets the first result."""
+    store = IdempotencyStore(maxsize=10, ttl_seconds=60)
+    gate = threading.Event()
+    handler = _Handler([_ok("req-1")], gate=gate)
+    results: list[tuple[ChatResponse, bool]] = []
+    first = threading.Thread(target=lambda: results.append(run_idempotent("k1", None, "fp", handler, store)))
+    first.start()
+    while handler.calls == 0:
+        time.sleep(0.001)
+    second = threading.Thread(target=lambda: results.append(run_idempotent("k1", None, "fp", handler, store)))
+    second.start()
+    gate.set()
+    first.join(5)
+    second.join(5)
+    assert handler.calls == 1
+    assert sorted(replayed for _, replayed in results) == [False, True]
+    assert {r.request_id for r, _ in results} == {"req-1"}
+
+
+def test_wait_times_out_with_409(monkeypatch: pytest.MonkeyPatch) -> None:
+    """When the in-flight request outlasts IDEMPOTENCY_WAIT_SECONDS, the duplicate gets 409."""
+    monkeypatch.setenv("IDEMPOTENCY_WAIT_SECONDS", "0")
+    store = IdempotencyStore(maxsize=10, ttl_seconds=60)
+    store.claim(scoped_key("k1", None), "fp", now=time.time())  # in flight, never completes
+    with pytest.raises(IdempotencyError) as exc:
+        run_idempotent("k1", None, "fp", _Handler([_ok()]), store)
+    assert exc.value.status_code == 409
+
+
+def test_store_is_bounded_and_expires_in_order() -> None:
+    """Oldest completed entries are evicted past maxsize; expired entries are purged from the front."""
+    store = IdempotencyStore(maxsize=2, ttl_seconds=10)
+    for i, key in enumerate(("a", "b", "c")):
+        entry, _ = store.claim(key, "fp", now=float(i))
+        store.complete(entry, "{}")
+    assert len(store) == 2
+    _, owner = store.claim("a", "fp", now=3.0)
+    assert owner  # "a" was evicted
+    store.claim("d", "fp", now=12.5)  # "b" (expires 11) and "c" (expires 12) are gone
+    assert len(store) == 2
+
+
+def test_in_flight_entries_are_never_evicted() -> None:
+    """With maxsize=1, a second key while the first is in flight gets 503; a retry of the first still waits for it."""
+    store = IdempotencyStore(maxsize=1, ttl_seconds=60)
+    first, owner = store.claim("a", "fp", now=0.0)
+    assert owner
+    with pytest.raises(IdempotencyError) as exc:
+        store.claim("b", "fp", now=1.0)
+    assert exc.value.status_code == 503
+    again, owner = store.claim("a", "fp", now=2.0)
+    assert again is first and not owner
+    store.complete(first, "{}")
+    _, owner = store.claim("b", "fp", now=3.0)
+    assert owner and len(store) == 1
+
+
+def test_expired_in_flight_entries_are_not_purged() -> None:
+    """Past the TTL, a completed entry is purged but an in-flight one stays claimed until it finishes."""
+    store = IdempotencyStore(maxsize=10, ttl_seconds=10)
+    slow, _ = store.claim("a", "fp", now=0.0)
+    done, _ = store.claim("b", "fp", now=1.0)
+    store.complete(done, "{}")
+    again, owner = store.claim("a", "fp", now=20.0)
+    assert again is slow and not owner
+    assert len(store) == 1
+    store.complete(slow, "{}")
+    _, owner = store.claim("a", "fp", now=21.0)
+    assert owner
+
+
+def test_concurrent_keys_on_a_full_store_call_the_provider_once() -> None:
+    """maxsize=1 with two concurrent keys: the second key gets 503 and the in-flight key is not evicted."""
+    store = IdempotencyStore(maxsize=1, ttl_seconds=60)
+    gate = threading.Event()
+    handler = _Handler([_ok("req-1")], gate=gate)
+    results: list[tuple[ChatResponse, bool]] = []
+    first = threading.Thread(target=lambda: results.append(run_idempotent("k1", None, "fp", handler, store)))
+    first.start()
+    while handler.calls == 0:
+        time.sleep(0.001)
+    with pytest.raises(IdempotencyError) as exc:
+        run_idempotent("k2", None, "fp", _Handler([_ok("req-2")]), store)
+    assert exc.value.status_code == 503
+    retry = threading.Thread(target=lambda: results.append(run_idempotent("k1", None, "fp", handler, store)))
+    retry.start()
+    gate.set()
+    first.join(5)
+    retry.join(5)
+    assert handler.calls == 1
+    assert sorted(replayed for _, replayed in results) == [False, True]
+
+
+def test_request_fingerprint_depends_on_body() -> None:
+    """Different messages or model → different fingerprint."""
+    body = ChatRequest(messages=[ChatMessage(role="user", content="Hi")])
+    other = ChatRequest(messages=[ChatMessage(role="user", content="Hi")], model="m")
+    assert request_fingerprint(body) == request_fingerprint(body.model_copy())
+    assert request_fingerprint(body) != request_fingerprint(other)
+
+
+def test_other_worker_result_is_replayed_from_postgres(monkeypatch: pytest.MonkeyPatch) -> None:
+    """With audit enabled, a key completed by another worker is replayed from its stored row."""
+    monkeypatch.setenv("DATABASE_URL", "postgresql+psycopg://u:p@localhost/db")
+    monkeypatch.setenv("AUDIT_ENABLED", "true")
+    store = IdempotencyStore(maxsize=10, ttl_seconds=60)
+    handler = _Handler([_ok("req-local")])
+    stored = _ok("req-other-worker").model_dump_json()
+    with patch("app.services.idempotency.claim_idempotency_key", return_value=("fp", stored)):
+        response, replayed = run_idempotent("k1", None, "fp", handler, store)
+    assert replayed and response.request_id == "req-other-worker"
+    assert handler.calls == 0
+
+
+def test_postgres_outage_falls_back_to_memory(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A failing claim does not block the request; the key is still held in memory."""
+    monkeypatch.setenv("DATABASE_URL", "postgresql+psycopg://u:p@localhost/db")
+    monkeypatch.setenv("AUDIT_ENABLED", "true")
+    store = IdempotencyStore(maxsize=10, ttl_seconds=60)
+    handler = _Handler([_ok("req-1")])
+    with (
+        patch("app.services.idempotency.claim_idempotency_key", side_effect=OSError("down")),
+        patch("app.services.idempotency.complete_idempotency_key") as mock_complete,
+    ):
+        run_idempotent("k1", None, "fp", handler, store)
+        _, replayed = run_idempotent("k1", None, "fp", handler, store)
+    assert replayed and handler.calls == 1
+    mock_complete.assert_not_called()
+
+
+def test_retry_takes_over_a_claim_whose_worker_died(monkeypatch: pytest.MonkeyPatch) -> None:
+    """An in-flight Postgres claim past its lease is no longer live: the retry claims the key and calls the provider."""
+    monkeypatch.setenv("DATABASE_URL", "postgresql+psycopg://u:p@localhost/db")
+    monkeypatch.setenv("AUDIT_ENABLED", "true")
+    monkeypatch.setenv("IDEMPOTENCY_LEASE_SECONDS", "30")
+    handler = _Handler([_ok("req-retry")])
+    with (
+        patch("app.services.idempotency.claim_idempotency_key", side_effect=[("fp", None), None]) as mock_claim,
+        patch("app.services.idempotency.get_idempotency_record", return_value=None),
+        patch("app.services.idempotency.complete_idempotency_key"),
+        patch("app.services.idempotency._POLL_SECONDS", 0.0),
+    ):
+        response, replayed = run_idempotent("k1", None, "fp", handler, IdempotencyStore(maxsize=10, ttl_seconds=60))
+    assert not replayed and response.request_id == "req-retry"
+    assert handler.calls == 1
+    expires, lease = mock_claim.call_args[0][2:4]
+    assert timedelta(seconds=25) < lease - datetime.now(timezone.utc) <= timedelta(seconds=30)
+    assert lease < expires
+
+
+def test_lapsed_claim_is_replaced_in_the_database() -> None:
+    """claim_idempotency_key replaces an in-flight row past claimed_until, but not a live one."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+
+    from app.audit.models import IdempotencyRecord
+    from app.audit.repository import claim_idempotency_key, get_idempotency_record
+
+    engine = create_engine("sqlite://")
+    IdempotencyRecord.__table__.create(engine)
+    now = datetime.now(timezone.utc)
+    expires = now + timedelta(days=1)
+    with Session(engine) as session:
+        assert claim_idempotency_key("k", "fp", expires, now - timedelta(seconds=1), session=session) is None
+        assert get_idempotency_record("k", session=session) is None
+        assert claim_idempotency_key("k", "fp", expires, now + timedelta(seconds=60), session=session) is None
+        assert claim_idempotency_key("k", "fp", expires, now + timedelta(seconds=60), session=session) == ("fp", None)
@@ -0,0 +1,160 @@
+"""Unit tests for asynchronous chat jobs: priority queue, backlog bound, execution, callbacks."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.api.schemas.chat import ChatMessage, ChatResponse
+from app.api.schemas.jobs import ChatJobRequest
+from app.services.jobs import (
+    JobCallbackError,
+    JobQueueFull,
+    JobWorkers,
+    JobWorkersUnavailable,
+    SCHEDULER_PRIORITY,
+    get_job_view,
+    job_queue,
+    run_job,
+    submit_job,
+)
+
+
+def _request(**kwargs) -> ChatJobRequest:
+    return ChatJobRequest(messages=[ChatMessage(role="user", content="Hi")], **kwargs)
+
+
+def _ok() -> ChatResponse:
+    return ChatResponse(request_id="req-1", provider="local", reason_codes=["default"], content="ok")
+
+
+def test_queue_dispatches_by_priority_then_fifo() -> None:
+    """high before normal before low; submission order within a class."""
+    jobs = [submit_job(_request(priority=p)) for p in ("low", "normal", "high", "normal")]
+    order = [job_queue.get(timeout=0) for _ in jobs]
+    assert [j.id for j in order] == [jobs[2].id, jobs[1].id, jobs[3].id, jobs[0].id]
+    assert job_queue.get(timeout=0) is None
+
+
+def test_full_queue_rejects(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The backlog is bounded; a full queue rejects instead of growing."""
+    monkeypatch.setattr(job_queue, "maxsize", 1)
+    submit_job(_request())
+    with pytest.raises(JobQueueFull):
+        submit_job(_request())
+    assert len(job_queue) == 1
+
+
+def test_submit_requires_running_workers(monkeypatch: pytest.MonkeyPatch) -> None:
+    """JOB_WORKERS=0 starts no workers; submissions are rejected rather than queued forever."""
+    monkeypatch.setattr(job_queue, "consumers", 0)
+    workers = JobWorkers(count=0)
+    workers.start()
+    with pytest.raises(JobWorkersUnavailable):
+        submit_job(_request())
+    assert len(job_queue) == 0
+    workers = JobWorkers(count=1)
+    workers.start()
+    try:
+        assert job_queue.consumers == 1
+    finally:
+        workers.stop()
+    assert job_queue.consumers == 0
+
+
+def test_run_job_completes_with_orchestrator_result() -> None:
+    """A worker runs the orchestrator with the submitted headers; the job holds the response."""
+    job = submit_job(_request(model="m"), headers={"x-tenant": "acme"})
+    assert job.tenant == "acme"
+    with patch("app.services.jobs.handle_chat_request", return_value=_ok()) as mock_handle:
+        run_job(job_queue.get(timeout=0))
+
+    body = mock_handle.call_args[0][0]
+    assert body.model == "m" and mock_handle.call_args[1]["headers"] == {"x-tenant": "acme"}
+    view = get_job_view(job.id, "acme")
+    assert view.status == "completed" and view.result.content == "ok"
+    assert job.body is None and job.headers is None
+
+
+def test_job_is_visible_only_to_its_tenant(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Another tenant (or a caller without one) gets no view, from memory or from Postgres."""
+    job = submit_job(_request(), headers={"x-tenant": "acme"})
+    assert get_job_view(job.id, "acme") is not None
+    assert get_job_view(job.id, "globex") is None
+    assert get_job_view(job.id, None) is None
+    monkeypatch.setenv("DATABASE_URL", "postgresql+psycopg://u:p@localhost/db")
+    monkeypatch.setenv("AUDIT_ENABLED", "true")
+    with patch("app.services.jobs.get_chat_job", return_value=job.row()):
+        assert get_job_view("other-worker-job", "acme").job_id == job.id
+        assert get_job_view("other-worker-job", "globex") is None
+
+
+@pytest.mark.parametrize(
+    ("priority", "scheduler_class"), [("high", "interactive"), ("normal", "batch"), ("low", "batch")]
+)
+def test_job_priority_maps_to_scheduler_class(priority: str, scheduler_class: str) -> None:
+    """Every job priority has a scheduler class, passed to the chat as its default priority."""
+    assert set(SCHEDULER_PRIORITY) == {"high", "normal", "low"}
+    job = submit_job(_request(priority=priority))
+    with patch("app.services.jobs.handle_chat_request", return_value=_ok()) as mock_handle:
+        run_job(job_queue.get(timeout=0))
+    assert mock_handle.call_args[1]["default_priority"] == scheduler_class
+
+
+def test_run_job_failure_records_error_type_only() -> None:
+    """An unexpected exception fails the job with the exception type (no message)."""
+    job = submit_job(_request())
+    with patch("app.services.jobs.handle_chat_request", side_effect=RuntimeError("boom")):
+        run_job(job_queue.get(timeout=0))
+    view = get_job_view(job.id, None)
+    assert view.status == "failed" and view.error == "RuntimeError"
+
+
+def test_callback_host_must_be_allowlisted(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Callbacks are disabled by default and limited to JOB_CALLBACK_ALLOWED_HOSTS."""
+    with pytest.raises(JobCallbackError):
+        submit_job(_request(callback_url="https://hooks.example.com/done"))
+    monkeypatch.setenv("JOB_CALLBACK_ALLOWED_HOSTS", "hooks.example.com")
+    with pytest.raises(JobCallbackError):
+        submit_job(_request(callback_url="file:///etc/passwd"))
+    assert submit_job(_request(callback_url="https://hooks.example.com/done")).callback_url
+
+
+def test_callback_receives_job_view(monkeypatch: pytest.MonkeyPatch) -> None:
+    """On finish, the job view is POSTed to callback_url."""
+    monkeypatch.setenv("JOB_CALLBACK_ALLOWED_HOSTS", "hooks.example.com")
+    job = submit_job(_request(callback_url="https://hooks.example.com/done"))
+    with (
+        patch("app.services.jobs.handle_chat_request", return_value=_ok()),
+        patch("app.services.jobs.httpx.post", return_value=MagicMock(status_code=204)) as mock_post,
+    ):
+        run_job(job_queue.get(timeout=0))
+
+    url = mock_post.call_args[0][0]
+    payload = mock_post.call_args[1]["json"]
+    assert url == "https://hooks.example.com/done"
+    assert payload["job_id"] == job.id and payload["status"] == "completed"
+
+
+def test_stop_fails_jobs_still_queued() -> None:
+    """Queued bodies live only in memory; stopping the workers marks them failed."""
+    job = submit_job(_request())
+    JobWorkers(count=0).stop()
+    view = get_job_view(job.id, None)
+    assert view.status == "failed" and view.error == "shutdown"
+    assert len(job_queue) == 0
+
+
+def test_job_state_is_persisted_without_body(monkeypatch: pytest.MonkeyPatch) -> None:
+    """With audit enabled, job rows carry status and result but no request body."""
+    monkeypatch.setenv("DATABASE_URL", "postgresql+psycopg://u:p@localhost/db")
+    monkeypatch.setenv("AUDIT_ENABLED", "true")
+    with patch("app.services.jobs.save_chat_job") as mock_save:
+        job = submit_job(_request())
+        with patch("app.services.jobs.handle_chat_request", return_value=_ok()):
+            run_job(job_queue.get(timeout=0))
+
+    statuses = [c[0][0].status for c in mock_save.call_args_list]
+    assert statuses == ["queued", "running", "completed"]
+    row = mock_save.call_args[0][0]
+    assert '"content":"ok"' in row.result
+    assert not hasattr(row, "body")
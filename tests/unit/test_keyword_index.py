@@ -0,0 +1,106 @@
+"""Unit tests for the memory-mapped external keyword index. Terms are made-up codenames."""
+
+from pathlib import Path
+
+import pytest
+
+from app.core.config import PolicyConfig
+from app.decision.engine import decide
+from app.decision.keyword_index import (
+    KeywordIndexError,
+    build_keyword_index,
+    load_keyword_index,
+    main,
+)
+from app.decision.reason_codes import DEFAULT, SENSITIVE_KEYWORD_MATCH
+
+TERMS = ["Bluefalcon", "Project Night Owl", "acme-widgets", "  ", "Zeta Nine Labs Ltd"]
+
+
+@pytest.fixture
+def index_path(tmp_path: Path) -> Path:
+    path = tmp_path / "terms.kwidx"
+    build_keyword_index(TERMS, str(path))
+    return path
+
+
+def test_build_and_load_reports_term_count_and_size(index_path: Path) -> None:
+    """Blank terms are skipped; header term count and file size are exposed."""
+    index = load_keyword_index(str(index_path))
+    assert index.term_count == 4
+    assert index.max_words == 4
+    assert index.size_bytes == index_path.stat().st_size
+    assert "bluefalcon" in index
+    assert "project night owl" in index
+    assert "project night" not in index
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("status of BLUEFALCON?", True),
+        ("notes on project night-owl rollout", True),
+        ("ACME widgets order", True),
+        ("zeta nine labs ltd signed", True),
+        ("the project night shift", False),
+        ("bluefalcons are birds", False),
+        ("zeta nine labs", False),
+    ],
+)
+def test_matches_whole_words_and_phrases(index_path: Path, text: str, expected: bool) -> None:
+    """Terms match as whole words; multi-word terms ignore punctuation between words."""
+    index = load_keyword_index(str(index_path))
+    assert index.matches([text]) is expected
+
+
+def test_matches_any_segment(index_path: Path) -> None:
+    """Segments are checked independently; a phrase does not span two segments."""
+    index = load_keyword_index(str(index_path))
+    assert index.matches(["hello", "about Bluefalcon"])
+    assert not index.matches(["project night", "owl"])
+
+
+def test_invalid_index_files_raise(tmp_path: Path, index_path: Path) -> None:
+    """Missing, foreign, and truncated files are rejected."""
+    with pytest.raises(KeywordIndexError):
+        load_keyword_index(str(tmp_path / "missing.kwidx"))
+    foreign = tmp_path / "foreign.kwidx"
+    foreign.write_bytes(b"x" * 64)
+    with pytest.raises(KeywordIndexError):
+        load_keyword_index(str(foreign))
+    truncated = tmp_path / "truncated.kwidx"
+    truncated.write_bytes(index_path.read_bytes()[:-3])
+    with pytest.raises(KeywordIndexError):
+        load_keyword_index(str(truncated))
+
+
+def test_cli_builds_index(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    """`python -m app.decision.keyword_index build` compiles a newline-separated term file."""
+    terms = tmp_path / "terms.txt"
+    terms.write_text("Bluefalcon\nProject Night Owl\n", encoding="utf-8")
+    out = tmp_path / "out.kwidx"
+    assert main(["build", str(terms), str(out)]) == 0
+    assert "2 terms" in capsys.readouterr().out
+    assert load_keyword_index(str(out)).term_count == 2
+    assert main(["oops"]) == 2
+
+
+def test_sensitivity_rule_uses_keyword_index(index_path: Path) -> None:
+    """Index hit → local with sensitive_keyword_match and a keywords=index audit flag."""
+    config = PolicyConfig(
+        sensitivity_keywords=(),
+        cost_max_prompt_length_for_local=0,
+        default_provider="public",
+        cost_max_usd_for_local=None,
+        llm_input_usd_per_1m_tokens=None,
+        cost_chars_per_token=4,
+        sensitivity_keyword_index=load_keyword_index(str(index_path)),
+    )
+    result = decide(prompt_text="Summarize Bluefalcon status", prompt_length=27, config=config)
+    assert result == {
+        "provider": "local",
+        "reason_codes": [SENSITIVE_KEYWORD_MATCH],
+        "flags": ["keywords=index"],
+    }
+    result = decide(prompt_text="Summarize the weather", prompt_length=21, config=config)
+    assert result == {"provider": "openai", "reason_codes": [DEFAULT]}
@@ -0,0 +1,81 @@
+"""Unit tests for local model fallbacks: policy compilation and saturation hysteresis."""
+
+import pytest
+
+from app.decision.fallbacks import FallbackConfigError, LocalFallbacks, compile_local_fallbacks
+from app.services.local_load import LocalLoad
+
+
+def _fallbacks(**overrides) -> LocalFallbacks:
+    raw = {"models": {"llama3:70b": "llama3:8b", "default": "llama3:8b"}, "queue_depth": 4, "latency_ms": 10000}
+    raw.update(overrides)
+    return compile_local_fallbacks(raw)
+
+
+def test_compile_defaults_recover_thresholds_to_half() -> None:
+    """Recover thresholds default to half of the entry thresholds."""
+    fallbacks = _fallbacks()
+    assert fallbacks.recover_queue_depth == 2
+    assert fallbacks.recover_latency_ms == 5000.0
+
+
+def test_fallback_for_uses_default_entry_without_model() -> None:
+    """A mapped model gets its fallback, no model gets "default", unmapped models get None."""
+    fallbacks = _fallbacks()
+    assert fallbacks.fallback_for("llama3:70b") == "llama3:8b"
+    assert fallbacks.fallback_for(None) == "llama3:8b"
+    assert fallbacks.fallback_for("mistral") is None
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        [],
+        {"models": {}, "queue_depth": 4},
+        {"models": {"a": "b"}},
+        {"models": {"a": "b"}, "queue_depth": 0},
+        {"models": {"a": "a"}, "queue_depth": 4},
+        {"models": {"a": ""}, "queue_depth": 4},
+        {"models": {"a": "b"}, "queue_depth": 4, "recover_queue_depth": 4},
+        {"models": {"a": "b"}, "queue_depth": 4, "latency_ms": 100, "recover_latency_ms": 200},
+        {"models": {"a": "b"}, "queue_depth": 4, "recover_latency_ms": 200},
+        {"models": {"a": "b"}, "queue_depth": True},
+        {"models": {"a": "b"}, "queue_depth": 4, "cooldown": 3},
+    ],
+)
+def test_compile_rejects_invalid_config(raw: object) -> None:
+    """Malformed maps, missing or inverted thresholds and unknown keys are rejected."""
+    with pytest.raises(FallbackConfigError):
+        compile_local_fallbacks(raw)
+
+
+def test_queue_depth_saturates_until_recover_threshold() -> None:
+    """Saturated at queue_depth; stays saturated above recover_queue_depth (hysteresis)."""
+    load = LocalLoad()
+    fallbacks = _fallbacks()
+    assert load.update(fallbacks, 3) is False
+    assert load.update(fallbacks, 4) is True
+    assert load.update(fallbacks, 3) is True
+    assert load.update(fallbacks, 2) is False
+
+
+def test_latency_saturates_until_average_recovers() -> None:
+    """Slow local calls saturate; recovery needs the moving average under recover_latency_ms."""
+    load = LocalLoad()
+    fallbacks = _fallbacks()
+    load.observe(12000)
+    assert load.update(fallbacks, 0) is True
+    load.observe(6000)
+    assert load.update(fallbacks, 0) is True
+    for _ in range(20):
+        load.observe(1000)
+    assert load.update(fallbacks, 0) is False
+
+
+def test_recovery_requires_both_signals() -> None:
+    """A short queue alone does not end saturation while latency is still high."""
+    load = LocalLoad()
+    fallbacks = _fallbacks()
+    assert load.update(fallbacks, 5) is True
+    load.observe(8000)
+    assert load.update(fallbacks, 0) is True
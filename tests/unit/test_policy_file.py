@@ -1,6 +1,7 @@
 """Unit tests for policy file loader: valid JSON, errors when unset/missing/invalid, unknown keys ignored."""
 
 import json
+import os
 import tempfile
 from pathlib import Path
 
@@ -134,3 +135,204 @@ def test_load_policy_config_unknown_top_level_keys_ignored(tmp_path: Path) -> No
     config = load_policy_config(path=str(path))
     assert config.sensitivity_keywords == ("internal", "confidential")
     assert config.default_provider == "local"
+
+
+def test_load_policy_config_without_rules_uses_default_pipeline(tmp_path: Path) -> None:
+    """No `rules` key → config.rules is None (engine uses the default pipeline)."""
+    path = tmp_path / "policies.json"
+    path.write_text(json.dumps(_valid_policy()), encoding="utf-8")
+    config = load_policy_config(path=str(path))
+    assert config.rules is None
+
+
+def test_load_policy_config_compiles_rules(tmp_path: Path) -> None:
+    """`rules` array is compiled at load time in declared order."""
+    policy = _valid_policy()
+    policy["rules"] = [
+        {"type": "cost"},
+        {"type": "time_of_day", "name": "nightly", "start": "22:00", "end": "06:00"},
+        {"type": "sensitivity"},
+    ]
+    path = tmp_path / "policies.json"
+    path.write_text(json.dumps(policy), encoding="utf-8")
+    config = load_policy_config(path=str(path))
+    assert config.rules is not None
+    assert [r.name for r in config.rules] == ["cost", "nightly", "sensitivity"]
+    assert [r.type_name for r in config.rules] == ["cost", "time_of_day", "sensitivity"]
+
+
+@pytest.mark.parametrize(
+    "rules",
+    [
+        {"type": "cost"},
+        [{"type": "no_such_rule"}],
+        [{"name": "missing-type"}],
+        [{"type": "cost"}, {"type": "cost"}],
+        [{"type": "header_match", "values": ["x"]}],
+        [{"type": "time_of_day", "start": "25:00", "end": "06:00"}],
+        [{"type": "model_allowlist", "models": ["a"], "route": "openai"}],
+        [{"type": "sensitivity", "keywords": ["typo"]}],
+    ],
+)
+def test_load_policy_config_invalid_rules_raise(tmp_path: Path, rules: object) -> None:
+    """Invalid `rules` (not an array, unknown type, bad or unexpected params, duplicates) → PolicyFileError."""
+    policy = _valid_policy()
+    policy["rules"] = rules
+    path = tmp_path / "policies.json"
+    path.write_text(json.dumps(policy), encoding="utf-8")
+    with pytest.raises(PolicyFileError) as exc_info:
+        load_policy_config(path=str(path))
+    assert "rules" in str(exc_info.value)
+
+
+def test_load_policy_config_compiles_detectors(tmp_path: Path) -> None:
+    """sensitivity.detectors (+ suffixes, budget) compiles into a DetectorScanner."""
+    policy = _valid_policy()
+    policy["sensitivity"]["detectors"] = ["email", "internal_hostname"]
+    policy["sensitivity"]["internal_host_suffixes"] = [".corp.example"]
+    policy["sensitivity"]["detector_cpu_budget_ms"] = 20
+    path = tmp_path / "policies.json"
+    path.write_text(json.dumps(policy), encoding="utf-8")
+    config = load_policy_config(path=str(path))
+    assert config.sensitivity_detectors is not None
+    assert config.sensitivity_detectors.detectors == ("email", "internal_hostname")
+    assert config.sensitivity_detectors.cpu_budget_ms == 20.0
+
+
+def test_load_policy_config_invalid_detectors_raise(tmp_path: Path) -> None:
+    """Unknown detector class → PolicyFileError."""
+    policy = _valid_policy()
+    policy["sensitivity"]["detectors"] = ["email", "ssn"]
+    path = tmp_path / "policies.json"
+    path.write_text(json.dumps(policy), encoding="utf-8")
+    with pytest.raises(PolicyFileError) as exc_info:
+        load_policy_config(path=str(path))
+    assert "detectors" in str(exc_info.value)
+
+
+def test_load_policy_config_decision_scope(tmp_path: Path) -> None:
+    """decision_scope defaults to last_user; conversation is accepted; other values are errors."""
+    policy = _valid_policy()
+    path = tmp_path / "policies.json"
+    path.write_text(json.dumps(policy), encoding="utf-8")
+    assert load_policy_config(path=str(path)).decision_scope == "last_user"
+    policy["decision_scope"] = "Conversation"
+    path.write_text(json.dumps(policy), encoding="utf-8")
+    assert load_policy_config(path=str(path)).decision_scope == "conversation"
+    policy["decision_scope"] = "all"
+    path.write_text(json.dumps(policy), encoding="utf-8")
+    with pytest.raises(PolicyFileError) as exc_info:
+        load_policy_config(path=str(path))
+    assert "decision_scope" in str(exc_info.value)
+
+
+def test_load_policy_config_keyword_index_relative_to_policy_file(tmp_path: Path) -> None:
+    """sensitivity.keyword_index resolves relative to the policy file and is memory-mapped."""
+    from app.decision.keyword_index import build_keyword_index
+
+    build_keyword_index(["Bluefalcon", "Project Night Owl"], str(tmp_path / "terms.kwidx"))
+    policy = _valid_policy()
+    policy["sensitivity"]["keyword_index"] = "terms.kwidx"
+    path = tmp_path / "policies.json"
+    path.write_text(json.dumps(policy), encoding="utf-8")
+    config = load_policy_config(path=str(path))
+    assert config.sensitivity_keyword_index is not None
+    assert config.sensitivity_keyword_index.term_count == 2
+
+
+@pytest.mark.parametrize("ref", ["missing.kwidx", "", 42])
+def test_load_policy_config_invalid_keyword_index_raises(tmp_path: Path, ref: object) -> None:
+    """Missing index file or a non-string reference → PolicyFileError."""
+    policy = _valid_policy()
+    policy["sensitivity"]["keyword_index"] = ref
+    path = tmp_path / "policies.json"
+    path.write_text(json.dumps(policy), encoding="utf-8")
+    with pytest.raises(PolicyFileError) as exc_info:
+        load_policy_config(path=str(path))
+    assert "keyword_index" in str(exc_info.value)
+
+
+def test_load_policy_config_generation_tracks_content(tmp_path: Path) -> None:
+    """The policy generation is stable for identical content and changes when the file changes."""
+    path = tmp_path / "policies.json"
+    path.write_text(json.dumps(_valid_policy()), encoding="utf-8")
+    first = load_policy_config(path=str(path)).generation
+    assert first and load_policy_config(path=str(path)).generation == first
+    policy = _valid_policy()
+    policy["sensitivity"]["keywords"] = ["other"]
+    path.write_text(json.dumps(policy), encoding="utf-8")
+    assert load_policy_config(path=str(path)).generation != first
+
+
+def test_get_policy_config_reuses_compiled_policy_until_a_file_changes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """POLICY_FILE is compiled once; editing the policy or rebuilding its keyword index reloads it."""
+    from app.core.config import get_policy_config
+    from app.decision.keyword_index import build_keyword_index
+
+    index_path = tmp_path / "terms.kwidx"
+    build_keyword_index(["bluefalcon"], str(index_path))
+    policy = _valid_policy()
+    policy["sensitivity"]["keyword_index"] = "terms.kwidx"
+    path = tmp_path / "policies.json"
+    path.write_text(json.dumps(policy), encoding="utf-8")
+    monkeypatch.setenv("POLICY_FILE", str(path))
+    first = get_policy_config()
+    assert get_policy_config() is first
+
+    policy["sensitivity"]["keywords"] = ["other"]
+    path.write_text(json.dumps(policy), encoding="utf-8")
+    os.utime(path, ns=(1, 1))
+    edited = get_policy_config()
+    assert edited is not first and edited.sensitivity_keywords == ("other",)
+    assert get_policy_config() is edited
+
+    build_keyword_index(["bluefalcon", "night owl"], str(index_path))
+    rebuilt = get_policy_config()
+    assert rebuilt is not edited and rebuilt.sensitivity_keyword_index.term_count == 2
+
+
+def test_load_policy_config_pricing_and_tokenizer(tmp_path: Path) -> None:
+    """cost.pricing, cost.tokenizer, and cost.expected_output_tokens are compiled into PolicyConfig."""
+    policy = _valid_policy()
+    policy["cost"]["pricing"] = {"openai": {"default": {"input_usd_per_1m_tokens": 0.5}}}
+    policy["cost"]["tokenizer"] = "bpe_estimate"
+    policy["cost"]["expected_output_tokens"] = 200
+    path = tmp_path / "policies.json"
+    path.write_text(json.dumps(policy), encoding="utf-8")
+    config = load_policy_config(path=str(path))
+    assert config.pricing is not None
+    assert config.pricing.model_keys() == ["openai/default"]
+    assert config.cost_tokenizer == "bpe_estimate"
+    assert config.cost_expected_output_tokens == 200
+
+
+@pytest.mark.parametrize(
+    ("key", "value"),
+    [("tokenizer", "tiktoken"), ("pricing", {"openai": {"m": {}}})],
+)
+def test_load_policy_config_invalid_cost_pricing_raises(tmp_path: Path, key: str, value: object) -> None:
+    """Unknown tokenizer or invalid pricing table → PolicyFileError."""
+    policy = _valid_policy()
+    policy["cost"][key] = value
+    path = tmp_path / "policies.json"
+    path.write_text(json.dumps(policy), encoding="utf-8")
+    with pytest.raises(PolicyFileError) as exc_info:
+        load_policy_config(path=str(path))
+    assert f"cost.{key}" in str(exc_info.value)
+
+
+def test_load_policy_config_local_fallbacks(tmp_path: Path) -> None:
+    """local_fallbacks is compiled into PolicyConfig; invalid input → PolicyFileError."""
+    policy = _valid_policy()
+    policy["local_fallbacks"] = {"models": {"llama3:70b": "llama3:8b"}, "queue_depth": 4}
+    path = tmp_path / "policies.json"
+    path.write_text(json.dumps(policy), encoding="utf-8")
+    assert load_policy_config(path=str(path)).local_fallbacks.fallback_for("llama3:70b") == "llama3:8b"
+
+    policy["local_fallbacks"] = {"models": {}, "queue_depth": 4}
+    path.write_text(json.dumps(policy), encoding="utf-8")
+    with pytest.raises(PolicyFileError) as exc_info:
+        load_policy_config(path=str(path))
+    assert "local_fallbacks" in str(exc_info.value)
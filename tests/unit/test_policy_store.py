@@ -0,0 +1,115 @@
+"""Unit tests for POLICY_DIR per-tenant policies: lookup, fallback, copy-on-write reload, sharing."""
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from app.core.config import get_policy_config
+from app.core.policy_file import PolicyFileError
+from app.core.policy_store import PolicyStore
+
+
+def _policy(keywords: list[str], max_length: int = 1000) -> dict:
+    return {
+        "sensitivity": {"keywords": keywords},
+        "cost": {"max_prompt_length_for_local": max_length, "default_provider": "local"},
+    }
+
+
+def _write(directory: Path, name: str, policy: dict | str, bump: int = 0) -> Path:
+    path = directory / f"{name}.json"
+    path.write_text(policy if isinstance(policy, str) else json.dumps(policy), encoding="utf-8")
+    if bump:
+        # Make the change visible even on filesystems with coarse mtimes.
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + bump))
+    return path
+
+
+@pytest.fixture
+def policy_dir(tmp_path: Path) -> Path:
+    """A policy directory of its own (the shared tmp_path also holds the conftest POLICY_FILE)."""
+    directory = tmp_path / "policies.d"
+    directory.mkdir()
+    return directory
+
+
+def test_tenant_policy_and_default_fallback(policy_dir: Path) -> None:
+    """Tenants with a file get it; unknown tenants and None get default.json."""
+    _write(policy_dir, "default", _policy(["internal"]))
+    _write(policy_dir, "acme", _policy(["acme-secret"]))
+    store = PolicyStore(str(policy_dir), reload_seconds=3600)
+    assert store.get("acme").sensitivity_keywords == ("acme-secret",)
+    assert store.get("globex").sensitivity_keywords == ("internal",)
+    assert store.get(None).sensitivity_keywords == ("internal",)
+    assert store.index.tenants() == ["acme"]
+
+
+def test_non_tenant_files_are_ignored(policy_dir: Path) -> None:
+    """Only <tenant>.json with a valid lowercase tenant id is indexed."""
+    _write(policy_dir, "default", _policy([]))
+    _write(policy_dir, "Acme", _policy([]))
+    (policy_dir / "notes.txt").write_text("x", encoding="utf-8")
+    store = PolicyStore(str(policy_dir), reload_seconds=3600)
+    assert store.index.tenants() == []
+
+
+def test_reload_recompiles_only_changed_files(policy_dir: Path) -> None:
+    """A changed tenant file is recompiled; unchanged policies keep the same objects."""
+    _write(policy_dir, "default", _policy(["internal"]))
+    _write(policy_dir, "acme", _policy(["a"]))
+    store = PolicyStore(str(policy_dir), reload_seconds=0)
+    default_before = store.get(None)
+    old_index = store.index
+    _write(policy_dir, "acme", _policy(["b"]), bump=10_000_000)
+    assert store.get("acme").sensitivity_keywords == ("b",)
+    assert store.get(None) is default_before
+    assert store.index is not old_index
+    assert old_index.get("acme").sensitivity_keywords == ("a",)
+
+
+def test_invalid_reload_keeps_last_good_policy(policy_dir: Path) -> None:
+    """A broken edit keeps serving the previous version of that tenant's policy."""
+    _write(policy_dir, "default", _policy([]))
+    _write(policy_dir, "acme", _policy(["a"]))
+    store = PolicyStore(str(policy_dir), reload_seconds=0)
+    _write(policy_dir, "acme", "{not json", bump=10_000_000)
+    assert store.get("acme").sensitivity_keywords == ("a",)
+
+
+def test_invalid_new_tenant_fails_only_that_tenant(policy_dir: Path) -> None:
+    """A tenant file that never compiled raises for that tenant; others are unaffected."""
+    _write(policy_dir, "default", _policy([]))
+    _write(policy_dir, "acme", {"cost": {}})
+    store = PolicyStore(str(policy_dir), reload_seconds=3600)
+    with pytest.raises(PolicyFileError):
+        store.get("acme")
+    assert store.get("globex").sensitivity_keywords == ()
+
+
+def test_missing_default_raises_for_unknown_tenants(policy_dir: Path) -> None:
+    """Without default.json only tenants with their own file resolve."""
+    _write(policy_dir, "acme", _policy([]))
+    store = PolicyStore(str(policy_dir), reload_seconds=3600)
+    store.get("acme")
+    with pytest.raises(PolicyFileError):
+        store.get("globex")
+
+
+def test_identical_keyword_sets_share_memory(policy_dir: Path) -> None:
+    """Tenants with the same keyword list share one keyword tuple."""
+    _write(policy_dir, "default", _policy(["x", "y"]))
+    _write(policy_dir, "acme", _policy(["x", "y"], max_length=10))
+    store = PolicyStore(str(policy_dir), reload_seconds=3600)
+    assert store.get("acme").sensitivity_keywords is store.get(None).sensitivity_keywords
+
+
+def test_get_policy_config_uses_policy_dir(monkeypatch: pytest.MonkeyPatch, policy_dir: Path) -> None:
+    """POLICY_DIR takes precedence over POLICY_FILE and selects by tenant."""
+    _write(policy_dir, "default", _policy([]))
+    _write(policy_dir, "acme", _policy(["acme-only"]))
+    monkeypatch.setenv("POLICY_DIR", str(policy_dir))
+    assert get_policy_config("acme").sensitivity_keywords == ("acme-only",)
+    assert get_policy_config().sensitivity_keywords == ()
@@ -0,0 +1,122 @@
+"""Unit tests for per-model pricing, the offline token estimator, and the USD cost rule."""
+
+import pytest
+
+from app.core.config import PolicyConfig
+from app.decision.engine import decide
+from app.decision.pricing import ModelPrice, PricingConfigError, compile_pricing
+from app.decision.reason_codes import COST_PREFER_LOCAL, DEFAULT
+from app.decision.tokens import estimate_tokens, estimate_tokens_bpe
+
+PRICING = {
+    "openai": {
+        "cheap-model": {"input_usd_per_1m_tokens": 0.1, "output_usd_per_1m_tokens": 0.4},
+        "big-model": {"input_usd_per_1m_tokens": 10.0, "output_usd_per_1m_tokens": 30.0},
+        "default": {"input_usd_per_1m_tokens": 2.0},
+    },
+    "anthropic": {"big-model": {"input_usd_per_1m_tokens": 20.0}},
+}
+
+
+def _config(**kwargs) -> PolicyConfig:
+    values = dict(
+        sensitivity_keywords=(),
+        cost_max_prompt_length_for_local=0,
+        default_provider="public",
+        cost_max_usd_for_local=0.001,
+        llm_input_usd_per_1m_tokens=None,
+        cost_chars_per_token=4,
+        pricing=compile_pricing(PRICING),
+    )
+    values.update(kwargs)
+    return PolicyConfig(**values)
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("", 0),
+        ("hello world, this is 12345 tokens", 9),
+        ("The quick brown fox jumps over the lazy dog.", 10),
+        ("internationalization", 3),
+    ],
+)
+def test_bpe_estimate_counts(text: str, expected: int) -> None:
+    """Pre-tokenizer estimator: words, digit groups, and punctuation counted like BPE pieces."""
+    assert estimate_tokens_bpe(text) == expected
+
+
+def test_estimate_tokens_dispatches_on_tokenizer() -> None:
+    """heuristic divides total chars; bpe_estimate sums per-text estimates."""
+    texts = ("hello world", "again")
+    assert estimate_tokens(texts, "heuristic", 4) == 16 / 4
+    assert estimate_tokens(texts, "bpe_estimate", 4) == 3.0
+
+
+def test_pricing_lookup_falls_back_to_provider_default() -> None:
+    """Listed model → its price; unlisted or missing model → provider "default"; unknown provider → None."""
+    table = compile_pricing(PRICING)
+    assert table.lookup("openai", "big-model") == ModelPrice(10.0, 30.0)
+    assert table.lookup("openai", "other") == ModelPrice(2.0)
+    assert table.lookup("openai", None) == ModelPrice(2.0)
+    assert table.lookup("anthropic", "other") is None
+    assert "openai/cheap-model" in table.model_keys()
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        [],
+        {"azure": {}},
+        {"openai": {"m": {"output_usd_per_1m_tokens": 1.0}}},
+        {"openai": {"m": {"input_usd_per_1m_tokens": -1}}},
+        {"openai": {"m": {"input_usd_per_1m_tokens": 1, "cached": 0.5}}},
+    ],
+)
+def test_compile_pricing_rejects_invalid_tables(raw: object) -> None:
+    """Unknown providers, missing/negative rates, and unknown fields are errors."""
+    with pytest.raises(PricingConfigError):
+        compile_pricing(raw)
+
+
+def test_cost_rule_prices_the_requested_model() -> None:
+    """Same prompt: cheap model stays under the USD threshold, the expensive one does not."""
+    prompt = "word " * 400  # ~400 tokens
+    config = _config()
+    cheap = decide(prompt, len(prompt), config, model="cheap-model")
+    big = decide(prompt, len(prompt), config, model="big-model")
+    assert cheap["reason_codes"] == [COST_PREFER_LOCAL]
+    assert big["reason_codes"] == [DEFAULT]
+
+
+def test_cost_rule_includes_expected_output_tokens() -> None:
+    """Output rate × expected_output_tokens is added to the estimate."""
+    prompt = "hi"
+    config = _config(cost_expected_output_tokens=5000)
+    assert decide(prompt, 2, config, model="cheap-model")["reason_codes"] == [DEFAULT]
+    config = _config(cost_expected_output_tokens=100)
+    assert decide(prompt, 2, config, model="cheap-model")["reason_codes"] == [COST_PREFER_LOCAL]
+
+
+def test_cost_rule_uses_target_provider_from_public_url(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The price comes from the public provider the request would go to."""
+    prompt = "word " * 60
+    config = _config(cost_max_usd_for_local=0.001)
+    monkeypatch.setenv("PUBLIC_LLM_URL", "https://api.openai.com")
+    assert decide(prompt, len(prompt), config, model="big-model")["reason_codes"] == [COST_PREFER_LOCAL]
+    monkeypatch.setenv("PUBLIC_LLM_URL", "https://api.anthropic.com")
+    assert decide(prompt, len(prompt), config, model="big-model")["reason_codes"] == [DEFAULT]
+
+
+def test_cost_rule_bpe_estimate_uses_prompt_text() -> None:
+    """With tokenizer bpe_estimate, tokens come from the text rather than prompt_length / chars."""
+    prompt = "a b c d e f g h"  # 15 chars, 8 tokens
+    config = _config(pricing=None, llm_input_usd_per_1m_tokens=100.0, cost_max_usd_for_local=0.0005)
+    assert decide(prompt, len(prompt), config)["reason_codes"] == [COST_PREFER_LOCAL]
+    config = _config(
+        pricing=None,
+        llm_input_usd_per_1m_tokens=100.0,
+        cost_max_usd_for_local=0.0005,
+        cost_tokenizer="bpe_estimate",
+    )
+    assert decide(prompt, len(prompt), config)["reason_codes"] == [DEFAULT]
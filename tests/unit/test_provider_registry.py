@@ -0,0 +1,187 @@
+"""Unit tests for the provider registry and shared transport: backend config, dispatch, status mapping, retries."""
+
+from unittest.mock import patch
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import PoolSettings, get_provider_backends, get_provider_pool, get_public_provider
+from app.decision.pricing import PricingConfigError, compile_pricing
+from app.main import app
+from app.providers import registry
+from app.providers.base import FAILURE_AUTH_ERROR, FAILURE_CLIENT_ERROR, FAILURE_SERVER_ERROR, FAILURE_UNKNOWN
+from app.providers.transport import connect_retries, send
+
+_REAL_CLIENT = httpx.Client
+_OPENAI_REPLY = {"model": "m", "choices": [{"message": {"content": "ok"}}]}
+
+
+def _upstream(handler) -> tuple[patch, list]:
+    """Patch pooled client creation onto a MockTransport; returns the patch and the pools it was asked for."""
+    pools: list = []
+
+    def fake_client(timeout, pool):
+        pools.append(pool)
+        return _REAL_CLIENT(transport=httpx.MockTransport(handler), timeout=timeout)
+
+    return patch("app.providers.transport.provider_client", fake_client), pools
+
+
+def test_backends_from_env_extend_and_override_builtins(monkeypatch: pytest.MonkeyPatch) -> None:
+    """PROVIDER_BACKENDS adds backends and can switch a built-in's kind; bad entries are ignored."""
+    monkeypatch.setenv("PROVIDER_BACKENDS", "vllm=openai, Claude_EU=anthropic,local=openai,bad=grpc,no-dash=openai")
+    assert get_provider_backends() == {
+        "local": "openai",
+        "openai": "openai",
+        "anthropic": "anthropic",
+        "vllm": "openai",
+        "claude_eu": "anthropic",
+    }
+
+
+def test_public_provider_names_a_configured_backend(monkeypatch: pytest.MonkeyPatch) -> None:
+    """PUBLIC_PROVIDER picks the public backend; unknown names and local fall back to PUBLIC_LLM_URL."""
+    monkeypatch.setenv("PROVIDER_BACKENDS", "vllm=openai")
+    monkeypatch.setenv("PUBLIC_LLM_URL", "https://api.anthropic.com")
+    monkeypatch.setenv("PUBLIC_PROVIDER", "vllm")
+    assert get_public_provider() == "vllm"
+    for name in ("missing", "local"):
+        monkeypatch.setenv("PUBLIC_PROVIDER", name)
+        assert get_public_provider() == "anthropic"
+
+
+def test_pool_settings_from_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    """PROVIDER_POOL_<NAME> overrides pool limits; invalid values keep the defaults."""
+    monkeypatch.setenv("PROVIDER_POOL_VLLM", "max_connections=8,max_keepalive=0,keepalive_expiry=30,other=1")
+    assert get_provider_pool("vllm") == PoolSettings(max_connections=8, max_keepalive=20, keepalive_expiry=30.0)
+    assert get_provider_pool("openai") == PoolSettings(max_connections=100, max_keepalive=20, keepalive_expiry=5.0)
+
+
+def test_two_openai_kind_backends_use_their_own_url_key_and_pool(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Backends of one kind are configured side by side; each call goes to its own URL with its own key and pool."""
+    monkeypatch.setenv("PROVIDER_BACKENDS", "vllm=openai,llamacpp=openai")
+    monkeypatch.setenv("PROVIDER_URL_VLLM", "http://vllm:8000")
+    monkeypatch.setenv("PROVIDER_API_KEY_VLLM", "vllm-key")
+    monkeypatch.setenv("PROVIDER_URL_LLAMACPP", "http://llamacpp:8080")
+    monkeypatch.setenv("PROVIDER_POOL_LLAMACPP", "max_connections=4")
+    monkeypatch.setenv("PUBLIC_LLM_API_KEY", "public-key")
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append((str(request.url), request.headers.get("authorization")))
+        return httpx.Response(200, json=_OPENAI_REPLY)
+
+    upstream, pools = _upstream(handler)
+    with upstream:
+        for provider in ("vllm", "llamacpp", "vllm"):
+            assert registry.chat(provider, [{"role": "user", "content": "Hi"}], timeout=5.0)["success"] is True
+    assert seen == [
+        ("http://vllm:8000/v1/chat/completions", "Bearer vllm-key"),
+        ("http://llamacpp:8080/v1/chat/completions", None),  # no fallback to PUBLIC_LLM_API_KEY
+        ("http://vllm:8000/v1/chat/completions", "Bearer vllm-key"),
+    ]
+    assert [p.max_connections for p in pools] == [100, 4]  # one pooled client per backend
+
+
+def test_added_anthropic_backend_without_key_is_auth_error(monkeypatch: pytest.MonkeyPatch) -> None:
+    """An added Anthropic backend does not borrow PUBLIC_LLM_API_KEY; the failure names its own key variable."""
+    monkeypatch.setenv("PROVIDER_BACKENDS", "claude_eu=anthropic")
+    monkeypatch.setenv("PUBLIC_LLM_API_KEY", "public-key")
+    result = registry.chat("claude_eu", [{"role": "user", "content": "Hi"}])
+    assert result["failure_category"] == FAILURE_AUTH_ERROR
+    assert result["message"] == "PROVIDER_API_KEY_CLAUDE_EU not set"
+
+
+def test_unknown_provider_is_a_failure() -> None:
+    """Dispatch to a name that is not configured fails without a request."""
+    result = registry.chat("nowhere", [{"role": "user", "content": "Hi"}])
+    assert result["success"] is False and result["failure_category"] == FAILURE_UNKNOWN
+
+
+@pytest.mark.parametrize(
+    "status, category, message",
+    [
+        (401, FAILURE_AUTH_ERROR, "Unauthorized"),
+        (404, FAILURE_CLIENT_ERROR, "not found"),
+        (503, FAILURE_SERVER_ERROR, "not found"),
+        (204, FAILURE_UNKNOWN, "not found"),
+    ],
+)
+def test_send_maps_status_to_failure_category(status: int, category: str, message: str) -> None:
+    """Every adapter shares one status → failure_category mapping."""
+    transport = httpx.MockTransport(lambda r: httpx.Response(status, text="not found"))
+    with _REAL_CLIENT(transport=transport) as client:
+        result = send(client, "http://fake/", {}, None, httpx.Timeout(5.0), lambda data: {"success": True, "content": ""})
+    assert result["failure_category"] == category
+    assert result["message"] == message
+
+
+def test_connect_retries_only_retry_unsent_requests() -> None:
+    """Connect errors are retried up to the limit; a read timeout (request sent) is not."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(1)
+        if len(calls) < 3:
+            raise httpx.ConnectError("refused", request=request)
+        return httpx.Response(200, json={})
+
+    parse = lambda data: {"success": True, "content": "ok"}  # noqa: E731
+    with (
+        patch("app.providers.transport.time.sleep") as mock_sleep,
+        _REAL_CLIENT(transport=httpx.MockTransport(handler)) as client,
+    ):
+        assert send(client, "http://fake/", {}, None, httpx.Timeout(5.0), parse, retry=connect_retries(2))["success"]
+        calls.clear()
+        assert not send(client, "http://fake/", {}, None, httpx.Timeout(5.0), parse, retry=connect_retries(1))["success"]
+    assert len(calls) == 2
+    assert [c.args[0] for c in mock_sleep.call_args_list] == [0.1, 0.2, 0.1]
+
+    def read_timeout(request: httpx.Request) -> httpx.Response:
+        calls.append(1)
+        raise httpx.ReadTimeout("slow", request=request)
+
+    calls.clear()
+    with _REAL_CLIENT(transport=httpx.MockTransport(read_timeout)) as client:
+        send(client, "http://fake/", {}, None, httpx.Timeout(5.0), parse, retry=connect_retries(3))
+    assert len(calls) == 1
+    assert connect_retries(0) is None
+
+
+def test_pricing_accepts_added_public_backends(monkeypatch: pytest.MonkeyPatch) -> None:
+    """cost.pricing may price any configured public backend, but not local or unknown names."""
+    monkeypatch.setenv("PROVIDER_BACKENDS", "vllm=openai")
+    table = compile_pricing({"vllm": {"default": {"input_usd_per_1m_tokens": 0.1}}})
+    assert table is not None and table.lookup("vllm", None) is not None
+    for name in ("local", "other"):
+        with pytest.raises(PricingConfigError):
+            compile_pricing({name: {"default": {"input_usd_per_1m_tokens": 0.1}}})
+
+
+def test_chat_routes_public_to_the_configured_public_provider(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """/v1/chat with a public route reaches the PUBLIC_PROVIDER backend at its own URL."""
+    import json
+
+    from tests.conftest import DEFAULT_POLICY_JSON
+
+    policy = json.loads(DEFAULT_POLICY_JSON)
+    policy["cost"]["max_prompt_length_for_local"] = 0
+    policy["cost"]["default_provider"] = "public"
+    (tmp_path / "public.json").write_text(json.dumps(policy), encoding="utf-8")
+    monkeypatch.setenv("POLICY_FILE", str(tmp_path / "public.json"))
+    monkeypatch.setenv("PROVIDER_BACKENDS", "vllm=openai")
+    monkeypatch.setenv("PROVIDER_URL_VLLM", "http://vllm:8000")
+    monkeypatch.setenv("PUBLIC_PROVIDER", "vllm")
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(str(request.url))
+        return httpx.Response(200, json=_OPENAI_REPLY)
+
+    upstream, _ = _upstream(handler)
+    with upstream, patch("app.services.chat_orchestrator.persist_audit_event"):
+        response = TestClient(app).post("/v1/chat", json={"messages": [{"role": "user", "content": "Hi"}]})
+    assert response.status_code == 200
+    assert response.json()["provider"] == "vllm"
+    assert seen == ["http://vllm:8000/v1/chat/completions"]
@@ -0,0 +1,162 @@
+"""Unit tests for candidate policy rollout: config, canary bucketing, shadow evaluation."""
+
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from app.core.policy_file import PolicyFileError, load_policy_config
+from app.decision.rollout import Rollout, RolloutConfigError, parse_rollout
+from app.services.shadow import evaluate_shadow
+from tests.conftest import DEFAULT_POLICY_JSON
+
+
+def _write_policies(tmp_path: Path, rollout: dict, candidate: dict | None = None) -> Path:
+    active = json.loads(DEFAULT_POLICY_JSON)
+    active["rollout"] = rollout
+    if candidate is None:
+        candidate = json.loads(DEFAULT_POLICY_JSON)
+        candidate["cost"]["default_provider"] = "public"
+        candidate["rules"] = []
+    (tmp_path / "candidate.json").write_text(json.dumps(candidate), encoding="utf-8")
+    path = tmp_path / "active.json"
+    path.write_text(json.dumps(active), encoding="utf-8")
+    return path
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        [],
+        {"mode": "shadow"},
+        {"candidate": "c.json", "mode": "blue_green"},
+        {"candidate": "c.json", "canary_percent": 150},
+        {"candidate": "c.json", "canary_key": "ip"},
+        {"candidate": "c.json", "shadow_sample_rate": 2},
+        {"candidate": "c.json", "extra": 1},
+    ],
+)
+def test_parse_rollout_rejects_invalid(raw: object) -> None:
+    """Invalid rollout objects are rejected with RolloutConfigError."""
+    with pytest.raises(RolloutConfigError):
+        parse_rollout(raw)
+
+
+def test_policy_loads_candidate_relative_to_policy_file(tmp_path: Path) -> None:
+    """The candidate path resolves next to the policy file and is compiled with it."""
+    config = load_policy_config(str(_write_policies(tmp_path, {"candidate": "candidate.json"})))
+    assert config.rollout is not None
+    assert config.rollout.mode == "shadow"
+    assert config.rollout.candidate.default_provider == "public"
+
+
+def test_candidate_may_not_declare_rollout(tmp_path: Path) -> None:
+    """Nested rollouts are rejected."""
+    candidate = json.loads(DEFAULT_POLICY_JSON)
+    candidate["rollout"] = {"candidate": "x.json"}
+    with pytest.raises(PolicyFileError, match="rollout.candidate"):
+        load_policy_config(str(_write_policies(tmp_path, {"candidate": "candidate.json"}, candidate)))
+
+
+def test_missing_candidate_invalidates_policy(tmp_path: Path) -> None:
+    """A candidate path that does not exist makes the policy invalid."""
+    path = _write_policies(tmp_path, {"candidate": "nope.json"})
+    with pytest.raises(PolicyFileError, match="rollout.candidate"):
+        load_policy_config(str(path))
+
+
+def _rollout(tmp_path: Path, **settings) -> Rollout:
+    config = load_policy_config(str(_write_policies(tmp_path, {"candidate": "candidate.json", **settings})))
+    assert config.rollout is not None
+    return config.rollout
+
+
+def test_canary_share_is_deterministic_and_close_to_percent(tmp_path: Path) -> None:
+    """The same request id always lands in the same variant; the share tracks canary_percent."""
+    rollout = _rollout(tmp_path, mode="canary", canary_percent=10)
+    ids = [f"req-{i}" for i in range(5000)]
+    first = [rollout.in_canary(i, None) for i in ids]
+    assert first == [rollout.in_canary(i, None) for i in ids]
+    assert 0.08 < sum(first) / len(ids) < 0.12
+
+
+def test_canary_by_tenant_keeps_a_tenant_together(tmp_path: Path) -> None:
+    """With canary_key tenant, every request of a tenant gets the same variant."""
+    rollout = _rollout(tmp_path, mode="canary", canary_percent=50, canary_key="tenant")
+    assert len({rollout.in_canary(f"req-{i}", "acme") for i in range(50)}) == 1
+
+
+def test_shadow_mode_never_routes_canary(tmp_path: Path) -> None:
+    """Shadow rollouts do not change routing even with canary_percent set."""
+    rollout = _rollout(tmp_path, mode="shadow", canary_percent=100)
+    assert not rollout.in_canary("req-1", None)
+
+
+def test_evaluate_shadow_counts_match(tmp_path: Path) -> None:
+    """Same provider and reason codes → match; nothing written to audit."""
+    rollout = _rollout(tmp_path)
+    active = {"provider": "openai", "reason_codes": ["default"]}
+    with (
+        patch("app.services.shadow.set_shadow_decision") as mock_set,
+        patch("app.decision.engine.get_public_provider", return_value="openai"),
+    ):
+        result = evaluate_shadow(rollout, "req-1", active, {"prompt_text": "hi", "prompt_length": 2})
+    assert result == "match"
+    mock_set.assert_not_called()
+
+
+def test_evaluate_shadow_records_sampled_divergence(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A divergence is written onto the audit event as shadow_decision."""
+    monkeypatch.setenv("DATABASE_URL", "postgresql+psycopg://u:p@localhost/db")
+    monkeypatch.setenv("AUDIT_ENABLED", "true")
+    rollout = _rollout(tmp_path, shadow_sample_rate=1)
+    active = {"provider": "local", "reason_codes": ["cost_prefer_local"]}
+    with (
+        patch("app.services.shadow.set_shadow_decision") as mock_set,
+        patch("app.decision.engine.get_public_provider", return_value="openai"),
+    ):
+        result = evaluate_shadow(rollout, "req-1", active, {"prompt_text": "hi", "prompt_length": 2})
+    assert result == "diverge"
+    mock_set.assert_called_once_with("req-1", "provider=openai,reason_codes=default")
+
+
+def test_evaluate_shadow_skips_audit_when_not_sampled(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """shadow_sample_rate 0 counts divergences without writing them."""
+    monkeypatch.setenv("DATABASE_URL", "postgresql+psycopg://u:p@localhost/db")
+    monkeypatch.setenv("AUDIT_ENABLED", "true")
+    rollout = _rollout(tmp_path, shadow_sample_rate=0)
+    active = {"provider": "local", "reason_codes": ["cost_prefer_local"]}
+    with patch("app.services.shadow.set_shadow_decision") as mock_set:
+        assert evaluate_shadow(rollout, "req-1", active, {"prompt_text": "hi", "prompt_length": 2}) == "diverge"
+    mock_set.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "rules",
+    [[{"type": "sensitivity"}, {"type": "cost"}], [{"type": "budget", "limit_usd": 10}, {"type": "cost"}]],
+)
+def test_evaluate_shadow_leaves_live_metrics_and_cache_alone(tmp_path: Path, rules: list) -> None:
+    """Shadow decisions neither use the decision cache nor record rule, cache or budget metrics."""
+    from app.decision.cache import decision_cache
+
+    candidate = json.loads(DEFAULT_POLICY_JSON)
+    candidate["rules"] = rules
+    path = _write_policies(tmp_path, {"candidate": "candidate.json"}, candidate)
+    rollout = load_policy_config(str(path)).rollout
+    active = {"provider": "local", "reason_codes": ["cost_prefer_local"]}
+    kwargs = {"prompt_text": "hi", "prompt_length": 2, "prompt_hash": "ab" * 32}
+    with (
+        patch("app.decision.engine.record_rule_evaluation") as mock_rules,
+        patch("app.decision.engine.record_decision_cache") as mock_cache,
+        patch("app.decision.rules.record_budget_remaining") as mock_budget,
+    ):
+        assert evaluate_shadow(rollout, "req-1", active, kwargs) == "match"
+    mock_rules.assert_not_called()
+    mock_cache.assert_not_called()
+    mock_budget.assert_not_called()
+    assert len(decision_cache) == 0
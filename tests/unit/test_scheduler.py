@@ -0,0 +1,156 @@
+"""Unit tests for the provider scheduler: priority classes, weighted fair share, slot limits."""
+
+import threading
+import time
+
+import pytest
+
+from app.services.scheduler import FairScheduler, SlotTimeout, resolve_priority, scheduler_for, tenant_weight
+
+
+def _enqueue(
+    scheduler: FairScheduler, tenant: str, priority: str, order: list, weight: float = 1.0
+) -> threading.Thread:
+    """Start a request that records (tenant, priority) once admitted; returns after it is queued."""
+    before = sum(scheduler.waiting().values())
+
+    def run() -> None:
+        with scheduler.slot(tenant, priority, weight):
+            order.append((tenant, priority))
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 2
+    while sum(scheduler.waiting().values()) == before and time.monotonic() < deadline:
+        time.sleep(0.001)
+    return thread
+
+
+def _drain(scheduler: FairScheduler, held, threads: list[threading.Thread]) -> None:
+    held.__exit__(None, None, None)
+    for thread in threads:
+        thread.join(timeout=2)
+
+
+def test_interactive_is_admitted_before_queued_batch() -> None:
+    """A freed slot goes to interactive even when batch requests queued first."""
+    scheduler = FairScheduler(1)
+    held = scheduler.slot("a", "batch")
+    held.__enter__()
+    order: list = []
+    threads = [_enqueue(scheduler, "a", "batch", order) for _ in range(3)]
+    threads.append(_enqueue(scheduler, "b", "interactive", order))
+    _drain(scheduler, held, threads)
+    assert order[0] == ("b", "interactive")
+    assert len(order) == 4
+
+
+def test_flooding_tenant_does_not_starve_another_tenant() -> None:
+    """Within a class, a tenant's late request goes ahead of another tenant's backlog."""
+    scheduler = FairScheduler(1)
+    held = scheduler.slot("flood", "batch")
+    held.__enter__()
+    order: list = []
+    threads = [_enqueue(scheduler, "flood", "batch", order) for _ in range(5)]
+    threads.append(_enqueue(scheduler, "quiet", "batch", order))
+    _drain(scheduler, held, threads)
+    assert order.index(("quiet", "batch")) <= 1
+
+
+def test_weights_split_admissions_proportionally() -> None:
+    """A tenant with weight 2 is admitted about twice as often while both are backlogged."""
+    scheduler = FairScheduler(1)
+    held = scheduler.slot("x", "batch")
+    held.__enter__()
+    order: list = []
+    threads = []
+    for _ in range(6):
+        threads.append(_enqueue(scheduler, "heavy", "batch", order, weight=2.0))
+        threads.append(_enqueue(scheduler, "light", "batch", order, weight=1.0))
+    _drain(scheduler, held, threads)
+    first_six = [tenant for tenant, _ in order[:6]]
+    assert first_six.count("heavy") == 4
+    assert first_six.count("light") == 2
+
+
+def test_slots_bound_concurrency_and_report_wait() -> None:
+    """With all slots taken the next request waits; the yielded value is the wait in seconds."""
+    scheduler = FairScheduler(2)
+    with scheduler.slot("a", "interactive") as first, scheduler.slot("a", "interactive"):
+        assert first < 0.1
+        waits: list[float] = []
+
+        def run() -> None:
+            with scheduler.slot("b", "interactive") as waited:
+                waits.append(waited)
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        time.sleep(0.05)
+        assert scheduler.waiting() == {"interactive": 1, "batch": 0}
+    thread.join(timeout=2)
+    assert waits and waits[0] >= 0.04
+
+
+def test_wait_gives_up_after_timeout_and_leaves_the_queue() -> None:
+    """A waiter past its limit raises SlotTimeout and is removed; the freed slot is not lost to it."""
+    scheduler = FairScheduler(1)
+    with scheduler.slot("a", "interactive"):
+        with pytest.raises(SlotTimeout) as exc:
+            with scheduler.slot("b", "interactive", timeout=0.05):
+                pass
+        assert exc.value.waited >= 0.04
+        assert scheduler.waiting() == {"interactive": 0, "batch": 0}
+    with scheduler.slot("c", "interactive", timeout=0) as waited:
+        assert waited < 0.05
+    assert scheduler._free == 1
+
+
+@pytest.mark.parametrize(
+    ("deadline_ms", "category", "phase"), [(None, "timeout", "pool"), (50, "deadline_exceeded", None)]
+)
+def test_call_gives_up_waiting_at_pool_timeout_or_deadline(
+    monkeypatch: pytest.MonkeyPatch, deadline_ms: int | None, category: str, phase: str | None
+) -> None:
+    """A queued call waits at most the pool timeout or its X-Deadline-Ms, whichever is sooner, and calls nothing."""
+    from unittest.mock import patch
+
+    from app.api.schemas.chat import ChatMessage, ChatRequest
+    from app.services.chat_orchestrator import call_provider, prepare_chat
+
+    monkeypatch.setenv("SCHEDULER_LOCAL_SLOTS", "1")
+    monkeypatch.setenv("PROVIDER_TIMEOUTS_LOCAL", "pool=0.1")
+    headers = {"x-deadline-ms": str(deadline_ms)} if deadline_ms is not None else {}
+    prepared = prepare_chat(ChatRequest(messages=[ChatMessage(role="user", content="Hi")]), headers)
+    assert prepared.provider == "local"
+    messages = [{"role": "user", "content": "Hi"}]
+    with scheduler_for("local").slot("other", "interactive"), patch("app.providers.ollama.chat") as mock_chat:
+        result, latency_ms, waited = call_provider(prepared, messages, None)
+    mock_chat.assert_not_called()
+    assert result["failure_category"] == category
+    assert result.get("timeout_phase") == phase
+    assert latency_ms == 0.0 and 0.02 <= waited < 1.0
+    assert scheduler_for("local").waiting() == {"interactive": 0, "batch": 0}
+
+
+def test_resolve_priority_header_then_tenant_then_default(monkeypatch: pytest.MonkeyPatch) -> None:
+    """X-Priority wins, then SCHEDULER_TENANT_PRIORITIES, then the endpoint default."""
+    monkeypatch.setenv("SCHEDULER_TENANT_PRIORITIES", "acme=batch")
+    assert resolve_priority({"X-Priority": "Interactive"}, "acme", "batch") == "interactive"
+    assert resolve_priority({"X-Priority": "urgent"}, "acme", "interactive") == "batch"
+    assert resolve_priority({}, "acme", "interactive") == "batch"
+    assert resolve_priority(None, "globex", "interactive") == "interactive"
+
+
+def test_scheduler_per_provider_uses_configured_slots_and_weights(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Local and public providers get their own slot counts; unknown tenants weigh 1."""
+    monkeypatch.setenv("SCHEDULER_LOCAL_SLOTS", "2")
+    monkeypatch.setenv("SCHEDULER_PUBLIC_SLOTS", "8")
+    monkeypatch.setenv("SCHEDULER_TENANT_WEIGHTS", "acme=4,bad=x,neg=-1")
+    assert scheduler_for("local").slots == 2
+    assert scheduler_for("openai").slots == 8
+    assert scheduler_for("local") is scheduler_for("local")
+    assert tenant_weight("acme") == 4.0
+    assert tenant_weight("bad") == 1.0
+    assert tenant_weight("neg") == 1.0
+    assert tenant_weight(None) == 1.0
@@ -0,0 +1,108 @@
+"""Unit tests for chat sessions: store scoping, claims, expiry, turns, and incremental decisions."""
+
+import pytest
+
+from app.core.config import DECISION_SCOPE_CONVERSATION, PolicyConfig
+from app.decision.engine import decide
+from app.services.sessions import SessionError, SessionStore, append_turn, check_size
+
+
+def _store(maxsize: int = 10, ttl: float = 60.0) -> SessionStore:
+    return SessionStore(maxsize, ttl)
+
+
+def test_start_then_claim_after_release() -> None:
+    """A started session is claimed by its first turn; the next turn claims it after release."""
+    store = _store()
+    session = store.start("acme", now=0.0)
+    with pytest.raises(SessionError) as exc_info:
+        store.claim(session.id, "acme", now=1.0)
+    assert exc_info.value.status_code == 409
+    store.release(session)
+    assert store.claim(session.id, "acme", now=2.0) is session
+
+
+def test_claim_is_scoped_by_tenant() -> None:
+    """Another tenant cannot continue a session, even with its id."""
+    store = _store()
+    session = store.start("acme", now=0.0)
+    store.release(session)
+    with pytest.raises(SessionError) as exc_info:
+        store.claim(session.id, "globex", now=1.0)
+    assert exc_info.value.status_code == 404
+
+
+def test_idle_sessions_expire_and_lru_is_bounded() -> None:
+    """Sessions expire after the idle TTL; past maxsize the least recently used is dropped."""
+    store = _store(maxsize=2, ttl=60.0)
+    first = store.start(None, now=0.0)
+    store.release(first)
+    with pytest.raises(SessionError):
+        store.claim(first.id, None, now=61.0)
+
+    a, b = store.start(None, now=100.0), store.start(None, now=101.0)
+    store.release(a)
+    store.release(b)
+    store.claim(a.id, None, now=102.0)
+    store.release(a)
+    store.start(None, now=103.0)
+    assert len(store) == 2
+    with pytest.raises(SessionError):
+        store.claim(b.id, None, now=104.0)
+
+
+def test_busy_sessions_are_never_evicted_or_purged() -> None:
+    """Past maxsize only idle sessions are dropped; with every session busy a new one gets 503."""
+    store = _store(maxsize=2, ttl=60.0)
+    busy, idle = store.start(None, now=0.0), store.start(None, now=1.0)
+    store.release(idle)
+    store.start(None, now=2.0)  # drops `idle`, not the older but busy session
+    with pytest.raises(SessionError) as exc_info:
+        store.claim(idle.id, None, now=3.0)
+    assert exc_info.value.status_code == 404
+    with pytest.raises(SessionError) as exc_info:
+        store.start(None, now=4.0)
+    assert exc_info.value.status_code == 503
+    assert len(store) == 2
+
+    with pytest.raises(SessionError) as exc_info:
+        store.claim(busy.id, None, now=100.0)  # past the TTL, but its turn is still running
+    assert exc_info.value.status_code == 409
+    store.release(busy)
+    with pytest.raises(SessionError) as exc_info:
+        store.claim(busy.id, None, now=101.0)  # idle and expired once its turn ends
+    assert exc_info.value.status_code == 404
+
+
+def test_append_turn_leaves_reply_unscanned() -> None:
+    """A turn adds the new messages and the reply; the reply is scanned with the next turn."""
+    session = _store().start(None, now=0.0)
+    append_turn(session, [{"role": "user", "content": "Hello"}], "Hi there", tokens=2.0)
+    assert session.messages[-1] == {"role": "assistant", "content": "Hi there"}
+    assert session.unscanned() == [{"role": "assistant", "content": "Hi there"}]
+    assert (session.chars, session.tokens, session.turns) == (13, 2.0, 1)
+
+
+def test_check_size_rejects_history_past_limit(monkeypatch) -> None:
+    """New messages that push the history past SESSION_MAX_CHARS → 413."""
+    monkeypatch.setenv("SESSION_MAX_CHARS", "10")
+    session = _store().start(None, now=0.0)
+    check_size(session, [{"role": "user", "content": "x" * 10}])
+    with pytest.raises(SessionError) as exc_info:
+        check_size(session, [{"role": "user", "content": "x" * 11}])
+    assert exc_info.value.status_code == 413
+
+
+def test_decide_counts_history_length_toward_cost() -> None:
+    """Conversation scope: history_length is added to the cost rule's length; only messages are scanned."""
+    config = PolicyConfig(
+        sensitivity_keywords=("secret",),
+        cost_max_prompt_length_for_local=100,
+        cost_max_usd_for_local=None,
+        llm_input_usd_per_1m_tokens=None,
+        cost_chars_per_token=4,
+        default_provider="public",
+        decision_scope=DECISION_SCOPE_CONVERSATION,
+    )
+    assert decide("hi", 2, config, messages=["hi"])["reason_codes"] == ["cost_prefer_local"]
+    assert decide("hi", 2, config, messages=["hi"], history_length=500)["reason_codes"] == ["default"]
@@ -0,0 +1,127 @@
+"""Unit tests for size limits: request body 413, capped provider responses, windowed prompt copies and payloads."""
+
+import hashlib
+import json
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.decision.policies import LOWER_WINDOW_CHARS, sensitivity_match
+from app.main import app
+from app.providers import openai as openai_module
+from app.providers.base import (
+    FAILURE_RESPONSE_TOO_LARGE,
+    STREAM_PAYLOAD_CHARS,
+    CappedTransport,
+    ResponseTooLarge,
+    post_json,
+)
+from app.services.chat_orchestrator import HASH_WINDOW_CHARS, _sha256_text
+
+
+class _Chunks(httpx.SyncByteStream):
+    """Response body without Content-Length, produced chunk by chunk."""
+
+    def __init__(self, chunks) -> None:
+        self._chunks = chunks
+
+    def __iter__(self):
+        yield from self._chunks
+
+
+def test_request_over_content_length_limit_gets_413_before_routing(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A declared Content-Length over MAX_REQUEST_BODY_BYTES is rejected without reading the body."""
+    monkeypatch.setenv("MAX_REQUEST_BODY_BYTES", "100")
+    client = TestClient(app)
+    response = client.post("/v1/chat", json={"messages": [{"role": "user", "content": "x" * 200}]})
+    assert response.status_code == 413
+    assert "MAX_REQUEST_BODY_BYTES" in response.json()["detail"]
+
+
+def test_streamed_body_over_limit_gets_413(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A chunked body (no Content-Length) is cut off once it passes the limit, on any POST route."""
+    monkeypatch.setenv("MAX_REQUEST_BODY_BYTES", "100")
+    client = TestClient(app)
+
+    def chunks():
+        yield b'{"messages": [{"role": "user", "content": "'
+        for _ in range(10):
+            yield b"x" * 50
+        yield b'"}]}'
+
+    for path in ("/v1/chat", "/v1/chat/completions"):
+        response = client.post(path, content=chunks(), headers={"Content-Type": "application/json"})
+        assert response.status_code == 413, path
+
+
+def test_body_under_limit_passes(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Bodies within the limit reach validation as before; 0 disables the limit."""
+    monkeypatch.setenv("MAX_REQUEST_BODY_BYTES", "0")
+    client = TestClient(app)
+    assert client.post("/v1/chat", json={"messages": []}).status_code == 422
+
+
+def test_capped_transport_rejects_large_content_length() -> None:
+    """A Content-Length over the cap fails before the body is read."""
+    inner = httpx.MockTransport(lambda r: httpx.Response(200, content=b"x" * 1000))
+    with httpx.Client(transport=CappedTransport(100, inner)) as client:
+        with pytest.raises(ResponseTooLarge):
+            client.get("http://fake/")
+
+
+def test_capped_transport_stops_reading_unsized_body() -> None:
+    """A body without Content-Length stops being read once it passes the cap."""
+    read = []
+
+    def body():
+        for _ in range(100):
+            read.append(1)
+            yield b"x" * 64
+
+    inner = httpx.MockTransport(lambda r: httpx.Response(200, stream=_Chunks(body())))
+    with httpx.Client(transport=CappedTransport(256, inner)) as client:
+        with pytest.raises(ResponseTooLarge):
+            client.get("http://fake/")
+    assert len(read) == 5
+
+
+def test_adapter_reports_response_too_large() -> None:
+    """The adapter maps an oversized provider response to failure_category response_too_large."""
+    inner = httpx.MockTransport(lambda r: httpx.Response(200, content=b"x" * 1000))
+    with httpx.Client(transport=CappedTransport(100, inner)) as client:
+        result = openai_module.chat([{"role": "user", "content": "Hi"}], api_key="k", base_url="http://fake", client=client)
+    assert result["success"] is False
+    assert result["failure_category"] == FAILURE_RESPONSE_TOO_LARGE
+
+
+def test_sensitivity_match_finds_keyword_across_window_boundary() -> None:
+    """Windowed lowering still finds a keyword that straddles two windows."""
+    text = "a" * (LOWER_WINDOW_CHARS - 3) + "SECRET" + "b" * 10
+    assert sensitivity_match(text, ("secret",))
+    assert not sensitivity_match("a" * (3 * LOWER_WINDOW_CHARS), ("secret",))
+
+
+def test_windowed_prompt_hash_matches_whole_text_hash() -> None:
+    """Hashing in windows gives the same digest as hashing the whole encoded text."""
+    text = "é" * (HASH_WINDOW_CHARS + 7)
+    assert _sha256_text(text) == hashlib.sha256(text.encode()).hexdigest()
+
+
+def test_post_json_streams_huge_payload_with_content_length() -> None:
+    """A payload with a very long string is sent in window-encoded chunks that decode to the same JSON."""
+    content = ('line "one"\n\tcafé ☕ ' * (STREAM_PAYLOAD_CHARS // 10))[: STREAM_PAYLOAD_CHARS + 5]
+    payload = {"model": "m", "messages": [{"role": "user", "content": content}], "stream": False}
+    seen = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen["headers"] = request.headers
+        seen["body"] = request.read()
+        return httpx.Response(200, json={})
+
+    with httpx.Client(transport=httpx.MockTransport(handler)) as client:
+        post_json(client, "http://fake/", payload, {"X-Test": "1"}, httpx.Timeout(5.0))
+    assert json.loads(seen["body"]) == payload
+    assert int(seen["headers"]["content-length"]) == len(seen["body"])
+    assert "transfer-encoding" not in seen["headers"]
+    assert seen["headers"]["x-test"] == "1"
@@ -0,0 +1,81 @@
+"""Unit tests for provider timeouts: split config, adaptive read timeout, client deadlines."""
+
+import time
+
+import pytest
+
+from app.core.config import get_provider_timeouts
+from app.services.timeouts import (
+    MIN_SAMPLES,
+    latency_windows,
+    parse_deadline,
+    plan_timeouts,
+    prompt_bucket,
+)
+
+
+def _observe(provider: str, seconds: float, n: int = MIN_SAMPLES, chars: int = 10) -> None:
+    for _ in range(n):
+        latency_windows.observe(provider, prompt_bucket(chars), seconds)
+
+
+def test_split_timeouts_default_and_override(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Read defaults to PROVIDER_TIMEOUT_SECONDS; PROVIDER_TIMEOUTS_<PROVIDER> overrides phases."""
+    monkeypatch.setenv("PROVIDER_TIMEOUT_SECONDS", "30")
+    monkeypatch.setenv("PROVIDER_TIMEOUTS_OPENAI", "connect=1.5,read=90,pool=bad,other=3,write=-1")
+    local = get_provider_timeouts("local")
+    assert (local.connect, local.read, local.write, local.pool) == (5.0, 30.0, 10.0, 5.0)
+    public = get_provider_timeouts("openai")
+    assert (public.connect, public.read, public.write, public.pool) == (1.5, 90.0, 10.0, 5.0)
+
+
+def test_static_mode_ignores_observed_latency(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Without PROVIDER_TIMEOUT_MODE=adaptive the configured read timeout is used."""
+    monkeypatch.setenv("PROVIDER_TIMEOUT_SECONDS", "60")
+    _observe("local", 0.5)
+    plan = plan_timeouts("local", 10)
+    assert (plan.source, plan.timeouts.read, plan.skip) == ("static", 60.0, False)
+
+
+def test_adaptive_read_timeout_from_percentile_with_floor_and_ceiling(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Adaptive: percentile × multiplier per prompt bucket, clamped; static until enough samples."""
+    monkeypatch.setenv("PROVIDER_TIMEOUT_MODE", "adaptive")
+    monkeypatch.setenv("PROVIDER_TIMEOUT_SECONDS", "60")
+    monkeypatch.setenv("ADAPTIVE_TIMEOUT_MULTIPLIER", "2")
+    monkeypatch.setenv("ADAPTIVE_TIMEOUT_FLOOR_SECONDS", "1")
+    _observe("local", 4.0, n=MIN_SAMPLES - 1)
+    assert plan_timeouts("local", 10).source == "static"
+    _observe("local", 4.0, n=1)
+    plan = plan_timeouts("local", 10)
+    assert (plan.source, plan.timeouts.read) == ("adaptive", 8.0)
+    assert plan_timeouts("local", 20_000).source == "static"  # other bucket has no samples
+
+    _observe("local", 0.1, chars=5_000)
+    assert plan_timeouts("local", 5_000).timeouts.read == 1.0
+    _observe("local", 50.0, chars=50_000)
+    assert plan_timeouts("local", 50_000).timeouts.read == 60.0
+
+
+def test_deadline_caps_every_phase() -> None:
+    """With time left below the timeouts, every phase is capped at the remaining time."""
+    plan = plan_timeouts("openai", 10, time.monotonic() + 2.0)
+    assert plan.source == "deadline" and not plan.skip
+    assert plan.timeouts.read <= 2.0 and plan.timeouts.connect <= 2.0
+
+
+def test_deadline_skips_when_median_latency_exceeds_time_left() -> None:
+    """A provider whose median latency is above the time left (or no time left) is skipped."""
+    _observe("local", 3.0)
+    assert plan_timeouts("local", 10, time.monotonic() + 1.0).skip
+    assert not plan_timeouts("local", 10, time.monotonic() + 10.0).skip
+    assert plan_timeouts("openai", 10, time.monotonic() - 0.1).skip
+
+
+def test_parse_deadline_header() -> None:
+    """X-Deadline-Ms is milliseconds from now; missing, invalid or non-positive values are ignored."""
+    before = time.monotonic()
+    deadline = parse_deadline({"X-Deadline-Ms": "1500"})
+    assert deadline is not None and 1.4 < deadline - before < 1.6
+    assert parse_deadline({"X-Deadline-Ms": "soon"}) is None
+    assert parse_deadline({"X-Deadline-Ms": "0"}) is None
+    assert parse_deadline(None) is None
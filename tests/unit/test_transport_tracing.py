@@ -0,0 +1,117 @@
+"""Unit tests for provider transport timing: trace phases, post_json capture, audit and metrics wiring."""
+
+import json
+from unittest.mock import patch
+
+import httpx
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app.main import app
+from app.providers import tracing
+from app.providers.base import post_json
+from app.providers.tracing import TransportTrace, capture
+
+_REAL_CLIENT = httpx.Client
+
+# One call on a new TLS connection: each step takes 10 ms of the fake clock.
+_EVENTS = (
+    "connection.connect_tcp",
+    "connection.start_tls",
+    "http11.send_request_headers",
+    "http11.send_request_body",
+    "http11.receive_response_headers",
+    "http11.receive_response_body",
+)
+
+
+def _play(trace, steps=_EVENTS) -> None:
+    """Emit started/complete pairs for `steps` as httpcore would."""
+    for step in steps:
+        trace(f"{step}.started", {})
+        trace(f"{step}.complete", {})
+
+
+class _Clock:
+    """perf_counter stand-in that advances 10 ms per reading."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        self.now += 0.010
+        return self.now
+
+
+def test_trace_sums_phases_from_httpcore_events() -> None:
+    """Started/complete pairs become per-phase durations; headers and body writes add up."""
+    trace = TransportTrace()
+    with patch.object(tracing.time, "perf_counter", _Clock()):
+        _play(trace)
+        trace("http11.response_closed.started", {})  # not a timed phase
+    assert trace.timing() == {"connect_ms": 10.0, "tls_ms": 10.0, "write_ms": 20.0, "ttfb_ms": 10.0, "read_ms": 10.0}
+
+
+def test_trace_keeps_phases_reached_by_a_failed_call() -> None:
+    """A failed connect is timed; phases that never started are absent; no events means no timing."""
+    trace = TransportTrace()
+    with patch.object(tracing.time, "perf_counter", _Clock()):
+        trace("connection.connect_tcp.started", {})
+        trace("connection.connect_tcp.failed", {"exception": OSError()})
+    assert trace.timing() == {"connect_ms": 10.0}
+    assert TransportTrace().timing() is None
+
+
+def test_post_json_attaches_active_trace_and_records_body_sizes() -> None:
+    """Within capture(), the request carries the trace and the body sizes are recorded."""
+    seen = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen["trace"] = request.extensions.get("trace")
+        _play(seen["trace"], _EVENTS[2:])  # pooled connection: no connect or tls
+        return httpx.Response(200, stream=httpx.ByteStream(b'{"ok":true}'))
+
+    with _REAL_CLIENT(transport=httpx.MockTransport(handler)) as client, capture() as trace:
+        post_json(client, "http://fake/", {"model": "m"}, None, httpx.Timeout(5.0))
+    timing = trace.timing()
+    assert seen["trace"] is trace
+    assert set(timing) == {"write_ms", "ttfb_ms", "read_ms", "bytes_sent", "bytes_received"}
+    assert timing["bytes_sent"] == len(b'{"model":"m"}')
+    assert timing["bytes_received"] == len(b'{"ok":true}')
+
+
+def test_post_json_without_capture_sends_no_trace() -> None:
+    """Outside capture() requests go out without the trace extension."""
+    seen = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen["extensions"] = dict(request.extensions)
+        return httpx.Response(200, json={})
+
+    with _REAL_CLIENT(transport=httpx.MockTransport(handler)) as client:
+        post_json(client, "http://fake/", {"model": "m"}, None, httpx.Timeout(5.0))
+    assert "trace" not in seen["extensions"]
+
+
+def test_chat_audits_and_observes_transport_timing() -> None:
+    """A /v1/chat call records the phases in the audit event and the transport histograms."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        _play(request.extensions["trace"])
+        body = json.dumps({"message": {"role": "assistant", "content": "Hello"}}).encode()
+        return httpx.Response(200, stream=httpx.ByteStream(body))
+
+    transport = httpx.MockTransport(handler)
+    labels = {"provider": "local", "phase": "tls"}
+    before = REGISTRY.get_sample_value("provider_transport_phase_seconds_count", labels) or 0.0
+    with (
+        patch("app.services.chat_orchestrator.decide", return_value={"provider": "local", "reason_codes": ["default"]}),
+        patch("app.providers.transport.provider_client", lambda timeout, pool: _REAL_CLIENT(transport=transport, timeout=timeout)),
+        patch("app.services.chat_orchestrator.persist_audit_event") as mock_persist,
+    ):
+        response = TestClient(app).post("/v1/chat", json={"messages": [{"role": "user", "content": "Hi"}]})
+    assert response.status_code == 200
+    timing = json.loads(mock_persist.call_args[0][0].transport_timing)
+    assert {"connect_ms", "tls_ms", "write_ms", "ttfb_ms", "read_ms", "bytes_sent", "bytes_received"} <= set(timing)
+    assert timing["bytes_received"] > 0
+    assert REGISTRY.get_sample_value("provider_transport_phase_seconds_count", labels) == before + 1